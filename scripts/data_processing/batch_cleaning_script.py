@@ -0,0 +1,26 @@
+import os
+import definitions
+from src.data_base_module.data_retrival import instance as db
+import src.data_base_module.data_blocks as data
+import src.data_processing_module.data_cleaning as data_cleaner
+import src.data_processing_module.batch_cleaning as batch_cleaning
+
+# ------- user inputs ------
+symbol = "NHK17"
+date_range = (data.Date(day = 1, month = 3, year = 2017), data.Date(day = 31, month = 3, year = 2017))
+manifest_file_path = os.path.join(definitions.LOGS_FOLDER_PATH, "cleaning_manifest_" + symbol + ".json")
+workers = 4
+cleaning_pipeline = data_cleaner.TickCleaningPipeline([
+    data_cleaner.ZeroInterpolationStep(data_cleaner.BID_ASK_PRICE_COLUMNS),
+    data_cleaner.ZeroInterpolationStep(data_cleaner.BID_ASK_QUANTITY_COLUMNS),
+    data_cleaner.OutlierInterpolationStep(data_cleaner.BID_ASK_QUANTITY_COLUMNS, upper_threshold = 1000),
+    # ------ rolling median / MAD outliers, the price thresholds follow the market and need no tuning per day ------
+    data_cleaner.RollingMedianOutlierStep(data_cleaner.BID_ASK_PRICE_COLUMNS, window = 101, num_mads = 5.0),
+    data_cleaner.TradeRollingMedianOutlierStep(data.TickDataColumns.LAST_PRICE, window = 101, num_mads = 5.0),
+    data_cleaner.TradeOutlierInterpolationStep(data.TickDataColumns.LAST_QUANTITY, upper_threshold = 200)])
+
+# ------- clean every day of the range, the days in the manifest were cleaned by a previous run and are skipped ------
+day_reports = batch_cleaning.run_batch_cleaning(db, symbol, cleaning_pipeline, manifest_file_path, date_range = date_range,
+                                                split_points_hours = 7, workers = workers)
+for day_report in sorted(day_reports, key = lambda day_report : day_report.date.get_str()):
+    print(day_report.date.get_str_format_2(), day_report.raw_row_count, "ticks", f"{day_report.total_seconds:.3f}s")
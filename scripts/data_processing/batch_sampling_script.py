@@ -0,0 +1,15 @@
+from src.data_base_module.data_retrival import instance as db
+import src.data_processing_module.batch_sampling as batch_sampling
+import src.data_base_module.data_blocks as data
+
+# ------- user inputs ------
+symbol = "NHK17"
+date_range = (data.Date(day = 1, month = 3, year = 2017), data.Date(day = 31, month = 3, year = 2017))
+sampling_specs = [batch_sampling.SamplingSpec(data.Sampling.VOLUME, level) for level in [10, 20, 50, 100]] + \
+                 [batch_sampling.SamplingSpec(data.Sampling.TIME, 60), batch_sampling.SamplingSpec(data.Sampling.DOLLAR, 500000)]
+workers = 4
+
+# ------- sample every (date, intra day period) of the range, bars already stored are skipped ------
+reports = batch_sampling.run_batch_sampling(db, symbol, sampling_specs, date_range = date_range, workers = workers)
+for report in reports:
+    print(report.tick_info, len(report.sampled_bar_infos), "sampled", len(report.skipped_bar_infos), "skipped", f"{report.total_seconds:.3f}s")
@@ -0,0 +1,20 @@
+from src.data_base_module.data_retrival import instance as db
+import src.data_base_module.data_blocks as data
+import src.data_processing_module.data_cleaning as data_cleaner
+
+# ------- same cleaning as clean_and_store_data_script.py, for raw tick files that do not fit into memory -------
+CHUNK_SIZE = 1000000
+cleaning_pipeline = data_cleaner.TickCleaningPipeline([
+    data_cleaner.ZeroInterpolationStep(data_cleaner.BID_ASK_PRICE_COLUMNS),
+    data_cleaner.ZeroInterpolationStep(data_cleaner.BID_ASK_QUANTITY_COLUMNS),
+    data_cleaner.OutlierInterpolationStep(data_cleaner.BID_ASK_QUANTITY_COLUMNS, upper_threshold = 1000),
+    data_cleaner.OutlierInterpolationStep(data_cleaner.BID_ASK_PRICE_COLUMNS, lower_threshold = 18000, upper_threshold = 20000),
+    data_cleaner.TradeOutlierInterpolationStep(data.TickDataColumns.LAST_PRICE, lower_threshold = 18000, upper_threshold = 20000),
+    data_cleaner.TradeOutlierInterpolationStep(data.TickDataColumns.LAST_QUANTITY, upper_threshold = 200)])
+
+# ------- read the raw tick data chunk by chunk, only one chunk is held in memory at a time -------
+tick_chunks = db.iter_raw_tick_data("NHK17", data.Date(day = 7, month = 3, year = 2017), chunk_size = CHUNK_SIZE)
+# ------- split tick data between morning and afternoon to deal with mid day gapping ------
+period_chunks = data_cleaner.morning_after_noon_split_chunks(tick_chunks, 7)
+# ------ clean and insert the morning and afternoon data -------
+db.insert_clean_tick_chunks(data_cleaner.clean_tick_chunks(period_chunks, [cleaning_pipeline]))
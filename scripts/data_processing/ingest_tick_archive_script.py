@@ -0,0 +1,20 @@
+from src.data_base_module.data_retrival import instance as db
+import src.data_base_module.data_blocks as data
+import src.data_base_module.tick_archive as tick_archive
+import src.data_processing_module.data_diagnostics as data_diagnostics
+
+"""
+Converts the raw tick files of a symbol into the date partitioned tick archive
+Days that are already in the archive are skipped, so the script can be rerun when new raw tick files arrive
+Every added day is diagnosed and its diagnostics summary is logged
+"""
+
+# ------- user inputs -------
+symbol : str = "NHK17"
+date_range = (data.Date(day = 1, month = 1, year = 2017), data.Date(day = 31, month = 12, year = 2017))
+
+# ------- ingest -------
+archive = tick_archive.TickArchive()
+added_partitions = tick_archive.ingest_raw_tick_files(data_base = db, tick_archive = archive, symbol = symbol, date_range = date_range,
+                                                      ingest_callback = data_diagnostics.diagnose_and_log)
+print("Number of partitions added : " + str(len(added_partitions)))
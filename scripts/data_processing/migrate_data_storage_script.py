@@ -0,0 +1,18 @@
+from src.data_base_module.data_retrival import DataBase, migrate_data_base
+import src.data_base_module.storage_backends as storage
+
+"""
+One shot migration of the data_storage folder from csv files to parquet files (or memory mapped numpy column files)
+After running this script, create the data base with DataBase(storage_backend = target_backend)
+"""
+
+# ------- user inputs -------
+remove_source_files : bool = False
+target_backend : storage.StorageBackend = storage.ParquetStorageBackend()
+#target_backend : storage.StorageBackend = storage.NumpyMemmapStorageBackend()
+
+# ------- migrate -------
+source_db = DataBase(storage_backend = storage.CsvStorageBackend())
+target_db = DataBase(storage_backend = target_backend)
+num_migrated = migrate_data_base(source = source_db, target = target_db, remove_source_files = remove_source_files)
+print("Number of files migrated : " + str(num_migrated))
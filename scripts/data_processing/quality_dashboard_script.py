@@ -0,0 +1,19 @@
+import os
+import definitions
+from src.data_base_module.data_retrival import instance as db
+import src.data_processing_module.quality_dashboard as quality_dashboard
+
+"""
+Diagnoses every raw and clean tick file in the data base and writes quality.parquet and quality.html to the output folder
+Files that did not change since the last run are answered from the cache in the output folder
+"""
+
+# ------- user inputs ------
+output_folder_path = os.path.join(definitions.DATA_FOLDER_PATH, "data_quality")
+symbols = None
+workers = 4
+
+# ------- diagnose every tick file, print the per symbol summary ------
+quality_df = quality_dashboard.run_quality_dashboard(db, output_folder_path, symbols = symbols, workers = workers)
+print(quality_dashboard.make_symbol_summary_table(quality_df).to_string(index = False))
+print("Dashboard written to : " + os.path.join(output_folder_path, "quality.html"))
@@ -3,37 +3,31 @@ import src.data_processing_module.sampling as sampling
 import src.data_base_module.data_blocks as data
 
 # ------- user inputs ------
-sampling_seconds = 60
-sampling_ticks = 200
-sampling_volume = 20
-sampling_dollar = 500000
+sampling_seconds_levels = [60]
+sampling_ticks_levels = [200]
+sampling_volume_levels = [10, 20, 50, 100]
+sampling_dollar_levels = [500000]
 symbol = "NHK17"
 date = data.Date(day = 7, month = 3, year = 2017)
 
-# ------- retrieve raw tick data -------
-morning_df_wrapper = db.get_clean_tick_data(symbol = "NHK17", date = date, intra_day_period = data.IntraDayPeriod.MORNING)
-afternoon_df_wrapper = db.get_clean_tick_data(symbol = "NHK17", date = date, intra_day_period = data.IntraDayPeriod.AFTERNOON)
+# ------- retrieve clean tick data, only the trade columns are read -------
+morning_df_wrapper = db.get_clean_tick_data(symbol = symbol, date = date, intra_day_period = data.IntraDayPeriod.MORNING, columns = data.TRADE_TICK_COLUMNS)
+afternoon_df_wrapper = db.get_clean_tick_data(symbol = symbol, date = date, intra_day_period = data.IntraDayPeriod.AFTERNOON, columns = data.TRADE_TICK_COLUMNS)
 
-# ------- time smapling ------
-#morning_time_bar_df = sampling.time_sampling(morning_df_wrapper, sampling_seconds = sampling_seconds)
-#afternoon_time_bar_df = sampling.time_sampling(afternoon_df_wrapper, sampling_seconds = sampling_seconds)
-#db.insert_sampled_time_bar(morning_time_bar_df)
-#db.insert_sampled_time_bar(afternoon_time_bar_df)
+# ------- every sampler scans the ticks once for all of its levels ------
+for tick_wrapper in [morning_df_wrapper, afternoon_df_wrapper]:
+    # ------- time sampling ------
+    #for time_bar_wrapper in sampling.time_sampling_multi(tick_wrapper, levels = sampling_seconds_levels).values():
+    #    db.insert_sampled_bar(time_bar_wrapper)
 
-# ------- tick sampling ------
-#morning_tick_bar_df = sampling.tick_sampling(morning_df_wrapper, sampling_ticks = sampling_ticks)
-#afternoon_tick_bar_df = sampling.tick_sampling(afternoon_df_wrapper, sampling_ticks = sampling_ticks)
-#db.insert_sampled_tick_bar(morning_tick_bar_df)
-#db.insert_sampled_tick_bar(afternoon_tick_bar_df)
+    # ------- tick sampling ------
+    #for tick_bar_wrapper in sampling.tick_sampling_multi(tick_wrapper, levels = sampling_ticks_levels).values():
+    #    db.insert_sampled_bar(tick_bar_wrapper)
 
-# ------- volume sampling -------
-morning_volume_bar_df = sampling.volume_sampling(morning_df_wrapper, sampling_volume = sampling_volume)
-afternoon_volume_bar_df = sampling.volume_sampling(afternoon_df_wrapper, sampling_volume = sampling_volume)
-db.insert_sampled_volume_bar(morning_volume_bar_df)
-db.insert_sampled_volume_bar(afternoon_volume_bar_df)
+    # ------- volume sampling -------
+    for volume_bar_wrapper in sampling.volume_sampling_multi(tick_wrapper, levels = sampling_volume_levels).values():
+        db.insert_sampled_bar(volume_bar_wrapper)
 
-# ------- dollar sampling --------
-#morning_dollar_bar_df = sampling.dollar_sampling(morning_df_wrapper, sampling_dollar = sampling_dollar)
-#afternoon_dollar_bar_df = sampling.dollar_sampling(afternoon_df_wrapper, sampling_dollar = sampling_dollar)
-#db.insert_sampled_dollar_bar(morning_dollar_bar_df)
-#db.insert_sampled_dollar_bar(afternoon_dollar_bar_df)
\ No newline at end of file
+    # ------- dollar sampling --------
+    #for dollar_bar_wrapper in sampling.dollar_sampling_multi(tick_wrapper, levels = sampling_dollar_levels).values():
+    #    db.insert_sampled_bar(dollar_bar_wrapper)
@@ -0,0 +1,23 @@
+from src.data_base_module.data_retrival import instance as db
+import src.data_base_module.data_blocks as data
+
+"""
+Records every file in the data_storage folder into the data catalog
+Only needs to be run when files are added to the data base without going through the DataBase class
+"""
+
+# ------- user inputs -------
+symbol : str = "NHK17"
+sampling_volume : int = 20
+
+# ------- rebuild -------
+num_recorded = db.rebuild_catalog()
+print("Number of files recorded : " + str(num_recorded))
+
+# ------- summary -------
+for raw_tick_date in db.list_available_raw_tick_dates(symbol = symbol):
+    print("raw tick data : " + symbol + " -- " + raw_tick_date.get_str_format_2())
+for tick_info in db.list_available_clean_ticks(symbol = symbol):
+    print("clean tick data : " + str(tick_info))
+for bar_info in db.list_available(symbol = symbol, sampling_type = data.Sampling.VOLUME, sampling_level = sampling_volume):
+    print(bar_info)
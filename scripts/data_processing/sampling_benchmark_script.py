@@ -0,0 +1,15 @@
+import os
+import definitions
+import src.data_processing_module.sampling_benchmark as benchmark
+
+# ------- user inputs ------
+results_file_path = os.path.join(definitions.LOGS_FOLDER_PATH, "sampling_benchmark.csv")
+sizes = benchmark.BENCHMARK_SIZES
+config = benchmark.SyntheticTickConfig(trade_probability = 0.5, quantity_distribution = benchmark.QuantityDistribution.GEOMETRIC, mean_quantity = 5,
+                                       block_trade_probability = 0.001, block_trade_quantity_range = (500, 5000))
+
+# ------- time every sampler from 10k to 10M ticks, the rows of this run are appended to the results file -------
+results = benchmark.run_sampling_benchmark(results_file_path, sizes = sizes, config = config)
+for result in results:
+    print(f"{result.sampler_name:<32} {result.num_ticks:>9} ticks -- {result.seconds:8.3f} s -- {result.ticks_per_second / 10 ** 6:6.1f} M ticks/s \
+-- {result.peak_memory_mb:8.1f} MB")
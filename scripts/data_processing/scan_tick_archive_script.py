@@ -0,0 +1,18 @@
+import src.data_base_module.data_blocks as data
+import src.data_base_module.tick_archive as tick_archive
+import src.data_processing_module.data_diagnostics as data_diagnostics
+
+"""
+Diagnostics answered from the partition footers of the tick archive, no tick data is read
+Run ingest_tick_archive_script.py first
+"""
+
+# ------- user inputs -------
+symbol : str = "NHK17"
+date_range = (data.Date(day = 1, month = 2, year = 2017), data.Date(day = 28, month = 2, year = 2017))
+
+# ------- scan footers -------
+archive = tick_archive.TickArchive()
+for partition_statistics in archive.find_partitions(symbol = symbol, date_range = date_range):
+    data_diagnostics.scan_partition_summary(partition_statistics = partition_statistics)
+    data_diagnostics.scan_partition_bid_ask_prices_zero_entries(partition_statistics = partition_statistics)
@@ -0,0 +1,48 @@
+import logging
+import time
+import pandas as pd
+import src.data_base_module.data_blocks as data
+import src.data_processing_module.sampling as sampler
+from src.data_processing_module.sampling_benchmark import make_synthetic_ticks
+
+# ------- compares the vectorised volume sampling with the original row by row loop on a synthetic 5M tick day -------
+NUM_TICKS = 5000000
+NUM_LEGACY_TICKS = 100000
+SAMPLING_VOLUME = 100
+logging.getLogger("data_processing_module").setLevel(logging.WARNING)
+
+
+def legacy_volume_sampling(tick_df : pd.DataFrame, sampling_volume : int) -> int:
+    """ the original iterrows loop, only the bar boundaries and VWAP are kept, returns the number of bars """
+    df = tick_df[tick_df[data.TickDataColumns.LAST_PRICE.value] > 0]
+    vwap_series = []
+    volume_counter = 0
+    curr_prices, curr_volumes = [], []
+    for i, tick_row in df.iterrows():
+        while volume_counter >= sampling_volume:
+            volume_counter = volume_counter - sampling_volume
+            vwap_series.append(sum([vol * price for vol, price in zip(curr_volumes, curr_prices)]) / sampling_volume)
+            if volume_counter == 0:
+                curr_prices, curr_volumes = [], []
+            else:
+                curr_prices, curr_volumes = curr_prices[-1:], [min(volume_counter, sampling_volume)]
+        volume_counter = volume_counter + tick_row[data.TickDataColumns.LAST_QUANTITY.value]
+        curr_prices.append(tick_row[data.TickDataColumns.LAST_PRICE.value])
+        if volume_counter >= sampling_volume:
+            curr_volumes.append(sampling_volume - volume_counter + tick_row[data.TickDataColumns.LAST_QUANTITY.value])
+        else:
+            curr_volumes.append(tick_row[data.TickDataColumns.LAST_QUANTITY.value])
+    return len(vwap_series)
+
+
+tick_wrapper = make_synthetic_ticks(NUM_TICKS)
+# ------ the legacy loop is linear in the number of ticks, it is timed on a prefix and extrapolated ------
+start_time = time.perf_counter()
+legacy_volume_sampling(tick_wrapper.tick_data.iloc[:NUM_LEGACY_TICKS], SAMPLING_VOLUME)
+legacy_seconds = (time.perf_counter() - start_time) * NUM_TICKS / NUM_LEGACY_TICKS
+start_time = time.perf_counter()
+bar_wrapper = sampler.volume_sampling(tick_wrapper, sampling_volume = SAMPLING_VOLUME)
+vectorised_seconds = time.perf_counter() - start_time
+print(f"{NUM_TICKS} ticks -> {len(bar_wrapper)} volume bars of {SAMPLING_VOLUME}")
+print(f"row by row loop (extrapolated from {NUM_LEGACY_TICKS} ticks) : {legacy_seconds:.1f} s")
+print(f"vectorised : {vectorised_seconds:.2f} s -- speed up : {legacy_seconds / vectorised_seconds:.0f}x")
@@ -1,5 +1,5 @@
 import src.data_base_module.data_blocks as data
-from src.data_base_module.data_retrival import instance as db
+from src.data_base_module.data_retrival import instance as db, make_interleaved_bar_infos
 import src.machine_learning_module.label_generators as label_gen_mod
 import src.machine_learning_module.filter_generators as filter_gen_mod
 import src.machine_learning_module.bootstrapping as boot_mod
@@ -28,6 +28,7 @@ Average uniqueness across all of the data sets weighted by the number of example
 # ------ data loading inputs ------
 symbol : str = "NHK17"
 sampling_volume : int = 20
+num_load_workers : int = 8
 num_datasets : int = 40
 
 # ----- labeling -----
@@ -76,11 +77,8 @@ date_lst : [data.Date] = [
     #data.Date(day=24, month=2, year=2017)]
 
 # ------ load data ------
-morning_bar_wrapper_lst : List[data.BarDataFrame] = [db.get_sampled_volume_bar(symbol = symbol, date = date, sampling_volume = sampling_volume, intra_day_period = MORNING) for date in date_lst]
-afternoon_bar_wrapper_lst : List[data.BarDataFrame] = [db.get_sampled_volume_bar(symbol = symbol, date = date, sampling_volume = sampling_volume, intra_day_period = AFTERNOON) for date in date_lst]
-bar_wrapper_lst : List[data.BarDataFrame] = [None] * (len(morning_bar_wrapper_lst) + len(afternoon_bar_wrapper_lst))
-bar_wrapper_lst[::2] = morning_bar_wrapper_lst
-bar_wrapper_lst[1::2] = afternoon_bar_wrapper_lst
+bar_info_lst : List[data.BarInfo] = make_interleaved_bar_infos(symbol = symbol, dates = date_lst, sampling_type = data.Sampling.VOLUME, sampling_level = sampling_volume)
+bar_wrapper_lst : List[data.BarDataFrame] = db.load_many(bar_info_lst, workers = num_load_workers)
 
 # ----- create labels -----
 label_df_lst : List[label_gen_mod.LabelDataFrame] = [label_generator.create_labels_for_data_bar(bar_wrapper) for bar_wrapper in bar_wrapper_lst]
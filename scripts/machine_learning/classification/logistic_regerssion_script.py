@@ -1,7 +1,7 @@
 import sklearn.linear_model
 from sklearn.linear_model import LogisticRegression
 import src.data_base_module.data_blocks as data
-from src.data_base_module.data_retrival import instance as db
+from src.data_base_module.data_retrival import instance as db, make_interleaved_bar_infos
 from typing import Dict, List, Any, Set, Tuple, Iterator
 import src.machine_learning_module.utils.random_feature_generators as rand_feat_gen_mod
 import src.machine_learning_module.feature_generators as feature_gen_mod
@@ -24,6 +24,7 @@ In this script, we attempt to use logistic regression
 # ------ user inputs ------
 symbol : str = "NHK17"
 sampling_volume : int = 20
+num_load_workers : int = 8
 price_series_used : data.BarDataColumns = data.BarDataColumns.CLOSE
 look_ahead : int = 15
 threshold : float = 15
@@ -156,12 +157,8 @@ date_lst : [data.Date] = [
 cross_val_indices : List[Tuple[List[int], List[int]]] = pipe_mod.find_cross_val_sets_indices(num_datasets = num_datasets, num_test_sets = num_test_sets, start= cross_val_shift)
 
 # ------ load data ------
-morning_bar_wrapper_lst : List[data.BarDataFrame] = [db.get_sampled_volume_bar(symbol = symbol, date = date, sampling_volume = sampling_volume, intra_day_period = MORNING) for date in date_lst]
-afternoon_bar_wrapper_lst : List[data.BarDataFrame] = [db.get_sampled_volume_bar(symbol = symbol, date = date, sampling_volume = sampling_volume, intra_day_period = AFTERNOON) for date in date_lst]
-bar_wrapper_lst = []
-for morning_bar_wrapper, afternoon_bar_wrapper in zip(morning_bar_wrapper_lst, afternoon_bar_wrapper_lst):
-    bar_wrapper_lst.append(morning_bar_wrapper)
-    bar_wrapper_lst.append(afternoon_bar_wrapper)
+bar_info_lst : List[data.BarInfo] = make_interleaved_bar_infos(symbol = symbol, dates = date_lst, sampling_type = data.Sampling.VOLUME, sampling_level = sampling_volume)
+bar_wrapper_lst : List[data.BarDataFrame] = db.load_many(bar_info_lst, workers = num_load_workers)
 
 # ----- get description for each data set for easier tracking -----
 bar_data_description_lst : List[str] = [str(bar_wrapper) for bar_wrapper in bar_wrapper_lst]
@@ -21,10 +21,10 @@ def log_raw_tick_data_access(tick_info : dat_blocks.TickInfo) -> None:
     logger.info(f"Retrieved raw tick data : {tick_info.symbol} : {tick_info.date.get_str_format_2()}")
 
 def log_clean_tick_data_insertion(tick_info : dat_blocks.TickInfo):
-    logger.info(f"Insert clean tick data : {tick_info.symbol} : {tick_info.date.get_str_format_2()} : {tick_info.intra_day_period.value()}")
+    logger.info(f"Insert clean tick data : {tick_info.symbol} : {tick_info.date.get_str_format_2()} : {tick_info.intra_day_period.value}")
 
 def log_clean_tick_data_access(tick_info : dat_blocks.TickInfo):
-    logger.info(f"Retrieved clean tick data : {tick_info.symbol} : {tick_info.date.get_str_format_2()} : {tick_info.intra_day_period.value()}")
+    logger.info(f"Retrieved clean tick data : {tick_info.symbol} : {tick_info.date.get_str_format_2()} : {tick_info.intra_day_period.value}")
 
 # ------- bar data logging -------
 def log_insert_bar(bar_info : dat_blocks.BarInfo):
@@ -36,6 +36,8 @@ def log_insert_bar(bar_info : dat_blocks.BarInfo):
         logger.info("Inserted Volume Bar Data Frame : " + str(bar_info))
     elif bar_info.sampling_type == dat_blocks.Sampling.DOLLAR:
         logger.info("Inserted Dollar Bar Data Frame : " + str(bar_info))
+    elif bar_info.sampling_type in dat_blocks.IMBALANCE_SAMPLINGS + dat_blocks.RUN_SAMPLINGS:
+        logger.info("Inserted Information Driven Bar Data Frame : " + str(bar_info))
     else :
         raise NotImplementedError()
 
@@ -49,5 +51,30 @@ def log_retrieved_bar(bar_info : dat_blocks.BarInfo):
         logger.info("Retrieved Volume Bar Data Frame : " + str(bar_info))
     elif bar_info.sampling_type == dat_blocks.Sampling.DOLLAR:
         logger.info("Retrieved dollar Bar Data Frame : " + str(bar_info))
+    elif bar_info.sampling_type in dat_blocks.IMBALANCE_SAMPLINGS + dat_blocks.RUN_SAMPLINGS:
+        logger.info("Retrieved Information Driven Bar Data Frame : " + str(bar_info))
     else :
         raise NotImplementedError()
+
+# ------ storage migration -------
+def log_file_migration(source_file_path : str, target_file_path : str):
+    logger.info(f"Migrated file : {source_file_path} -> {target_file_path}")
+
+def log_skipped_migration(source_file_path : str, target_file_path : str):
+    logger.info(f"Skipped migration, target file is already at schema version {dat_blocks.SCHEMA_VERSION} : {source_file_path} -> {target_file_path}")
+
+def log_legacy_schema_read(file_path : str, schema_version : int):
+    logger.warning(f"Read file of schema version {schema_version}, cast to schema version {dat_blocks.SCHEMA_VERSION} on load : {file_path} "
+                   f"-- migrate_data_base rewrites legacy files")
+
+# ------ catalog -------
+def log_catalog_rebuild(num_recorded : int):
+    logger.info(f"Rebuilt data catalog : {num_recorded} files recorded")
+
+# ------ bulk loading -------
+def log_load_many(num_loaded : int, workers : int):
+    logger.info(f"Loaded {num_loaded} data frames with {workers} workers")
+
+# ------ tick archive -------
+def log_partition_append(partition_statistics):
+    logger.info(f"Appended tick archive partition : {partition_statistics.symbol} : {partition_statistics.date.get_str_format_2()} : {partition_statistics.row_count} ticks")
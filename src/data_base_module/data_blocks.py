@@ -1,7 +1,8 @@
 from enum import Enum
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass
-from typing import ClassVar, Dict
+from typing import Callable, ClassVar, Dict, Iterable, Iterator, List, Optional
 
 
 # ------- date class --------
@@ -56,12 +57,29 @@ class Date:
     def __eq__(self, other):
         return (self.day == other.day) and (self.month == other.month) and (self.year == other.year)
 
+    @staticmethod
+    def from_str(date_str : str):
+        """ inverse of get_str, takes a string in the format YYYYMMDD """
+        return Date(day = int(date_str[6:8]), month = int(date_str[4:6]), year = int(date_str[0:4]))
+
 # ------- Enums -------
 class Sampling(Enum):
     TIME = "Time sampled"
     TICK = "Tick sampled"
     VOLUME = "Volume sampled"
     DOLLAR = "Dollar sampled"
+    TICK_IMBALANCE = "Tick imbalance sampled"
+    VOLUME_IMBALANCE = "Volume imbalance sampled"
+    DOLLAR_IMBALANCE = "Dollar imbalance sampled"
+    TICK_RUN = "Tick run sampled"
+    VOLUME_RUN = "Volume run sampled"
+    DOLLAR_RUN = "Dollar run sampled"
+
+
+""" information driven bars close when the imbalance / run of signed trades exceeds its expected value, 
+their sampling level is the initial expected number of ticks per bar """
+IMBALANCE_SAMPLINGS : List[Sampling] = [Sampling.TICK_IMBALANCE, Sampling.VOLUME_IMBALANCE, Sampling.DOLLAR_IMBALANCE]
+RUN_SAMPLINGS : List[Sampling] = [Sampling.TICK_RUN, Sampling.VOLUME_RUN, Sampling.DOLLAR_RUN]
 
 
 class BarDataColumns(Enum):
@@ -74,6 +92,21 @@ class BarDataColumns(Enum):
     TIMESTAMP  = "timestamp"
 
 
+class LimitBookBarColumns(Enum):
+    OPEN_BID = "open_bid"
+    CLOSE_BID = "close_bid"
+    HIGH_BID = "high_bid"
+    LOW_BID = "low_bid"
+    AVERAGE_BID = "average_bid"
+    OPEN_ASK = "open_ask"
+    CLOSE_ASK = "close_ask"
+    HIGH_ASK = "high_ask"
+    LOW_ASK = "low_ask"
+    AVERAGE_ASK = "average_ask"
+    AVERAGE_BID_ASK_SPREAD = "average_bid_ask_spread"
+    STD_BID_ASK_SPREAD = "std_bid_ask_spread"
+
+
 class IntraDayPeriod(Enum):
     MORNING = "morning"
     AFTERNOON = "afternoon"
@@ -107,6 +140,62 @@ class TickDataColumns(Enum):
     BID5Q = "bid5q"
 
 
+# ------- column data types -------
+""" schema of the stored and retrieved bar and tick data, 
+-> timestamps are int64 nanoseconds
+-> prices are float32, exact for prices on a tick grid of up to 7 significant digits
+-> quantities are int32, fractional quantities (e.g. produced by interpolation) are rounded to the nearest integer
+-> averages and sums that need the extra precision (VWAP, bar volume) stay float64
+The schema version is stored in every file written by a storage backend, files without one are version 1 (all float64) 
+NOTE : raw tick files may contain missing quantities, they are read with float32 quantities until they are cleaned """
+SCHEMA_VERSION : int = 2
+LEGACY_SCHEMA_VERSION : int = 1
+TIMESTAMP_DTYPE : str = "int64"
+PRICE_DTYPE : str = "float32"
+QUANTITY_DTYPE : str = "int32"
+RAW_QUANTITY_DTYPE : str = "float32"
+
+TICK_QUANTITY_COLUMNS : List[TickDataColumns] = [TickDataColumns.LAST_QUANTITY,
+                                                 TickDataColumns.ASK1Q, TickDataColumns.ASK2Q, TickDataColumns.ASK3Q, TickDataColumns.ASK4Q, TickDataColumns.ASK5Q,
+                                                 TickDataColumns.BID1Q, TickDataColumns.BID2Q, TickDataColumns.BID3Q, TickDataColumns.BID4Q, TickDataColumns.BID5Q]
+
+def find_tick_dtype(col : TickDataColumns, quantity_dtype : str) -> str:
+    if col == TickDataColumns.TIMESTAMP_NANO:
+        return TIMESTAMP_DTYPE
+    return quantity_dtype if col in TICK_QUANTITY_COLUMNS else PRICE_DTYPE
+
+BAR_DATA_DTYPES : Dict[str, str] = {BarDataColumns.OPEN.value : PRICE_DTYPE, BarDataColumns.CLOSE.value : PRICE_DTYPE,
+                                    BarDataColumns.HIGH.value : PRICE_DTYPE, BarDataColumns.LOW.value : PRICE_DTYPE,
+                                    BarDataColumns.VOLUME.value : "float64", BarDataColumns.VWAP.value : "float64",
+                                    BarDataColumns.TIMESTAMP.value : TIMESTAMP_DTYPE}
+TICK_DATA_DTYPES : Dict[str, str] = {col.value : find_tick_dtype(col, QUANTITY_DTYPE) for col in TickDataColumns}
+RAW_TICK_DATA_DTYPES : Dict[str, str] = {col.value : find_tick_dtype(col, RAW_QUANTITY_DTYPE) for col in TickDataColumns}
+LEGACY_BAR_DATA_DTYPES : Dict[str, str] = {col.value : ("int64" if col == BarDataColumns.TIMESTAMP else "float64") for col in BarDataColumns}
+LEGACY_TICK_DATA_DTYPES : Dict[str, str] = {col.value : ("int64" if col == TickDataColumns.TIMESTAMP_NANO else "float64") for col in TickDataColumns}
+
+
+def cast_array(array : np.ndarray, dtype : str) -> np.ndarray:
+    """
+    casts an array to the schema data type, returns the array itself if it already has the data type
+    float arrays cast to integer types are rounded to the nearest integer instead of truncated
+    :raises SchemaViolationException: if missing values would be cast to an integer type
+    """
+    target_dtype = np.dtype(dtype)
+    if array.dtype == target_dtype:
+        return array
+    if target_dtype.kind in "iu" and array.dtype.kind == "f":
+        if np.isnan(array).any():
+            raise SchemaViolationException(dtype = dtype)
+        return np.rint(array).astype(target_dtype)
+    return array.astype(target_dtype)
+
+
+def apply_schema(df : pd.DataFrame, dtypes : Dict[str, str]) -> pd.DataFrame:
+    """ selects the columns in dtypes and casts them with cast_array, columns that already have the right data type are not copied """
+    return pd.DataFrame({col_name : cast_array(df[col_name].to_numpy(), dtype) for col_name, dtype in dtypes.items()},
+                        index = df.index, copy = False)
+
+
 # ------- bar data frames -------
 """ The purpose of bar data frame classes is to encapsulate a pandas data frame containing bar data 
 -> ensure that the wrapped data frame contains certain columns 
@@ -130,6 +219,19 @@ class BarDataFrame:
         self.bar_data : pd.DataFrame = bar_data.loc[:, [col.value for col in BarDataColumns]]
         self.bar_info = bar_info
 
+    @classmethod
+    def wrap_without_copy(cls, bar_data : pd.DataFrame, bar_info : BarInfo):
+        """
+        Wraps a data frame that already contains exactly the BarDataColumns in order, without making a copy
+        NOTE : the bar data frame shares memory with bar_data
+        """
+        if list(bar_data.columns) != [col.value for col in BarDataColumns]:
+            raise ValueError("bar_data must contain exactly the BarDataColumns in order")
+        bar_wrapper = cls.__new__(cls)
+        bar_wrapper.bar_data = bar_data
+        bar_wrapper.bar_info = bar_info
+        return bar_wrapper
+
     def get_column(self, col_name : BarDataColumns) -> pd.Series:
         return self.bar_data[col_name.value]
 
@@ -149,6 +251,29 @@ class BarDataFrame:
             return False
         return self.bar_data.equals(other.bar_data) and (self.bar_info == other.bar_info)
 
+class LimitBookBarDataFrame(BarDataFrame):
+    """
+    Bar data frame with statistics of the best bid (BID1P) and best ask (ASK1P) of the ticks in each bar
+    Requires and enforces the BarDataColumns followed by the LimitBookBarColumns
+    """
+    def __init__(self, bar_data : pd.DataFrame, bar_info : BarInfo):
+        self.validate_bar_columns(bar_data)
+        self.validate_limit_book_columns(bar_data)
+        self.bar_data : pd.DataFrame = bar_data.loc[:, [col.value for col in BarDataColumns] + [col.value for col in LimitBookBarColumns]]
+        self.bar_info = bar_info
+
+    def get_limit_book_column(self, col_name : LimitBookBarColumns) -> pd.Series:
+        return self.bar_data[col_name.value]
+
+    def validate_limit_book_columns(self, bar_data : pd.DataFrame):
+        for required_column in LimitBookBarColumns:
+            if required_column.value not in bar_data.columns:
+                raise LimitBookBarRequiredColumnNotFound(required_column)
+
+    def get_trade_bar(self) -> BarDataFrame:
+        """ the bar data frame without the limit order book statistics """
+        return BarDataFrame(bar_data = self.bar_data, bar_info = self.bar_info)
+
 # -------- Tick data frame -------
 @dataclass
 class TickInfo:
@@ -175,20 +300,200 @@ class TickDataFrame:
         self.tick_data : pd.DataFrame = tick_df.loc[:, [column.value for column in TickDataColumns]]
         self.tick_data.index = pd.RangeIndex(len(self.tick_data))
 
+    @classmethod
+    def wrap_without_copy(cls, tick_df : pd.DataFrame, tick_info : TickInfo):
+        """
+        Wraps a data frame that already contains exactly the TickDataColumns in order, without making a copy
+        Used by the data base for frames it has just read, e.g. frames backed by memory mapped arrays
+        NOTE : the tick data frame shares memory with tick_df
+        """
+        if list(tick_df.columns) != [column.value for column in TickDataColumns]:
+            raise ValueError("tick_df must contain exactly the TickDataColumns in order")
+        tick_wrapper = cls.__new__(cls)
+        tick_wrapper.tick_info = tick_info
+        tick_wrapper.tick_data = tick_df
+        tick_wrapper.tick_data.index = pd.RangeIndex(len(tick_df))
+        return tick_wrapper
+
     def validate_tick_columns(self, tick_df : pd.DataFrame) -> None:
         for required_column in TickDataColumns:
             if required_column.value not in tick_df.columns:
                 raise TickRequiredColumnNotFound(required_column)
 
+    def get_tick_data(self) -> pd.DataFrame:
+        return self.tick_data
+
+    def get_column(self, col_name : TickDataColumns) -> pd.Series:
+        return self.tick_data[col_name.value]
+
+    def get_columns(self, col_names : List[TickDataColumns]) -> pd.DataFrame:
+        """ data frame of the requested columns, NOTE : shares memory with the tick data frame """
+        return pd.DataFrame({col_name.value : self.tick_data[col_name.value].to_numpy() for col_name in col_names}, copy = False)
+
     def __str__(self):
         return str(self.tick_info)
 
+    def __len__(self) -> int:
+        return len(self.tick_data)
+
     def __eq__(self, other) -> bool:
         """ NOTE : this equality condition fails when comparing floats with int even if the values are the same """
         if not isinstance(other, TickDataFrame):
             return False
         return self.tick_data.equals(other.tick_data) and (self.tick_info == other.tick_info)
 
+# -------- lazily loaded data frames -------
+""" Lazy data frames read their columns from storage the first time they are accessed
+-> get_column and get_columns only read the requested columns
+-> accessing tick_data / bar_data reads every column that has not been read yet, after which the lazy data frame behaves as a normal one
+The data base hands these out when a columns projection is passed to its getters """
+TRADE_TICK_COLUMNS : List[TickDataColumns] = [TickDataColumns.TIMESTAMP_NANO, TickDataColumns.LAST_PRICE, TickDataColumns.LAST_QUANTITY]
+BEST_QUOTE_TICK_COLUMNS : List[TickDataColumns] = TRADE_TICK_COLUMNS + [TickDataColumns.ASK1P, TickDataColumns.BID1P]
+
+
+class LazyColumnStore:
+    """
+    :param load_columns: function taking a list of column names and returning a data frame with those columns
+    :param loaded_df: columns that have already been read
+    """
+    def __init__(self, load_columns : Callable[[List[str]], pd.DataFrame], loaded_df : Optional[pd.DataFrame] = None):
+        self.load_columns : Callable[[List[str]], pd.DataFrame] = load_columns
+        self.column_arrays : Dict[str, np.ndarray] = {}
+        if loaded_df is not None:
+            self.column_arrays.update({col_name : loaded_df[col_name].to_numpy() for col_name in loaded_df.columns})
+
+    def get_frame(self, col_names : List[str]) -> pd.DataFrame:
+        missing_col_names = [col_name for col_name in col_names if col_name not in self.column_arrays]
+        if len(missing_col_names) > 0:
+            loaded_df = self.load_columns(missing_col_names)
+            self.column_arrays.update({col_name : loaded_df[col_name].to_numpy() for col_name in missing_col_names})
+        return pd.DataFrame({col_name : self.column_arrays[col_name] for col_name in col_names}, copy = False)
+
+    def is_loaded(self, col_name : str) -> bool:
+        return col_name in self.column_arrays
+
+    def get_num_rows(self, any_col_name : str) -> int:
+        if len(self.column_arrays) == 0:
+            self.get_frame([any_col_name])
+        return len(next(iter(self.column_arrays.values())))
+
+
+class LazyTickDataFrame(TickDataFrame):
+    """ Tick data frame whose columns are read on first access, see LazyColumnStore """
+    def __init__(self, tick_info : TickInfo, column_store : LazyColumnStore):
+        self.tick_info : TickInfo = tick_info
+        self.column_store : LazyColumnStore = column_store
+        self.materialized_tick_data : Optional[pd.DataFrame] = None
+
+    @property
+    def tick_data(self) -> pd.DataFrame:
+        if self.materialized_tick_data is None:
+            self.materialized_tick_data = self.column_store.get_frame([col.value for col in TickDataColumns])
+            self.materialized_tick_data.index = pd.RangeIndex(len(self.materialized_tick_data))
+        return self.materialized_tick_data
+
+    def get_column(self, col_name : TickDataColumns) -> pd.Series:
+        return self.get_columns([col_name])[col_name.value]
+
+    def get_columns(self, col_names : List[TickDataColumns]) -> pd.DataFrame:
+        if self.materialized_tick_data is not None:
+            return super().get_columns(col_names)
+        return self.column_store.get_frame([col_name.value for col_name in col_names])
+
+    def is_loaded(self, col_name : TickDataColumns) -> bool:
+        return self.column_store.is_loaded(col_name.value)
+
+    def __len__(self) -> int:
+        return self.column_store.get_num_rows(TickDataColumns.TIMESTAMP_NANO.value)
+
+
+class LazyBarDataFrame(BarDataFrame):
+    """ Bar data frame whose columns are read on first access, see LazyColumnStore """
+    def __init__(self, bar_info : BarInfo, column_store : LazyColumnStore):
+        self.bar_info : BarInfo = bar_info
+        self.column_store : LazyColumnStore = column_store
+        self.materialized_bar_data : Optional[pd.DataFrame] = None
+
+    @property
+    def bar_data(self) -> pd.DataFrame:
+        if self.materialized_bar_data is None:
+            self.materialized_bar_data = self.column_store.get_frame([col.value for col in BarDataColumns])
+        return self.materialized_bar_data
+
+    def get_column(self, col_name : BarDataColumns) -> pd.Series:
+        if self.materialized_bar_data is not None:
+            return self.materialized_bar_data[col_name.value]
+        return self.column_store.get_frame([col_name.value])[col_name.value]
+
+    def is_loaded(self, col_name : BarDataColumns) -> bool:
+        return self.column_store.is_loaded(col_name.value)
+
+    def __len__(self) -> int:
+        return self.column_store.get_num_rows(BarDataColumns.TIMESTAMP.value)
+
+
+# -------- tick data chunks -------
+""" Tick files that do not fit into memory are read in chunks of bounded size, see DataBase.iter_raw_tick_data
+-> every chunk is a TickDataFrame sorted by time stamp, the chunks of one tick info follow each other in time stamp order
+-> a stream of chunks may contain several tick infos one after the other, e.g. the morning chunks followed by the afternoon chunks
+-> the chunk index, start row and is_last_chunk are counted within one tick info """
+DEFAULT_TICK_CHUNK_SIZE : int = 1000000
+
+
+@dataclass
+class TickChunk:
+    tick_wrapper : TickDataFrame
+    chunk_index : int
+    start_row : int
+    first_timestamp : int
+    last_timestamp : int
+    is_last_chunk : bool
+
+    def __len__(self) -> int:
+        return len(self.tick_wrapper)
+
+
+def sort_tick_frame(tick_df : pd.DataFrame) -> pd.DataFrame:
+    """ stable sort by time stamp, the data frame is returned as is if it is already sorted """
+    timestamps = tick_df[TickDataColumns.TIMESTAMP_NANO.value].to_numpy()
+    if np.all(timestamps[1:] >= timestamps[:-1]):
+        return tick_df
+    return tick_df.iloc[np.argsort(timestamps, kind = "stable")].reset_index(drop = True)
+
+
+def make_tick_chunks(tick_wrappers : Iterable[TickDataFrame]) -> Iterator[TickChunk]:
+    """
+    Turns a stream of tick data frames into a stream of tick chunks, empty data frames are skipped
+    Each data frame is sorted by time stamp, the data frames of one tick info must not overlap in time
+    NOTE : one data frame is read ahead to find the last chunk of each tick info
+    :param tick_wrappers: tick data frames in time stamp order, each holding the columns in TickDataColumns order
+    """
+    def next_non_empty(tick_wrapper_iter):
+        for tick_wrapper in tick_wrapper_iter:
+            if len(tick_wrapper) > 0:
+                return TickDataFrame.wrap_without_copy(tick_df = sort_tick_frame(tick_wrapper.tick_data), tick_info = tick_wrapper.tick_info)
+        return None
+
+    tick_wrapper_iter = iter(tick_wrappers)
+    tick_wrapper = next_non_empty(tick_wrapper_iter)
+    chunk_index, start_row, previous_timestamp = 0, 0, None
+    while tick_wrapper is not None:
+        next_tick_wrapper = next_non_empty(tick_wrapper_iter)
+        timestamps = tick_wrapper.tick_data[TickDataColumns.TIMESTAMP_NANO.value]
+        first_timestamp, last_timestamp = int(timestamps.iloc[0]), int(timestamps.iloc[-1])
+        if previous_timestamp is not None and first_timestamp < previous_timestamp:
+            raise UnorderedTickDataException(tick_wrapper.tick_info, chunk_index)
+        is_last_chunk = next_tick_wrapper is None or next_tick_wrapper.tick_info != tick_wrapper.tick_info
+        yield TickChunk(tick_wrapper = tick_wrapper, chunk_index = chunk_index, start_row = start_row,
+                        first_timestamp = first_timestamp, last_timestamp = last_timestamp, is_last_chunk = is_last_chunk)
+        # ------ the counters restart for the next tick info ------
+        if is_last_chunk:
+            chunk_index, start_row, previous_timestamp = 0, 0, None
+        else:
+            chunk_index, start_row, previous_timestamp = chunk_index + 1, start_row + len(tick_wrapper), last_timestamp
+        tick_wrapper = next_tick_wrapper
+
+
 # -------- custom exceptions ---------
 class TickRequiredColumnNotFound(Exception):
     def __init__(self, missing_column : TickDataColumns):
@@ -200,7 +505,22 @@ class BarRequiredColumnNotFound(Exception):
         message = "Required column missing : " + missing_column.value
         super().__init__(message)
 
+class LimitBookBarRequiredColumnNotFound(Exception):
+    def __init__(self, missing_column: LimitBookBarColumns):
+        message = "Required column missing : " + missing_column.value
+        super().__init__(message)
+
 class InvalidDateException(ValueError):
     def __init__(self, day : int, month : int, year : int):
         message = "Invalid day, month or year input : " + str(day) + " : " + str(month) + " : " + str(year)
         super().__init__(message)
+
+class SchemaViolationException(ValueError):
+    def __init__(self, dtype : str):
+        message = "Missing values can not be stored with data type : " + dtype
+        super().__init__(message)
+
+class UnorderedTickDataException(ValueError):
+    def __init__(self, tick_info : TickInfo, chunk_index : int):
+        message = "Tick chunk starts before the end of the previous chunk : " + str(tick_info) + " : chunk " + str(chunk_index)
+        super().__init__(message)
@@ -0,0 +1,123 @@
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, Union
+import src.data_base_module.data_blocks as dat_blocks
+
+
+# ------- in process cache for data base reads -------
+""" The data cache keeps recently read tick and bar data in memory
+-> entries are evicted least recently used first once the memory budget is exceeded
+-> cached columns are read only numpy arrays, every hit returns a new data frame over the same arrays
+   so that one consumer can not modify the data seen by another consumer """
+
+RAW_TICK_KEY : str = "raw_tick"
+CLEAN_TICK_KEY : str = "clean_tick"
+BAR_KEY : str = "bar"
+
+
+def make_cache_key(info : Union[dat_blocks.TickInfo, dat_blocks.BarInfo], kind : str) -> Tuple:
+    """ TickInfo and BarInfo are not hashable, the key is built from their fields """
+    if isinstance(info, dat_blocks.BarInfo):
+        return (kind, info.symbol, info.date.get_str(), info.intra_day_period.name, info.sampling_type.name, info.sampling_level)
+    return (kind, info.symbol, info.date.get_str(), info.intra_day_period.name)
+
+
+@dataclass
+class CacheStatistics:
+    hits : int
+    misses : int
+    evictions : int
+    num_entries : int
+    current_bytes : int
+    max_bytes : int
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+
+class DataCache:
+    """
+    Least recently used cache of data frames with a memory budget in bytes
+    Thread safe, so it can be shared by the threads of DataBase.load_many
+    NOTE : the data frames returned by get() are backed by read only arrays, writing into them raises a ValueError
+    """
+    def __init__(self, max_bytes : int):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be integer > 0")
+        self.max_bytes : int = max_bytes
+        self.entries : OrderedDict = OrderedDict()
+        self.current_bytes : int = 0
+        self.hits : int = 0
+        self.misses : int = 0
+        self.evictions : int = 0
+        self.lock = threading.Lock()
+
+    def get(self, key : Tuple) -> Optional[pd.DataFrame]:
+        """ :return: a new data frame over the cached read only columns, None if the key is not cached """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        column_arrays, _ = entry
+        return pd.DataFrame(column_arrays, copy = False)
+
+    def put(self, key : Tuple, df : pd.DataFrame) -> pd.DataFrame:
+        """
+        caches the columns of df, data frames larger than the memory budget are not cached
+        :return: a new data frame over the cached read only columns, df itself if it was not cached
+        """
+        column_arrays : Dict[str, np.ndarray] = {}
+        for col_name in df.columns:
+            column_array = df[col_name].to_numpy()
+            if column_array.flags.writeable:
+                column_array = column_array.copy()
+                column_array.flags.writeable = False
+            column_arrays[col_name] = column_array
+        num_bytes = sum(column_array.nbytes for column_array in column_arrays.values())
+        if num_bytes > self.max_bytes:
+            return df
+        with self.lock:
+            self.remove_entry(key)
+            self.entries[key] = (column_arrays, num_bytes)
+            self.current_bytes += num_bytes
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self.entries.popitem(last = False)
+                self.current_bytes -= evicted_bytes
+                self.evictions += 1
+        return pd.DataFrame(column_arrays, copy = False)
+
+    def invalidate(self, key : Tuple) -> None:
+        """ removes the entry of key and every entry whose key extends key, e.g. column projections of the same file """
+        with self.lock:
+            for entry_key in [entry_key for entry_key in self.entries if entry_key[:len(key)] == key]:
+                self.remove_entry(entry_key)
+
+    def remove_entry(self, key : Tuple) -> None:
+        """ NOTE : the caller must hold the lock """
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.current_bytes = 0
+
+    def get_statistics(self) -> CacheStatistics:
+        with self.lock:
+            return CacheStatistics(hits = self.hits, misses = self.misses, evictions = self.evictions, num_entries = len(self.entries),
+                                   current_bytes = self.current_bytes, max_bytes = self.max_bytes)
+
+    # ------ pickling, worker processes start with an empty cache of the same size ------
+    def __getstate__(self):
+        return {"max_bytes" : self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(max_bytes = state["max_bytes"])
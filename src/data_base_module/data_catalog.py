@@ -0,0 +1,155 @@
+import hashlib
+import os
+import sqlite3
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+import src.data_base_module.data_blocks as dat_blocks
+
+
+# ------- catalog entries -------
+""" The data catalog is a sqlite manifest that sits next to the stored files
+-> records what is in the data base together with row counts, time spans and checksums
+-> answers range queries without touching the stored files """
+
+RAW_TICK : str = "raw"
+CLEAN_TICK : str = "clean"
+
+# ------ order in which intra day periods are returned for the same date ------
+INTRA_DAY_PERIOD_ORDER = [dat_blocks.IntraDayPeriod.MORNING, dat_blocks.IntraDayPeriod.AFTERNOON,
+                          dat_blocks.IntraDayPeriod.MIDNIGHT, dat_blocks.IntraDayPeriod.WHOLE_DAY]
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """ meta data of one stored file, info is either a TickInfo or a BarInfo """
+    info : Union[dat_blocks.TickInfo, dat_blocks.BarInfo]
+    file_path : str
+    row_count : int
+    start_timestamp : int
+    end_timestamp : int
+    checksum : str
+
+
+def compute_checksum(file_path : str) -> str:
+    """ sha256 checksum of a file, or of all files in a folder for folder based storage """
+    sha256 = hashlib.sha256()
+    if os.path.isdir(file_path):
+        member_paths = sorted(os.path.join(file_path, file_name) for file_name in os.listdir(file_path))
+    else:
+        member_paths = [file_path]
+    for member_path in member_paths:
+        sha256.update(os.path.basename(member_path).encode())
+        with open(member_path, "rb") as member_file:
+            for block in iter(lambda: member_file.read(1 << 20), b""):
+                sha256.update(block)
+    return sha256.hexdigest()
+
+
+def date_range_to_str(date_range : Optional[Tuple[dat_blocks.Date, dat_blocks.Date]]) -> Tuple[str, str]:
+    """ converts an inclusive date range into YYYYMMDD strings, None means no restriction """
+    if date_range is None:
+        return "00000000", "99999999"
+    start_date, end_date = date_range
+    return start_date.get_str(), end_date.get_str()
+
+
+class DataCatalog:
+    """
+    sqlite manifest of tick and bar data stored in the data base
+    The sqlite file is only created when the catalog is first used
+    A new connection is opened for every call, so the catalog can be shared between threads and processes
+    """
+    def __init__(self, catalog_file_path : str):
+        self.catalog_file_path : str = catalog_file_path
+
+    def connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.catalog_file_path), exist_ok = True)
+        connection = sqlite3.connect(self.catalog_file_path, timeout = 60)
+        connection.execute("""CREATE TABLE IF NOT EXISTS tick_data (
+                                symbol TEXT, date TEXT, intra_day_period TEXT, tick_kind TEXT,
+                                file_path TEXT, row_count INTEGER, start_timestamp INTEGER, end_timestamp INTEGER, checksum TEXT,
+                                PRIMARY KEY (symbol, date, intra_day_period, tick_kind))""")
+        connection.execute("""CREATE TABLE IF NOT EXISTS bar_data (
+                                symbol TEXT, date TEXT, intra_day_period TEXT, sampling_type TEXT, sampling_level INTEGER,
+                                file_path TEXT, row_count INTEGER, start_timestamp INTEGER, end_timestamp INTEGER, checksum TEXT,
+                                PRIMARY KEY (symbol, date, intra_day_period, sampling_type, sampling_level))""")
+        return connection
+
+    # ------- recording entries -------
+    def record_tick_data(self, tick_info : dat_blocks.TickInfo, tick_kind : str, file_path : str, row_count : int,
+                         start_timestamp : int, end_timestamp : int) -> None:
+        connection = self.connect()
+        with connection:
+            connection.execute("INSERT OR REPLACE INTO tick_data VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                               (tick_info.symbol, tick_info.date.get_str(), tick_info.intra_day_period.name, tick_kind,
+                                file_path, row_count, start_timestamp, end_timestamp, compute_checksum(file_path)))
+        connection.close()
+
+    def record_bar_data(self, bar_info : dat_blocks.BarInfo, file_path : str, row_count : int,
+                        start_timestamp : int, end_timestamp : int) -> None:
+        connection = self.connect()
+        with connection:
+            connection.execute("INSERT OR REPLACE INTO bar_data VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                               (bar_info.symbol, bar_info.date.get_str(), bar_info.intra_day_period.name,
+                                bar_info.sampling_type.name, bar_info.sampling_level,
+                                file_path, row_count, start_timestamp, end_timestamp, compute_checksum(file_path)))
+        connection.close()
+
+    def clear(self) -> None:
+        connection = self.connect()
+        with connection:
+            connection.execute("DELETE FROM tick_data")
+            connection.execute("DELETE FROM bar_data")
+        connection.close()
+
+    # ------- queries -------
+    def query_bar_entries(self, symbol : str, sampling_type : dat_blocks.Sampling, sampling_level : int,
+                          date_range : Optional[Tuple[dat_blocks.Date, dat_blocks.Date]] = None,
+                          intra_day_periods : Optional[List[dat_blocks.IntraDayPeriod]] = None) -> List[CatalogEntry]:
+        """
+        :param date_range: inclusive (start date, end date), None returns all dates
+        :param intra_day_periods: the intra day periods to return, None returns all periods
+        :return: catalog entries ordered by date, then by intra day period (morning before afternoon)
+        """
+        start_date_str, end_date_str = date_range_to_str(date_range)
+        connection = self.connect()
+        rows = connection.execute("""SELECT date, intra_day_period, file_path, row_count, start_timestamp, end_timestamp, checksum
+                                     FROM bar_data WHERE symbol = ? AND sampling_type = ? AND sampling_level = ? AND date BETWEEN ? AND ?""",
+                                  (symbol, sampling_type.name, sampling_level, start_date_str, end_date_str)).fetchall()
+        connection.close()
+        entries = []
+        for date_str, period_name, file_path, row_count, start_timestamp, end_timestamp, checksum in rows:
+            intra_day_period = dat_blocks.IntraDayPeriod[period_name]
+            if intra_day_periods is not None and intra_day_period not in intra_day_periods:
+                continue
+            bar_info = dat_blocks.BarInfo(symbol = symbol, date = dat_blocks.Date.from_str(date_str), intra_day_period = intra_day_period,
+                                          sampling_type = sampling_type, sampling_level = sampling_level)
+            entries.append(CatalogEntry(info = bar_info, file_path = file_path, row_count = row_count,
+                                        start_timestamp = start_timestamp, end_timestamp = end_timestamp, checksum = checksum))
+        return sorted(entries, key = lambda entry : (entry.info.date.get_str(), INTRA_DAY_PERIOD_ORDER.index(entry.info.intra_day_period)))
+
+    def query_tick_entries(self, symbol : str, tick_kind : str = CLEAN_TICK,
+                           date_range : Optional[Tuple[dat_blocks.Date, dat_blocks.Date]] = None,
+                           intra_day_periods : Optional[List[dat_blocks.IntraDayPeriod]] = None) -> List[CatalogEntry]:
+        """ same as query_bar_entries for raw or clean tick data """
+        start_date_str, end_date_str = date_range_to_str(date_range)
+        connection = self.connect()
+        rows = connection.execute("""SELECT date, intra_day_period, file_path, row_count, start_timestamp, end_timestamp, checksum
+                                     FROM tick_data WHERE symbol = ? AND tick_kind = ? AND date BETWEEN ? AND ?""",
+                                  (symbol, tick_kind, start_date_str, end_date_str)).fetchall()
+        connection.close()
+        entries = []
+        for date_str, period_name, file_path, row_count, start_timestamp, end_timestamp, checksum in rows:
+            intra_day_period = dat_blocks.IntraDayPeriod[period_name]
+            if intra_day_periods is not None and intra_day_period not in intra_day_periods:
+                continue
+            tick_info = dat_blocks.TickInfo(symbol = symbol, date = dat_blocks.Date.from_str(date_str), intra_day_period = intra_day_period)
+            entries.append(CatalogEntry(info = tick_info, file_path = file_path, row_count = row_count,
+                                        start_timestamp = start_timestamp, end_timestamp = end_timestamp, checksum = checksum))
+        return sorted(entries, key = lambda entry : (entry.info.date.get_str(), INTRA_DAY_PERIOD_ORDER.index(entry.info.intra_day_period)))
+
+    def list_symbols(self) -> List[str]:
+        connection = self.connect()
+        rows = connection.execute("SELECT symbol FROM tick_data UNION SELECT symbol FROM bar_data ORDER BY symbol").fetchall()
+        connection.close()
+        return [row[0] for row in rows]
@@ -1,93 +1,446 @@
 import definitions
+import functools
+import itertools
 import os
+import re
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import src.data_base_module.data_blocks as dat_blocks
 import src.data_base_module.data_base_logger as db_logger
+import src.data_base_module.storage_backends as storage
+import src.data_base_module.data_catalog as dat_catalog
+import src.data_base_module.data_cache as dat_cache
+
+# ------ labels used in the file and folder names of sampled bars ------
+SAMPLING_FILE_LABELS : Dict[dat_blocks.Sampling, str] = {
+    dat_blocks.Sampling.TIME : "time",
+    dat_blocks.Sampling.VOLUME : "volume",
+    dat_blocks.Sampling.TICK : "tick",
+    dat_blocks.Sampling.DOLLAR : "dollar",
+    dat_blocks.Sampling.TICK_IMBALANCE : "tick_imbalance",
+    dat_blocks.Sampling.VOLUME_IMBALANCE : "volume_imbalance",
+    dat_blocks.Sampling.DOLLAR_IMBALANCE : "dollar_imbalance",
+    dat_blocks.Sampling.TICK_RUN : "tick_run",
+    dat_blocks.Sampling.VOLUME_RUN : "volume_run",
+    dat_blocks.Sampling.DOLLAR_RUN : "dollar_run",
+}
 
 
 class DataBase:
-    def __init__(self):
-        """ Makeshift database that works with csv files and folders
+    def __init__(self, storage_backend : storage.StorageBackend = None,
+                 data_storage_folder_path : str = os.path.join(definitions.DATA_FOLDER_PATH, "data_storage"),
+                 cache : dat_cache.DataCache = None):
+        """ Makeshift database that works with files and folders
+        :param storage_backend: the file format used to store tick and bar data, defaults to csv files
+        :param data_storage_folder_path: the root folder of the data base
+        :param cache: optional in memory cache of retrieved data, e.g. DataCache(max_bytes = 2 * 1024 ** 3)
+        -> cached data is handed out as data frames over read only arrays
+        -> inserting data invalidates the cached entry for the same key
+        What is in the data base is recorded in a sqlite catalog next to the stored files (see data_catalog.py)
+        -> inserts through this class are recorded automatically
+        -> files that were added by other means require rebuild_catalog() to be called
         Issues :
-        -> no way to check what is in the data base
         -> very hard to validate inputs
         -> will simply throw a FileNotFound Exception if attempting to retrieve data that is not in the data base
         """
-        self.bar_data_folder_path = os.path.join(definitions.DATA_FOLDER_PATH, "data_storage", "data_bar")
-        self.bar_data_wlimit_folder_path = os.path.join(definitions.DATA_FOLDER_PATH, "data_storage", "data_bar_wlimit")
-        self.tick_data_folder_path = os.path.join(definitions.DATA_FOLDER_PATH, "data_storage", "data_raw_tick")
-        self.tick_clean_data_folder = os.path.join(definitions.DATA_FOLDER_PATH, "data_storage", "data_clean_tick")
+        self.storage_backend : storage.StorageBackend = storage_backend if storage_backend is not None else storage.CsvStorageBackend()
+        self.data_storage_folder_path : str = data_storage_folder_path
+        self.bar_data_folder_path = os.path.join(data_storage_folder_path, "data_bar")
+        self.bar_data_wlimit_folder_path = os.path.join(data_storage_folder_path, "data_bar_wlimit")
+        self.tick_data_folder_path = os.path.join(data_storage_folder_path, "data_raw_tick")
+        self.tick_clean_data_folder = os.path.join(data_storage_folder_path, "data_clean_tick")
+        self.catalog : dat_catalog.DataCatalog = dat_catalog.DataCatalog(
+            os.path.join(data_storage_folder_path, f"data_catalog_{self.storage_backend.name}.sqlite"))
+        self.cache : Optional[dat_cache.DataCache] = cache
+
+    # ------ schema version checks ------
+    def check_schema_version(self, file_path : str) -> int:
+        """ logs files written before data_blocks.SCHEMA_VERSION, they are cast to the current schema when read """
+        schema_version = self.storage_backend.read_schema_version(file_path)
+        if schema_version < dat_blocks.SCHEMA_VERSION:
+            db_logger.log_legacy_schema_read(file_path=file_path, schema_version=schema_version)
+        return schema_version
+
+    def read_frame_from_storage(self, file_path : str, dtypes : Dict[str, str]) -> pd.DataFrame:
+        df = self.storage_backend.read_frame(file_path, dtypes=dtypes)
+        self.check_schema_version(file_path)
+        return df
+
+    # ------ cache lookups ------
+    def read_frame_cached(self, file_path : str, dtypes : Dict[str, str], cache_key : Tuple) -> pd.DataFrame:
+        """ reads a frame through the cache if there is one """
+        if self.cache is None:
+            return self.read_frame_from_storage(file_path, dtypes=dtypes)
+        df = self.cache.get(cache_key)
+        if df is None:
+            df = self.cache.put(cache_key, self.read_frame_from_storage(file_path, dtypes=dtypes))
+        return df
+
+    def invalidate_cache(self, cache_key : Tuple) -> None:
+        """ NOTE : also invalidates the cached column projections of the same file """
+        if self.cache is not None:
+            self.cache.invalidate(cache_key)
+
+    # ------ column projections ------
+    def read_columns_cached(self, file_path : str, dtypes : Dict[str, str], cache_key : Tuple, col_names : List[str]) -> pd.DataFrame:
+        """ reads only the columns in col_names, projections are cached under the cache key extended by the column names """
+        projected_dtypes = {col_name : dtypes[col_name] for col_name in col_names}
+        return self.read_frame_cached(file_path, dtypes=projected_dtypes, cache_key=cache_key + (tuple(col_names),))
+
+    def make_column_store(self, file_path : str, dtypes : Dict[str, str], cache_key : Tuple, col_names : List[str]) -> dat_blocks.LazyColumnStore:
+        """ reads the columns in col_names now, the other columns are read by the column store when they are first accessed """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(file_path)
+        load_columns = functools.partial(self.read_columns_cached, file_path, dtypes, cache_key)
+        return dat_blocks.LazyColumnStore(load_columns=load_columns, loaded_df=load_columns(col_names) if len(col_names) > 0 else None)
+
+    # ------ raw tick data file path constructor -----
+    def get_raw_tick_file_path(self, ticker_symbol: str, date: dat_blocks.Date) -> str:
+        """ raw tick files are stored in the name format : ModelDepthProto_[date] """
+        return os.path.join(self.tick_data_folder_path, ticker_symbol,
+                            "ModelDepthProto_" + date.get_str() + self.storage_backend.file_extension)
 
     # ------- get raw tick data -------
-    def get_raw_tick_data(self, ticker_symbol: str, date: dat_blocks.Date) -> dat_blocks.TickDataFrame:
-        """ This function reads tick files in the name format : ModelDepthProto_[date].csv """
+    def get_raw_tick_data(self, ticker_symbol: str, date: dat_blocks.Date,
+                          columns: Optional[List[dat_blocks.TickDataColumns]] = None) -> dat_blocks.TickDataFrame:
+        """
+        This function reads tick files in the name format : ModelDepthProto_[date]
+        :param columns: if given, only these columns are read now and a LazyTickDataFrame is returned,
+        the other columns are read when they are first accessed, e.g. columns = data_blocks.TRADE_TICK_COLUMNS
+        """
+        tick_info = dat_blocks.TickInfo(symbol=ticker_symbol, date=date,
+                                        intra_day_period=dat_blocks.IntraDayPeriod.WHOLE_DAY)
+        file_path = self.get_raw_tick_file_path(ticker_symbol=ticker_symbol, date=date)
+        cache_key = dat_cache.make_cache_key(tick_info, dat_cache.RAW_TICK_KEY)
+        db_logger.log_raw_tick_data_access(tick_info=tick_info)
+        if columns is not None:
+            column_store = self.make_column_store(file_path, dat_blocks.RAW_TICK_DATA_DTYPES, cache_key, [col.value for col in columns])
+            return dat_blocks.LazyTickDataFrame(tick_info=tick_info, column_store=column_store)
+        retrieved_tick_df: pd.DataFrame = self.read_frame_cached(file_path, dtypes=dat_blocks.RAW_TICK_DATA_DTYPES, cache_key=cache_key)
+        return dat_blocks.TickDataFrame.wrap_without_copy(tick_df=retrieved_tick_df, tick_info=tick_info)
+
+    def iter_raw_tick_data(self, ticker_symbol: str, date: dat_blocks.Date,
+                           chunk_size: int = dat_blocks.DEFAULT_TICK_CHUNK_SIZE) -> Iterator[dat_blocks.TickChunk]:
+        """
+        Reads a raw tick file in chunks of at most chunk_size ticks, for tick files that do not fit into memory
+        :return: iterator of tick chunks in time stamp order, see data_blocks.make_tick_chunks
+        NOTE : the chunks are read straight from storage and are not cached
+        NOTE : raises data_blocks.UnorderedTickDataException if the ticks in the file are out of order across chunks
+        """
         tick_info = dat_blocks.TickInfo(symbol=ticker_symbol, date=date,
                                         intra_day_period=dat_blocks.IntraDayPeriod.WHOLE_DAY)
-        file_path = os.path.join(self.tick_data_folder_path, ticker_symbol,
-                                 "ModelDepthProto_" + date.get_str() + ".csv")
+        file_path = self.get_raw_tick_file_path(ticker_symbol=ticker_symbol, date=date)
         db_logger.log_raw_tick_data_access(tick_info=tick_info)
-        retrieved_tick_df: pd.DataFrame = pd.read_csv(file_path)
-        return dat_blocks.TickDataFrame(tick_df=retrieved_tick_df, tick_info=tick_info)
+        self.check_schema_version(file_path)
+        tick_dfs = self.storage_backend.iter_frames(file_path, dtypes=dat_blocks.RAW_TICK_DATA_DTYPES, chunk_size=chunk_size)
+        return dat_blocks.make_tick_chunks(dat_blocks.TickDataFrame.wrap_without_copy(tick_df=tick_df, tick_info=tick_info) for tick_df in tick_dfs)
 
     # ------ clean tick data file path constructor -----
     def get_clean_tick_file_path(self, tick_info: dat_blocks.TickInfo) -> str:
         """ creates file path to store cleaned tick data in the format [symbol]_[date]_[intra day period]"""
         file_name = tick_info.symbol
         file_name += "_" + tick_info.date.get_str()
-        file_name += "_" + tick_info.intra_day_period.value + ".csv"
+        file_name += "_" + tick_info.intra_day_period.value + self.storage_backend.file_extension
         return os.path.join(self.tick_clean_data_folder, file_name)
 
     # ------ get clean tick data ------
-    def get_clean_tick_data(self, symbol: str, date: dat_blocks.Date,
-                            intra_day_period: dat_blocks.IntraDayPeriod) -> dat_blocks.TickDataFrame:
-        """ retrieved stored cleaned tick data and wrap it into a TickDataFrame class """
+    def get_clean_tick_data(self, symbol: str, date: dat_blocks.Date, intra_day_period: dat_blocks.IntraDayPeriod,
+                            columns: Optional[List[dat_blocks.TickDataColumns]] = None) -> dat_blocks.TickDataFrame:
+        """
+        retrieved stored cleaned tick data and wrap it into a TickDataFrame class
+        :param columns: see get_raw_tick_data
+        """
         tick_info = dat_blocks.TickInfo(symbol=symbol, date=date, intra_day_period=intra_day_period)
         file_path = self.get_clean_tick_file_path(tick_info=tick_info)
-        tick_df = pd.read_csv(file_path)
+        cache_key = dat_cache.make_cache_key(tick_info, dat_cache.CLEAN_TICK_KEY)
+        if columns is not None:
+            column_store = self.make_column_store(file_path, dat_blocks.TICK_DATA_DTYPES, cache_key, [col.value for col in columns])
+            db_logger.log_clean_tick_data_access(tick_info=tick_info)
+            return dat_blocks.LazyTickDataFrame(tick_info=tick_info, column_store=column_store)
+        tick_df = self.read_frame_cached(file_path, dtypes=dat_blocks.TICK_DATA_DTYPES, cache_key=cache_key)
         db_logger.log_clean_tick_data_access(tick_info=tick_info)
-        return dat_blocks.TickDataFrame(tick_df=tick_df, tick_info=tick_info)
+        return dat_blocks.TickDataFrame.wrap_without_copy(tick_df=tick_df, tick_info=tick_info)
 
     # ------ insert clean tick data --------
     def insert_clean_tick_data(self, tick_wrapper: dat_blocks.TickDataFrame) -> None:
         """ Store a cleaned tick data frame """
         file_path = self.get_clean_tick_file_path(tick_info=tick_wrapper.tick_info)
-        tick_wrapper.tick_data.to_csv(file_path, index=False)
+        self.storage_backend.write_frame(tick_wrapper.tick_data, file_path, dtypes=dat_blocks.TICK_DATA_DTYPES)
+        self.invalidate_cache(dat_cache.make_cache_key(tick_wrapper.tick_info, dat_cache.CLEAN_TICK_KEY))
+        start_timestamp, end_timestamp = find_time_span(tick_wrapper.tick_data[dat_blocks.TickDataColumns.TIMESTAMP_NANO.value])
+        self.catalog.record_tick_data(tick_info=tick_wrapper.tick_info, tick_kind=dat_catalog.CLEAN_TICK, file_path=file_path,
+                                      row_count=len(tick_wrapper.tick_data), start_timestamp=start_timestamp, end_timestamp=end_timestamp)
         db_logger.log_clean_tick_data_insertion(tick_info=tick_wrapper.tick_info)
 
+    def insert_clean_tick_chunks(self, tick_chunks: Iterable[dat_blocks.TickChunk]) -> List[dat_blocks.TickInfo]:
+        """
+        Stores a stream of cleaned tick chunks, the chunks of each tick info are written into one file as they arrive
+        :param tick_chunks: e.g. the output of data_cleaning.clean_tick_chunks
+        :return: the tick infos that were stored
+        """
+        stored_tick_infos = []
+        for tick_info, period_chunks in itertools.groupby(tick_chunks, key=lambda tick_chunk: tick_chunk.tick_wrapper.tick_info):
+            file_path = self.get_clean_tick_file_path(tick_info=tick_info)
+            chunk_spans = []
+
+            def chunk_frames():
+                for tick_chunk in period_chunks:
+                    chunk_spans.append((len(tick_chunk), tick_chunk.first_timestamp, tick_chunk.last_timestamp))
+                    yield tick_chunk.tick_wrapper.tick_data
+
+            self.storage_backend.write_frames(chunk_frames(), file_path, dtypes=dat_blocks.TICK_DATA_DTYPES)
+            self.invalidate_cache(dat_cache.make_cache_key(tick_info, dat_cache.CLEAN_TICK_KEY))
+            # ------ the chunks are in time stamp order, the time span runs from the first to the last chunk ------
+            self.catalog.record_tick_data(tick_info=tick_info, tick_kind=dat_catalog.CLEAN_TICK, file_path=file_path,
+                                          row_count=sum(chunk_span[0] for chunk_span in chunk_spans),
+                                          start_timestamp=chunk_spans[0][1], end_timestamp=chunk_spans[-1][2])
+            db_logger.log_clean_tick_data_insertion(tick_info=tick_info)
+            stored_tick_infos.append(tick_info)
+        return stored_tick_infos
+
     # ------- Manager bar data sampled from tick data ---------
     # ----------- file_path generating functions ------------
     def get_sampled_bar_file_path(self, bar_info: dat_blocks.BarInfo):
-        file_name = f"{bar_info.date.get_str()}_{bar_info.intra_day_period.value}"
-        folder_name = None
-        if bar_info.sampling_type == dat_blocks.Sampling.TIME:
-            file_name += f"_time_{bar_info.sampling_level}S_sampled.csv"
-            folder_name = "time_sampled"
-        elif bar_info.sampling_type == dat_blocks.Sampling.VOLUME:
-            file_name += f"_volume_{bar_info.sampling_level}_sampled.csv"
-            folder_name = "volume_sampled"
-        elif bar_info.sampling_type == dat_blocks.Sampling.TICK:
-            file_name += f"_tick_{bar_info.sampling_level}_sampled.csv"
-            folder_name = "tick_sampled"
-        elif bar_info.sampling_type == dat_blocks.Sampling.DOLLAR:
-            file_name += f"_dollar_{bar_info.sampling_level}_sampled.csv"
-            folder_name = "dollar_sampled"
-        return os.path.join(self.bar_data_folder_path, bar_info.symbol, folder_name, file_name)
+        sampling_label = SAMPLING_FILE_LABELS[bar_info.sampling_type]
+        level_str = f"{bar_info.sampling_level}S" if bar_info.sampling_type == dat_blocks.Sampling.TIME else str(bar_info.sampling_level)
+        file_name = f"{bar_info.date.get_str()}_{bar_info.intra_day_period.value}_{sampling_label}_{level_str}_sampled"
+        file_name += self.storage_backend.file_extension
+        return os.path.join(self.bar_data_folder_path, bar_info.symbol, sampling_label + "_sampled", file_name)
 
     # ----------- get bar data functions --------
     def get_sampled_bar(self, symbol: str, date: dat_blocks.Date, intra_day_period: dat_blocks.IntraDayPeriod,
-                        sampling_level: int, sampling_type: dat_blocks.Sampling):
+                        sampling_level: int, sampling_type: dat_blocks.Sampling,
+                        columns: Optional[List[dat_blocks.BarDataColumns]] = None):
+        """ :param columns: if given, only these columns are read now and a LazyBarDataFrame is returned """
         bar_info = dat_blocks.BarInfo(symbol=symbol, date=date, intra_day_period=intra_day_period,
                                       sampling_level=sampling_level, sampling_type=sampling_type)
         file_path = self.get_sampled_bar_file_path(bar_info=bar_info)
-        bar_df = pd.read_csv(file_path)
+        cache_key = dat_cache.make_cache_key(bar_info, dat_cache.BAR_KEY)
+        if columns is not None:
+            column_store = self.make_column_store(file_path, dat_blocks.BAR_DATA_DTYPES, cache_key, [col.value for col in columns])
+            db_logger.log_retrieved_bar(bar_info=bar_info)
+            return dat_blocks.LazyBarDataFrame(bar_info=bar_info, column_store=column_store)
+        bar_df = self.read_frame_cached(file_path, dtypes=dat_blocks.BAR_DATA_DTYPES, cache_key=cache_key)
         db_logger.log_retrieved_bar(bar_info=bar_info)
-        return dat_blocks.BarDataFrame(bar_data=bar_df, bar_info=bar_info)
+        return dat_blocks.BarDataFrame.wrap_without_copy(bar_data=bar_df, bar_info=bar_info)
 
     # ------ insert bar data functions ------
     def insert_sampled_bar(self, bar_wrapper: dat_blocks.BarDataFrame) -> None:
         file_path = self.get_sampled_bar_file_path(bar_wrapper.bar_info)
-        bar_wrapper.bar_data.to_csv(file_path, index=False)
+        self.storage_backend.write_frame(bar_wrapper.bar_data, file_path, dtypes=dat_blocks.BAR_DATA_DTYPES)
+        self.invalidate_cache(dat_cache.make_cache_key(bar_wrapper.bar_info, dat_cache.BAR_KEY))
+        start_timestamp, end_timestamp = find_time_span(bar_wrapper.bar_data[dat_blocks.BarDataColumns.TIMESTAMP.value])
+        self.catalog.record_bar_data(bar_info=bar_wrapper.bar_info, file_path=file_path, row_count=len(bar_wrapper.bar_data),
+                                     start_timestamp=start_timestamp, end_timestamp=end_timestamp)
         db_logger.log_insert_bar(bar_info=bar_wrapper.bar_info)
 
+    # ------- bulk loading -------
+    def load(self, info: Union[dat_blocks.BarInfo, dat_blocks.TickInfo]) -> Union[dat_blocks.BarDataFrame, dat_blocks.TickDataFrame]:
+        """ retrieves a sampled bar for a BarInfo or clean tick data for a TickInfo """
+        if isinstance(info, dat_blocks.BarInfo):
+            return self.get_sampled_bar(symbol=info.symbol, date=info.date, intra_day_period=info.intra_day_period,
+                                        sampling_level=info.sampling_level, sampling_type=info.sampling_type)
+        elif isinstance(info, dat_blocks.TickInfo):
+            return self.get_clean_tick_data(symbol=info.symbol, date=info.date, intra_day_period=info.intra_day_period)
+        else:
+            raise TypeError("Expected BarInfo or TickInfo : Actual : " + str(type(info)))
+
+    def load_many(self, requests: List[Union[dat_blocks.BarInfo, dat_blocks.TickInfo]], workers: int = 1,
+                  use_processes: bool = False) -> List[Union[dat_blocks.BarDataFrame, dat_blocks.TickDataFrame]]:
+        """
+        Retrieves many sampled bars and clean tick data in parallel
+        :param requests: list of BarInfo and TickInfo, see make_interleaved_bar_infos for the usual morning / afternoon list
+        :param workers: number of threads or processes, 1 loads serially in the calling thread
+        :param use_processes: use a process pool instead of a thread pool, for csv files where parsing holds the GIL
+        :return: the retrieved data frames in the same order as requests
+        NOTE : raises the first FileNotFoundError encountered, use list_available to plan requests that exist
+        """
+        if workers <= 1 or len(requests) <= 1:
+            return [self.load(info) for info in requests]
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        with executor_class(max_workers=min(workers, len(requests))) as executor:
+            loaded_lst = list(executor.map(self.load, requests))
+        db_logger.log_load_many(num_loaded=len(loaded_lst), workers=workers)
+        return loaded_lst
+
+    # ------- catalog queries -------
+    def list_available(self, symbol: str, sampling_type: dat_blocks.Sampling, sampling_level: int,
+                       date_range: Optional[Tuple[dat_blocks.Date, dat_blocks.Date]] = None,
+                       intra_day_periods: Optional[List[dat_blocks.IntraDayPeriod]] = None) -> List[dat_blocks.BarInfo]:
+        """
+        Lists the sampled bars in the data base without touching the stored files
+        :param date_range: inclusive (start date, end date), None lists all dates
+        :param intra_day_periods: the intra day periods to list, None lists all periods
+        :return: bar infos ordered by date, morning before afternoon
+        """
+        entries = self.catalog.query_bar_entries(symbol=symbol, sampling_type=sampling_type, sampling_level=sampling_level,
+                                                 date_range=date_range, intra_day_periods=intra_day_periods)
+        return [entry.info for entry in entries]
+
+    def list_available_clean_ticks(self, symbol: str, date_range: Optional[Tuple[dat_blocks.Date, dat_blocks.Date]] = None,
+                                   intra_day_periods: Optional[List[dat_blocks.IntraDayPeriod]] = None) -> List[dat_blocks.TickInfo]:
+        """ same as list_available for clean tick data """
+        entries = self.catalog.query_tick_entries(symbol=symbol, tick_kind=dat_catalog.CLEAN_TICK, date_range=date_range,
+                                                  intra_day_periods=intra_day_periods)
+        return [entry.info for entry in entries]
+
+    def list_available_raw_tick_dates(self, symbol: str, date_range: Optional[Tuple[dat_blocks.Date, dat_blocks.Date]] = None) -> List[dat_blocks.Date]:
+        entries = self.catalog.query_tick_entries(symbol=symbol, tick_kind=dat_catalog.RAW_TICK, date_range=date_range)
+        return [entry.info.date for entry in entries]
+
+    def find_raw_tick_dates(self, symbol: str, date_range: Optional[Tuple[dat_blocks.Date, dat_blocks.Date]] = None) -> List[dat_blocks.Date]:
+        """
+        Scans the raw tick folder of the symbol, raw tick files copied into the data base are found without rebuilding the catalog
+        :param date_range: inclusive (start date, end date), None finds all dates
+        :return: dates in ascending order
+        """
+        raw_tick_dates = []
+        for file_path in self.storage_backend.find_stored_paths(os.path.join(self.tick_data_folder_path, symbol)):
+            tick_info = self.parse_raw_tick_file_path(file_path)
+            if tick_info is None:
+                continue
+            if date_range is not None and not (date_range[0].get_str() <= tick_info.date.get_str() <= date_range[1].get_str()):
+                continue
+            raw_tick_dates.append(tick_info.date)
+        return sorted(raw_tick_dates, key=lambda raw_tick_date: raw_tick_date.get_str())
+
+    def get_sampled_bars_range(self, symbol: str, sampling_type: dat_blocks.Sampling, sampling_level: int,
+                               date_range: Optional[Tuple[dat_blocks.Date, dat_blocks.Date]] = None,
+                               intra_day_periods: Optional[List[dat_blocks.IntraDayPeriod]] = None) -> List[dat_blocks.BarDataFrame]:
+        """ retrieves every sampled bar listed by list_available, in the same order """
+        return [self.get_sampled_bar(symbol=bar_info.symbol, date=bar_info.date, intra_day_period=bar_info.intra_day_period,
+                                     sampling_level=bar_info.sampling_level, sampling_type=bar_info.sampling_type)
+                for bar_info in self.list_available(symbol=symbol, sampling_type=sampling_type, sampling_level=sampling_level,
+                                                    date_range=date_range, intra_day_periods=intra_day_periods)]
+
+    # ------- catalog maintenance -------
+    def parse_raw_tick_file_path(self, file_path: str) -> Optional[dat_blocks.TickInfo]:
+        """ inverse of get_raw_tick_file_path, None if the file is not a raw tick file """
+        match = re.fullmatch(r"ModelDepthProto_(\d{8})", os.path.basename(file_path)[:-len(self.storage_backend.file_extension)])
+        if match is None:
+            return None
+        return dat_blocks.TickInfo(symbol=os.path.basename(os.path.dirname(file_path)), date=dat_blocks.Date.from_str(match.group(1)),
+                                   intra_day_period=dat_blocks.IntraDayPeriod.WHOLE_DAY)
+
+    def parse_clean_tick_file_path(self, file_path: str) -> Optional[dat_blocks.TickInfo]:
+        """ inverse of get_clean_tick_file_path, None if the file is not a clean tick file """
+        file_stem = os.path.basename(file_path)[:-len(self.storage_backend.file_extension)]
+        match = re.fullmatch(r"(.+)_(\d{8})_(" + "|".join(period.value for period in dat_blocks.IntraDayPeriod) + ")", file_stem)
+        if match is None:
+            return None
+        return dat_blocks.TickInfo(symbol=match.group(1), date=dat_blocks.Date.from_str(match.group(2)),
+                                   intra_day_period=dat_blocks.IntraDayPeriod(match.group(3)))
+
+    def parse_sampled_bar_file_path(self, file_path: str) -> Optional[dat_blocks.BarInfo]:
+        """ inverse of get_sampled_bar_file_path, None if the file is not a sampled bar file """
+        file_stem = os.path.basename(file_path)[:-len(self.storage_backend.file_extension)]
+        symbol = os.path.basename(os.path.dirname(os.path.dirname(file_path)))
+        sampling_types = {label : sampling_type for sampling_type, label in SAMPLING_FILE_LABELS.items()}
+        match = re.fullmatch(r"(\d{8})_(" + "|".join(period.value for period in dat_blocks.IntraDayPeriod) + ")_("
+                             + "|".join(sampling_types.keys()) + r")_(\d+)S?_sampled", file_stem)
+        if match is None:
+            return None
+        return dat_blocks.BarInfo(symbol=symbol, date=dat_blocks.Date.from_str(match.group(1)),
+                                  intra_day_period=dat_blocks.IntraDayPeriod(match.group(2)),
+                                  sampling_type=sampling_types[match.group(3)], sampling_level=int(match.group(4)))
+
+    def rebuild_catalog(self) -> int:
+        """
+        Clears the catalog and records every file found in the data base folders
+        Only the timestamp column of each file is read
+        :return: the number of files recorded
+        """
+        self.catalog.clear()
+        num_recorded = 0
+        tick_dtypes = {dat_blocks.TickDataColumns.TIMESTAMP_NANO.value : dat_blocks.TICK_DATA_DTYPES[dat_blocks.TickDataColumns.TIMESTAMP_NANO.value]}
+        bar_dtypes = {dat_blocks.BarDataColumns.TIMESTAMP.value : dat_blocks.BAR_DATA_DTYPES[dat_blocks.BarDataColumns.TIMESTAMP.value]}
+        # ------ raw tick data ------
+        for file_path in self.storage_backend.find_stored_paths(self.tick_data_folder_path):
+            tick_info = self.parse_raw_tick_file_path(file_path)
+            if tick_info is None:
+                continue
+            timestamps = self.storage_backend.read_frame(file_path, dtypes=tick_dtypes).iloc[:, 0]
+            start_timestamp, end_timestamp = find_time_span(timestamps)
+            self.catalog.record_tick_data(tick_info=tick_info, tick_kind=dat_catalog.RAW_TICK, file_path=file_path,
+                                          row_count=len(timestamps), start_timestamp=start_timestamp, end_timestamp=end_timestamp)
+            num_recorded += 1
+        # ------ clean tick data ------
+        for file_path in self.storage_backend.find_stored_paths(self.tick_clean_data_folder):
+            tick_info = self.parse_clean_tick_file_path(file_path)
+            if tick_info is None:
+                continue
+            timestamps = self.storage_backend.read_frame(file_path, dtypes=tick_dtypes).iloc[:, 0]
+            start_timestamp, end_timestamp = find_time_span(timestamps)
+            self.catalog.record_tick_data(tick_info=tick_info, tick_kind=dat_catalog.CLEAN_TICK, file_path=file_path,
+                                          row_count=len(timestamps), start_timestamp=start_timestamp, end_timestamp=end_timestamp)
+            num_recorded += 1
+        # ------ sampled bar data ------
+        for file_path in self.storage_backend.find_stored_paths(self.bar_data_folder_path):
+            bar_info = self.parse_sampled_bar_file_path(file_path)
+            if bar_info is None:
+                continue
+            timestamps = self.storage_backend.read_frame(file_path, dtypes=bar_dtypes).iloc[:, 0]
+            start_timestamp, end_timestamp = find_time_span(timestamps)
+            self.catalog.record_bar_data(bar_info=bar_info, file_path=file_path, row_count=len(timestamps),
+                                         start_timestamp=start_timestamp, end_timestamp=end_timestamp)
+            num_recorded += 1
+        db_logger.log_catalog_rebuild(num_recorded=num_recorded)
+        return num_recorded
+
+
+def make_interleaved_bar_infos(symbol: str, dates: List[dat_blocks.Date], sampling_type: dat_blocks.Sampling, sampling_level: int,
+                               intra_day_periods: Tuple[dat_blocks.IntraDayPeriod, ...] = (dat_blocks.IntraDayPeriod.MORNING, dat_blocks.IntraDayPeriod.AFTERNOON))\
+        -> List[dat_blocks.BarInfo]:
+    """ bar infos in the order date 1 morning, date 1 afternoon, date 2 morning ... as expected by the machine learning scripts """
+    return [dat_blocks.BarInfo(symbol=symbol, date=date, intra_day_period=intra_day_period,
+                               sampling_type=sampling_type, sampling_level=sampling_level)
+            for date in dates for intra_day_period in intra_day_periods]
+
+
+def find_time_span(timestamps: pd.Series) -> Tuple[Optional[int], Optional[int]]:
+    """ first and last time stamp of a time stamp column, (None, None) for empty columns """
+    if len(timestamps) == 0:
+        return None, None
+    return int(timestamps.min()), int(timestamps.max())
+
+
+# ------- migration between storage backends -------
+def migrate_data_base(source : DataBase, target : DataBase, remove_source_files : bool = False) -> int:
+    """
+    Copies every raw tick, clean tick and sampled bar file of the source data base into the target data base
+    The folder layout is kept, only the file format changes
+    :param source: the data base to migrate from, e.g. DataBase(storage_backend = CsvStorageBackend())
+    :param target: the data base to migrate to, e.g. DataBase(storage_backend = ParquetStorageBackend())
+    :param remove_source_files: deletes each source file once it has been written to the target
+    :return: the number of files migrated
+    NOTE : target files that already exist at data_blocks.SCHEMA_VERSION are kept and not counted, an interrupted migration can be rerun,
+    legacy files are cast to the current schema when read and written at the current schema version
+    NOTE : the catalog of the target data base is rebuilt after migration
+    NOTE : files in the data_bar_wlimit folder do not have the BarDataColumns format and are not migrated
+    """
+    if source.storage_backend.file_extension == target.storage_backend.file_extension and \
+            source.data_storage_folder_path == target.data_storage_folder_path:
+        raise ValueError("source and target data base are the same")
+    folder_dtypes_lst = [(source.tick_data_folder_path, target.tick_data_folder_path, dat_blocks.RAW_TICK_DATA_DTYPES),
+                         (source.tick_clean_data_folder, target.tick_clean_data_folder, dat_blocks.TICK_DATA_DTYPES),
+                         (source.bar_data_folder_path, target.bar_data_folder_path, dat_blocks.BAR_DATA_DTYPES)]
+    num_migrated = 0
+    for source_folder, target_folder, dtypes in folder_dtypes_lst:
+        for source_file_path in source.storage_backend.find_stored_paths(source_folder):
+            relative_file_stem = os.path.relpath(source_file_path, source_folder)[:-len(source.storage_backend.file_extension)]
+            target_file_path = os.path.join(target_folder, relative_file_stem + target.storage_backend.file_extension)
+            if os.path.exists(target_file_path) and target.storage_backend.read_schema_version(target_file_path) == dat_blocks.SCHEMA_VERSION:
+                db_logger.log_skipped_migration(source_file_path=source_file_path, target_file_path=target_file_path)
+            else:
+                df = source.read_frame_from_storage(source_file_path, dtypes=dtypes)
+                target.storage_backend.write_frame(df, target_file_path, dtypes=dtypes)
+                db_logger.log_file_migration(source_file_path=source_file_path, target_file_path=target_file_path)
+                num_migrated += 1
+            if remove_source_files:
+                source.storage_backend.delete(source_file_path)
+    target.rebuild_catalog()
+    return num_migrated
+
 
 instance: DataBase = DataBase()
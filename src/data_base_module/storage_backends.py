@@ -0,0 +1,256 @@
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Iterator, List
+import src.data_base_module.data_blocks as dat_blocks
+
+
+# ------- storage backends -------
+""" A storage backend decides how a data frame is laid out on disk
+-> the DataBase class decides where the files are and what is in them
+-> the storage backend decides the file format
+Every backend reads and writes with explicit column data types, see data_blocks.TICK_DATA_DTYPES and data_blocks.BAR_DATA_DTYPES
+Every backend stores data_blocks.SCHEMA_VERSION with the file, read back with read_schema_version
+Files larger than memory are read with iter_frames and written with write_frames, one chunk of rows at a time """
+
+class StorageBackend:
+    """ abstract class storage backend """
+    def __init__(self, name : str, file_extension : str):
+        self.name : str = name
+        self.file_extension : str = file_extension
+
+    def read_frame(self, file_path : str, dtypes : Dict[str, str]) -> pd.DataFrame:
+        """
+        :param file_path: path to the stored file, including the file extension
+        :param dtypes: dictionary of column name to data type, only these columns are returned
+        :return: data frame with the columns in dtypes, cast to the given data types
+        """
+        raise NotImplementedError()
+
+    def write_frame(self, df : pd.DataFrame, file_path : str, dtypes : Dict[str, str]) -> None:
+        """
+        :param df: data frame to be stored, columns not in dtypes are dropped
+        :param file_path: path to store the file at, including the file extension
+        :param dtypes: dictionary of column name to data type
+        """
+        raise NotImplementedError()
+
+    def iter_frames(self, file_path : str, dtypes : Dict[str, str], chunk_size : int) -> Iterator[pd.DataFrame]:
+        """
+        Reads the file in consecutive chunks of rows, only one chunk is held in memory at a time
+        :param chunk_size: the maximum number of rows per chunk
+        :return: iterator of data frames with the columns in dtypes, see read_frame
+        """
+        raise NotImplementedError()
+
+    def write_frames(self, dfs : Iterable[pd.DataFrame], file_path : str, dtypes : Dict[str, str]) -> None:
+        """
+        Writes consecutive chunks of rows into a single file, the file is the same as writing the concatenated chunks with write_frame
+        :param dfs: data frames holding the columns in dtypes
+        """
+        raise NotImplementedError()
+
+    def read_schema_version(self, file_path : str) -> int:
+        """ :return: the schema version the file was written with, data_blocks.LEGACY_SCHEMA_VERSION for files without one """
+        raise NotImplementedError()
+
+    def find_stored_paths(self, folder_path : str) -> List[str]:
+        """ recursively finds all files stored by this backend in folder_path, returned in sorted order """
+        stored_paths = []
+        for dir_path, _, file_names in os.walk(folder_path):
+            stored_paths.extend(os.path.join(dir_path, file_name) for file_name in file_names if file_name.endswith(self.file_extension))
+        return sorted(stored_paths)
+
+    def delete(self, file_path : str) -> None:
+        os.remove(file_path)
+
+    def __str__(self):
+        return self.name
+
+
+def cast_columns(df : pd.DataFrame, dtypes : Dict[str, str]) -> pd.DataFrame:
+    """ selects the columns in dtypes and casts them to the specified data types, see data_blocks.apply_schema """
+    return dat_blocks.apply_schema(df, dtypes)
+
+
+CSV_SCHEMA_VERSION_PREFIX : str = "# schema_version : "
+
+class CsvStorageBackend(StorageBackend):
+    """
+    Plain text storage, this is the original format of the data base
+    The schema version is written as a comment on the first line of the file
+    """
+    def __init__(self):
+        super().__init__(name = "csv", file_extension = ".csv")
+
+    def read_frame(self, file_path : str, dtypes : Dict[str, str]) -> pd.DataFrame:
+        df = pd.read_csv(file_path, usecols = lambda col_name : col_name in dtypes, comment = "#")
+        return cast_columns(df, dtypes)
+
+    def write_frame(self, df : pd.DataFrame, file_path : str, dtypes : Dict[str, str]) -> None:
+        os.makedirs(os.path.dirname(file_path), exist_ok = True)
+        with open(file_path, "w", newline = "") as csv_file:
+            csv_file.write(CSV_SCHEMA_VERSION_PREFIX + str(dat_blocks.SCHEMA_VERSION) + "\n")
+            cast_columns(df, dtypes).to_csv(csv_file, index = False)
+
+    def iter_frames(self, file_path : str, dtypes : Dict[str, str], chunk_size : int) -> Iterator[pd.DataFrame]:
+        with pd.read_csv(file_path, usecols = lambda col_name : col_name in dtypes, comment = "#", chunksize = chunk_size) as csv_reader:
+            for df in csv_reader:
+                yield cast_columns(df, dtypes)
+
+    def write_frames(self, dfs : Iterable[pd.DataFrame], file_path : str, dtypes : Dict[str, str]) -> None:
+        os.makedirs(os.path.dirname(file_path), exist_ok = True)
+        with open(file_path, "w", newline = "") as csv_file:
+            csv_file.write(CSV_SCHEMA_VERSION_PREFIX + str(dat_blocks.SCHEMA_VERSION) + "\n")
+            # ------ the header is written even if there are no chunks ------
+            csv_file.write(",".join(dtypes.keys()) + "\n")
+            for df in dfs:
+                cast_columns(df, dtypes).to_csv(csv_file, index = False, header = False)
+
+    def read_schema_version(self, file_path : str) -> int:
+        with open(file_path, "r") as csv_file:
+            first_line = csv_file.readline()
+        if first_line.startswith(CSV_SCHEMA_VERSION_PREFIX):
+            return int(first_line[len(CSV_SCHEMA_VERSION_PREFIX):])
+        return dat_blocks.LEGACY_SCHEMA_VERSION
+
+
+PARQUET_SCHEMA_VERSION_KEY : bytes = b"schema_version"
+
+class ParquetStorageBackend(StorageBackend):
+    """
+    Compressed columnar storage using parquet files (requires pyarrow)
+    Data types are stored in the file, reading does not involve any text parsing
+    """
+    def __init__(self, compression : str = "zstd"):
+        super().__init__(name = "parquet", file_extension = ".parquet")
+        self.compression : str = compression
+
+    def read_frame(self, file_path : str, dtypes : Dict[str, str]) -> pd.DataFrame:
+        df = pd.read_parquet(file_path, engine = "pyarrow", columns = list(dtypes.keys()))
+        return cast_columns(df, dtypes)
+
+    def write_frame(self, df : pd.DataFrame, file_path : str, dtypes : Dict[str, str]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        os.makedirs(os.path.dirname(file_path), exist_ok = True)
+        table = pa.Table.from_pandas(cast_columns(df, dtypes), preserve_index = False)
+        # ------ the schema version is kept in the key value meta data of the parquet file ------
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), PARQUET_SCHEMA_VERSION_KEY : str(dat_blocks.SCHEMA_VERSION).encode()})
+        pq.write_table(table, file_path, compression = self.compression)
+
+    def iter_frames(self, file_path : str, dtypes : Dict[str, str], chunk_size : int) -> Iterator[pd.DataFrame]:
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(file_path)
+        for record_batch in parquet_file.iter_batches(batch_size = chunk_size, columns = list(dtypes.keys())):
+            yield cast_columns(record_batch.to_pandas(), dtypes)
+
+    def write_frames(self, dfs : Iterable[pd.DataFrame], file_path : str, dtypes : Dict[str, str]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        os.makedirs(os.path.dirname(file_path), exist_ok = True)
+        empty_df = pd.DataFrame({col_name : np.empty(0, dtype = dtype) for col_name, dtype in dtypes.items()})
+        schema = pa.Schema.from_pandas(empty_df, preserve_index = False)
+        schema = schema.with_metadata({**(schema.metadata or {}), PARQUET_SCHEMA_VERSION_KEY : str(dat_blocks.SCHEMA_VERSION).encode()})
+        with pq.ParquetWriter(file_path, schema, compression = self.compression) as parquet_writer:
+            # ------ every chunk becomes one row group ------
+            for df in dfs:
+                parquet_writer.write_table(pa.Table.from_pandas(cast_columns(df, dtypes), schema = schema, preserve_index = False))
+
+    def read_schema_version(self, file_path : str) -> int:
+        import pyarrow.parquet as pq
+        metadata = pq.read_schema(file_path).metadata or {}
+        return int(metadata.get(PARQUET_SCHEMA_VERSION_KEY, dat_blocks.LEGACY_SCHEMA_VERSION))
+
+
+MEMMAP_SCHEMA_FILE_NAME : str = "schema.json"
+
+class NumpyMemmapStorageBackend(StorageBackend):
+    """
+    Stores every column as a fixed width .npy file inside a folder, the folder takes the place of the file
+    Reading memory maps the column files, no data is parsed or copied until it is touched
+    :param mmap_mode: "r" returns read only arrays, "c" (copy on write) allows in place cleaning without modifying the stored files
+    NOTE : the returned data frame is only valid as long as the files are not overwritten
+    """
+    def __init__(self, mmap_mode : str = "r"):
+        super().__init__(name = "numpy_memmap", file_extension = ".npcols")
+        if mmap_mode not in ("r", "c"):
+            raise ValueError("mmap_mode must be 'r' or 'c'")
+        self.mmap_mode : str = mmap_mode
+
+    def read_frame(self, file_path : str, dtypes : Dict[str, str]) -> pd.DataFrame:
+        if not os.path.isdir(file_path):
+            raise FileNotFoundError(file_path)
+        column_arrays = {}
+        for col_name, dtype in dtypes.items():
+            column_array = np.load(os.path.join(file_path, col_name + ".npy"), mmap_mode = self.mmap_mode)
+            # ------ only columns stored with a different data type are copied ------
+            column_arrays[col_name] = dat_blocks.cast_array(column_array, dtype)
+        return pd.DataFrame(column_arrays, copy = False)
+
+    def write_frame(self, df : pd.DataFrame, file_path : str, dtypes : Dict[str, str]) -> None:
+        os.makedirs(file_path, exist_ok = True)
+        for col_name, dtype in dtypes.items():
+            # ------ write to a temporary file first so that existing memory maps of the old file stay valid ------
+            column_file_path = os.path.join(file_path, col_name + ".npy")
+            temp_file_path = column_file_path + ".tmp"
+            with open(temp_file_path, "wb") as temp_file:
+                np.save(temp_file, np.ascontiguousarray(dat_blocks.cast_array(df[col_name].to_numpy(), dtype)))
+            os.replace(temp_file_path, column_file_path)
+        with open(os.path.join(file_path, MEMMAP_SCHEMA_FILE_NAME), "w") as schema_file:
+            json.dump({"schema_version" : dat_blocks.SCHEMA_VERSION}, schema_file)
+
+    def iter_frames(self, file_path : str, dtypes : Dict[str, str], chunk_size : int) -> Iterator[pd.DataFrame]:
+        if not os.path.isdir(file_path):
+            raise FileNotFoundError(file_path)
+        column_arrays = {col_name : np.load(os.path.join(file_path, col_name + ".npy"), mmap_mode = self.mmap_mode) for col_name in dtypes}
+        num_rows = len(next(iter(column_arrays.values()))) if len(column_arrays) > 0 else 0
+        for start_row in range(0, num_rows, chunk_size):
+            yield pd.DataFrame({col_name : dat_blocks.cast_array(column_array[start_row : start_row + chunk_size], dtypes[col_name])
+                                for col_name, column_array in column_arrays.items()}, copy = False)
+
+    def write_frames(self, dfs : Iterable[pd.DataFrame], file_path : str, dtypes : Dict[str, str]) -> None:
+        """ the column bytes are appended to raw files, the .npy header is written once the number of rows is known """
+        os.makedirs(file_path, exist_ok = True)
+        raw_file_paths = {col_name : os.path.join(file_path, col_name + ".npy.raw") for col_name in dtypes}
+        raw_files = {col_name : open(raw_file_path, "wb") for col_name, raw_file_path in raw_file_paths.items()}
+        num_rows = 0
+        try:
+            for df in dfs:
+                for col_name, dtype in dtypes.items():
+                    raw_files[col_name].write(np.ascontiguousarray(dat_blocks.cast_array(df[col_name].to_numpy(), dtype)).tobytes())
+                num_rows += len(df)
+        finally:
+            for raw_file in raw_files.values():
+                raw_file.close()
+        for col_name, dtype in dtypes.items():
+            column_file_path = os.path.join(file_path, col_name + ".npy")
+            temp_file_path = column_file_path + ".tmp"
+            header = {"descr" : np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order" : False, "shape" : (num_rows,)}
+            with open(temp_file_path, "wb") as temp_file, open(raw_file_paths[col_name], "rb") as raw_file:
+                np.lib.format.write_array_header_1_0(temp_file, header)
+                shutil.copyfileobj(raw_file, temp_file)
+            os.remove(raw_file_paths[col_name])
+            os.replace(temp_file_path, column_file_path)
+        with open(os.path.join(file_path, MEMMAP_SCHEMA_FILE_NAME), "w") as schema_file:
+            json.dump({"schema_version" : dat_blocks.SCHEMA_VERSION}, schema_file)
+
+    def read_schema_version(self, file_path : str) -> int:
+        schema_file_path = os.path.join(file_path, MEMMAP_SCHEMA_FILE_NAME)
+        if not os.path.exists(schema_file_path):
+            return dat_blocks.LEGACY_SCHEMA_VERSION
+        with open(schema_file_path, "r") as schema_file:
+            return json.load(schema_file)["schema_version"]
+
+    def find_stored_paths(self, folder_path : str) -> List[str]:
+        stored_paths = []
+        for dir_path, dir_names, _ in os.walk(folder_path):
+            stored_paths.extend(os.path.join(dir_path, dir_name) for dir_name in dir_names if dir_name.endswith(self.file_extension))
+            # ------ do not walk into the column folders ------
+            dir_names[:] = [dir_name for dir_name in dir_names if not dir_name.endswith(self.file_extension)]
+        return sorted(stored_paths)
+
+    def delete(self, file_path : str) -> None:
+        shutil.rmtree(file_path)
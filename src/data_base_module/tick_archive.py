@@ -0,0 +1,222 @@
+import definitions
+import json
+import os
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Tuple
+import src.data_base_module.data_blocks as dat_blocks
+import src.data_base_module.data_base_logger as db_logger
+import src.data_base_module.storage_backends as storage
+
+
+# ------- date partitioned tick archive -------
+""" The tick archive stores raw tick data in one partition per symbol and day
+-> partitions live in [archive folder]/[symbol]/[YYYY]/[MM]/[DD]/
+-> every partition holds the tick file and a footer with statistics of the ticks in it
+-> partitions are append only, a day that is already in the archive is never rewritten
+Queries read the footers first and skip the partitions that can not contain matching ticks
+NOTE : the footer is written after the tick file, a partition without a footer is an interrupted ingest and is ignored """
+
+TICK_FILE_NAME : str = "ticks"
+FOOTER_FILE_NAME : str = "footer.json"
+LIMIT_PRICE_COLUMNS : List[dat_blocks.TickDataColumns] = [
+    dat_blocks.TickDataColumns.ASK1P, dat_blocks.TickDataColumns.ASK2P, dat_blocks.TickDataColumns.ASK3P,
+    dat_blocks.TickDataColumns.ASK4P, dat_blocks.TickDataColumns.ASK5P,
+    dat_blocks.TickDataColumns.BID1P, dat_blocks.TickDataColumns.BID2P, dat_blocks.TickDataColumns.BID3P,
+    dat_blocks.TickDataColumns.BID4P, dat_blocks.TickDataColumns.BID5P]
+
+
+@dataclass(frozen=True)
+class PartitionStatistics:
+    """
+    footer of a partition
+    min_last_price, max_last_price : taken over the ticks with a non zero last price, None if there are none
+    num_trades : number of ticks with a non zero last quantity
+    zero_price_counts : number of zero entries in each of the bid ask price columns
+    """
+    symbol : str
+    date : dat_blocks.Date
+    row_count : int
+    min_timestamp : Optional[int]
+    max_timestamp : Optional[int]
+    min_last_price : Optional[float]
+    max_last_price : Optional[float]
+    num_trades : int
+    zero_price_counts : Dict[str, int]
+
+    def to_dict(self) -> Dict:
+        footer_dict = asdict(self)
+        footer_dict["date"] = self.date.get_str()
+        return footer_dict
+
+    @staticmethod
+    def from_dict(footer_dict : Dict):
+        return PartitionStatistics(**{**footer_dict, "date" : dat_blocks.Date.from_str(footer_dict["date"])})
+
+    def overlaps_time_range(self, time_range : Optional[Tuple[int, int]]) -> bool:
+        if time_range is None:
+            return True
+        if self.row_count == 0:
+            return False
+        return self.min_timestamp <= time_range[1] and self.max_timestamp >= time_range[0]
+
+    def overlaps_price_range(self, price_range : Optional[Tuple[float, float]]) -> bool:
+        if price_range is None:
+            return True
+        if self.min_last_price is None:
+            return False
+        return self.min_last_price <= price_range[1] and self.max_last_price >= price_range[0]
+
+
+def find_partition_statistics(tick_wrapper : dat_blocks.TickDataFrame) -> PartitionStatistics:
+    tick_df = tick_wrapper.get_tick_data()
+    timestamps = tick_df[dat_blocks.TickDataColumns.TIMESTAMP_NANO.value].to_numpy()
+    last_prices = tick_df[dat_blocks.TickDataColumns.LAST_PRICE.value].to_numpy()
+    last_quantities = tick_df[dat_blocks.TickDataColumns.LAST_QUANTITY.value].to_numpy()
+    traded_prices = last_prices[np.nan_to_num(last_prices) != 0]
+    traded_prices = traded_prices[~np.isnan(traded_prices)]
+    has_ticks = len(timestamps) > 0
+    has_prices = len(traded_prices) > 0
+    return PartitionStatistics(symbol = tick_wrapper.tick_info.symbol, date = tick_wrapper.tick_info.date, row_count = len(timestamps),
+                               min_timestamp = int(timestamps.min()) if has_ticks else None,
+                               max_timestamp = int(timestamps.max()) if has_ticks else None,
+                               min_last_price = float(traded_prices.min()) if has_prices else None,
+                               max_last_price = float(traded_prices.max()) if has_prices else None,
+                               num_trades = int(np.count_nonzero(np.nan_to_num(last_quantities) > 0)),
+                               zero_price_counts = {col.value : int(np.count_nonzero(tick_df[col.value].to_numpy() == 0)) for col in LIMIT_PRICE_COLUMNS})
+
+
+class TickArchive:
+    def __init__(self, archive_folder_path : str = os.path.join(definitions.DATA_FOLDER_PATH, "data_storage", "tick_archive"),
+                 storage_backend : storage.StorageBackend = None):
+        """
+        :param archive_folder_path: root folder of the archive
+        :param storage_backend: file format of the tick files, defaults to parquet
+        """
+        self.archive_folder_path : str = archive_folder_path
+        self.storage_backend : storage.StorageBackend = storage_backend if storage_backend is not None else storage.ParquetStorageBackend()
+
+    # ------ partition layout ------
+    def get_partition_folder_path(self, symbol : str, date : dat_blocks.Date) -> str:
+        date_str = date.get_str()
+        return os.path.join(self.archive_folder_path, symbol, date_str[0:4], date_str[4:6], date_str[6:8])
+
+    def get_partition_tick_file_path(self, symbol : str, date : dat_blocks.Date) -> str:
+        return os.path.join(self.get_partition_folder_path(symbol, date), TICK_FILE_NAME + self.storage_backend.file_extension)
+
+    def has_partition(self, symbol : str, date : dat_blocks.Date) -> bool:
+        return os.path.exists(os.path.join(self.get_partition_folder_path(symbol, date), FOOTER_FILE_NAME))
+
+    # ------ writing ------
+    def append_partition(self, tick_wrapper : dat_blocks.TickDataFrame) -> PartitionStatistics:
+        """
+        adds one day of raw tick data to the archive
+        :raises PartitionExistsException: if the day is already in the archive
+        """
+        symbol, date = tick_wrapper.tick_info.symbol, tick_wrapper.tick_info.date
+        if self.has_partition(symbol, date):
+            raise PartitionExistsException(symbol = symbol, date = date)
+        partition_statistics = find_partition_statistics(tick_wrapper)
+        self.storage_backend.write_frame(tick_wrapper.get_tick_data(), self.get_partition_tick_file_path(symbol, date),
+                                         dtypes = dat_blocks.RAW_TICK_DATA_DTYPES)
+        footer_file_path = os.path.join(self.get_partition_folder_path(symbol, date), FOOTER_FILE_NAME)
+        with open(footer_file_path + ".tmp", "w") as footer_file:
+            json.dump(partition_statistics.to_dict(), footer_file, indent = 2)
+        os.replace(footer_file_path + ".tmp", footer_file_path)
+        db_logger.log_partition_append(partition_statistics = partition_statistics)
+        return partition_statistics
+
+    # ------ footers ------
+    def read_partition_statistics(self, symbol : str, date : dat_blocks.Date) -> PartitionStatistics:
+        with open(os.path.join(self.get_partition_folder_path(symbol, date), FOOTER_FILE_NAME), "r") as footer_file:
+            return PartitionStatistics.from_dict(json.load(footer_file))
+
+    def list_partition_dates(self, symbol : str) -> List[dat_blocks.Date]:
+        """ dates of the complete partitions of a symbol in ascending order, reads folder names only """
+        dates = []
+        symbol_folder_path = os.path.join(self.archive_folder_path, symbol)
+        for year_str in sorted(os.listdir(symbol_folder_path)) if os.path.isdir(symbol_folder_path) else []:
+            for month_str in sorted(os.listdir(os.path.join(symbol_folder_path, year_str))):
+                for day_str in sorted(os.listdir(os.path.join(symbol_folder_path, year_str, month_str))):
+                    date = dat_blocks.Date.from_str(year_str + month_str + day_str)
+                    if self.has_partition(symbol, date):
+                        dates.append(date)
+        return dates
+
+    def find_partitions(self, symbol : str, date_range : Optional[Tuple[dat_blocks.Date, dat_blocks.Date]] = None,
+                        time_range : Optional[Tuple[int, int]] = None,
+                        price_range : Optional[Tuple[float, float]] = None) -> List[PartitionStatistics]:
+        """
+        footers of the partitions that may contain ticks in the given ranges, only footers are read
+        :param date_range: inclusive (start date, end date)
+        :param time_range: inclusive (start, end) in nanoseconds, compared with timestampNano
+        :param price_range: inclusive (low, high), compared with lastPrice
+        """
+        partition_statistics_lst = []
+        for date in self.list_partition_dates(symbol):
+            if date_range is not None and not (date_range[0].get_str() <= date.get_str() <= date_range[1].get_str()):
+                continue
+            partition_statistics = self.read_partition_statistics(symbol, date)
+            if partition_statistics.overlaps_time_range(time_range) and partition_statistics.overlaps_price_range(price_range):
+                partition_statistics_lst.append(partition_statistics)
+        return partition_statistics_lst
+
+    # ------ reading ------
+    def read_partition(self, symbol : str, date : dat_blocks.Date) -> dat_blocks.TickDataFrame:
+        tick_info = dat_blocks.TickInfo(symbol = symbol, date = date, intra_day_period = dat_blocks.IntraDayPeriod.WHOLE_DAY)
+        tick_df = self.storage_backend.read_frame(self.get_partition_tick_file_path(symbol, date), dtypes = dat_blocks.RAW_TICK_DATA_DTYPES)
+        return dat_blocks.TickDataFrame.wrap_without_copy(tick_df = tick_df, tick_info = tick_info)
+
+    def query(self, symbol : str, date_range : Optional[Tuple[dat_blocks.Date, dat_blocks.Date]] = None,
+              time_range : Optional[Tuple[int, int]] = None,
+              price_range : Optional[Tuple[float, float]] = None) -> List[dat_blocks.TickDataFrame]:
+        """
+        reads the ticks in the given ranges, one tick data frame per day that has matching ticks
+        partitions whose footer shows no overlap with the ranges are not read
+        NOTE : with a price range only the ticks with a last price inside the range are kept
+        """
+        tick_wrapper_lst = []
+        for partition_statistics in self.find_partitions(symbol, date_range = date_range, time_range = time_range, price_range = price_range):
+            tick_wrapper = self.read_partition(symbol, partition_statistics.date)
+            tick_df = tick_wrapper.get_tick_data()
+            keep_array = np.ones(len(tick_df), dtype = bool)
+            if time_range is not None:
+                timestamps = tick_df[dat_blocks.TickDataColumns.TIMESTAMP_NANO.value].to_numpy()
+                keep_array &= (timestamps >= time_range[0]) & (timestamps <= time_range[1])
+            if price_range is not None:
+                last_prices = tick_df[dat_blocks.TickDataColumns.LAST_PRICE.value].to_numpy()
+                keep_array &= (last_prices >= price_range[0]) & (last_prices <= price_range[1])
+            if not keep_array.all():
+                tick_wrapper = dat_blocks.TickDataFrame(tick_df = tick_df[keep_array].reset_index(drop = True), tick_info = tick_wrapper.tick_info)
+            if len(tick_wrapper.get_tick_data()) > 0:
+                tick_wrapper_lst.append(tick_wrapper)
+        return tick_wrapper_lst
+
+
+# ------- ingest -------
+def ingest_raw_tick_files(data_base, tick_archive : TickArchive, symbol : str,
+                          date_range : Optional[Tuple[dat_blocks.Date, dat_blocks.Date]] = None,
+                          ingest_callback : Optional[Callable[[dat_blocks.TickDataFrame], object]] = None) -> List[PartitionStatistics]:
+    """
+    appends every raw tick file of a symbol in the data base to the archive, days already in the archive are skipped
+    :param data_base: a DataBase, the raw tick files are found by scanning its raw tick folder
+    :param ingest_callback: called with the ticks of every added day, e.g. data_diagnostics.diagnose_and_log
+    :return: the footers of the partitions that were added
+    """
+    added_partitions = []
+    for date in data_base.find_raw_tick_dates(symbol, date_range = date_range):
+        if tick_archive.has_partition(symbol, date):
+            continue
+        tick_wrapper = data_base.get_raw_tick_data(symbol, date)
+        added_partitions.append(tick_archive.append_partition(tick_wrapper))
+        if ingest_callback is not None:
+            ingest_callback(tick_wrapper)
+    return added_partitions
+
+
+# -------- custom exceptions ---------
+class PartitionExistsException(Exception):
+    def __init__(self, symbol : str, date : dat_blocks.Date):
+        message = "Partition already in the tick archive : " + symbol + " : " + date.get_str_format_2()
+        super().__init__(message)
@@ -0,0 +1,135 @@
+import functools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+import src.data_base_module.data_blocks as data
+import src.data_processing_module.data_cleaning as data_cleaner
+import src.data_processing_module.data_processing_logger as dp_logger
+
+
+# ------ batch cleaning job ------
+""" Cleans the raw tick data of a symbol over a date range, one day per unit of work on a process pool
+-> every day runs get_raw_tick_data, morning_after_noon_split, the cleaning pipeline on both periods and insert_clean_tick_data
+-> the finished days and their metrics are recorded in a json manifest as soon as each day finishes,
+   an interrupted run started again with the same manifest only cleans the days that are not in it
+-> the manifest also records the split hours and the cleaning steps, a manifest written with other settings is refused
+NOTE : only the calling process writes the manifest, the workers return their metrics """
+@dataclass
+class CleaningDayReport:
+    symbol : str
+    date : data.Date
+    raw_row_count : int
+    morning_row_count : int
+    afternoon_row_count : int
+    load_seconds : float
+    cleaning_seconds : float
+    insert_seconds : float
+
+    @property
+    def total_seconds(self) -> float:
+        return self.load_seconds + self.cleaning_seconds + self.insert_seconds
+
+    def to_dict(self) -> Dict:
+        report_dict = asdict(self)
+        report_dict["date"] = self.date.get_str()
+        return report_dict
+
+    @staticmethod
+    def from_dict(report_dict : Dict):
+        return CleaningDayReport(**{**report_dict, "date" : data.Date.from_str(report_dict["date"])})
+
+
+class CleaningManifest:
+    """ json file of the finished days of a batch cleaning run, keyed by YYYYMMDD """
+    def __init__(self, manifest_file_path : str, symbol : str, split_points_hours : int, cleaning_pipeline : data_cleaner.TickCleaningPipeline):
+        self.manifest_file_path : str = manifest_file_path
+        self.settings : Dict = {"symbol" : symbol, "split_points_hours" : split_points_hours,
+                                "cleaning_steps" : [repr(cleaning_step) for cleaning_step in cleaning_pipeline.cleaning_steps]}
+        self.day_reports : Dict[str, CleaningDayReport] = {}
+        if os.path.exists(manifest_file_path):
+            with open(manifest_file_path, "r") as manifest_file:
+                manifest_dict = json.load(manifest_file)
+            if manifest_dict["settings"] != self.settings:
+                raise CleaningManifestMismatchException(manifest_file_path)
+            self.day_reports = {date_str : CleaningDayReport.from_dict(report_dict) for date_str, report_dict in manifest_dict["days"].items()}
+
+    def is_done(self, date : data.Date) -> bool:
+        return date.get_str() in self.day_reports
+
+    def record(self, day_report : CleaningDayReport) -> None:
+        """ adds the day and rewrites the manifest, the file is replaced atomically so an interrupted write leaves the previous manifest """
+        self.day_reports[day_report.date.get_str()] = day_report
+        manifest_dict = {"settings" : self.settings,
+                         "days" : {date_str : self.day_reports[date_str].to_dict() for date_str in sorted(self.day_reports)}}
+        temp_file_path = self.manifest_file_path + ".tmp"
+        with open(temp_file_path, "w") as manifest_file:
+            json.dump(manifest_dict, manifest_file, indent = 1)
+        os.replace(temp_file_path, self.manifest_file_path)
+
+
+def clean_day(data_base, symbol : str, date : data.Date, cleaning_pipeline : data_cleaner.TickCleaningPipeline,
+              split_points_hours : int = 7) -> CleaningDayReport:
+    """
+    Cleans one day of raw tick data and inserts the morning and afternoon clean tick data into the data base
+    :param data_base: a DataBase
+    :param split_points_hours: see morning_after_noon_split
+    """
+    start_time = time.perf_counter()
+    tick_wrapper = data_base.get_raw_tick_data(symbol, date)
+    load_seconds = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    morning_wrapper, afternoon_wrapper = data_cleaner.morning_after_noon_split(tick_wrapper, split_points_hours)
+    cleaning_pipeline(morning_wrapper)
+    cleaning_pipeline(afternoon_wrapper)
+    cleaning_seconds = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    data_base.insert_clean_tick_data(morning_wrapper)
+    data_base.insert_clean_tick_data(afternoon_wrapper)
+    insert_seconds = time.perf_counter() - start_time
+    day_report = CleaningDayReport(symbol = symbol, date = date, raw_row_count = len(tick_wrapper.tick_data),
+                                   morning_row_count = len(morning_wrapper.tick_data), afternoon_row_count = len(afternoon_wrapper.tick_data),
+                                   load_seconds = load_seconds, cleaning_seconds = cleaning_seconds, insert_seconds = insert_seconds)
+    dp_logger.log_cleaning_day(day_report)
+    return day_report
+
+
+def run_batch_cleaning(data_base, symbol : str, cleaning_pipeline : data_cleaner.TickCleaningPipeline, manifest_file_path : str,
+                       date_range : Optional[Tuple[data.Date, data.Date]] = None, split_points_hours : int = 7,
+                       workers : int = 1) -> List[CleaningDayReport]:
+    """
+    Cleans every raw tick file of a symbol in the data base that is not recorded in the manifest
+    :param data_base: a DataBase, the raw tick files are found by DataBase.find_raw_tick_dates
+    :param manifest_file_path: json file of the finished days, created if it does not exist
+    :param date_range: inclusive (start date, end date), None cleans all dates
+    :param workers: number of processes, 1 cleans serially in the calling process
+    :return: the reports of the days cleaned by this run, in the order they finished
+    NOTE : raises CleaningManifestMismatchException if the manifest was written with another symbol, split or cleaning steps
+    """
+    manifest = CleaningManifest(manifest_file_path, symbol, split_points_hours, cleaning_pipeline)
+    all_dates = data_base.find_raw_tick_dates(symbol, date_range = date_range)
+    pending_dates = [date for date in all_dates if not manifest.is_done(date)]
+    clean_func = functools.partial(clean_day, data_base, symbol, cleaning_pipeline = cleaning_pipeline, split_points_hours = split_points_hours)
+    start_time = time.perf_counter()
+    day_reports = []
+    if workers <= 1 or len(pending_dates) <= 1:
+        for date in pending_dates:
+            day_reports.append(clean_func(date))
+            manifest.record(day_reports[-1])
+    else:
+        with ProcessPoolExecutor(max_workers = min(workers, len(pending_dates))) as executor:
+            for future in as_completed([executor.submit(clean_func, date) for date in pending_dates]):
+                day_reports.append(future.result())
+                manifest.record(day_reports[-1])
+    dp_logger.log_batch_cleaning(symbol = symbol, num_cleaned = len(day_reports), num_skipped = len(all_dates) - len(pending_dates),
+                                 workers = workers, elapsed_seconds = time.perf_counter() - start_time)
+    return day_reports
+
+
+# -------- custom exceptions ---------
+class CleaningManifestMismatchException(ValueError):
+    def __init__(self, manifest_file_path : str):
+        message = "The cleaning manifest was written with other settings (symbol, split hours or cleaning steps) : " + manifest_file_path
+        super().__init__(message)
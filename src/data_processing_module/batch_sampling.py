@@ -0,0 +1,119 @@
+import functools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import src.data_base_module.data_blocks as data
+import src.data_processing_module.sampling as sampling
+import src.data_processing_module.data_processing_logger as dp_logger
+
+
+# ------ batch sampling job ------
+""" Samples the clean tick data of a symbol over a date range into bars of every requested (Sampling, level) spec
+-> a unit of work is the clean tick data of one (date, intra day period), units are distributed across a process pool
+-> every unit reads its ticks once and runs each sampling type over all of its levels in one pass (the multi level samplers)
+-> bars already stored in the data base are skipped, a unit whose bars are all stored does not read its ticks
+-> every unit reports its load, sampling and insert timings """
+@dataclass(frozen=True)
+class SamplingSpec:
+    sampling_type : data.Sampling
+    sampling_level : int
+
+
+@dataclass
+class SamplingUnitReport:
+    tick_info : data.TickInfo
+    sampled_bar_infos : List[data.BarInfo]
+    skipped_bar_infos : List[data.BarInfo]
+    num_ticks : int
+    load_seconds : float
+    sampling_seconds : float
+    insert_seconds : float
+
+    @property
+    def total_seconds(self) -> float:
+        return self.load_seconds + self.sampling_seconds + self.insert_seconds
+
+
+MULTI_LEVEL_SAMPLERS = {
+    data.Sampling.TIME : sampling.time_sampling_multi,
+    data.Sampling.TICK : sampling.tick_sampling_multi,
+    data.Sampling.VOLUME : sampling.volume_sampling_multi,
+    data.Sampling.DOLLAR : sampling.dollar_sampling_multi,
+}
+
+
+def sample_levels(tick_wrapper : data.TickDataFrame, sampling_type : data.Sampling, levels : List[int]) -> Dict[int, data.BarDataFrame]:
+    """ :return: bars of every level keyed by level """
+    if sampling_type in MULTI_LEVEL_SAMPLERS:
+        return MULTI_LEVEL_SAMPLERS[sampling_type](tick_wrapper, levels = levels)
+    if sampling_type in data.IMBALANCE_SAMPLINGS + data.RUN_SAMPLINGS:
+        return {level : sampling.information_driven_sampling(tick_wrapper, sampling_type, expected_ticks = level) for level in levels}
+    raise NotImplementedError()
+
+
+def make_spec_bar_info(tick_info : data.TickInfo, sampling_spec : SamplingSpec) -> data.BarInfo:
+    return data.BarInfo(symbol = tick_info.symbol, date = tick_info.date, intra_day_period = tick_info.intra_day_period,
+                        sampling_type = sampling_spec.sampling_type, sampling_level = sampling_spec.sampling_level)
+
+
+def sample_unit(data_base, tick_info : data.TickInfo, sampling_specs : List[SamplingSpec], skip_existing : bool = True) -> SamplingUnitReport:
+    """
+    Samples the clean tick data of one (date, intra day period) into bars of every spec and inserts them into the data base
+    :param data_base: a DataBase
+    :param skip_existing: bars whose file is already in the data base are not sampled again
+    """
+    bar_infos = [make_spec_bar_info(tick_info, sampling_spec) for sampling_spec in dict.fromkeys(sampling_specs)]
+    skipped_bar_infos = [bar_info for bar_info in bar_infos if skip_existing and os.path.exists(data_base.get_sampled_bar_file_path(bar_info))]
+    pending_bar_infos = [bar_info for bar_info in bar_infos if bar_info not in skipped_bar_infos]
+    report = SamplingUnitReport(tick_info = tick_info, sampled_bar_infos = pending_bar_infos, skipped_bar_infos = skipped_bar_infos,
+                                num_ticks = 0, load_seconds = 0.0, sampling_seconds = 0.0, insert_seconds = 0.0)
+    if len(pending_bar_infos) == 0:
+        dp_logger.log_sampling_unit(report)
+        return report
+    # ------ only the trade columns are read ------
+    start_time = time.perf_counter()
+    tick_wrapper = data_base.get_clean_tick_data(symbol = tick_info.symbol, date = tick_info.date, intra_day_period = tick_info.intra_day_period,
+                                                 columns = data.TRADE_TICK_COLUMNS)
+    report.num_ticks = len(tick_wrapper)
+    report.load_seconds = time.perf_counter() - start_time
+    # ------ one pass over the ticks per sampling type ------
+    levels_by_type : Dict[data.Sampling, List[int]] = {}
+    for bar_info in pending_bar_infos:
+        levels_by_type.setdefault(bar_info.sampling_type, []).append(bar_info.sampling_level)
+    for sampling_type, levels in levels_by_type.items():
+        start_time = time.perf_counter()
+        bar_wrappers = sample_levels(tick_wrapper, sampling_type, levels)
+        report.sampling_seconds += time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        for bar_wrapper in bar_wrappers.values():
+            data_base.insert_sampled_bar(bar_wrapper)
+        report.insert_seconds += time.perf_counter() - start_time
+    dp_logger.log_sampling_unit(report)
+    return report
+
+
+def run_batch_sampling(data_base, symbol : str, sampling_specs : List[SamplingSpec],
+                       date_range : Optional[Tuple[data.Date, data.Date]] = None,
+                       intra_day_periods : Optional[List[data.IntraDayPeriod]] = None,
+                       workers : int = 1, skip_existing : bool = True) -> List[SamplingUnitReport]:
+    """
+    Samples every clean tick data of a symbol in the data base into bars of every spec
+    :param data_base: a DataBase, the units are the clean tick data listed by its catalog
+    :param date_range: inclusive (start date, end date), None samples all dates
+    :param intra_day_periods: the intra day periods to sample, None samples all periods
+    :param workers: number of processes, 1 samples serially in the calling process
+    :param skip_existing: bars whose file is already in the data base are not sampled again
+    :return: one report per unit, ordered by date, morning before afternoon
+    """
+    tick_infos = data_base.list_available_clean_ticks(symbol = symbol, date_range = date_range, intra_day_periods = intra_day_periods)
+    sample_func = functools.partial(sample_unit, data_base, sampling_specs = sampling_specs, skip_existing = skip_existing)
+    start_time = time.perf_counter()
+    if workers <= 1 or len(tick_infos) <= 1:
+        reports = [sample_func(tick_info) for tick_info in tick_infos]
+    else:
+        with ProcessPoolExecutor(max_workers = min(workers, len(tick_infos))) as executor:
+            reports = list(executor.map(sample_func, tick_infos))
+    dp_logger.log_batch_sampling(symbol = symbol, reports = reports, workers = workers, elapsed_seconds = time.perf_counter() - start_time)
+    return reports
@@ -1,5 +1,9 @@
+import dataclasses
+from dataclasses import dataclass
 import pandas as pd
 import numpy as np
+from scipy import ndimage
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Union
 import src.data_base_module.data_blocks as data
 import src.data_processing_module.data_processing_logger as dp_logger
 
@@ -25,6 +29,59 @@ def morning_after_noon_split(tick_wrapper : data.TickDataFrame, split_points_hou
     dp_logger.log_morning_after_noon_split(tick_wrapper= tick_wrapper, split_hours = split_points_hours)
     return morning_df_wrapper, afternoon_df_wrapper
 
+def morning_after_noon_split_chunks(tick_chunks : Iterable[data.TickChunk], split_points_hours : int) -> Iterator[data.TickChunk]:
+    """
+    Splits a stream of tick chunks along the mid day gap, see morning_after_noon_split
+    :param tick_chunks: chunks of one tick file in time stamp order, e.g. DataBase.iter_raw_tick_data
+    :param split_points_hours: The time in hours from the time of the first tick to the gap
+    :return: the morning chunks followed by the afternoon chunks, the chunk at the split point is cut in two
+    """
+    split_point = None
+    morning_info, afternoon_info = None, None
+
+    def split_tick_wrappers():
+        nonlocal split_point, morning_info, afternoon_info
+        for tick_chunk in tick_chunks:
+            tick_df_ref : pd.DataFrame = tick_chunk.tick_wrapper.tick_data
+            if split_point is None:
+                split_point = tick_chunk.first_timestamp + split_points_hours * 3600 * 1E9
+                tick_info = tick_chunk.tick_wrapper.tick_info
+                morning_info = data.TickInfo(symbol = tick_info.symbol, date = tick_info.date, intra_day_period = data.IntraDayPeriod.MORNING)
+                afternoon_info = data.TickInfo(symbol = tick_info.symbol, date = tick_info.date, intra_day_period = data.IntraDayPeriod.AFTERNOON)
+                dp_logger.log_morning_after_noon_split(tick_wrapper = tick_chunk.tick_wrapper, split_hours = split_points_hours)
+            morning_points : [bool] = (tick_df_ref[data.TickDataColumns.TIMESTAMP_NANO.value] < split_point).to_numpy()
+            yield data.TickDataFrame.wrap_without_copy(tick_df = tick_df_ref[morning_points], tick_info = morning_info)
+            yield data.TickDataFrame.wrap_without_copy(tick_df = tick_df_ref[np.logical_not(morning_points)], tick_info = afternoon_info)
+
+    return data.make_tick_chunks(split_tick_wrappers())
+
+
+def clean_tick_chunks(tick_chunks : Iterable[data.TickChunk], cleaning_funcs : List[Callable[[data.TickDataFrame], None]]) -> Iterator[data.TickChunk]:
+    """
+    Applies the tick data frame cleaning functions below to a stream of tick chunks, one chunk at a time
+    The last cleaned tick of the previous chunk is put in front of each chunk so that interpolation continues across the chunk boundary
+    :param tick_chunks: chunks in time stamp order, e.g. morning_after_noon_split_chunks
+    :param cleaning_funcs: functions that clean a tick data frame in place,
+    e.g. functools.partial(interpolate_bid_ask_quantity_outliers, outlier_threshold = 1000)
+    :return: the cleaned chunks with the same chunk meta data
+    NOTE : a zero or outlier run at the end of a chunk is forward filled instead of interpolated towards the next chunk,
+    the result is the same as cleaning the whole tick data frame as long as no such run touches the end of a chunk
+    """
+    context_df = None
+    for tick_chunk in tick_chunks:
+        chunk_df : pd.DataFrame = tick_chunk.tick_wrapper.tick_data
+        num_context_rows = 0 if context_df is None else len(context_df)
+        # ------ the chunk is copied, cleaning never writes into the data read from storage ------
+        work_df = chunk_df.copy() if context_df is None else pd.concat([context_df, chunk_df], ignore_index = True)
+        work_wrapper = data.TickDataFrame.wrap_without_copy(tick_df = work_df, tick_info = tick_chunk.tick_wrapper.tick_info)
+        for cleaning_func in cleaning_funcs:
+            cleaning_func(work_wrapper)
+        clean_df = work_wrapper.tick_data.iloc[num_context_rows:].reset_index(drop = True)
+        context_df = None if tick_chunk.is_last_chunk else clean_df.iloc[-1:]
+        clean_wrapper = data.TickDataFrame.wrap_without_copy(tick_df = clean_df, tick_info = tick_chunk.tick_wrapper.tick_info)
+        dp_logger.log_clean_tick_chunk(tick_chunk = tick_chunk)
+        yield dataclasses.replace(tick_chunk, tick_wrapper = clean_wrapper)
+
 # ----- tick_data_frame_cleaning --------
 def interpolate_zero_bid_ask_prices(tick_df_wrapper : data.TickDataFrame) -> None:
     """
@@ -56,7 +113,8 @@ def interpolate_zero_bid_ask_quantities(tick_df_wrapper : data.TickDataFrame) ->
     This function passes by reference and do not produce a new tick data frame
     :param tick_df_wrapper: reference to the tick data frame
     :return: None
-    NOTE : this function will convert entries from int to float in the columns where interpolation has occurred
+    NOTE : this function will convert entries from int to float in the columns where interpolation has occurred,
+    the quantities are rounded back to int32 when the tick data is inserted into the data base (see data_blocks.TICK_DATA_DTYPES)
     """
     tick_df_ref : pd.DataFrame = tick_df_wrapper.tick_data
     for col_name in [data.TickDataColumns.ASK1Q.value,
@@ -169,6 +227,306 @@ def interpolate_trade_volume_outliers(tick_df_wrapper : data.TickDataFrame, outl
     tick_df_ref.loc[:, data.TickDataColumns.LAST_QUANTITY.value] = tick_df_ref.loc[:, data.TickDataColumns.LAST_QUANTITY.value].fillna(0)
     dp_logger.log_interpolate_outlier_trade_quantities(tick_wrapper= tick_df_wrapper, outlier_threshold = outlier_threshold)
 
+# ------ single pass tick cleaning pipeline ------
+""" Applies a list of cleaning steps with the same result as calling the tick data frame cleaning functions above in sequence
+-> the columns cleaned by the steps are read once into 2D blocks, one block per column group and data type
+   e.g. the ten bid ask price columns form one (10, number of ticks) block, every column is contiguous
+-> every step masks the invalid entries of the whole block at once and interpolates the runs of invalid entries between
+   the valid entries around them, a step without invalid entries costs one comparison
+-> only the columns with replaced entries are written back, once at the end
+The interpolation follows pandas mask().interpolate().ffill().bfill() exactly : linear in the row position, computed in float64
+and stored in the data type of the block, runs at the end take the last valid value, runs at the start the first valid value,
+a column without valid entries becomes NaN
+NOTE : like the functions above, an integer column that has entries replaced becomes float64 """
+BID_ASK_PRICE_COLUMNS : Tuple[data.TickDataColumns, ...] = (data.TickDataColumns.ASK1P, data.TickDataColumns.ASK2P, data.TickDataColumns.ASK3P,
+                                                            data.TickDataColumns.ASK4P, data.TickDataColumns.ASK5P,
+                                                            data.TickDataColumns.BID1P, data.TickDataColumns.BID2P, data.TickDataColumns.BID3P,
+                                                            data.TickDataColumns.BID4P, data.TickDataColumns.BID5P)
+BID_ASK_QUANTITY_COLUMNS : Tuple[data.TickDataColumns, ...] = (data.TickDataColumns.ASK1Q, data.TickDataColumns.ASK2Q, data.TickDataColumns.ASK3Q,
+                                                               data.TickDataColumns.ASK4Q, data.TickDataColumns.ASK5Q,
+                                                               data.TickDataColumns.BID1Q, data.TickDataColumns.BID2Q, data.TickDataColumns.BID3Q,
+                                                               data.TickDataColumns.BID4Q, data.TickDataColumns.BID5Q)
+
+
+def find_invalid_runs(invalid_bool_arr : np.ndarray) -> (np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+    """
+    :param invalid_bool_arr: (number of columns, number of rows)
+    :return: column and row of every invalid entry, first row and length of every run of invalid entries in a column
+    """
+    num_rows = invalid_bool_arr.shape[1]
+    invalid_positions = np.flatnonzero(invalid_bool_arr)
+    invalid_cols = invalid_positions // num_rows
+    invalid_rows = invalid_positions - invalid_cols * num_rows
+    # ------ a run ends where the next invalid entry is not the next row of the same column ------
+    is_run_start_bool_arr = np.ones(len(invalid_positions), dtype = bool)
+    is_run_start_bool_arr[1:] = np.logical_or(np.diff(invalid_positions) != 1, invalid_rows[1:] == 0)
+    run_starts = np.flatnonzero(is_run_start_bool_arr)
+    run_lengths = np.diff(np.append(run_starts, len(invalid_positions)))
+    return invalid_cols, invalid_rows, invalid_rows[run_starts], run_lengths
+
+
+def interpolate_invalid_block(values : np.ndarray, invalid_bool_arr : np.ndarray) -> None:
+    """
+    Replaces the invalid entries of every column of a 2D block in place, see the interpolation rules above
+    :param values: (number of columns, number of rows) float block
+    :param invalid_bool_arr: same shape as values, True for the entries to replace
+    """
+    num_rows = values.shape[1]
+    invalid_cols, invalid_rows, run_first_rows, run_lengths = find_invalid_runs(invalid_bool_arr)
+    if len(invalid_cols) == 0:
+        return
+    # ------ the valid entries before and after the run of every invalid entry, if any ------
+    prev_rows, next_rows = np.repeat(run_first_rows - 1, run_lengths), np.repeat(run_first_rows + run_lengths, run_lengths)
+    has_prev_bool_arr, has_next_bool_arr = prev_rows >= 0, next_rows < num_rows
+    prev_values = values[invalid_cols, np.maximum(prev_rows, 0)].astype(np.float64)
+    next_values = values[invalid_cols, np.minimum(next_rows, num_rows - 1)].astype(np.float64)
+    # ------ same arithmetic as np.interp used by pandas ------
+    with np.errstate(invalid = "ignore", divide = "ignore"):
+        slopes = (next_values - prev_values) / (next_rows - prev_rows)
+        interpolated_values = slopes * (invalid_rows - prev_rows) + prev_values
+        interpolated_values = np.where(np.isnan(interpolated_values), slopes * (invalid_rows - next_rows) + next_values, interpolated_values)
+    values[invalid_cols, invalid_rows] = np.where(has_prev_bool_arr & has_next_bool_arr, interpolated_values,
+                                                  np.where(has_prev_bool_arr, prev_values, np.where(has_next_bool_arr, next_values, np.nan)))
+
+
+@dataclass
+class ColumnBlock:
+    """
+    Columns of the same group and data type held as one (number of columns, number of rows) block,
+    float32 columns stay float32, other columns are float64
+    """
+    col_names : List[str]
+    values : np.ndarray
+    input_dtypes : List[np.dtype]
+    is_replaced : np.ndarray
+
+    def get_output_column(self, col_index : int) -> np.ndarray:
+        """ :return: the column in its input data type, integer columns with replaced entries stay float64 """
+        input_dtype = self.input_dtypes[col_index]
+        if input_dtype.kind != "f" and self.is_replaced[col_index]:
+            return self.values[col_index]
+        return self.values[col_index].astype(input_dtype)
+
+
+@dataclass(frozen = True)
+class ZeroInterpolationStep:
+    """ same as interpolate_zero_bid_ask_prices / interpolate_zero_bid_ask_quantities on the given columns """
+    columns : Tuple[data.TickDataColumns, ...]
+
+    def find_invalid(self, values : np.ndarray) -> np.ndarray:
+        return values == 0
+
+
+@dataclass(frozen = True)
+class OutlierInterpolationStep:
+    """ same as interpolate_bid_ask_price_outliers / interpolate_bid_ask_quantity_outliers on the given columns """
+    columns : Tuple[data.TickDataColumns, ...]
+    lower_threshold : float = -np.inf
+    upper_threshold : float = np.inf
+
+    def find_invalid(self, values : np.ndarray) -> np.ndarray:
+        return np.logical_or(values < self.lower_threshold, values > self.upper_threshold)
+
+
+@dataclass(frozen = True)
+class TradeOutlierInterpolationStep:
+    """
+    same as interpolate_trade_price_outliers / interpolate_trade_volume_outliers on the given column
+    NOTE : only the ticks with a positive value are interpolated, the other ticks are set to 0
+    """
+    column : data.TickDataColumns
+    lower_threshold : float = -np.inf
+    upper_threshold : float = np.inf
+
+    @property
+    def columns(self) -> Tuple[data.TickDataColumns, ...]:
+        return (self.column,)
+
+    def find_invalid(self, values : np.ndarray) -> np.ndarray:
+        return np.logical_or(values < self.lower_threshold, values > self.upper_threshold)
+
+
+# ------ rolling median outlier detection ------
+""" Hampel filter : an entry is an outlier if it is more than num_mads scaled MADs away from the median of the window centred on it
+-> the thresholds follow the level of the prices, no per contract or per day bounds are needed and regime shifts are not outliers
+-> the rolling medians use the one dimensional rank filter of scipy.ndimage, O(n log w) for n entries and windows of w entries,
+   the windows at both ends of a column are mirrored around the first / last entry (repeating the entry itself would let a spike
+   in the last tick be the median of its own window)
+-> the MAD of an entry is the rolling median of the absolute deviations from the rolling median (two rolling medians),
+   scaled by 1.4826 to estimate the standard deviation of normal data
+-> prices on a tick grid often have a MAD of 0, the scale is floored at min_relative_scale * |median| so that moves of a few ticks
+   are never outliers
+NOTE : zero entries are far from the median and are detected as outliers, sparse zeros are interpolated like ZeroInterpolationStep """
+MAD_NORMAL_SCALE : float = 1.4826
+
+
+def find_rolling_median_outliers(values : np.ndarray, window : int, num_mads : float, min_relative_scale : float) -> np.ndarray:
+    """
+    :param values: (number of columns, number of rows) block, every column is filtered separately
+    :param window: number of entries in the window centred on each entry
+    :return: same shape as values, True for the outliers
+    """
+    outlier_bool_arr = np.zeros(values.shape, dtype = bool)
+    if values.shape[1] == 0:
+        return outlier_bool_arr
+    for col_index, column_values in enumerate(values.astype(np.float64)):
+        rolling_medians = ndimage.median_filter(column_values, size = window, mode = "mirror")
+        abs_deviations = np.abs(column_values - rolling_medians)
+        rolling_mads = ndimage.median_filter(abs_deviations, size = window, mode = "mirror")
+        scales = np.maximum(MAD_NORMAL_SCALE * rolling_mads, min_relative_scale * np.abs(rolling_medians))
+        outlier_bool_arr[col_index] = abs_deviations > num_mads * scales
+    return outlier_bool_arr
+
+
+@dataclass(frozen = True)
+class RollingMedianOutlierStep:
+    """ interpolates the Hampel filter outliers of the given columns, e.g. the bid ask prices after ZeroInterpolationStep """
+    columns : Tuple[data.TickDataColumns, ...]
+    window : int = 101
+    num_mads : float = 5.0
+    min_relative_scale : float = 5e-4
+
+    def find_invalid(self, values : np.ndarray) -> np.ndarray:
+        return find_rolling_median_outliers(values, self.window, self.num_mads, self.min_relative_scale)
+
+
+@dataclass(frozen = True)
+class TradeRollingMedianOutlierStep:
+    """
+    interpolates the Hampel filter outliers of the trades in the given column, e.g. the last price
+    NOTE : like TradeOutlierInterpolationStep, only the ticks with a positive value are filtered and interpolated, the other ticks are set to 0
+    """
+    column : data.TickDataColumns
+    window : int = 101
+    num_mads : float = 5.0
+    min_relative_scale : float = 5e-4
+
+    @property
+    def columns(self) -> Tuple[data.TickDataColumns, ...]:
+        return (self.column,)
+
+    def find_invalid(self, values : np.ndarray) -> np.ndarray:
+        return find_rolling_median_outliers(values, self.window, self.num_mads, self.min_relative_scale)
+
+
+CleaningStep = Union[ZeroInterpolationStep, OutlierInterpolationStep, TradeOutlierInterpolationStep, RollingMedianOutlierStep, TradeRollingMedianOutlierStep]
+TRADE_CLEANING_STEP_TYPES = (TradeOutlierInterpolationStep, TradeRollingMedianOutlierStep)
+
+
+def make_column_blocks(tick_df : pd.DataFrame, cleaning_steps : List[CleaningStep]) -> List[ColumnBlock]:
+    """ :return: one block per (column group of the first step that cleans the column, float32 or float64) """
+    block_columns : Dict[Tuple[int, bool], List[str]] = {}
+    assigned_col_names = set()
+    for step_index, cleaning_step in enumerate(cleaning_steps):
+        for column in cleaning_step.columns:
+            if column.value in assigned_col_names:
+                continue
+            assigned_col_names.add(column.value)
+            is_float32 = tick_df[column.value].dtype == np.float32
+            block_columns.setdefault((step_index, is_float32), []).append(column.value)
+    column_blocks = []
+    for (_, is_float32), col_names in block_columns.items():
+        values = np.empty((len(col_names), len(tick_df)), dtype = np.float32 if is_float32 else np.float64)
+        for col_index, col_name in enumerate(col_names):
+            values[col_index] = tick_df[col_name].to_numpy()
+        column_blocks.append(ColumnBlock(col_names = col_names, values = values, input_dtypes = [tick_df[col_name].dtype for col_name in col_names],
+                                         is_replaced = np.zeros(len(col_names), dtype = bool)))
+    return column_blocks
+
+
+def apply_column_step(column_block : ColumnBlock, col_indices : np.ndarray, cleaning_step : CleaningStep) -> None:
+    """ applies a zero or outlier step to the rows col_indices of the block """
+    is_whole_block = len(col_indices) == len(column_block.col_names)
+    values = column_block.values if is_whole_block else column_block.values[col_indices]
+    invalid_bool_arr = np.logical_or(cleaning_step.find_invalid(values), np.isnan(values))
+    if not invalid_bool_arr.any():
+        return
+    interpolate_invalid_block(values, invalid_bool_arr)
+    if not is_whole_block:
+        column_block.values[col_indices] = values
+    column_block.is_replaced[col_indices] |= invalid_bool_arr.any(axis = 1)
+
+
+def apply_trade_step(column_block : ColumnBlock, col_index : int, cleaning_step : Union[TradeOutlierInterpolationStep, TradeRollingMedianOutlierStep]) -> None:
+    column_values = column_block.values[col_index]
+    has_trade_bool_arr = column_values > 0
+    trade_values = column_values[has_trade_bool_arr][np.newaxis, :]
+    invalid_bool_arr = np.logical_or(cleaning_step.find_invalid(trade_values), np.isnan(trade_values))
+    is_all_trades = bool(has_trade_bool_arr.all())
+    if not invalid_bool_arr.any() and (is_all_trades or not column_values[~has_trade_bool_arr].any()):
+        # ------ nothing to replace, an integer column still becomes float64 if it has ticks without trade ------
+        column_block.is_replaced[col_index] |= not is_all_trades
+        return
+    interpolate_invalid_block(trade_values, invalid_bool_arr)
+    # ------ ticks without trade and trades left without a valid value are set to 0 ------
+    clean_values = np.zeros_like(column_values)
+    clean_values[has_trade_bool_arr] = np.where(np.isnan(trade_values[0]), 0, trade_values[0])
+    column_block.values[col_index] = clean_values
+    column_block.is_replaced[col_index] = True
+
+
+class TickCleaningPipeline:
+    """
+    Single pass replacement of a sequence of tick data frame cleaning functions, e.g.
+    TickCleaningPipeline([ZeroInterpolationStep(BID_ASK_PRICE_COLUMNS), OutlierInterpolationStep(BID_ASK_QUANTITY_COLUMNS, upper_threshold = 1000),
+                          TradeOutlierInterpolationStep(data.TickDataColumns.LAST_QUANTITY, upper_threshold = 200)])
+    The pipeline is called on a tick data frame like the cleaning functions, it can be passed to clean_tick_chunks
+    """
+    def __init__(self, cleaning_steps : List[CleaningStep]):
+        self.cleaning_steps : List[CleaningStep] = list(cleaning_steps)
+
+    def __call__(self, tick_df_wrapper : data.TickDataFrame) -> None:
+        """
+        Cleans the tick data frame in place
+        :param tick_df_wrapper: reference to the tick data frame
+        NOTE : the columns with replaced entries are replaced by new arrays, the arrays of the tick data frame are never written into
+        """
+        tick_df_ref : pd.DataFrame = tick_df_wrapper.tick_data
+        column_blocks = make_column_blocks(tick_df_ref, self.cleaning_steps)
+        block_positions = {col_name : (column_block, col_index) for column_block in column_blocks for col_index, col_name in enumerate(column_block.col_names)}
+        for cleaning_step in self.cleaning_steps:
+            if isinstance(cleaning_step, TRADE_CLEANING_STEP_TYPES):
+                apply_trade_step(*block_positions[cleaning_step.column.value], cleaning_step)
+                continue
+            step_col_names = {column.value for column in cleaning_step.columns}
+            for column_block in column_blocks:
+                col_indices = np.array([col_index for col_index, col_name in enumerate(column_block.col_names) if col_name in step_col_names], dtype = np.int64)
+                if len(col_indices) > 0:
+                    apply_column_step(column_block, col_indices, cleaning_step)
+        # ------ the columns with replaced entries are written back once, dropped together and inserted at their position ------
+        # ------ (replacing the columns one by one copies the rest of a consolidated frame for every column) ------
+        output_columns = {column_block.col_names[col_index] : column_block.get_output_column(col_index)
+                          for column_block in column_blocks for col_index in np.flatnonzero(column_block.is_replaced)}
+        col_positions = {col_name : col_position for col_position, col_name in enumerate(tick_df_ref.columns)}
+        tick_df_ref.drop(columns = list(output_columns), inplace = True)
+        for col_name in sorted(output_columns, key = col_positions.get):
+            tick_df_ref.insert(col_positions[col_name], col_name, output_columns[col_name])
+        dp_logger.log_tick_cleaning_pipeline(tick_wrapper = tick_df_wrapper, num_steps = len(self.cleaning_steps), num_replaced_columns = len(output_columns))
+
+
+def interpolate_bid_ask_price_rolling_outliers(tick_df_wrapper : data.TickDataFrame, window : int = 101, num_mads : float = 5.0) -> None:
+    """
+    replaces the Hampel filter outliers of the bid ask prices by linear interpolation, see RollingMedianOutlierStep
+    This function passes by reference and do not produce a new tick data frame
+    :param tick_df_wrapper: reference to the tick data frame
+    :param window: number of ticks in the window centred on each tick
+    :param num_mads: a price further than num_mads scaled MADs from the rolling median is considered an outlier
+    NOTE : unlike interpolate_bid_ask_price_outliers no thresholds have to be tuned per contract
+    """
+    TickCleaningPipeline([RollingMedianOutlierStep(BID_ASK_PRICE_COLUMNS, window = window, num_mads = num_mads)])(tick_df_wrapper)
+
+
+def interpolate_trade_price_rolling_outliers(tick_df_wrapper : data.TickDataFrame, window : int = 101, num_mads : float = 5.0) -> None:
+    """
+    replaces the Hampel filter outliers of the trade prices by linear interpolation on the non-zero sub series, see TradeRollingMedianOutlierStep
+    This function passes by reference and do not produce a new tick data frame
+    :param tick_df_wrapper: reference to the tick data frame
+    :param window: number of trades in the window centred on each trade
+    :param num_mads: a price further than num_mads scaled MADs from the rolling median is considered an outlier
+    """
+    TickCleaningPipeline([TradeRollingMedianOutlierStep(data.TickDataColumns.LAST_PRICE, window = window, num_mads = num_mads)])(tick_df_wrapper)
+
+
 # -------- interpolation functions for bar data ----------
 def interpolate_bar_zero_prices(bar_wrapper : data.BarDataFrame) -> data.BarDataFrame:
     """
@@ -1,7 +1,17 @@
 from scipy import stats
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 import pandas as pd
 import src.data_base_module.data_blocks as data
+import src.data_base_module.tick_archive as tick_archive
+import src.data_processing_module.data_cleaning as data_cleaner
+import src.data_processing_module.data_processing_logger as dp_logger
+
+ASK_PRICE_COLUMNS : List[data.TickDataColumns] = [data.TickDataColumns.ASK1P, data.TickDataColumns.ASK2P, data.TickDataColumns.ASK3P,
+                                                  data.TickDataColumns.ASK4P, data.TickDataColumns.ASK5P]
+BID_PRICE_COLUMNS : List[data.TickDataColumns] = [data.TickDataColumns.BID1P, data.TickDataColumns.BID2P, data.TickDataColumns.BID3P,
+                                                  data.TickDataColumns.BID4P, data.TickDataColumns.BID5P]
 
 
 # ------- print statistics on tick data -------
@@ -81,7 +91,7 @@ def scan_both_non_zero_bid_ask_price_and_quantity(tick_df_wrapper: data.TickData
         price_series = tick_df_ref[price_col_name]
         quantity_series = tick_df_ref[quantity_col_name]
         is_one_zero_series: [bool] = np.logical_xor((price_series.values == 0), (quantity_series.values == 0))
-        print(price_col_name + " - " + quantity_col_name + " -- Number of ticks with non zero price but zero trade quantity or vice versa : " + str(len([bol for bol in is_one_zero_series if bol])))
+        print(price_col_name + " - " + quantity_col_name + " -- Number of ticks with non zero price but zero trade quantity or vice versa : " + str(np.count_nonzero(is_one_zero_series)))
 
 
 def scan_both_non_zero_trade_price_and_quantity(tick_df_wrapper : data.TickDataFrame) -> None:
@@ -90,7 +100,7 @@ def scan_both_non_zero_trade_price_and_quantity(tick_df_wrapper : data.TickDataF
     last_price_series = tick_df_ref[data.TickDataColumns.LAST_PRICE.value]
     last_quantity_series = tick_df_ref[data.TickDataColumns.LAST_QUANTITY.value]
     is_one_zero_series : [bool]= np.logical_xor((last_price_series.values == 0), (last_quantity_series == 0))
-    print(" Number of ticks with non zero trade price but zero trade quantity or vice versa : " + str(len([bol for bol in is_one_zero_series if bol])))
+    print(" Number of ticks with non zero trade price but zero trade quantity or vice versa : " + str(np.count_nonzero(is_one_zero_series)))
 
 def is_ascending(values : [float]) -> bool:
     return values == sorted(values)
@@ -98,30 +108,29 @@ def is_ascending(values : [float]) -> bool:
 def is_descending(values : [float]) -> bool:
     return values == sorted(values, reverse = True)
 
+def find_not_ascending_rows(level_arrays : List[np.ndarray]) -> np.ndarray:
+    """
+    :param level_arrays: one array per book level, level 1 first
+    :return: True for the rows where a level is lower than the level before it, equal levels are ascending
+    """
+    not_ascending_bool_arr = np.zeros(len(level_arrays[0]), dtype = bool)
+    for lower_level_values, higher_level_values in zip(level_arrays[:-1], level_arrays[1:]):
+        not_ascending_bool_arr |= higher_level_values < lower_level_values
+    return not_ascending_bool_arr
+
 def scan_ask_in_ascending_order(tick_df_wrapper : data.TickDataFrame) -> None:
     print(" ---------- " + str(tick_df_wrapper) + " scanning if ask prices are in ascending order ---------------")
     tick_df_ref : pd.DataFrame = tick_df_wrapper.get_tick_data()
-    ask1p_series = tick_df_ref[data.TickDataColumns.ASK1P.value]
-    ask2p_series = tick_df_ref[data.TickDataColumns.ASK2P.value]
-    ask3p_series = tick_df_ref[data.TickDataColumns.ASK3P.value]
-    ask4p_series = tick_df_ref[data.TickDataColumns.ASK4P.value]
-    ask5p_series = tick_df_ref[data.TickDataColumns.ASK5P.value]
-    ascending_bool_array = [is_ascending([ask1p, ask2p, ask3p, ask4p, ask5p]) for ask1p, ask2p, ask3p, ask4p, ask5p
-                            in zip(ask1p_series, ask2p_series, ask3p_series, ask4p_series, ask5p_series)]
-    print(" Number of rows that ask prices are not ascending : " + str(len([bol for bol in ascending_bool_array if not bol])))
+    ask_price_arrays = [tick_df_ref[col.value].to_numpy() for col in ASK_PRICE_COLUMNS]
+    print(" Number of rows that ask prices are not ascending : " + str(np.count_nonzero(find_not_ascending_rows(ask_price_arrays))))
 
 
 def scan_bid_in_descending_order(tick_df_wrapper : data.TickDataFrame) -> None:
     print(" ---------- " + str(tick_df_wrapper) + " scanning if bid prices are in descending order --------------")
     tick_df_ref : pd.DataFrame = tick_df_wrapper.get_tick_data()
-    bid1p_series = tick_df_ref[data.TickDataColumns.BID1P.value]
-    bid2p_series = tick_df_ref[data.TickDataColumns.BID2P.value]
-    bid3p_series = tick_df_ref[data.TickDataColumns.BID3P.value]
-    bid4p_series = tick_df_ref[data.TickDataColumns.BID4P.value]
-    bid5p_series = tick_df_ref[data.TickDataColumns.BID5P.value]
-    descending_bool_array = [is_descending([bid1p, bid2p, bid3p, bid4p, bid5p]) for bid1p, bid2p, bid3p, bid4p, bid5p
-                            in zip(bid1p_series, bid2p_series, bid3p_series, bid4p_series, bid5p_series)]
-    print(" Number of rows that bid prices are not descending : " + str(len([bol for bol in descending_bool_array if not bol])))
+    # ------ bids are descending if the negated bids are ascending ------
+    negated_bid_price_arrays = [-tick_df_ref[col.value].to_numpy() for col in BID_PRICE_COLUMNS]
+    print(" Number of rows that bid prices are not descending : " + str(np.count_nonzero(find_not_ascending_rows(negated_bid_price_arrays))))
 
 
 def scan_bid_ask_price_outliers(tick_df_wrapper : data.TickDataFrame, lower_threshold : float, upper_threshold : float) -> None:
@@ -140,7 +149,7 @@ def scan_bid_ask_price_outliers(tick_df_wrapper : data.TickDataFrame, lower_thre
     for col_name in limit_price_column_names:
         limit_price_col = tick_data_ref[col_name]
         outlier_bool_arr = np.logical_or((limit_price_col < lower_threshold), (limit_price_col > upper_threshold))
-        print(" Number of outliers in column : " + col_name + " : " + str(len([bol for bol in outlier_bool_arr if bol]))\
+        print(" Number of outliers in column : " + col_name + " : " + str(np.count_nonzero(outlier_bool_arr))\
               + " : lower_threshold : " + str(lower_threshold) + " : upper_threshold : " + str(upper_threshold))
 
 
@@ -160,7 +169,7 @@ def scan_bid_ask_quantity_outliers(tick_df_wrapper : data.TickDataFrame, lower_t
     for col_name in limit_quantity_column_names:
         limit_quantity_col = tick_data_ref[col_name]
         outlier_bool_arr = np.logical_or((limit_quantity_col < lower_threshold), (limit_quantity_col > upper_threshold))
-        print(" Number of outliers in column : " + col_name + " : " + str(len([bol for bol in outlier_bool_arr if bol]))\
+        print(" Number of outliers in column : " + col_name + " : " + str(np.count_nonzero(outlier_bool_arr))\
               + " : lower_threshold : " + str(lower_threshold) + " : upper_threshold : " + str(upper_threshold))
 
 def scan_trade_quantity_outliers(tick_df_wrapper : data.TickDataFrame, outlier_threshold : float):
@@ -168,5 +177,142 @@ def scan_trade_quantity_outliers(tick_df_wrapper : data.TickDataFrame, outlier_t
     tick_df_ref = tick_df_wrapper.get_tick_data()
     trade_quantity_series = tick_df_ref[data.TickDataColumns.LAST_QUANTITY.value]
     outlier_bool_arr = (trade_quantity_series > outlier_threshold)
-    print(" Number of outlier trade quantities : " + str(len([bol for bol in outlier_bool_arr if bol])) + " : threshold : " + str(outlier_threshold))
+    print(" Number of outlier trade quantities : " + str(np.count_nonzero(outlier_bool_arr)) + " : threshold : " + str(outlier_threshold))
+
+
+# ----------- diagnostics report, every check above in one scan -------
+""" diagnose runs every check of the print functions on a tick data frame and returns the counts in a DiagnosticsReport
+-> each column is read once as a numpy array, the checks are vectorised, a day of ticks takes milliseconds
+-> the report is a dataclass of ints and dicts of ints, to_dict / from_dict convert it to and from json
+-> the outlier checks need thresholds, a check whose thresholds are None is skipped and its counts are empty / None
+NOTE : comparisons with NaN are False, a NaN entry is only counted in missing_value_counts """
+@dataclass
+class DiagnosticsReport:
+    """
+    zero_price_counts, zero_quantity_counts : number of zero entries in each of the bid ask price / quantity columns
+    price_quantity_mismatch_counts : keyed by price column, number of ticks with a zero price and a non zero quantity at that level or vice versa
+    trade_price_quantity_mismatch_count : same for the trade price and trade quantity
+    duplicated_timestamp_count : number of ticks whose time stamp is the time stamp of an earlier tick
+    ask_not_ascending_count, bid_not_descending_count : number of ticks whose ask prices are not ascending / bid prices are not descending
+    price_outlier_counts, quantity_outlier_counts : number of entries outside the thresholds in each bid ask price / quantity column
+    trade_quantity_outlier_count : number of trade quantities above trade_quantity_threshold
+    """
+    symbol : str
+    date : data.Date
+    intra_day_period : data.IntraDayPeriod
+    row_count : int
+    missing_value_counts : Dict[str, int]
+    zero_price_counts : Dict[str, int]
+    zero_quantity_counts : Dict[str, int]
+    duplicated_timestamp_count : int
+    price_quantity_mismatch_counts : Dict[str, int]
+    trade_price_quantity_mismatch_count : int
+    ask_not_ascending_count : int
+    bid_not_descending_count : int
+    price_thresholds : Optional[Tuple[float, float]]
+    price_outlier_counts : Dict[str, int]
+    quantity_thresholds : Optional[Tuple[float, float]]
+    quantity_outlier_counts : Dict[str, int]
+    trade_quantity_threshold : Optional[float]
+    trade_quantity_outlier_count : Optional[int]
+
+    @property
+    def book_order_violation_count(self) -> int:
+        return self.ask_not_ascending_count + self.bid_not_descending_count
+
+    def to_dict(self) -> Dict:
+        report_dict = asdict(self)
+        report_dict["date"] = self.date.get_str()
+        report_dict["intra_day_period"] = self.intra_day_period.value
+        return report_dict
+
+    @staticmethod
+    def from_dict(report_dict : Dict):
+        return DiagnosticsReport(**{**report_dict, "date" : data.Date.from_str(report_dict["date"]),
+                                    "intra_day_period" : data.IntraDayPeriod(report_dict["intra_day_period"]),
+                                    "price_thresholds" : None if report_dict["price_thresholds"] is None else tuple(report_dict["price_thresholds"]),
+                                    "quantity_thresholds" : None if report_dict["quantity_thresholds"] is None else tuple(report_dict["quantity_thresholds"])})
+
+
+def count_outside(values : np.ndarray, thresholds : Tuple[float, float]) -> int:
+    return int(np.count_nonzero((values < thresholds[0]) | (values > thresholds[1])))
+
+
+def diagnose(tick_wrapper : data.TickDataFrame, price_thresholds : Optional[Tuple[float, float]] = None,
+             quantity_thresholds : Optional[Tuple[float, float]] = None, trade_quantity_threshold : Optional[float] = None) -> DiagnosticsReport:
+    """
+    :param price_thresholds: (lower, upper) bounds of the bid ask prices, None skips the price outlier check
+    :param quantity_thresholds: (lower, upper) bounds of the bid ask quantities, None skips the quantity outlier check
+    :param trade_quantity_threshold: upper bound of the trade quantities, None skips the trade quantity outlier check
+    :return: the counts of every check, nothing is printed
+    """
+    tick_df = tick_wrapper.get_tick_data()
+    column_arrays : Dict[str, np.ndarray] = {col_name : tick_df[col_name].to_numpy() for col_name in tick_df.columns}
+    price_col_names = [col.value for col in data_cleaner.BID_ASK_PRICE_COLUMNS]
+    quantity_col_names = [col.value for col in data_cleaner.BID_ASK_QUANTITY_COLUMNS]
+    is_zero_arrays : Dict[str, np.ndarray] = {col_name : column_arrays[col_name] == 0 for col_name in price_col_names + quantity_col_names}
+    timestamps = column_arrays[data.TickDataColumns.TIMESTAMP_NANO.value]
+    is_zero_last_price = column_arrays[data.TickDataColumns.LAST_PRICE.value] == 0
+    is_zero_last_quantity = column_arrays[data.TickDataColumns.LAST_QUANTITY.value] == 0
+    trade_quantities = column_arrays[data.TickDataColumns.LAST_QUANTITY.value]
+    return DiagnosticsReport(
+        symbol = tick_wrapper.tick_info.symbol, date = tick_wrapper.tick_info.date, intra_day_period = tick_wrapper.tick_info.intra_day_period,
+        row_count = len(tick_df),
+        missing_value_counts = {col_name : int(np.count_nonzero(pd.isnull(values))) for col_name, values in column_arrays.items()},
+        zero_price_counts = {col_name : int(np.count_nonzero(is_zero_arrays[col_name])) for col_name in price_col_names},
+        zero_quantity_counts = {col_name : int(np.count_nonzero(is_zero_arrays[col_name])) for col_name in quantity_col_names},
+        duplicated_timestamp_count = len(timestamps) - len(pd.unique(timestamps)),
+        price_quantity_mismatch_counts = {price_col_name : int(np.count_nonzero(is_zero_arrays[price_col_name] ^ is_zero_arrays[quantity_col_name]))
+                                          for price_col_name, quantity_col_name in zip(price_col_names, quantity_col_names)},
+        trade_price_quantity_mismatch_count = int(np.count_nonzero(is_zero_last_price ^ is_zero_last_quantity)),
+        ask_not_ascending_count = int(np.count_nonzero(find_not_ascending_rows([column_arrays[col.value] for col in ASK_PRICE_COLUMNS]))),
+        bid_not_descending_count = int(np.count_nonzero(find_not_ascending_rows([-column_arrays[col.value] for col in BID_PRICE_COLUMNS]))),
+        price_thresholds = price_thresholds,
+        price_outlier_counts = {} if price_thresholds is None else
+                               {col_name : count_outside(column_arrays[col_name], price_thresholds) for col_name in price_col_names},
+        quantity_thresholds = quantity_thresholds,
+        quantity_outlier_counts = {} if quantity_thresholds is None else
+                                  {col_name : count_outside(column_arrays[col_name], quantity_thresholds) for col_name in quantity_col_names},
+        trade_quantity_threshold = trade_quantity_threshold,
+        trade_quantity_outlier_count = None if trade_quantity_threshold is None else int(np.count_nonzero(trade_quantities > trade_quantity_threshold)))
+
+
+def diagnose_and_log(tick_wrapper : data.TickDataFrame) -> DiagnosticsReport:
+    """ diagnoses without thresholds and logs a summary, meant to be called on every ingested day (see tick_archive.ingest_raw_tick_files) """
+    report = diagnose(tick_wrapper)
+    dp_logger.log_diagnostics_report(report)
+    return report
+
+
+def print_diagnostics_report(report : DiagnosticsReport) -> None:
+    print(" ---------- " + report.symbol + " -- " + report.date.get_str_format_2() + " -- " + report.intra_day_period.value + " -- Diagnostics report ----------")
+    print("Number of ticks : " + str(report.row_count))
+    for col_name, num_missing_values in report.missing_value_counts.items():
+        print("Column : " + col_name + " has " + str(num_missing_values) + " missing values")
+    for col_name, num_zeros in {**report.zero_price_counts, **report.zero_quantity_counts}.items():
+        print("Number of zeros in " + col_name + " : " + str(num_zeros))
+    print("Number of duplicated time stamps : " + str(report.duplicated_timestamp_count))
+    for col_name, num_mismatches in report.price_quantity_mismatch_counts.items():
+        print(col_name + " -- Number of ticks with non zero price but zero quantity or vice versa : " + str(num_mismatches))
+    print("Number of ticks with non zero trade price but zero trade quantity or vice versa : " + str(report.trade_price_quantity_mismatch_count))
+    print("Number of rows that ask prices are not ascending : " + str(report.ask_not_ascending_count))
+    print("Number of rows that bid prices are not descending : " + str(report.bid_not_descending_count))
+    for col_name, num_outliers in {**report.price_outlier_counts, **report.quantity_outlier_counts}.items():
+        print("Number of outliers in column : " + col_name + " : " + str(num_outliers))
+    if report.trade_quantity_outlier_count is not None:
+        print("Number of outlier trade quantities : " + str(report.trade_quantity_outlier_count) + " : threshold : " + str(report.trade_quantity_threshold))
+
+
+# ----------- print functions answered from the footers of the tick archive, no tick data is read -------
+def scan_partition_summary(partition_statistics : tick_archive.PartitionStatistics) -> None:
+    print(" ---------- " + partition_statistics.symbol + " -- " + partition_statistics.date.get_str_format_2() + " -- Partition summary ----------")
+    print("Number of ticks : " + str(partition_statistics.row_count))
+    print("Number of trades : " + str(partition_statistics.num_trades))
+    print("First time stamp : " + str(partition_statistics.min_timestamp) + " : Last time stamp : " + str(partition_statistics.max_timestamp))
+    print("Lowest trade price : " + str(partition_statistics.min_last_price) + " : Highest trade price : " + str(partition_statistics.max_last_price))
+
 
+def scan_partition_bid_ask_prices_zero_entries(partition_statistics : tick_archive.PartitionStatistics) -> None:
+    print(" ---------- " + partition_statistics.symbol + " -- " + partition_statistics.date.get_str_format_2() + " -- Scanning for zeros in bid ask prices ----------")
+    for col_name, num_zeros in partition_statistics.zero_price_counts.items():
+        print("Number of zeros in " + col_name + " : " + str(num_zeros))
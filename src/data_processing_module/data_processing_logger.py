@@ -1,6 +1,7 @@
 import logging
 import definitions
 import os
+from typing import List
 import src.data_base_module.data_blocks as data
 
 # ------- initialize a logger for this specific module -------
@@ -53,6 +54,33 @@ def log_dollar_sampling_end(tick_info : data.TickInfo, sampling_dollar : int) ->
     message = f"Finished sampling : {tick_info.symbol} -- {tick_info.date.get_str_format_2()} -- {tick_info.intra_day_period.value} -- into {sampling_dollar}_dollar tick bars "
     LOGGER.info(message)
 
+def log_multi_level_sampling_start(tick_info : data.TickInfo, sampling_type : data.Sampling, levels : List[int]) -> None:
+    message = f"Started sampling : {tick_info.symbol} -- {tick_info.date.get_str_format_2()} -- {tick_info.intra_day_period.value} -- {sampling_type.value} -- levels : {levels}"
+    LOGGER.info(message)
+
+def log_multi_level_sampling_end(tick_info : data.TickInfo, sampling_type : data.Sampling, levels : List[int]) -> None:
+    message = f"Finished sampling : {tick_info.symbol} -- {tick_info.date.get_str_format_2()} -- {tick_info.intra_day_period.value} -- {sampling_type.value} -- levels : {levels}"
+    LOGGER.info(message)
+
+def log_information_driven_sampling_start(tick_info : data.TickInfo, sampling_type : data.Sampling, expected_ticks : int) -> None:
+    message = f"Started sampling : {tick_info.symbol} -- {tick_info.date.get_str_format_2()} -- {tick_info.intra_day_period.value} -- {sampling_type.value} -- initial expected ticks : {expected_ticks}"
+    LOGGER.info(message)
+
+def log_information_driven_sampling_end(tick_info : data.TickInfo, sampling_type : data.Sampling, expected_ticks : int) -> None:
+    message = f"Finished sampling : {tick_info.symbol} -- {tick_info.date.get_str_format_2()} -- {tick_info.intra_day_period.value} -- {sampling_type.value} -- initial expected ticks : {expected_ticks}"
+    LOGGER.info(message)
+
+def log_sampling_unit(report) -> None:
+    """ :param report: a SamplingUnitReport of the batch sampling job """
+    message = f"Sampled unit : {report.tick_info} -- {report.num_ticks} ticks -- {len(report.sampled_bar_infos)} bars sampled -- {len(report.skipped_bar_infos)} bars skipped \
+               -- load {report.load_seconds:.3f}s -- sampling {report.sampling_seconds:.3f}s -- insert {report.insert_seconds:.3f}s"
+    LOGGER.info(message)
+
+def log_batch_sampling(symbol : str, reports : List, workers : int, elapsed_seconds : float) -> None:
+    message = f"Finished batch sampling : {symbol} -- {len(reports)} units -- {sum(len(report.sampled_bar_infos) for report in reports)} bars sampled \
+               -- {workers} workers -- {elapsed_seconds:.3f}s"
+    LOGGER.info(message)
+
 # -------- logging functions for data cleaning -------
 def log_morning_after_noon_split(tick_wrapper : data.TickDataFrame, split_hours : int) -> None:
     message = f"{tick_wrapper} -- data split into morning and afternoon periods -- split point -- {split_hours} hours from start of day"
@@ -82,6 +110,39 @@ def log_interpolate_outlier_trade_quantities(tick_wrapper : data.TickDataFrame,
     message = f"{tick_wrapper} -- Interpolate outlier for -- traded quantity -- outier_threshold threshold : {outlier_threshold}"
     LOGGER.info(message)
 
+def log_tick_cleaning_pipeline(tick_wrapper : data.TickDataFrame, num_steps : int, num_replaced_columns : int) -> None:
+    message = f"Cleaned tick data : {tick_wrapper.tick_info.symbol} -- {tick_wrapper.tick_info.date.get_str_format_2()} -- {tick_wrapper.tick_info.intra_day_period.value} \
+               -- {num_steps} cleaning steps in a single pass -- {num_replaced_columns} columns with replaced entries"
+    LOGGER.info(message)
+
+def log_cleaning_day(report) -> None:
+    """ :param report: a CleaningDayReport of the batch cleaning job """
+    message = f"Cleaned day : {report.symbol} -- {report.date.get_str_format_2()} -- {report.raw_row_count} raw ticks \
+               -- {report.morning_row_count} morning ticks -- {report.afternoon_row_count} afternoon ticks \
+               -- load {report.load_seconds:.3f}s -- cleaning {report.cleaning_seconds:.3f}s -- insert {report.insert_seconds:.3f}s"
+    LOGGER.info(message)
+
+def log_batch_cleaning(symbol : str, num_cleaned : int, num_skipped : int, workers : int, elapsed_seconds : float) -> None:
+    message = f"Finished batch cleaning : {symbol} -- {num_cleaned} days cleaned -- {num_skipped} days already in the manifest \
+               -- {workers} workers -- {elapsed_seconds:.3f}s"
+    LOGGER.info(message)
+
+def log_diagnostics_report(report) -> None:
+    """ :param report: a DiagnosticsReport of data_diagnostics.diagnose """
+    message = f"Diagnosed tick data : {report.symbol} -- {report.date.get_str_format_2()} -- {report.intra_day_period.value} -- {report.row_count} ticks \
+               -- {sum(report.zero_price_counts.values())} zero prices -- {sum(report.missing_value_counts.values())} missing values \
+               -- {report.duplicated_timestamp_count} duplicated time stamps -- {report.book_order_violation_count} book order violations"
+    LOGGER.info(message)
+
+def log_quality_dashboard(num_files : int, num_diagnosed : int, workers : int, elapsed_seconds : float) -> None:
+    message = f"Finished data quality dashboard : {num_files} tick files -- {num_diagnosed} diagnosed -- {num_files - num_diagnosed} unchanged since the last run \
+               -- {workers} workers -- {elapsed_seconds:.3f}s"
+    LOGGER.info(message)
+
+def log_clean_tick_chunk(tick_chunk : data.TickChunk):
+    message = f"{tick_chunk.tick_wrapper} -- Cleaned chunk {tick_chunk.chunk_index} -- rows {tick_chunk.start_row} to {tick_chunk.start_row + len(tick_chunk)}"
+    LOGGER.info(message)
+
 # ------ bar data logging -----
 def log_interpolate_zeros_bar(bar_wrapper : data.BarDataFrame):
     message = f"{bar_wrapper} -- Interpolate zeros  -- "
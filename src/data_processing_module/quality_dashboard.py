@@ -0,0 +1,218 @@
+import datetime
+import functools
+import html
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, fields
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+import src.data_base_module.data_blocks as data
+import src.data_base_module.data_catalog as dat_catalog
+import src.data_processing_module.data_cleaning as data_cleaner
+import src.data_processing_module.data_diagnostics as data_diagnostics
+import src.data_processing_module.data_processing_logger as dp_logger
+
+
+# ------ data quality dashboard ------
+""" Diagnoses every raw and clean tick file in the data base and summarises the results in one table
+-> the tick files are found by scanning the data base folders, files that are not in the catalog are included
+-> every file is diagnosed by data_diagnostics.diagnose, the outliers are counted by the rolling median / MAD filter of data_cleaning
+   so that no per symbol thresholds are needed, files are distributed across a process pool
+-> one row per file, written to a parquet file and to a static html page with a per symbol summary on top
+-> the rows are cached in a json file keyed by file path and checksum, a rerun only diagnoses the files that were added or changed
+NOTE : the cache also records the outlier settings, a cache written with other settings is discarded """
+@dataclass(frozen=True)
+class StoredTickFile:
+    tick_kind : str
+    tick_info : data.TickInfo
+    file_path : str
+
+
+@dataclass
+class FileQualitySummary:
+    symbol : str
+    date : str
+    intra_day_period : str
+    tick_kind : str
+    file_path : str
+    checksum : str
+    row_count : int
+    missing_value_count : int
+    zero_price_count : int
+    zero_quantity_count : int
+    duplicated_timestamp_count : int
+    ask_not_ascending_count : int
+    bid_not_descending_count : int
+    book_order_violation_count : int
+    price_quantity_mismatch_count : int
+    trade_price_quantity_mismatch_count : int
+    price_outlier_count : int
+    trade_price_outlier_count : int
+    diagnose_seconds : float
+
+
+DASHBOARD_ISSUE_COLUMNS : List[str] = ["missing_value_count", "zero_price_count", "zero_quantity_count", "duplicated_timestamp_count",
+                                       "book_order_violation_count", "price_quantity_mismatch_count", "trade_price_quantity_mismatch_count",
+                                       "price_outlier_count", "trade_price_outlier_count"]
+
+
+def find_stored_tick_files(data_base, symbols : Optional[List[str]] = None) -> List[StoredTickFile]:
+    """
+    :param data_base: a DataBase
+    :param symbols: the symbols to include, None includes every symbol
+    :return: raw tick files then clean tick files, each in path order
+    """
+    stored_files = []
+    for file_path in data_base.storage_backend.find_stored_paths(data_base.tick_data_folder_path):
+        tick_info = data_base.parse_raw_tick_file_path(file_path)
+        if tick_info is not None and (symbols is None or tick_info.symbol in symbols):
+            stored_files.append(StoredTickFile(tick_kind = dat_catalog.RAW_TICK, tick_info = tick_info, file_path = file_path))
+    for file_path in data_base.storage_backend.find_stored_paths(data_base.tick_clean_data_folder):
+        tick_info = data_base.parse_clean_tick_file_path(file_path)
+        if tick_info is not None and (symbols is None or tick_info.symbol in symbols):
+            stored_files.append(StoredTickFile(tick_kind = dat_catalog.CLEAN_TICK, tick_info = tick_info, file_path = file_path))
+    return stored_files
+
+
+def count_rolling_price_outliers(tick_wrapper : data.TickDataFrame, window : int, num_mads : float) -> Dict[str, int]:
+    """ :return: number of rolling median / MAD outliers in the bid ask prices and in the non zero trade prices """
+    tick_df = tick_wrapper.get_tick_data()
+    price_values = np.stack([tick_df[col.value].to_numpy(dtype = np.float64) for col in data_cleaner.BID_ASK_PRICE_COLUMNS])
+    last_prices = tick_df[data.TickDataColumns.LAST_PRICE.value].to_numpy(dtype = np.float64)
+    trade_prices = last_prices[last_prices > 0][np.newaxis, :]
+    min_relative_scale = data_cleaner.RollingMedianOutlierStep.min_relative_scale
+    return {"price_outlier_count" : int(np.count_nonzero(data_cleaner.find_rolling_median_outliers(price_values, window, num_mads, min_relative_scale))),
+            "trade_price_outlier_count" : int(np.count_nonzero(data_cleaner.find_rolling_median_outliers(trade_prices, window, num_mads, min_relative_scale)))}
+
+
+def diagnose_stored_file(data_base, stored_file : StoredTickFile, checksum : str, outlier_window : int = 101,
+                         outlier_num_mads : float = 5.0) -> FileQualitySummary:
+    start_time = time.perf_counter()
+    tick_info = stored_file.tick_info
+    if stored_file.tick_kind == dat_catalog.RAW_TICK:
+        tick_wrapper = data_base.get_raw_tick_data(tick_info.symbol, tick_info.date)
+    else:
+        tick_wrapper = data_base.get_clean_tick_data(symbol = tick_info.symbol, date = tick_info.date, intra_day_period = tick_info.intra_day_period)
+    report = data_diagnostics.diagnose(tick_wrapper)
+    outlier_counts = count_rolling_price_outliers(tick_wrapper, outlier_window, outlier_num_mads)
+    return FileQualitySummary(symbol = tick_info.symbol, date = tick_info.date.get_str(), intra_day_period = tick_info.intra_day_period.value,
+                              tick_kind = stored_file.tick_kind, file_path = stored_file.file_path, checksum = checksum, row_count = report.row_count,
+                              missing_value_count = sum(report.missing_value_counts.values()),
+                              zero_price_count = sum(report.zero_price_counts.values()),
+                              zero_quantity_count = sum(report.zero_quantity_counts.values()),
+                              duplicated_timestamp_count = report.duplicated_timestamp_count,
+                              ask_not_ascending_count = report.ask_not_ascending_count, bid_not_descending_count = report.bid_not_descending_count,
+                              book_order_violation_count = report.book_order_violation_count,
+                              price_quantity_mismatch_count = sum(report.price_quantity_mismatch_counts.values()),
+                              trade_price_quantity_mismatch_count = report.trade_price_quantity_mismatch_count,
+                              price_outlier_count = outlier_counts["price_outlier_count"],
+                              trade_price_outlier_count = outlier_counts["trade_price_outlier_count"],
+                              diagnose_seconds = time.perf_counter() - start_time)
+
+
+class DashboardCache:
+    """ json file of the file summaries of previous runs, keyed by file path """
+    def __init__(self, cache_file_path : str, outlier_window : int, outlier_num_mads : float):
+        self.cache_file_path : str = cache_file_path
+        self.settings : Dict = {"outlier_window" : outlier_window, "outlier_num_mads" : outlier_num_mads}
+        self.summaries : Dict[str, FileQualitySummary] = {}
+        if os.path.exists(cache_file_path):
+            with open(cache_file_path, "r") as cache_file:
+                cache_dict = json.load(cache_file)
+            if cache_dict["settings"] == self.settings:
+                self.summaries = {file_path : FileQualitySummary(**summary_dict) for file_path, summary_dict in cache_dict["files"].items()}
+
+    def get(self, file_path : str, checksum : str) -> Optional[FileQualitySummary]:
+        """ :return: the cached summary, None if the file is not cached or was changed since """
+        summary = self.summaries.get(file_path)
+        return summary if summary is not None and summary.checksum == checksum else None
+
+    def save(self, summaries : List[FileQualitySummary]) -> None:
+        """ keeps only the given summaries, files that are no longer stored are dropped, the file is replaced atomically """
+        self.summaries = {summary.file_path : summary for summary in summaries}
+        cache_dict = {"settings" : self.settings, "files" : {file_path : asdict(summary) for file_path, summary in sorted(self.summaries.items())}}
+        temp_file_path = self.cache_file_path + ".tmp"
+        with open(temp_file_path, "w") as cache_file:
+            json.dump(cache_dict, cache_file, indent = 1)
+        os.replace(temp_file_path, self.cache_file_path)
+
+
+def make_quality_table(summaries : List[FileQualitySummary]) -> pd.DataFrame:
+    """ :return: one row per file ordered by symbol, tick kind, date and intra day period """
+    quality_df = pd.DataFrame([asdict(summary) for summary in summaries], columns = [field.name for field in fields(FileQualitySummary)])
+    # ------ the dtypes are set for the empty table too ------
+    quality_df = quality_df.astype({field.name : field.type for field in fields(FileQualitySummary)})
+    return quality_df.sort_values(["symbol", "tick_kind", "date", "intra_day_period"], ignore_index = True)
+
+
+def make_symbol_summary_table(quality_df : pd.DataFrame) -> pd.DataFrame:
+    """ :return: per (symbol, tick kind) number of files and days, total ticks and total of every issue count """
+    grouped = quality_df.groupby(["symbol", "tick_kind"])
+    summary_df = grouped[["row_count"] + DASHBOARD_ISSUE_COLUMNS].sum()
+    summary_df.insert(0, "num_days", grouped["date"].nunique())
+    summary_df.insert(0, "num_files", grouped.size())
+    return summary_df.reset_index()
+
+
+def write_dashboard_html(quality_df : pd.DataFrame, html_file_path : str) -> None:
+    """ static html page : the per symbol summary, then the files with at least one issue, then every file """
+    has_issue_bool_arr = (quality_df[DASHBOARD_ISSUE_COLUMNS] > 0).any(axis = 1)
+    generated_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    sections = [("Summary per symbol", make_symbol_summary_table(quality_df)),
+                (f"Files with issues ({int(has_issue_bool_arr.sum())} of {len(quality_df)})", quality_df[has_issue_bool_arr]),
+                ("All files", quality_df)]
+    page = ["<!DOCTYPE html>", "<html>", "<head>", "<meta charset=\"utf-8\">", "<title>Tick data quality</title>",
+            "<style>body { font-family : sans-serif; } table { border-collapse : collapse; font-size : 12px; }"
+            " th, td { border : 1px solid #ccc; padding : 2px 6px; text-align : right; } th { background : #eee; }</style>",
+            "</head>", "<body>", "<h1>Tick data quality</h1>", f"<p>Generated {html.escape(generated_str)}</p>"]
+    for title, section_df in sections:
+        page.append(f"<h2>{html.escape(title)}</h2>")
+        page.append(section_df.to_html(index = False, float_format = lambda value : f"{value:.3f}"))
+    page.extend(["</body>", "</html>"])
+    with open(html_file_path, "w") as html_file:
+        html_file.write("\n".join(page))
+
+
+def run_quality_dashboard(data_base, output_folder_path : str, symbols : Optional[List[str]] = None, workers : int = 1,
+                          outlier_window : int = 101, outlier_num_mads : float = 5.0) -> pd.DataFrame:
+    """
+    Diagnoses every tick file in the data base and writes quality.parquet, quality.html and the cache quality_cache.json
+    :param data_base: a DataBase
+    :param output_folder_path: folder of the output files, created if it does not exist
+    :param symbols: the symbols to include, None includes every symbol in the data base
+    :param workers: number of processes, 1 diagnoses serially in the calling process
+    :param outlier_window, outlier_num_mads: see data_cleaning.RollingMedianOutlierStep
+    :return: the quality table, one row per file
+    NOTE : every file is read once to compute its checksum, only the files that are not in the cache are diagnosed
+    """
+    os.makedirs(output_folder_path, exist_ok = True)
+    cache = DashboardCache(os.path.join(output_folder_path, "quality_cache.json"), outlier_window, outlier_num_mads)
+    start_time = time.perf_counter()
+    stored_files = find_stored_tick_files(data_base, symbols = symbols)
+    file_paths = [stored_file.file_path for stored_file in stored_files]
+    diagnose_func = functools.partial(diagnose_stored_file, data_base, outlier_window = outlier_window, outlier_num_mads = outlier_num_mads)
+    if workers <= 1 or len(stored_files) <= 1:
+        checksums = [dat_catalog.compute_checksum(file_path) for file_path in file_paths]
+        summaries = [cache.get(file_path, checksum) for file_path, checksum in zip(file_paths, checksums)]
+        pending_indices = [index for index, summary in enumerate(summaries) if summary is None]
+        pending_summaries = [diagnose_func(stored_files[index], checksums[index]) for index in pending_indices]
+    else:
+        # ------ the checksums are computed in the pool too, reading every file is the cost of a rerun ------
+        with ProcessPoolExecutor(max_workers = min(workers, len(stored_files))) as executor:
+            checksums = list(executor.map(dat_catalog.compute_checksum, file_paths))
+            summaries = [cache.get(file_path, checksum) for file_path, checksum in zip(file_paths, checksums)]
+            pending_indices = [index for index, summary in enumerate(summaries) if summary is None]
+            pending_summaries = list(executor.map(diagnose_func, [stored_files[index] for index in pending_indices],
+                                                  [checksums[index] for index in pending_indices]))
+    for index, summary in zip(pending_indices, pending_summaries):
+        summaries[index] = summary
+    cache.save(summaries)
+    quality_df = make_quality_table(summaries)
+    quality_df.to_parquet(os.path.join(output_folder_path, "quality.parquet"), engine = "pyarrow", index = False)
+    write_dashboard_html(quality_df, os.path.join(output_folder_path, "quality.html"))
+    dp_logger.log_quality_dashboard(num_files = len(stored_files), num_diagnosed = len(pending_indices), workers = workers,
+                                    elapsed_seconds = time.perf_counter() - start_time)
+    return quality_df
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
-import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 import src.data_base_module.data_blocks as data
 import src.data_processing_module.data_processing_logger as dp_logger
 
@@ -13,55 +14,297 @@ def get_nano_time_to_date_time_func(timezone_shift_hour: int) -> callable:
     return nano_time_to_date_time
 
 
+NANOSECONDS_PER_DAY : int = 24 * 3600 * 10 ** 9
+
+
+# ------ bar segment kernels ------
+""" The threshold samplers (volume, dollar) work on the trade ticks as arrays instead of iterating over rows
+-> the cumulative traded amount is computed once, bar boundaries are found with searchsorted
+-> a tick whose amount crosses a bar boundary belongs to both bars, each bar is a segment [bar start, bar end] of the trade ticks
+-> segments are laid out one after the other as pieces (tick index, bar index) so that numpy reduceat can aggregate every bar in one call """
+def find_trade_ticks(tick_df : pd.DataFrame) -> (np.ndarray, np.ndarray, np.ndarray):
+    """ :return: time stamps, prices and quantities (float64) of the ticks with a trade price above 0 """
+    has_trade_bool_arr = tick_df[data.TickDataColumns.LAST_PRICE.value].to_numpy() > 0
+    timestamps = tick_df[data.TickDataColumns.TIMESTAMP_NANO.value].to_numpy()[has_trade_bool_arr]
+    prices = tick_df[data.TickDataColumns.LAST_PRICE.value].to_numpy()[has_trade_bool_arr].astype(np.float64)
+    quantities = tick_df[data.TickDataColumns.LAST_QUANTITY.value].to_numpy()[has_trade_bool_arr].astype(np.float64)
+    return timestamps, prices, quantities
+
+
+def find_threshold_segments(cum_amounts : np.ndarray, sampling_level : float) -> (np.ndarray, np.ndarray):
+    """
+    Finds the ticks that start and end each bar of a fixed amount
+    :param cum_amounts: cumulative traded amount after each tick
+    :param sampling_level: the amount traded in each bar
+    :return: bar starts, bar ends (inclusive tick indices)
+    -> a bar ends at the first tick that brings the cumulative amount to the bar boundary
+    -> the next bar starts at the same tick if the tick crosses the boundary, at the next tick if it lands exactly on it
+    NOTE : a bar is only formed once a tick after its end tick has arrived, the bars completed by the very last tick are dropped
+    """
+    if len(cum_amounts) == 0:
+        return np.empty(0, dtype = np.int64), np.empty(0, dtype = np.int64)
+    bar_boundaries = sampling_level * np.arange(1, int(cum_amounts[-1] // sampling_level) + 1, dtype = np.float64)
+    bar_ends = np.searchsorted(cum_amounts, bar_boundaries, side = "left")
+    num_bars = int(np.count_nonzero(bar_ends < len(cum_amounts) - 1))
+    bar_ends = bar_ends[:num_bars]
+    bar_starts = np.zeros(num_bars, dtype = np.int64)
+    if num_bars > 1:
+        bar_starts[1:] = bar_ends[:-1] + (cum_amounts[bar_ends[:-1]] <= bar_boundaries[:num_bars - 1])
+    return bar_starts, bar_ends
+
+
+def expand_segments(bar_starts : np.ndarray, bar_ends : np.ndarray) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    Lays out the (possibly overlapping) segments [bar start, bar end] one after the other
+    :return: tick index of every piece, bar index of every piece, offset of the first piece of every bar
+    """
+    segment_lengths = bar_ends - bar_starts + 1
+    segment_offsets = np.zeros(len(segment_lengths), dtype = np.int64)
+    np.cumsum(segment_lengths[:-1], out = segment_offsets[1:])
+    piece_bar_indices = np.repeat(np.arange(len(segment_lengths)), segment_lengths)
+    piece_tick_indices = np.arange(segment_lengths.sum()) - np.repeat(segment_offsets - bar_starts, segment_lengths)
+    return piece_tick_indices, piece_bar_indices, segment_offsets
+
+
+def aggregate_segment_prices(prices : np.ndarray, piece_tick_indices : np.ndarray, segment_offsets : np.ndarray) -> (np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+    """ :return: open, close, high and low price of every segment """
+    if len(segment_offsets) == 0:
+        return tuple(np.empty(0, dtype = np.float64) for _ in range(4))
+    piece_prices = prices[piece_tick_indices]
+    segment_last_pieces = np.append(segment_offsets[1:], len(piece_prices)) - 1
+    return (piece_prices[segment_offsets], piece_prices[segment_last_pieces],
+            np.maximum.reduceat(piece_prices, segment_offsets), np.minimum.reduceat(piece_prices, segment_offsets))
+
+
+def sequential_segment_sums(values : np.ndarray, segment_offsets : np.ndarray, segment_lengths : np.ndarray) -> np.ndarray:
+    """
+    Sums each segment values[offset : offset + length] from left to right, the same order as the python sum function
+    NOTE : reduceat may sum long segments in a different order, which changes the rounding of non integer values
+    NOTE : loops over the positions within a segment, the number of iterations is the length of the longest segment
+    """
+    segment_sums = np.zeros(len(segment_offsets), dtype = np.float64)
+    if len(segment_offsets) == 0:
+        return segment_sums
+    # ------ longest segments first so that the segments still being summed are always a prefix ------
+    order = np.argsort(-segment_lengths, kind = "stable")
+    sorted_offsets, sorted_lengths = segment_offsets[order], segment_lengths[order]
+    sorted_sums = np.zeros(len(order), dtype = np.float64)
+    for position in range(int(sorted_lengths[0]) if len(sorted_lengths) > 0 else 0):
+        num_active = int(np.count_nonzero(sorted_lengths > position))
+        sorted_sums[:num_active] += values[sorted_offsets[:num_active] + position]
+    segment_sums[order] = sorted_sums
+    return segment_sums
+
+
+# ------ tick block kernels ------
+""" The block samplers (time, tick) cut all ticks (with or without trades) into contiguous blocks,
+the per tick arrays are prepared once in a TickArrays object and reduced per block with reduceat """
+@dataclass
+class TickArrays:
+    timestamps : np.ndarray
+    prices : np.ndarray
+    quantities : np.ndarray
+    vol_price_products : np.ndarray
+    # ------ trade prices with -inf / inf on ticks without trades, so that they never win the high / low reductions ------
+    high_candidates : np.ndarray
+    low_candidates : np.ndarray
+    trade_positions : np.ndarray
+
+    def __len__(self):
+        return len(self.timestamps)
+
+
+def make_tick_arrays(timestamps : np.ndarray, prices : np.ndarray, quantities : np.ndarray) -> TickArrays:
+    """ :param prices, quantities: trade prices and quantities of all ticks, a price of 0 marks a tick without trade """
+    prices, quantities = prices.astype(np.float64), quantities.astype(np.float64)
+    has_trade_bool_arr = prices > 0
+    return TickArrays(timestamps = timestamps, prices = prices, quantities = quantities, vol_price_products = prices * quantities,
+                      high_candidates = np.where(has_trade_bool_arr, prices, -np.inf), low_candidates = np.where(has_trade_bool_arr, prices, np.inf),
+                      trade_positions = np.flatnonzero(has_trade_bool_arr))
+
+
+def get_trade_columns(tick_df : pd.DataFrame) -> (np.ndarray, np.ndarray, np.ndarray):
+    """ :return: time stamps, trade prices and trade quantities of all ticks """
+    return (tick_df[data.TickDataColumns.TIMESTAMP_NANO.value].to_numpy(), tick_df[data.TickDataColumns.LAST_PRICE.value].to_numpy(),
+            tick_df[data.TickDataColumns.LAST_QUANTITY.value].to_numpy())
+
+
+def get_tick_arrays(tick_df : pd.DataFrame) -> TickArrays:
+    return make_tick_arrays(*get_trade_columns(tick_df))
+
+
+def aggregate_tick_blocks(tick_arrays : TickArrays, block_starts : np.ndarray, block_ends : np.ndarray) -> pd.DataFrame:
+    """
+    Forms one bar per block of contiguous ticks [block start, block end) in a single pass of reduceat calls
+    :param block_starts: the blocks must follow each other and cover all ticks, i.e. block_ends[i] == block_starts[i + 1], blocks may be empty
+    :return: bar data frame, open, close, high and low are taken over the ticks with a price above 0 (ticks with trades),
+    volume is the sum of quantities, VWAP = sum(price * quantity) / volume, the time stamp is the time stamp of the first tick
+    NOTE : blocks without trades have all their values set to 0, empty blocks also have a time stamp of 0
+    """
+    num_blocks = len(block_starts)
+    open_prices, close_prices, high_prices, low_prices, volumes, vol_price_products = (np.zeros(num_blocks) for _ in range(6))
+    block_timestamps = np.zeros(num_blocks, dtype = np.int64)
+    # ------ reduceat returns a single element for empty blocks, only the non empty blocks are reduced ------
+    non_empty_blocks = np.flatnonzero(block_ends > block_starts)
+    if len(non_empty_blocks) > 0:
+        offsets = block_starts[non_empty_blocks]
+        high_prices[non_empty_blocks] = np.maximum.reduceat(tick_arrays.high_candidates, offsets)
+        low_prices[non_empty_blocks] = np.minimum.reduceat(tick_arrays.low_candidates, offsets)
+        volumes[non_empty_blocks] = np.add.reduceat(tick_arrays.quantities, offsets)
+        vol_price_products[non_empty_blocks] = np.add.reduceat(tick_arrays.vol_price_products, offsets)
+        block_timestamps[non_empty_blocks] = tick_arrays.timestamps[offsets]
+        # ------ the first and last trade of each block are found by searching the positions of the trades ------
+        trade_positions = tick_arrays.trade_positions
+        first_trades = np.searchsorted(trade_positions, block_starts, side = "left")
+        last_trades = np.searchsorted(trade_positions, block_ends, side = "left") - 1
+        has_trades = first_trades <= last_trades
+        open_prices[has_trades] = tick_arrays.prices[trade_positions[first_trades[has_trades]]]
+        close_prices[has_trades] = tick_arrays.prices[trade_positions[last_trades[has_trades]]]
+    high_prices[np.isinf(high_prices)] = 0
+    low_prices[np.isinf(low_prices)] = 0
+    vwaps = np.divide(vol_price_products, volumes, out = np.zeros(num_blocks), where = volumes != 0)
+    return pd.DataFrame({
+        data.BarDataColumns.OPEN.value: open_prices,
+        data.BarDataColumns.CLOSE.value: close_prices,
+        data.BarDataColumns.HIGH.value: high_prices,
+        data.BarDataColumns.LOW.value: low_prices,
+        data.BarDataColumns.VOLUME.value: volumes,
+        data.BarDataColumns.VWAP.value: vwaps,
+        data.BarDataColumns.TIMESTAMP.value: block_timestamps
+    })
+
+
+# ------ bars of a single sampling level ------
+""" Every sampler is split into a shared pass over the ticks (column reads, trade ticks, cumulative amounts)
+and a per level function below, the multi level samplers run the shared pass once for all levels """
+def make_time_bar_df(tick_arrays : TickArrays, sampling_seconds : int) -> pd.DataFrame:
+    """ bins the integer nano second time stamps into bars of sampling_seconds aligned to midnight of the first tick """
+    timestamps = tick_arrays.timestamps.astype(np.int64)
+    if len(timestamps) > 0:
+        origin = int(timestamps.min()) // NANOSECONDS_PER_DAY * NANOSECONDS_PER_DAY
+        bin_indices = (timestamps - origin) // (sampling_seconds * 10 ** 9)
+        # ------ out of order ticks are moved into their bins, the order within a bin is kept ------
+        if np.any(bin_indices[1:] < bin_indices[:-1]):
+            order = np.argsort(bin_indices, kind = "stable")
+            tick_arrays = make_tick_arrays(tick_arrays.timestamps[order], tick_arrays.prices[order], tick_arrays.quantities[order])
+            bin_indices = bin_indices[order]
+        # ------ one block per bin from the first to the last bin, bins without ticks are empty blocks ------
+        block_starts = np.searchsorted(bin_indices, np.arange(bin_indices[0], bin_indices[-1] + 1), side = "left")
+    else:
+        block_starts = np.empty(0, dtype = np.int64)
+    block_ends = np.append(block_starts[1:], len(tick_arrays)) if len(block_starts) > 0 else block_starts
+    return aggregate_tick_blocks(tick_arrays, block_starts, block_ends)
+
+
+def make_tick_bar_df(tick_arrays : TickArrays, sampling_ticks : int) -> pd.DataFrame:
+    """ blocks of sampling_ticks ticks, the last block holds the left over ticks """
+    block_starts = np.arange(0, len(tick_arrays), sampling_ticks)
+    block_ends = np.append(block_starts[1:], len(tick_arrays))
+    return aggregate_tick_blocks(tick_arrays, block_starts, block_ends)
+
+
+def make_volume_bar_df(timestamps : np.ndarray, prices : np.ndarray, quantities : np.ndarray, cum_volumes : np.ndarray, sampling_volume : int) -> pd.DataFrame:
+    """ :param timestamps, prices, quantities: the trade ticks from find_trade_ticks, cum_volumes = np.cumsum(quantities) """
+    bar_starts, bar_ends = find_threshold_segments(cum_volumes, sampling_volume)
+    piece_tick_indices, piece_bar_indices, segment_offsets = expand_segments(bar_starts, bar_ends)
+    # ------ the volume of a piece is the overlap of the tick volume with the bar volume --------
+    lower_bounds = piece_bar_indices * float(sampling_volume)
+    piece_volumes = np.minimum(cum_volumes[piece_tick_indices], lower_bounds + sampling_volume) - \
+                    np.maximum(cum_volumes[piece_tick_indices] - quantities[piece_tick_indices], lower_bounds)
+    open_prices, close_prices, high_prices, low_prices = aggregate_segment_prices(prices, piece_tick_indices, segment_offsets)
+    vwaps = np.add.reduceat(piece_volumes * prices[piece_tick_indices], segment_offsets) / sampling_volume if len(segment_offsets) > 0 else np.empty(0)
+    return pd.DataFrame({
+        data.BarDataColumns.OPEN.value: open_prices,
+        data.BarDataColumns.CLOSE.value: close_prices,
+        data.BarDataColumns.HIGH.value: high_prices,
+        data.BarDataColumns.LOW.value: low_prices,
+        data.BarDataColumns.VWAP.value: vwaps,
+        data.BarDataColumns.TIMESTAMP.value: timestamps[bar_starts],
+        data.BarDataColumns.VOLUME.value : np.full(len(bar_starts), sampling_volume)
+    })
+
+
+def make_dollar_bar_df(timestamps : np.ndarray, prices : np.ndarray, quantities : np.ndarray, cum_dollars : np.ndarray, sampling_dollar : int,
+                       carry_residue_volume : Optional[float] = None) -> (pd.DataFrame, Optional[float]):
+    """
+    :param timestamps, prices, quantities: the trade ticks from find_trade_ticks, cum_dollars = np.cumsum(prices * quantities)
+    :param carry_residue_volume: the volume left on the first tick by the bar before it (streaming),
+    None if the first tick starts a new bar
+    :return: bar data frame, the volume left on the last tick of the last bar
+    """
+    bar_starts, bar_ends = find_threshold_segments(cum_dollars, sampling_dollar)
+    num_bars = len(bar_starts)
+    piece_tick_indices, piece_bar_indices, segment_offsets = expand_segments(bar_starts, bar_ends)
+    open_prices, close_prices, high_prices, low_prices = aggregate_segment_prices(prices, piece_tick_indices, segment_offsets)
+    # ------ bars that start with the residue of the tick that closed the previous bar ------
+    is_carry_bar = np.zeros(num_bars, dtype = bool)
+    is_carry_bar[1:] = bar_starts[1:] == bar_ends[:-1]
+    # ------ bars after the first one filled by the same tick, they are formed together with the first one ------
+    is_chain_bar = is_carry_bar & (bar_starts == bar_ends)
+    is_carry_bar[:1] = carry_residue_volume is not None
+    group_first_bars = np.flatnonzero(~is_chain_bar)
+    group_indices = np.cumsum(~is_chain_bar) - 1
+    # ------ the dollar amount filled by the last tick of each bar, in shares ------
+    cum_dollars_before = np.concatenate([[0.0], cum_dollars[:-1]])
+    prev_dollar_counters = np.maximum(cum_dollars_before[bar_ends] - np.arange(num_bars) * float(sampling_dollar), 0)
+    last_tick_volumes = (sampling_dollar - prev_dollar_counters) / close_prices
+    # ------ the volume left on the last tick after each bar, chained through the bars filled by the same tick ------
+    residue_volumes = quantities[bar_ends] - last_tick_volumes
+    chain_depths = np.arange(num_bars) - group_first_bars[group_indices] if num_bars > 0 else np.empty(0, dtype = np.int64)
+    for chain_depth in range(1, int(chain_depths.max()) + 1 if num_bars > 0 else 1):
+        chain_bars = np.flatnonzero(chain_depths == chain_depth)
+        residue_volumes[chain_bars] = residue_volumes[chain_bars - 1] - last_tick_volumes[chain_bars]
+    # ------ volume of all ticks in the bar except the last, a carry bar starts with the residue of the previous bar ------
+    piece_volumes = quantities[piece_tick_indices]
+    carry_bars = np.flatnonzero(is_carry_bar & ~is_chain_bar)
+    prev_residue_volumes = np.concatenate([[carry_residue_volume if carry_residue_volume is not None else 0.0], residue_volumes[:-1]])
+    piece_volumes[segment_offsets[carry_bars]] = prev_residue_volumes[carry_bars]
+    prev_tick_volumes = sequential_segment_sums(piece_volumes, segment_offsets, bar_ends - bar_starts)
+    prev_tick_volumes[is_chain_bar] = 0
+    volume_traded_series = last_tick_volumes + prev_tick_volumes
+    # ------ bars formed together share the time stamp of the first tick after the previous group of bars ------
+    group_first_ticks = np.zeros(len(group_first_bars), dtype = np.int64)
+    group_first_ticks[:1] = int(carry_residue_volume is not None)
+    group_first_ticks[1:] = bar_ends[group_first_bars[:-1]] + 1
+    timestamp_series = timestamps[group_first_ticks][group_indices] if num_bars > 0 else timestamps[:0]
+    bar_df = pd.DataFrame({
+        data.BarDataColumns.OPEN.value: open_prices,
+        data.BarDataColumns.CLOSE.value: close_prices,
+        data.BarDataColumns.HIGH.value: high_prices,
+        data.BarDataColumns.LOW.value: low_prices,
+        data.BarDataColumns.VOLUME.value: volume_traded_series,
+        data.BarDataColumns.TIMESTAMP.value: timestamp_series,
+        data.BarDataColumns.VWAP.value : sampling_dollar / volume_traded_series
+    })
+    return bar_df, residue_volumes[-1] if num_bars > 0 else carry_residue_volume
+
+
+def make_bar_wrapper(tick_info : data.TickInfo, bar_df : pd.DataFrame, sampling_type : data.Sampling, sampling_level : int) -> data.BarDataFrame:
+    bar_info = data.BarInfo(symbol = tick_info.symbol, date = tick_info.date, intra_day_period = tick_info.intra_day_period,
+                            sampling_level = sampling_level, sampling_type = sampling_type)
+    return data.BarDataFrame(bar_data = bar_df, bar_info = bar_info)
+
+
+# ------ single level samplers ------
 def time_sampling(tick_wrapper: data.TickDataFrame, sampling_seconds: int = 60) -> data.BarDataFrame:
     """
-    Makes use of the resampling function of pandas data frames to resample tick data into data frames
+    Bins the integer nano second time stamps into bars of sampling_seconds, the bins are aligned to midnight of the first tick
+    (the same bins as pandas resampling with its default origin), every bar is aggregated by aggregate_tick_blocks
     Only samples ticks with trades occuring.
     :param tick_df: data frame containing tick data
     :param sampling_seconds : the number of seconds in each time bar
     :return pd.DataFrame
     NOTE : time sampling can cause missing bars, these bars will have all their values set to 0.
+    NOTE : the input tick data frame is not modified
     """
-    # ------ get underlying reference from the tick data frame wrapper ------
-    tick_df: pd.DataFrame = tick_wrapper.tick_data
+    # ------ only the trade columns are needed, lazy tick data frames do not read the depth columns ------
+    tick_df: pd.DataFrame = tick_wrapper.get_columns(data.TRADE_TICK_COLUMNS)
     # ------ log start of sampling process -------
     dp_logger.log_time_sampling_start(tick_info = tick_wrapper.tick_info,sampling_seconds=sampling_seconds)
-    # ------ set the index to be date time --------
-    tick_df.index = tick_df[data.TickDataColumns.TIMESTAMP_NANO.value].apply(lambda ts: pd.Timestamp(ts))
-    # ------ extract the relevant tick information ---------
-    rule = str(sampling_seconds) + "S"
-    price_col = tick_df[data.TickDataColumns.LAST_PRICE.value]
-    qty_col = tick_df[data.TickDataColumns.LAST_QUANTITY.value]
-    price_col = price_col[price_col > 0]
-    qty_col = qty_col[qty_col > 0]
-    timestamps = tick_df[data.TickDataColumns.TIMESTAMP_NANO.value]
-    # ----- use pandas resampling functions ----------
-    open_price_series = price_col.resample(rule).first()
-    close_price_series = price_col.resample(rule).last()
-    high_price_series = price_col.resample(rule).max()
-    low_price_series = price_col.resample(rule).min()
-    volume_traded_series = qty_col.resample(rule).sum()
-    timestamps_series = timestamps.resample(rule).first()
-    vol_price_product = (price_col * qty_col).resample(rule).sum()
-    volume_weighted_average_price_series = vol_price_product.div(volume_traded_series)
-    # ----- organize the newly created columns --------
-    new_df = pd.DataFrame({
-        data.BarDataColumns.OPEN.value: open_price_series,
-        data.BarDataColumns.CLOSE.value: close_price_series,
-        data.BarDataColumns.HIGH.value: high_price_series,
-        data.BarDataColumns.LOW.value: low_price_series,
-        data.BarDataColumns.VOLUME.value: volume_traded_series,
-        data.BarDataColumns.VWAP.value: volume_weighted_average_price_series,
-        data.BarDataColumns.TIMESTAMP.value: timestamps_series
-    })
-    new_df.fillna(0, inplace=True)
-    # ----- reset the index of the input tick_df to range indexing ------
-    tick_df.index = pd.RangeIndex(len(tick_df))
+    new_df = make_time_bar_df(get_tick_arrays(tick_df), sampling_seconds)
     # ----- log end of sampling ------
     dp_logger.log_time_sampling_end(tick_info = tick_wrapper.tick_info, sampling_seconds=sampling_seconds)
-    bar_info = data.BarInfo(symbol = tick_wrapper.tick_info.symbol, date = tick_wrapper.tick_info.date, intra_day_period = tick_wrapper.tick_info.intra_day_period
-                            , sampling_level = sampling_seconds, sampling_type = data.Sampling.TIME)
-    return data.BarDataFrame(bar_data = new_df, bar_info = bar_info)
+    return make_bar_wrapper(tick_wrapper.tick_info, new_df, data.Sampling.TIME, sampling_seconds)
 
 
 def volume_sampling(tick_wrapper: data.TickDataFrame, sampling_volume: int = 50) -> data.BarDataFrame:
@@ -71,406 +314,593 @@ def volume_sampling(tick_wrapper: data.TickDataFrame, sampling_volume: int = 50)
     :param tick_df : data frame containing tick data
     :param sampling_volume : the volume traded size of each bar
     NOTE : the last bit of data that does not form a bar is dropped
+    NOTE : a tick that crosses a bar boundary is split, the residual volume is carried into the next bar(s),
+    the bar time stamp is the time stamp of the first tick in the bar, i.e. the splitting tick for bars that start with a residue
+    NOTE : the VWAP sums are exact for float32 prices and integer quantities, so the result does not depend on the summation order
     """
-    # ------ get underlying reference from the tick data frame wrapper ------
-    tick_df : pd.DataFrame = tick_wrapper.tick_data
+    # ------ only the trade columns are needed, lazy tick data frames do not read the depth columns ------
+    tick_df : pd.DataFrame = tick_wrapper.get_columns(data.TRADE_TICK_COLUMNS)
     # ------ log start of sampling process -------
     dp_logger.log_volume_sampling_start(tick_info = tick_wrapper.tick_info, sampling_volume=sampling_volume)
-    # ------ initialize --------
-    df = tick_df[tick_df[data.TickDataColumns.LAST_PRICE.value] > 0]
-    open_price_series = []
-    close_price_series = []
-    high_price_series = []
-    low_price_series = []
-    vwap_series = []
-    timestamp_series = []
-    # ------------ volume sampling  --------------
-    volume_counter = 0
-    curr_time_stamps: [int] = []
-    curr_prices: [float] = []
-    curr_volumes: [float] = []
-    for i, tick_row in df.iterrows():
-        # ------ form bars when there is sufficient volume --------
-        while volume_counter >= sampling_volume:
-            # ------- calculate the bar values OCHL --------
-            first_time_stamp = curr_time_stamps[0]
-            volume_counter = volume_counter - sampling_volume
-            open_price = float(curr_prices[0])
-            close_price = float(curr_prices[-1])
-            high_price = float(max(curr_prices))
-            low_price = float(min(curr_prices))
-            VWAP = sum([vol * price for vol, price in zip(curr_volumes, curr_prices)]) / sampling_volume
-            # ------- store bar values --------
-            open_price_series.append(open_price)
-            close_price_series.append(close_price)
-            high_price_series.append(high_price)
-            low_price_series.append(low_price)
-            vwap_series.append(VWAP)
-            timestamp_series.append(first_time_stamp)
-            # ------- check for residue volume and overflow --------
-            if volume_counter == 0:
-                curr_prices = []
-                curr_volumes = []
-                curr_time_stamps = []
-            else:
-                curr_prices = [close_price, ]
-                curr_volumes = [min(volume_counter, sampling_volume)]
-                curr_time_stamps = curr_time_stamps[-1:]
-        # ------- collect ticks to form a new bar ----------
-        volume_counter = volume_counter + tick_row[data.TickDataColumns.LAST_QUANTITY.value]
-        curr_prices.append(tick_row[data.TickDataColumns.LAST_PRICE.value])
-        curr_time_stamps.append(tick_row[data.TickDataColumns.TIMESTAMP_NANO.value])
-        if volume_counter >= sampling_volume:
-            curr_volumes.append(sampling_volume - volume_counter + tick_row[data.TickDataColumns.LAST_QUANTITY.value])
-        else:
-            curr_volumes.append(tick_row[data.TickDataColumns.LAST_QUANTITY.value])
-    # ------ returns a VolumeBarDataFrame object --------
-    new_bar_df = pd.DataFrame({
-        data.BarDataColumns.OPEN.value: open_price_series,
-        data.BarDataColumns.CLOSE.value: close_price_series,
-        data.BarDataColumns.HIGH.value: high_price_series,
-        data.BarDataColumns.LOW.value: low_price_series,
-        data.BarDataColumns.VWAP.value: vwap_series,
-        data.BarDataColumns.TIMESTAMP.value: timestamp_series,
-        data.BarDataColumns.VOLUME.value : sampling_volume
-    })
-    bar_info = data.BarInfo(symbol = tick_wrapper.tick_info.symbol, sampling_level = sampling_volume, date = tick_wrapper.tick_info.date,
-                            intra_day_period = tick_wrapper.tick_info.intra_day_period, sampling_type = data.Sampling.VOlUME)
-    volume_bar_wrapper =  data.BarDataFrame(bar_data = new_bar_df, bar_info = bar_info)
+    # ------ find the bar segments on the cumulative volume --------
+    timestamps, prices, quantities = find_trade_ticks(tick_df)
+    new_bar_df = make_volume_bar_df(timestamps, prices, quantities, np.cumsum(quantities), sampling_volume)
+    volume_bar_wrapper = make_bar_wrapper(tick_wrapper.tick_info, new_bar_df, data.Sampling.VOLUME, sampling_volume)
     # ----- log end of sampling ------
     dp_logger.log_volume_sampling_end(tick_info = tick_wrapper.tick_info, sampling_volume=sampling_volume)
     return volume_bar_wrapper
 
+
 def tick_sampling(tick_wrapper: data.TickDataFrame, sampling_ticks: int = 20) -> data.BarDataFrame:
-    """ Combines tick data into bunches of bar_size number of ticks, 
+    """ Combines tick data into bunches of bar_size number of ticks,
         only ticks with non zero trade volume is counted
     :param tick_df : data frame containing tick data
     :param sampling_ticks : the number of ticks per bar
     NOTE : left over ticks are combined into the last bar
-    NOTE : the timestamp is the time stamp of the first tick in the bar """
-    # ------ get underlying reference from the tick data frame wrapper ------
-    tick_df = tick_wrapper.tick_data
+    NOTE : the timestamp is the time stamp of the first tick in the bar
+    NOTE : open, close, high and low are taken over the non zero prices, bars without trades have their values set to 0 """
+    # ------ only the trade columns are needed, lazy tick data frames do not read the depth columns ------
+    tick_df = tick_wrapper.get_columns(data.TRADE_TICK_COLUMNS)
     # ------ log start of sampling process -------
     dp_logger.log_tick_sampling_start(tick_info = tick_wrapper.tick_info, sampling_ticks=sampling_ticks)
-    # --------- get relevant columns --------
-    price_col: pd.Series = tick_df[data.TickDataColumns.LAST_PRICE.value]
-    qty_col: pd.Series = tick_df[data.TickDataColumns.LAST_QUANTITY.value]
-    time_col: pd.Series = tick_df[data.TickDataColumns.TIMESTAMP_NANO.value]
-    # --------- reindex to a range index --------
-    price_col.index = pd.RangeIndex(0, len(price_col), 1)
-    qty_col.index = pd.RangeIndex(0, len(qty_col), 1)
-    time_col.index = pd.RangeIndex(0, len(time_col), 1)
-
-    # -------- aggregate functions -------
-    def find_open_non_zero(series: pd.Series) -> float:
-        series = series[series > 0]
-        return series.iloc[0] if len(series) > 0 else 0
-
-    def find_close_non_zero(series: pd.Series) -> float:
-        series = series[series > 0]
-        return series.iloc[-1] if len(series) > 0 else 0
-
-    def find_high_non_zero(series: pd.Series) -> float:
-        series = series[series > 0]
-        return max(series) if len(series) > 0 else 0
-
-    def find_low_non_zero(series: pd.Series) -> float:
-        series = series[series > 0]
-        return min(series) if len(series) > 0 else 0
-
-    # -------- find bar features -------
-    open_price_series = price_col.groupby(price_col.index // sampling_ticks).agg(find_open_non_zero)
-    close_price_series = price_col.groupby(price_col.index // sampling_ticks).agg(find_close_non_zero)
-    high_price_series = price_col.groupby(price_col.index // sampling_ticks).agg(find_high_non_zero)
-    low_price_series = price_col.groupby(price_col.index // sampling_ticks).agg(find_low_non_zero)
-    vol_price_product = price_col.mul(qty_col).groupby(price_col.index // sampling_ticks).sum()
-    volume_traded_series = qty_col.groupby(qty_col.index // sampling_ticks).sum()
-    vwap_series = vol_price_product.div(volume_traded_series).fillna(0)
-    timestamp_series = time_col.groupby(time_col.index // sampling_ticks).first()
-
-    # ------ returns a tick bar data frame object ------
-    new_bar_df = pd.DataFrame({
-        data.BarDataColumns.OPEN.value: open_price_series,
-        data.BarDataColumns.CLOSE.value: close_price_series,
-        data.BarDataColumns.HIGH.value: high_price_series,
-        data.BarDataColumns.LOW.value: low_price_series,
-        data.BarDataColumns.VOLUME.value: volume_traded_series,
-        data.BarDataColumns.VWAP.value: vwap_series,
-        data.BarDataColumns.TIMESTAMP.value: timestamp_series
-    })
-    # ----- create TickBarDataFrame object -----
-    bar_info = data.BarInfo(symbol = tick_wrapper.tick_info.symbol, date = tick_wrapper.tick_info.date, sampling_level = sampling_ticks,
-                            intra_day_period = tick_wrapper.tick_info.intra_day_period, sampling_type = data.Sampling.TICK)
-    bar_wrapper = data.BarDataFrame(bar_data = new_bar_df, bar_info = bar_info)
+    new_bar_df = make_tick_bar_df(get_tick_arrays(tick_df), sampling_ticks)
+    bar_wrapper = make_bar_wrapper(tick_wrapper.tick_info, new_bar_df, data.Sampling.TICK, sampling_ticks)
     # ----- log end of sampling ------
     dp_logger.log_tick_sampling_end(tick_info = tick_wrapper.tick_info, sampling_ticks=sampling_ticks)
     return bar_wrapper
 
+
 def dollar_sampling(tick_wrapper: data.TickDataFrame, sampling_dollar: int = 1000000) -> data.BarDataFrame:
     """
     combines tick data into dollar bars of size specified by bar_size
     NOTE : the last bit of data that does not form a bar is dropped
+    NOTE : a tick that crosses a bar boundary is split in proportion to the dollar amount on each side, a large tick can fill several bars,
+    the bar volume is the number of shares needed to fill the bar, VWAP = sampling_dollar / volume
+    NOTE : the bar time stamp is the time stamp of the first tick after the previous bar was formed,
+    bars filled by the same tick are formed together and share a time stamp
+    NOTE : the float operations follow the order of the original row by row loop, the results are exactly the same
+    as long as the cumulative dollar amounts are exact (float32 prices and integer quantities)
     """
-    # ------ get underlying reference from the tick data frame wrapper ------
-    tick_df = tick_wrapper.tick_data
+    # ------ only the trade columns are needed, lazy tick data frames do not read the depth columns ------
+    tick_df = tick_wrapper.get_columns(data.TRADE_TICK_COLUMNS)
     # ------ log start of sampling process -------
     dp_logger.log_dollar_sampling_start(tick_info = tick_wrapper.tick_info, sampling_dollar=sampling_dollar)
-    # ------ dollar sampling ------
-    df = tick_df[tick_df[data.TickDataColumns.LAST_PRICE.value] > 0]
-    open_price_series_lst : [float] = []
-    close_price_series_lst : [float] = []
-    high_price_series : [float] = []
-    low_price_series : [float] = []
-    volume_traded_series : [int]= []
-    timestamp_series : [int] = []
-    # ------------ dollar sampling  --------------
-    new_bar = True
-    dollar_counter = 0
-    prev_dollar_counter = 0
-    time_stamp = 0
-    curr_prices = []
-    curr_volumes = []
-    for i, row in df.iterrows():
-        # ------ form bars when there is sufficient volume --------
-        while dollar_counter >= sampling_dollar:
-            # ------- calculate the bar values OCHLV --------
-            dollar_counter = dollar_counter - sampling_dollar
-            open_price = curr_prices[0]
-            close_price = curr_prices[-1]
-            high_price = max(curr_prices)
-            low_price = min(curr_prices)
-            last_tick_total_volume = curr_volumes[-1]
-            last_tick_fill = sampling_dollar - prev_dollar_counter  # the amount of the dollar bar filled by the last tick
-            prev_tick_volumes = sum(curr_volumes[:-1])  # the volume of all ticks except the last volume
-            last_tick_volume = last_tick_fill / close_price  # the volume filled by the last tick
-            bar_volume = last_tick_volume + prev_tick_volumes  # the total volume in this bar
-            # ------- store bar values --------
-            open_price_series_lst.append(open_price)
-            close_price_series_lst.append(close_price)
-            high_price_series.append(high_price)
-            low_price_series.append(low_price)
-            volume_traded_series.append(bar_volume)
-            timestamp_series.append(time_stamp)
-            # ------- check for residue dollar and overflow --------
-            if dollar_counter >= sampling_dollar:
-                #  ----- the tick has so much dollar that it can fill multiple bars ------
-                curr_prices = [close_price, ]
-                curr_volumes = [last_tick_total_volume - last_tick_volume]
-                prev_dollar_counter = 0
-            elif dollar_counter == 0:
-                curr_prices = []
-                curr_volumes = []
-                prev_dollar_counter = 0
-            else:
-                # ------ the is a left over amount < bar_size which is to be carried forward to the next bar ------
-                curr_prices = [close_price, ]
-                curr_volumes = [last_tick_total_volume - last_tick_volume]
-                prev_dollar_counter = dollar_counter
-            new_bar = True
-        # ------- collect ticks to form a new bar ----------
-        if new_bar:
-            time_stamp = row[data.TickDataColumns.TIMESTAMP_NANO.value]
-            new_bar = False
-        dollar_counter = dollar_counter + row[data.TickDataColumns.LAST_QUANTITY.value] * row[
-            data.TickDataColumns.LAST_PRICE.value]
-        curr_prices.append(row[data.TickDataColumns.LAST_PRICE.value])
-        curr_volumes.append(row[data.TickDataColumns.LAST_QUANTITY.value])
-        if dollar_counter < sampling_dollar:
-            prev_dollar_counter = dollar_counter
-
-    # ----- convert to a bar data frame object ------
-    vwap_series = pd.Series([sampling_dollar for _ in range(len(volume_traded_series))]).div(volume_traded_series)
-    result_bar_df = pd.DataFrame({
-        data.BarDataColumns.OPEN.value: open_price_series_lst,
-        data.BarDataColumns.CLOSE.value: close_price_series_lst,
-        data.BarDataColumns.HIGH.value: high_price_series,
-        data.BarDataColumns.LOW.value: low_price_series,
-        data.BarDataColumns.VOLUME.value: volume_traded_series,
-        data.BarDataColumns.TIMESTAMP.value: timestamp_series,
-        data.BarDataColumns.VWAP.value : vwap_series
-    })
-    bar_info = data.BarInfo(symbol = tick_wrapper.tick_info.symbol, sampling_level = sampling_dollar, date = tick_wrapper.tick_info.date,
-                            intra_day_period = tick_wrapper.tick_info.intra_day_period, sampling_type = data.Sampling.DOLLAR)
-    dollar_bar_df_wrapper = data.BarDataFrame(bar_data = result_bar_df, bar_info = bar_info)
+    # ------ find the bar segments on the cumulative dollar amount ------
+    timestamps, prices, quantities = find_trade_ticks(tick_df)
+    result_bar_df, _ = make_dollar_bar_df(timestamps, prices, quantities, np.cumsum(prices * quantities), sampling_dollar)
+    dollar_bar_df_wrapper = make_bar_wrapper(tick_wrapper.tick_info, result_bar_df, data.Sampling.DOLLAR, sampling_dollar)
     # ----- log end of sampling ------
     dp_logger.log_dollar_sampling_end(tick_info = tick_wrapper.tick_info, sampling_dollar=sampling_dollar)
     return dollar_bar_df_wrapper
 
+
+# ------ multi level samplers ------
+""" Sweeping a sampler over many levels re-reads and re-scans the same ticks for every level,
+the multi level samplers read the columns and compute the trade ticks and cumulative amounts once and only run the per level functions per level
+-> the bars of every level are exactly the same as the bars of the single level sampler """
+def time_sampling_multi(tick_wrapper : data.TickDataFrame, levels : List[int]) -> Dict[int, data.BarDataFrame]:
+    """
+    :param levels: the sampling seconds of each set of time bars
+    :return: time bars keyed by sampling seconds
+    """
+    tick_df = tick_wrapper.get_columns(data.TRADE_TICK_COLUMNS)
+    dp_logger.log_multi_level_sampling_start(tick_info = tick_wrapper.tick_info, sampling_type = data.Sampling.TIME, levels = levels)
+    tick_arrays = get_tick_arrays(tick_df)
+    bar_wrappers = {level : make_bar_wrapper(tick_wrapper.tick_info, make_time_bar_df(tick_arrays, level), data.Sampling.TIME, level) for level in levels}
+    dp_logger.log_multi_level_sampling_end(tick_info = tick_wrapper.tick_info, sampling_type = data.Sampling.TIME, levels = levels)
+    return bar_wrappers
+
+
+def tick_sampling_multi(tick_wrapper : data.TickDataFrame, levels : List[int]) -> Dict[int, data.BarDataFrame]:
+    """
+    :param levels: the number of ticks per bar of each set of tick bars
+    :return: tick bars keyed by sampling ticks
+    """
+    tick_df = tick_wrapper.get_columns(data.TRADE_TICK_COLUMNS)
+    dp_logger.log_multi_level_sampling_start(tick_info = tick_wrapper.tick_info, sampling_type = data.Sampling.TICK, levels = levels)
+    tick_arrays = get_tick_arrays(tick_df)
+    bar_wrappers = {level : make_bar_wrapper(tick_wrapper.tick_info, make_tick_bar_df(tick_arrays, level), data.Sampling.TICK, level) for level in levels}
+    dp_logger.log_multi_level_sampling_end(tick_info = tick_wrapper.tick_info, sampling_type = data.Sampling.TICK, levels = levels)
+    return bar_wrappers
+
+
+def volume_sampling_multi(tick_wrapper : data.TickDataFrame, levels : List[int]) -> Dict[int, data.BarDataFrame]:
+    """
+    :param levels: the volume traded in each bar of each set of volume bars
+    :return: volume bars keyed by sampling volume
+    """
+    tick_df = tick_wrapper.get_columns(data.TRADE_TICK_COLUMNS)
+    dp_logger.log_multi_level_sampling_start(tick_info = tick_wrapper.tick_info, sampling_type = data.Sampling.VOLUME, levels = levels)
+    timestamps, prices, quantities = find_trade_ticks(tick_df)
+    cum_volumes = np.cumsum(quantities)
+    bar_wrappers = {level : make_bar_wrapper(tick_wrapper.tick_info, make_volume_bar_df(timestamps, prices, quantities, cum_volumes, level),
+                                             data.Sampling.VOLUME, level) for level in levels}
+    dp_logger.log_multi_level_sampling_end(tick_info = tick_wrapper.tick_info, sampling_type = data.Sampling.VOLUME, levels = levels)
+    return bar_wrappers
+
+
+def dollar_sampling_multi(tick_wrapper : data.TickDataFrame, levels : List[int]) -> Dict[int, data.BarDataFrame]:
+    """
+    :param levels: the dollar amount traded in each bar of each set of dollar bars
+    :return: dollar bars keyed by sampling dollar
+    """
+    tick_df = tick_wrapper.get_columns(data.TRADE_TICK_COLUMNS)
+    dp_logger.log_multi_level_sampling_start(tick_info = tick_wrapper.tick_info, sampling_type = data.Sampling.DOLLAR, levels = levels)
+    timestamps, prices, quantities = find_trade_ticks(tick_df)
+    cum_dollars = np.cumsum(prices * quantities)
+    bar_wrappers = {level : make_bar_wrapper(tick_wrapper.tick_info, make_dollar_bar_df(timestamps, prices, quantities, cum_dollars, level)[0],
+                                             data.Sampling.DOLLAR, level) for level in levels}
+    dp_logger.log_multi_level_sampling_end(tick_info = tick_wrapper.tick_info, sampling_type = data.Sampling.DOLLAR, levels = levels)
+    return bar_wrappers
+
+# ------ information driven bars ------
+""" Imbalance and run bars (Advances in Financial Machine Learning, chapter 2.3.2) on the trade ticks
+-> every trade is signed by the tick rule, its amount is 1 (tick), its quantity (volume) or price * quantity (dollar)
+-> imbalance bars close at the first tick where |sum of signed amounts| >= E[T] * |E[signed amount per tick]|
+-> run bars close at the first tick where max(buy amount, sell amount) >= E[T] * max(P[buy] * E[buy amount], (1 - P[buy]) * E[sell amount])
+-> the expectations are EWMAs over the previous bars, warmed up on the first expected_ticks ticks
+The threshold of a bar depends on the bars before it, the search is a loop over bars (not ticks) on cumulative sums computed once
+-> run bars : the buy and sell sums are non decreasing, the end of a bar is found with searchsorted
+-> imbalance bars : the signed sum is not monotonic, the end of a bar is searched in windows that double in size
+the total work is O(number of ticks) plus a python iteration per bar
+NOTE : the EWMA of the number of ticks per bar feeds back into the threshold and can run away to 1 tick or to a single bar,
+it is bounded to [expected_ticks / EXPECTED_TICKS_BOUND_RATIO, expected_ticks * EXPECTED_TICKS_BOUND_RATIO] """
+IMBALANCE_EWMA_SPAN : int = 20
+EXPECTED_TICKS_BOUND_RATIO : int = 10
+
+
+def tick_rule_signs(prices : np.ndarray) -> np.ndarray:
+    """
+    :return: +1 for a trade at a higher price than the previous trade, -1 for a lower price, the previous sign for an unchanged price
+    NOTE : the trades before the first price change take the sign of the first price change, +1 if the price never changes
+    """
+    price_changes = np.sign(np.diff(prices, prepend = prices[:1]))
+    changed_positions = np.flatnonzero(price_changes)
+    if len(changed_positions) == 0:
+        return np.ones(len(prices))
+    last_changes = np.maximum.accumulate(np.where(price_changes != 0, np.arange(len(prices)), changed_positions[0]))
+    return price_changes[last_changes]
+
+
+def find_trade_amounts(sampling_type : data.Sampling, prices : np.ndarray, quantities : np.ndarray) -> np.ndarray:
+    """ :return: the amount of every trade tick counted by the information driven bars of sampling_type """
+    if sampling_type in [data.Sampling.TICK_IMBALANCE, data.Sampling.TICK_RUN]:
+        return np.ones(len(prices))
+    if sampling_type in [data.Sampling.VOLUME_IMBALANCE, data.Sampling.VOLUME_RUN]:
+        return quantities
+    if sampling_type in [data.Sampling.DOLLAR_IMBALANCE, data.Sampling.DOLLAR_RUN]:
+        return prices * quantities
+    raise NotImplementedError()
+
+
+def update_expected_num_ticks(expected_num_ticks : float, bar_num_ticks : int, alpha : float, expected_ticks : int) -> float:
+    expected_num_ticks += alpha * (bar_num_ticks - expected_num_ticks)
+    return min(max(expected_num_ticks, expected_ticks / EXPECTED_TICKS_BOUND_RATIO), expected_ticks * EXPECTED_TICKS_BOUND_RATIO)
+
+
+def find_imbalance_bars(signed_amounts : np.ndarray, expected_ticks : int, ewma_span : int) -> (np.ndarray, np.ndarray):
+    """
+    :param signed_amounts: tick rule sign * amount of every trade tick
+    :param expected_ticks: the initial expected number of ticks per bar
+    :return: bar starts, bar ends (inclusive tick indices), the ticks after the last bar do not form a bar
+    """
+    num_ticks = len(signed_amounts)
+    cum_amounts = np.concatenate([[0.0], np.cumsum(signed_amounts)])
+    alpha = 2 / (ewma_span + 1)
+    expected_num_ticks = float(expected_ticks)
+    expected_imbalance = float(np.mean(signed_amounts[:expected_ticks])) if num_ticks > 0 else 0.0
+    bar_starts, bar_ends = [], []
+    bar_start = 0
+    while bar_start < num_ticks:
+        threshold = expected_num_ticks * abs(expected_imbalance)
+        # ------ search windows of the expected bar length, doubled until the threshold is crossed ------
+        window_start, window_length, bar_end = bar_start, int(expected_num_ticks) + 1, None
+        while bar_end is None and window_start < num_ticks:
+            window_end = min(window_start + window_length, num_ticks)
+            crossed_ticks = np.flatnonzero(np.abs(cum_amounts[window_start + 1 : window_end + 1] - cum_amounts[bar_start]) >= threshold)
+            bar_end = window_start + int(crossed_ticks[0]) if len(crossed_ticks) > 0 else None
+            window_start, window_length = window_end, window_length * 2
+        if bar_end is None:
+            break
+        bar_starts.append(bar_start)
+        bar_ends.append(bar_end)
+        # ------ update the expected number of ticks and the expected imbalance per tick ------
+        bar_num_ticks = bar_end - bar_start + 1
+        expected_imbalance += alpha * ((cum_amounts[bar_end + 1] - cum_amounts[bar_start]) / bar_num_ticks - expected_imbalance)
+        expected_num_ticks = update_expected_num_ticks(expected_num_ticks, bar_num_ticks, alpha, expected_ticks)
+        bar_start = bar_end + 1
+    return np.array(bar_starts, dtype = np.int64), np.array(bar_ends, dtype = np.int64)
+
+
+def find_run_bars(signs : np.ndarray, amounts : np.ndarray, expected_ticks : int, ewma_span : int) -> (np.ndarray, np.ndarray):
+    """
+    :param signs: tick rule sign of every trade tick
+    :param amounts: amount of every trade tick (>= 0)
+    :param expected_ticks: the initial expected number of ticks per bar
+    :return: bar starts, bar ends (inclusive tick indices), the ticks after the last bar do not form a bar
+    """
+    num_ticks = len(signs)
+    is_buy_bool_arr = signs > 0
+    buy_amounts, sell_amounts = np.where(is_buy_bool_arr, amounts, 0.0), np.where(is_buy_bool_arr, 0.0, amounts)
+    cum_buy_amounts = np.concatenate([[0.0], np.cumsum(buy_amounts)])
+    cum_sell_amounts = np.concatenate([[0.0], np.cumsum(sell_amounts)])
+    cum_buys = np.concatenate([[0], np.cumsum(is_buy_bool_arr)])
+    alpha = 2 / (ewma_span + 1)
+    # ------ warm up on the first expected_ticks ticks ------
+    expected_num_ticks = float(expected_ticks)
+    warm_up_buys, warm_up_sells = is_buy_bool_arr[:expected_ticks], ~is_buy_bool_arr[:expected_ticks]
+    buy_probability = float(np.mean(warm_up_buys)) if num_ticks > 0 else 0.5
+    expected_buy_amount = float(np.mean(amounts[:expected_ticks][warm_up_buys])) if warm_up_buys.any() else 0.0
+    expected_sell_amount = float(np.mean(amounts[:expected_ticks][warm_up_sells])) if warm_up_sells.any() else 0.0
+    bar_starts, bar_ends = [], []
+    bar_start = 0
+    while bar_start < num_ticks:
+        threshold = expected_num_ticks * max(buy_probability * expected_buy_amount, (1 - buy_probability) * expected_sell_amount)
+        # ------ first tick where the buy or the sell amount since the bar start reaches the threshold ------
+        buy_end = np.searchsorted(cum_buy_amounts, cum_buy_amounts[bar_start] + threshold, side = "left") - 1
+        sell_end = np.searchsorted(cum_sell_amounts, cum_sell_amounts[bar_start] + threshold, side = "left") - 1
+        bar_end = max(int(min(buy_end, sell_end)), bar_start)
+        if bar_end >= num_ticks:
+            break
+        bar_starts.append(bar_start)
+        bar_ends.append(bar_end)
+        # ------ update the expected number of ticks, the buy probability and the expected buy and sell amounts ------
+        bar_num_ticks = bar_end - bar_start + 1
+        bar_num_buys = int(cum_buys[bar_end + 1] - cum_buys[bar_start])
+        if bar_num_buys > 0:
+            expected_buy_amount += alpha * ((cum_buy_amounts[bar_end + 1] - cum_buy_amounts[bar_start]) / bar_num_buys - expected_buy_amount)
+        if bar_num_buys < bar_num_ticks:
+            expected_sell_amount += alpha * ((cum_sell_amounts[bar_end + 1] - cum_sell_amounts[bar_start]) / (bar_num_ticks - bar_num_buys) - expected_sell_amount)
+        buy_probability += alpha * (bar_num_buys / bar_num_ticks - buy_probability)
+        expected_num_ticks = update_expected_num_ticks(expected_num_ticks, bar_num_ticks, alpha, expected_ticks)
+        bar_start = bar_end + 1
+    return np.array(bar_starts, dtype = np.int64), np.array(bar_ends, dtype = np.int64)
+
+
+def information_driven_sampling(tick_wrapper : data.TickDataFrame, sampling_type : data.Sampling, expected_ticks : int = 100,
+                                ewma_span : int = IMBALANCE_EWMA_SPAN) -> data.BarDataFrame:
+    """
+    Combines the trade ticks into imbalance or run bars
+    :param sampling_type: one of the IMBALANCE_SAMPLINGS or RUN_SAMPLINGS
+    :param expected_ticks: the initial expected number of ticks per bar, stored as the sampling level
+    :param ewma_span: the span (in bars) of the EWMAs of the expectations
+    NOTE : bars are aggregated like tick bars of the trade ticks : volume is the sum of quantities, VWAP = sum(price * quantity) / volume,
+    the time stamp is the time stamp of the first tick
+    NOTE : the trade ticks after the last bar do not form a bar
+    """
+    tick_df = tick_wrapper.get_columns(data.TRADE_TICK_COLUMNS)
+    dp_logger.log_information_driven_sampling_start(tick_info = tick_wrapper.tick_info, sampling_type = sampling_type, expected_ticks = expected_ticks)
+    timestamps, prices, quantities = find_trade_ticks(tick_df)
+    signs = tick_rule_signs(prices)
+    amounts = find_trade_amounts(sampling_type, prices, quantities)
+    if sampling_type in data.IMBALANCE_SAMPLINGS:
+        bar_starts, bar_ends = find_imbalance_bars(signs * amounts, expected_ticks, ewma_span)
+    elif sampling_type in data.RUN_SAMPLINGS:
+        bar_starts, bar_ends = find_run_bars(signs, amounts, expected_ticks, ewma_span)
+    else:
+        raise NotImplementedError()
+    # ------ the bars are contiguous blocks of the trade ticks up to the end of the last bar ------
+    num_bar_ticks = int(bar_ends[-1]) + 1 if len(bar_ends) > 0 else 0
+    tick_arrays = make_tick_arrays(timestamps[:num_bar_ticks], prices[:num_bar_ticks], quantities[:num_bar_ticks])
+    bar_df = aggregate_tick_blocks(tick_arrays, bar_starts, bar_ends + 1)
+    dp_logger.log_information_driven_sampling_end(tick_info = tick_wrapper.tick_info, sampling_type = sampling_type, expected_ticks = expected_ticks)
+    return make_bar_wrapper(tick_wrapper.tick_info, bar_df, sampling_type, expected_ticks)
+
+
+def tick_imbalance_sampling(tick_wrapper : data.TickDataFrame, expected_ticks : int = 100, ewma_span : int = IMBALANCE_EWMA_SPAN) -> data.BarDataFrame:
+    return information_driven_sampling(tick_wrapper, data.Sampling.TICK_IMBALANCE, expected_ticks = expected_ticks, ewma_span = ewma_span)
+
+
+def volume_imbalance_sampling(tick_wrapper : data.TickDataFrame, expected_ticks : int = 100, ewma_span : int = IMBALANCE_EWMA_SPAN) -> data.BarDataFrame:
+    return information_driven_sampling(tick_wrapper, data.Sampling.VOLUME_IMBALANCE, expected_ticks = expected_ticks, ewma_span = ewma_span)
+
+
+def dollar_imbalance_sampling(tick_wrapper : data.TickDataFrame, expected_ticks : int = 100, ewma_span : int = IMBALANCE_EWMA_SPAN) -> data.BarDataFrame:
+    return information_driven_sampling(tick_wrapper, data.Sampling.DOLLAR_IMBALANCE, expected_ticks = expected_ticks, ewma_span = ewma_span)
+
+
+def tick_run_sampling(tick_wrapper : data.TickDataFrame, expected_ticks : int = 100, ewma_span : int = IMBALANCE_EWMA_SPAN) -> data.BarDataFrame:
+    return information_driven_sampling(tick_wrapper, data.Sampling.TICK_RUN, expected_ticks = expected_ticks, ewma_span = ewma_span)
+
+
+def volume_run_sampling(tick_wrapper : data.TickDataFrame, expected_ticks : int = 100, ewma_span : int = IMBALANCE_EWMA_SPAN) -> data.BarDataFrame:
+    return information_driven_sampling(tick_wrapper, data.Sampling.VOLUME_RUN, expected_ticks = expected_ticks, ewma_span = ewma_span)
+
+
+def dollar_run_sampling(tick_wrapper : data.TickDataFrame, expected_ticks : int = 100, ewma_span : int = IMBALANCE_EWMA_SPAN) -> data.BarDataFrame:
+    return information_driven_sampling(tick_wrapper, data.Sampling.DOLLAR_RUN, expected_ticks = expected_ticks, ewma_span = ewma_span)
+
+
+# ------ streaming bar builders ------
+""" The samplers above need the ticks of a whole period, the bar builders sample a live feed chunk by chunk
+-> push takes the next chunk of ticks and returns the bars completed by it, flush returns the bars the batch sampler forms at the end of the ticks
+-> the carry over state is explicit : the pending ticks of the open bar and the few numbers needed to continue it
+-> pending ticks are kept as a list of chunks and only concatenated once a bar completes, the work per tick is O(1) amortised
+NOTE : feeding the ticks of a period through push in chunks of any size and then calling flush gives exactly the same bars as the batch sampler """
+class BarBuilder:
+    sampling_type : data.Sampling = None
+
+    def __init__(self, tick_info : data.TickInfo, sampling_level : int):
+        """ :param tick_info: the bar info of the returned bars is taken from the tick info """
+        self.tick_info = tick_info
+        self.sampling_level = sampling_level
+        self.pending_chunks : List[Tuple[np.ndarray, ...]] = []
+
+    def push(self, tick_wrapper : data.TickDataFrame) -> data.BarDataFrame:
+        """ :return: the bars completed by the ticks, can be empty """
+        bar_df = self.push_ticks(tick_wrapper.get_columns(data.TRADE_TICK_COLUMNS))
+        return make_bar_wrapper(self.tick_info, bar_df, self.sampling_type, self.sampling_level)
+
+    def flush(self) -> data.BarDataFrame:
+        """ :return: the bars the batch sampler forms from the pending ticks at the end of the period, the pending ticks are dropped """
+        bar_df = self.flush_ticks()
+        self.pending_chunks = []
+        return make_bar_wrapper(self.tick_info, bar_df, self.sampling_type, self.sampling_level)
+
+    def take_pending(self) -> Tuple[np.ndarray, ...]:
+        """ concatenates and removes the pending chunks """
+        pending_arrays = tuple(np.concatenate(chunk_arrays) for chunk_arrays in zip(*self.pending_chunks))
+        self.pending_chunks = []
+        return pending_arrays
+
+    def push_ticks(self, tick_df : pd.DataFrame) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def flush_ticks(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+
+class ThresholdBarBuilder(BarBuilder):
+    """
+    Carry over state of the volume and dollar bar builders
+    -> pending chunks : time stamps, prices, quantities of the trade ticks from the first tick of the open bar and their cumulative amount
+    counted from the start of the open bar, the first tick can be partly used by the previous bar
+    -> pending_amount : the cumulative amount after the last pending tick
+    -> is_carry_tick : whether the first pending tick was split by the previous bar
+    NOTE : the results are exact as long as the cumulative amounts are exact (float32 prices and integer quantities)
+    """
+    def __init__(self, tick_info : data.TickInfo, sampling_level : int):
+        super().__init__(tick_info, sampling_level)
+        self.pending_amount : float = 0.0
+        self.is_carry_tick : bool = False
+
+    def get_amounts(self, prices : np.ndarray, quantities : np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def make_bar_df(self, timestamps : np.ndarray, prices : np.ndarray, quantities : np.ndarray, cum_amounts : np.ndarray) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def push_ticks(self, tick_df : pd.DataFrame) -> pd.DataFrame:
+        timestamps, prices, quantities = find_trade_ticks(tick_df)
+        cum_amounts = self.pending_amount + np.cumsum(self.get_amounts(prices, quantities))
+        if len(cum_amounts) == 0:
+            return self.make_bar_df(timestamps, prices, quantities, cum_amounts)
+        # ------ a bar is complete once a tick after its end tick has arrived ------
+        is_bar_complete = self.pending_amount >= self.sampling_level or \
+                          np.searchsorted(cum_amounts, self.sampling_level, side = "left") < len(cum_amounts) - 1
+        self.pending_chunks.append((timestamps, prices, quantities, cum_amounts))
+        self.pending_amount = cum_amounts[-1]
+        if not is_bar_complete:
+            return self.make_bar_df(timestamps[:0], prices[:0], quantities[:0], cum_amounts[:0])
+        timestamps, prices, quantities, cum_amounts = self.take_pending()
+        bar_df = self.make_bar_df(timestamps, prices, quantities, cum_amounts)
+        # ------ the open bar starts at the tick that closed the last bar if it crossed the bar boundary, at the next tick otherwise ------
+        closed_amount = len(bar_df) * float(self.sampling_level)
+        last_bar_end = np.searchsorted(cum_amounts, closed_amount, side = "left")
+        self.is_carry_tick = bool(cum_amounts[last_bar_end] > closed_amount)
+        open_bar_start = last_bar_end + int(not self.is_carry_tick)
+        self.pending_chunks = [(timestamps[open_bar_start:], prices[open_bar_start:], quantities[open_bar_start:], cum_amounts[open_bar_start:] - closed_amount)]
+        self.pending_amount = cum_amounts[-1] - closed_amount
+        return bar_df
+
+    def flush_ticks(self) -> pd.DataFrame:
+        """ the batch sampler drops the bar that is not complete at the end of the ticks """
+        empty_arrays = (np.empty(0, dtype = np.int64), np.empty(0), np.empty(0), np.empty(0))
+        self.pending_amount, self.is_carry_tick = 0.0, False
+        return self.make_bar_df(*empty_arrays)
+
+
+class VolumeBarBuilder(ThresholdBarBuilder):
+    """ streaming volume_sampling """
+    sampling_type = data.Sampling.VOLUME
+
+    def __init__(self, tick_info : data.TickInfo, sampling_volume : int = 50):
+        super().__init__(tick_info, sampling_volume)
+
+    def get_amounts(self, prices : np.ndarray, quantities : np.ndarray) -> np.ndarray:
+        return quantities
+
+    def make_bar_df(self, timestamps : np.ndarray, prices : np.ndarray, quantities : np.ndarray, cum_amounts : np.ndarray) -> pd.DataFrame:
+        return make_volume_bar_df(timestamps, prices, quantities, cum_amounts, self.sampling_level)
+
+
+class DollarBarBuilder(ThresholdBarBuilder):
+    """ streaming dollar_sampling, the carry over state also holds the volume left on the first pending tick by the previous bar """
+    sampling_type = data.Sampling.DOLLAR
+
+    def __init__(self, tick_info : data.TickInfo, sampling_dollar : int = 1000000):
+        super().__init__(tick_info, sampling_dollar)
+        self.carry_residue_volume : Optional[float] = None
+
+    def get_amounts(self, prices : np.ndarray, quantities : np.ndarray) -> np.ndarray:
+        return prices * quantities
+
+    def make_bar_df(self, timestamps : np.ndarray, prices : np.ndarray, quantities : np.ndarray, cum_amounts : np.ndarray) -> pd.DataFrame:
+        bar_df, self.carry_residue_volume = make_dollar_bar_df(timestamps, prices, quantities, cum_amounts, self.sampling_level,
+                                                               carry_residue_volume = self.carry_residue_volume if self.is_carry_tick else None)
+        return bar_df
+
+
+class TickBarBuilder(BarBuilder):
+    """ streaming tick_sampling, carry over state : the pending chunks hold the time stamps, prices and quantities of the ticks of the open bar """
+    sampling_type = data.Sampling.TICK
+
+    def __init__(self, tick_info : data.TickInfo, sampling_ticks : int = 20):
+        super().__init__(tick_info, sampling_ticks)
+        self.num_pending_ticks : int = 0
+
+    def push_ticks(self, tick_df : pd.DataFrame) -> pd.DataFrame:
+        self.pending_chunks.append(get_trade_columns(tick_df))
+        self.num_pending_ticks += len(tick_df)
+        num_complete_ticks = self.num_pending_ticks // self.sampling_level * self.sampling_level
+        if num_complete_ticks == 0:
+            return make_tick_bar_df(get_tick_arrays(tick_df.iloc[:0]), self.sampling_level)
+        pending_arrays = self.take_pending()
+        self.pending_chunks = [tuple(arr[num_complete_ticks:] for arr in pending_arrays)]
+        self.num_pending_ticks -= num_complete_ticks
+        return make_tick_bar_df(make_tick_arrays(*(arr[:num_complete_ticks] for arr in pending_arrays)), self.sampling_level)
+
+    def flush_ticks(self) -> pd.DataFrame:
+        """ the left over ticks form the last bar """
+        self.num_pending_ticks = 0
+        pending_arrays = self.take_pending() if len(self.pending_chunks) > 0 else (np.empty(0, dtype = np.int64), np.empty(0), np.empty(0))
+        return make_tick_bar_df(make_tick_arrays(*pending_arrays), self.sampling_level)
+
+
+class TimeBarBuilder(BarBuilder):
+    """
+    streaming time_sampling, carry over state
+    -> origin : midnight of the first tick, the bins are counted from it
+    -> open_bin : the bin of the open bar, the pending chunks hold the time stamps, prices, quantities and bins of its ticks
+    NOTE : a bar is complete once a tick of a later bin has arrived, the bins without ticks in between are formed as empty bars
+    NOTE : ticks are sorted into their bins within a chunk, a tick of a bin before the open bin raises a LateTickException
+    """
+    sampling_type = data.Sampling.TIME
+
+    def __init__(self, tick_info : data.TickInfo, sampling_seconds : int = 60):
+        super().__init__(tick_info, sampling_seconds)
+        self.origin : Optional[int] = None
+        self.open_bin : Optional[int] = None
+
+    def push_ticks(self, tick_df : pd.DataFrame) -> pd.DataFrame:
+        trade_arrays = get_trade_columns(tick_df)
+        timestamps = trade_arrays[0].astype(np.int64)
+        if len(timestamps) == 0:
+            return make_tick_bar_df(make_tick_arrays(*trade_arrays), self.sampling_level)
+        if self.origin is None:
+            self.origin = int(timestamps.min()) // NANOSECONDS_PER_DAY * NANOSECONDS_PER_DAY
+        bin_indices = (timestamps - self.origin) // (self.sampling_level * 10 ** 9)
+        if self.open_bin is not None and bin_indices.min() < self.open_bin:
+            raise LateTickException(self.tick_info, int(timestamps[np.argmin(bin_indices)]))
+        # ------ out of order ticks are moved into their bins, the order within a bin is kept ------
+        if np.any(bin_indices[1:] < bin_indices[:-1]):
+            order = np.argsort(bin_indices, kind = "stable")
+            trade_arrays, bin_indices = tuple(arr[order] for arr in trade_arrays), bin_indices[order]
+        if self.open_bin is None:
+            self.open_bin = int(bin_indices[0])
+        self.pending_chunks.append(trade_arrays + (bin_indices,))
+        if bin_indices[-1] == self.open_bin:
+            return make_tick_bar_df(make_tick_arrays(*(arr[:0] for arr in trade_arrays)), self.sampling_level)
+        # ------ the bins from the open bin up to the last bin are complete ------
+        *pending_arrays, bin_indices = self.take_pending()
+        last_bin = int(bin_indices[-1])
+        block_starts = np.searchsorted(bin_indices, np.arange(self.open_bin, last_bin), side = "left")
+        num_complete_ticks = int(np.searchsorted(bin_indices, last_bin, side = "left"))
+        block_ends = np.append(block_starts[1:], num_complete_ticks)
+        self.pending_chunks = [tuple(arr[num_complete_ticks:] for arr in pending_arrays) + (bin_indices[num_complete_ticks:],)]
+        self.open_bin = last_bin
+        return aggregate_tick_blocks(make_tick_arrays(*(arr[:num_complete_ticks] for arr in pending_arrays)), block_starts, block_ends)
+
+    def flush_ticks(self) -> pd.DataFrame:
+        """ the ticks of the open bin form the last bar """
+        self.origin, self.open_bin = None, None
+        if len(self.pending_chunks) == 0:
+            return make_tick_bar_df(make_tick_arrays(np.empty(0, dtype = np.int64), np.empty(0), np.empty(0)), self.sampling_level)
+        *pending_arrays, bin_indices = self.take_pending()
+        return aggregate_tick_blocks(make_tick_arrays(*pending_arrays), np.zeros(1, dtype = np.int64), np.array([len(bin_indices)]))
+
+
 # -------- bar sampling with statistics on limit order books ----------
-def volume_sampling_limit_book(tick_df, bar_size, last_price_col="lastPrice", last_qty_col="lastQty",
-                               time_stamp_col="timestampNano",
-                               best_ask_col="best_ask", best_bid_col="best_bid", save=None):
-    if len(tick_df) == 0:
-        if save:
-            new_df = pd.DataFrame({"timestamp": [], "open": [], "close": [], "high": [], "low": [], "VVAP": [],
-                                   "open_bid": [], "high_bid": [], "low_bid": [], "close_bid": [], "average_bid": [],
-                                   "open_ask": [], "close_ask": [], "high_ask": [], "low_ask": [], "average_ask": [],
-                                   "average_bid_ask_spread": []})
-            new_df.to_csv(save)
-        return tick_df
-    start_time = time.time()
+""" The limit order book samplers form the same bars as volume_sampling and tick_sampling and add statistics of the best bid and ask
+-> the statistics are reduced over the same segments / blocks of ticks as the trade prices, with reduceat
+-> a volume bar takes the quotes of its trade ticks, the tick that crosses a bar boundary counts in both bars
+-> a tick bar takes the quotes of all of its ticks """
+def aggregate_segment_values(values : np.ndarray, piece_tick_indices : np.ndarray, segment_offsets : np.ndarray) -> (np.ndarray, ...):
+    """ :return: open, close, high, low, mean and (population) standard deviation of every segment """
+    if len(segment_offsets) == 0:
+        return tuple(np.empty(0, dtype = np.float64) for _ in range(6))
+    open_values, close_values, high_values, low_values = aggregate_segment_prices(values, piece_tick_indices, segment_offsets)
+    piece_values = values[piece_tick_indices]
+    segment_lengths = np.diff(np.append(segment_offsets, len(piece_values)))
+    mean_values = np.add.reduceat(piece_values, segment_offsets) / segment_lengths
+    std_values = np.sqrt(np.add.reduceat((piece_values - np.repeat(mean_values, segment_lengths)) ** 2, segment_offsets) / segment_lengths)
+    return open_values, close_values, high_values, low_values, mean_values, std_values
+
+
+def aggregate_segment_quotes(best_asks : np.ndarray, best_bids : np.ndarray, piece_tick_indices : np.ndarray, segment_offsets : np.ndarray) -> pd.DataFrame:
+    """ :return: data frame of the LimitBookBarColumns, one row per segment """
+    open_bids, close_bids, high_bids, low_bids, average_bids, _ = aggregate_segment_values(best_bids, piece_tick_indices, segment_offsets)
+    open_asks, close_asks, high_asks, low_asks, average_asks, _ = aggregate_segment_values(best_asks, piece_tick_indices, segment_offsets)
+    *_, average_spreads, std_spreads = aggregate_segment_values(best_asks - best_bids, piece_tick_indices, segment_offsets)
+    return pd.DataFrame({
+        data.LimitBookBarColumns.OPEN_BID.value : open_bids,
+        data.LimitBookBarColumns.CLOSE_BID.value : close_bids,
+        data.LimitBookBarColumns.HIGH_BID.value : high_bids,
+        data.LimitBookBarColumns.LOW_BID.value : low_bids,
+        data.LimitBookBarColumns.AVERAGE_BID.value : average_bids,
+        data.LimitBookBarColumns.OPEN_ASK.value : open_asks,
+        data.LimitBookBarColumns.CLOSE_ASK.value : close_asks,
+        data.LimitBookBarColumns.HIGH_ASK.value : high_asks,
+        data.LimitBookBarColumns.LOW_ASK.value : low_asks,
+        data.LimitBookBarColumns.AVERAGE_ASK.value : average_asks,
+        data.LimitBookBarColumns.AVERAGE_BID_ASK_SPREAD.value : average_spreads,
+        data.LimitBookBarColumns.STD_BID_ASK_SPREAD.value : std_spreads
+    })
+
+
+def volume_sampling_limit_book(tick_wrapper : data.TickDataFrame, sampling_volume : int = 50) -> data.LimitBookBarDataFrame:
     """
-    combines tick data into volume bars of size specified by bar_size
-    NOTE : the last bit of data that does not form a bar is dropped
-    NOTE : 
-    """
-    df = tick_df[tick_df[last_price_col] > 0]
-    new_df = pd.DataFrame({"timestamp": [], "open": [], "close": [], "high": [], "low": [], "VVAP": [],
-                           "open_bid": [], "high_bid": [], "low_bid": [], "close_bid": [], "average_bid": [],
-                           "open_ask": [], "close_ask": [], "high_ask": [], "low_ask": [], "average_ask": [],
-                           "average_bid_ask_spread": [], "std_bid_ask_spread": []})
-    new_bar = True
-    volume_counter = 0
-    time_stamp = 0
-    curr_prices = []
-    curr_volumes = []
-    best_asks = []
-    best_bids = []
-    bid_ask_spreads = []
-    for i, row in df.iterrows():
-        while volume_counter >= bar_size:
-            # ----- trade statistics ------
-            volume_counter = volume_counter - bar_size
-            open_price = curr_prices[0]
-            close_price = curr_prices[-1]
-            high_price = max(curr_prices)
-            low_price = min(curr_prices)
-            # ----- bid ask statistics ------
-            open_bid = best_bids[0]
-            close_bid = best_bids[-1]
-            high_bid = max(best_bids)
-            low_bid = min(best_bids)
-            average_bid = np.mean(best_bids)
-
-            open_ask = best_asks[0]
-            close_ask = best_asks[-1]
-            high_ask = max(best_asks)
-            low_ask = min(best_asks)
-            average_ask = np.mean(best_asks)
-
-            average_bid_ask_spread = np.mean(bid_ask_spreads)
-            std_bid_ask_spread = np.std(bid_ask_spreads)
-
-            VVAP = sum([vol * price for vol, price in zip(curr_volumes, curr_prices)]) / bar_size
-            new_bar = {"timestamp": time_stamp, "open": open_price, "close": close_price, "high": high_price,
-                       "low": low_price, "VVAP": VVAP,
-                       "open_bid": open_bid, "close_bid": close_bid, "high_bid": high_bid, "low_bid": low_bid,
-                       "average_bid": average_bid,
-                       "open_ask": open_ask, "close_ask": close_ask, "high_ask": high_ask, "low_ask": low_ask,
-                       "average_ask": average_ask,
-                       "average_bid_ask_spread": average_bid_ask_spread, "std_bid_ask_spread": std_bid_ask_spread
-                       }
-            new_df = new_df.append(new_bar, ignore_index=True)
-            if volume_counter == 0:  # if there is no left over volume, we have hit exactly bar_size amount.
-                curr_prices = []
-                curr_volumes = []
-                best_asks = []
-                best_bids = []
-                bid_ask_spreads = []
-            else:  # there is still some volume left over
-                curr_prices = [close_price, ]  # the close price of previous bar becomes the new open price
-                curr_volumes = [min(volume_counter, bar_size)]  # if spill over volume exceeds bar_size amount
-                best_asks = [close_ask, ]
-                best_bids = [close_bid, ]
-                bid_ask_spreads = bid_ask_spreads[-1:]
-            new_bar = True
-        if new_bar:
-            time_stamp = row[time_stamp_col]
-            new_bar = False
-        volume_counter = volume_counter + row[last_qty_col]
-        curr_prices.append(row[last_price_col])
-        if volume_counter >= bar_size:
-            curr_volumes.append(bar_size - volume_counter + row[last_qty_col])
-        else:
-            curr_volumes.append(row[last_qty_col])
-        best_asks.append(row[best_ask_col])
-        best_bids.append(row[best_bid_col])
-        bid_ask_spreads.append(row[best_ask_col] - row[best_bid_col])
-
-    new_df["volume_time"] = list(range(0, len(new_df) * bar_size, bar_size))
-    new_df["timestamp"] = new_df["timestamp"].mask(lambda x: x == 0).interpolate().ffill().bfill()
-    if save:
-        new_df.to_csv(save, index=False)
-    end_time = time.time()
-    print("Volume sampling completed : elasped time : " + str(end_time - start_time))
-    return new_df
-
-
-def tick_sampling_limit_book(tick_df, bar_size=20, last_price_col="lastPrice", last_qty_col="lastQty",
-                             time_stamp_col="timestampNano",
-                             best_ask_col="best_ask", best_bid_col="best_bid", save=None):
-    if len(tick_df) == 0:
-        if save:
-            new_df = pd.DataFrame(
-                {"timestamp": [], "open": [], "close": [], "high": [], "low": [], "volume": [], "VVAP": [],
-                 "tick_time": [],
-                 "open_bid": [], "high_bid": [], "low_bid": [], "close_bid": [], "average_bid": [],
-                 "open_ask": [], "close_ask": [], "high_ask": [], "low_ask": [], "average_ask": [],
-                 "average_bid_ask_spread": [], "std_bid_ask_spread": []})
-            new_df.to_csv(save)
-        return tick_df
-    start_time = time.time()
-    """ Combines tick data into bunches of bar_size number of ticks, 
-        only ticks with non zero trade volume is counted 
-    NOTE : left over ticks are combined into the last bar """
-    price_col = tick_df[last_price_col]
-    qty_col = tick_df[last_qty_col]
-    time_col = tick_df[time_stamp_col]
-    ask_col = tick_df[best_ask_col]
-    bid_col = tick_df[best_bid_col]
-    # --------- filter out 0 rows --------
-    time_col = time_col[qty_col > 0]
-    price_col = price_col[price_col > 0]
-    ask_col = ask_col[qty_col > 0]
-    bid_col = bid_col[qty_col > 0]
-    qty_col = qty_col[qty_col > 0]
-    # --------- reindex to a range index --------
-    price_col.index = pd.RangeIndex(0, len(price_col), 1)
-    qty_col.index = pd.RangeIndex(0, len(qty_col), 1)
-    time_col.index = pd.RangeIndex(0, len(time_col), 1)
-    ask_col.index = pd.RangeIndex(0, len(qty_col), 1)
-    bid_col.index = pd.RangeIndex(0, len(qty_col), 1)
-    # -------- find bar features -------
-    open_price = price_col.groupby(price_col.index // bar_size).first()
-    close_price = price_col.groupby(price_col.index // bar_size).last()
-    high_price = price_col.groupby(price_col.index // bar_size).max()
-    low_price = price_col.groupby(price_col.index // bar_size).min()
-    vol_price_product = price_col.mul(qty_col).groupby(price_col.index // bar_size).sum()
-    total_vol = qty_col.groupby(qty_col.index // bar_size).sum()
-    vvap_col = vol_price_product.div(total_vol)
-    open_ask = ask_col.groupby(price_col.index // bar_size).first()
-    close_ask = ask_col.groupby(price_col.index // bar_size).last()
-    high_ask = ask_col.groupby(price_col.index // bar_size).max()
-    low_ask = ask_col.groupby(price_col.index // bar_size).min()
-    average_ask = ask_col.groupby(price_col.index // bar_size).mean()
-    open_bid = bid_col.groupby(price_col.index // bar_size).first()
-    close_bid = bid_col.groupby(price_col.index // bar_size).last()
-    high_bid = bid_col.groupby(price_col.index // bar_size).max()
-    low_bid = bid_col.groupby(price_col.index // bar_size).min()
-    average_bid = bid_col.groupby(price_col.index // bar_size).mean()
-    spread = ask_col - bid_col
-    average_bid_ask_spread = spread.groupby(price_col.index // bar_size).mean()
-    std_bid_ask_spread = spread.groupby(price_col.index // bar_size).std()
-    # ------- process time column -------
-    time_col = time_col.groupby(time_col.index // bar_size).first()
-    # ------- create and save the new data frame -------
-    new_df = pd.DataFrame({
-        "open": open_price,
-        "close": close_price,
-        "high": high_price,
-        "low": low_price,
-        "VVAP": vvap_col,
-        "volume": total_vol,
-        "timestamp": time_col,
-        "open_bid": open_bid, "high_bid": high_bid, "low_bid": low_bid, "close_bid": close_bid,
-        "average_bid": average_bid,
-        "open_ask": open_ask, "close_ask": close_ask, "high_ask": high_ask, "low_ask": low_ask,
-        "average_ask": average_ask,
-        "average_bid_ask_spread": average_bid_ask_spread, "std_bid_ask_spread": std_bid_ask_spread})
-    new_df["tick_time"] = [*range(0, len(new_df) * bar_size, bar_size)]
-    new_df["timestamp"] = new_df["timestamp"].mask(lambda x: x == 0).interpolate().ffill().bfill()
-    if save:
-        new_df.to_csv(save, index=False)
-    end_time = time.time()
-    print("Tick sampling completed : elasped time : " + str(end_time - start_time))
-    return new_df
+    volume_sampling with statistics of the best bid and ask of the trade ticks in each bar
+    :param tick_wrapper: only the trade and the ASK1P, BID1P columns are read
+    :param sampling_volume: the volume traded size of each bar
+    NOTE : the bar columns are exactly the same as the output of volume_sampling
+    NOTE : the standard deviation of the spread is the population standard deviation, 0 for bars with a single tick
+    """
+    tick_df = tick_wrapper.get_columns(data.BEST_QUOTE_TICK_COLUMNS)
+    dp_logger.log_volume_sampling_start(tick_info = tick_wrapper.tick_info, sampling_volume = sampling_volume)
+    timestamps, prices, quantities = find_trade_ticks(tick_df)
+    cum_volumes = np.cumsum(quantities)
+    bar_df = make_volume_bar_df(timestamps, prices, quantities, cum_volumes, sampling_volume)
+    # ------ the quotes of the trade ticks are reduced over the same bar segments ------
+    has_trade_bool_arr = tick_df[data.TickDataColumns.LAST_PRICE.value].to_numpy() > 0
+    best_asks = tick_df[data.TickDataColumns.ASK1P.value].to_numpy()[has_trade_bool_arr].astype(np.float64)
+    best_bids = tick_df[data.TickDataColumns.BID1P.value].to_numpy()[has_trade_bool_arr].astype(np.float64)
+    piece_tick_indices, _, segment_offsets = expand_segments(*find_threshold_segments(cum_volumes, sampling_volume))
+    quote_df = aggregate_segment_quotes(best_asks, best_bids, piece_tick_indices, segment_offsets)
+    bar_info = data.BarInfo(symbol = tick_wrapper.tick_info.symbol, date = tick_wrapper.tick_info.date, intra_day_period = tick_wrapper.tick_info.intra_day_period,
+                            sampling_level = sampling_volume, sampling_type = data.Sampling.VOLUME)
+    bar_wrapper = data.LimitBookBarDataFrame(bar_data = pd.concat([bar_df, quote_df], axis = 1), bar_info = bar_info)
+    dp_logger.log_volume_sampling_end(tick_info = tick_wrapper.tick_info, sampling_volume = sampling_volume)
+    return bar_wrapper
+
+
+def tick_sampling_limit_book(tick_wrapper : data.TickDataFrame, sampling_ticks : int = 20) -> data.LimitBookBarDataFrame:
+    """
+    Combines the trade ticks into bars of sampling_ticks trades with statistics of the best bid and ask of the trade ticks in each bar
+    :param tick_wrapper: only the trade and the ASK1P, BID1P columns are read
+    :param sampling_ticks: the number of trade ticks per bar, ticks without trade (a trade price of 0) are not counted
+    NOTE : unlike tick_sampling, the ticks without trade are dropped before the bars are formed and their quotes are not used,
+    the bar columns are those of tick_sampling applied to the trade ticks only
+    NOTE : left over trade ticks are combined into the last bar
+    NOTE : the standard deviation of the spread is the population standard deviation, 0 for bars with a single tick
+    """
+    tick_df = tick_wrapper.get_columns(data.BEST_QUOTE_TICK_COLUMNS)
+    dp_logger.log_tick_sampling_start(tick_info = tick_wrapper.tick_info, sampling_ticks = sampling_ticks)
+    timestamps, prices, quantities = find_trade_ticks(tick_df)
+    bar_df = make_tick_bar_df(make_tick_arrays(timestamps, prices, quantities), sampling_ticks)
+    # ------ tick bars are contiguous blocks of trade ticks, every trade tick is a single piece ------
+    has_trade_bool_arr = tick_df[data.TickDataColumns.LAST_PRICE.value].to_numpy() > 0
+    best_asks = tick_df[data.TickDataColumns.ASK1P.value].to_numpy()[has_trade_bool_arr].astype(np.float64)
+    best_bids = tick_df[data.TickDataColumns.BID1P.value].to_numpy()[has_trade_bool_arr].astype(np.float64)
+    quote_df = aggregate_segment_quotes(best_asks, best_bids, np.arange(len(timestamps)), np.arange(0, len(timestamps), sampling_ticks))
+    bar_info = data.BarInfo(symbol = tick_wrapper.tick_info.symbol, date = tick_wrapper.tick_info.date, intra_day_period = tick_wrapper.tick_info.intra_day_period,
+                            sampling_level = sampling_ticks, sampling_type = data.Sampling.TICK)
+    bar_wrapper = data.LimitBookBarDataFrame(bar_data = pd.concat([bar_df, quote_df], axis = 1), bar_info = bar_info)
+    dp_logger.log_tick_sampling_end(tick_info = tick_wrapper.tick_info, sampling_ticks = sampling_ticks)
+    return bar_wrapper
+
+
+class LateTickException(ValueError):
+    def __init__(self, tick_info : data.TickInfo, timestamp : int):
+        message = "Tick arrived after its bar was formed : " + str(tick_info) + " : time stamp " + str(timestamp)
+        super().__init__(message)
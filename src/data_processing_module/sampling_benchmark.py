@@ -0,0 +1,174 @@
+import csv
+import datetime
+import logging
+import os
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict, fields
+from enum import Enum
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+import src.data_base_module.data_blocks as data
+import src.data_processing_module.sampling as sampling
+import src.data_processing_module.data_processing_logger as dp_logger
+
+
+# ------ synthetic tick data ------
+""" Synthetic tick data with the shape of a real trading session
+-> ticks arrive with exponential inter arrival times, a tick carries a trade with probability trade_probability
+-> the best bid follows a random walk on the tick grid, the best ask is 1 to 3 ticks above the bid,
+   trades happen at the bid or at the ask
+-> trade sizes follow quantity_distribution, a small fraction of the trades are block trades far larger than a bar
+   (e.g. a block of 2000 lots spans 20 volume bars of 100) """
+class QuantityDistribution(Enum):
+    GEOMETRIC = "geometric"
+    POISSON = "poisson"
+    LOG_NORMAL = "log_normal"
+
+
+@dataclass
+class SyntheticTickConfig:
+    trade_probability : float = 0.5
+    quantity_distribution : QuantityDistribution = QuantityDistribution.GEOMETRIC
+    mean_quantity : float = 5.0
+    block_trade_probability : float = 0.001
+    block_trade_quantity_range : Tuple[int, int] = (500, 5000)
+    start_price : float = 19000.0
+    price_tick_size : float = 5.0
+    mean_tick_interval_nanos : int = 5 * 10 ** 6
+
+
+def draw_quantities(rng : np.random.Generator, config : SyntheticTickConfig, num_trades : int) -> np.ndarray:
+    """ :return: positive integer trade sizes of mean (about) config.mean_quantity, block trades included """
+    if config.quantity_distribution == QuantityDistribution.GEOMETRIC:
+        quantities = rng.geometric(1 / config.mean_quantity, num_trades)
+    elif config.quantity_distribution == QuantityDistribution.POISSON:
+        quantities = 1 + rng.poisson(config.mean_quantity - 1, num_trades)
+    elif config.quantity_distribution == QuantityDistribution.LOG_NORMAL:
+        # ------ sigma = 1, mu is chosen for a mean of mean_quantity ------
+        quantities = np.maximum(np.rint(rng.lognormal(np.log(config.mean_quantity) - 0.5, 1.0, num_trades)), 1)
+    else:
+        raise NotImplementedError()
+    is_block_bool_arr = rng.random(num_trades) < config.block_trade_probability
+    block_quantities = rng.integers(config.block_trade_quantity_range[0], config.block_trade_quantity_range[1] + 1, num_trades)
+    return np.where(is_block_bool_arr, block_quantities, quantities).astype(np.int32)
+
+
+def make_synthetic_ticks(num_ticks : int, config : Optional[SyntheticTickConfig] = None, seed : int = 0) -> data.TickDataFrame:
+    """
+    :param config: None uses the default SyntheticTickConfig
+    :return: a whole day tick data frame of the data base schema, ticks without trade have a price and quantity of 0
+    NOTE : only the best bid and ask are filled, the other depth columns are 0
+    """
+    config = SyntheticTickConfig() if config is None else config
+    rng = np.random.default_rng(seed)
+    tick_df = pd.DataFrame({col.value : np.zeros(num_ticks, dtype = np.float32) for col in data.TickDataColumns})
+    inter_arrival_nanos = np.maximum(rng.exponential(config.mean_tick_interval_nanos, num_ticks).astype(np.int64), 1)
+    tick_df[data.TickDataColumns.TIMESTAMP_NANO.value] = 1488844800000000000 + np.cumsum(inter_arrival_nanos)
+    # ------ quotes on the tick grid, bid random walk and a spread of 1 to 3 ticks ------
+    bid_ticks = np.cumsum(rng.choice([-1, 0, 0, 1], num_ticks))
+    spread_ticks = rng.choice([1, 1, 1, 2, 3], num_ticks)
+    best_bids = (config.start_price + config.price_tick_size * bid_ticks).astype(np.float32)
+    best_asks = (best_bids + config.price_tick_size * spread_ticks).astype(np.float32)
+    tick_df[data.TickDataColumns.BID1P.value] = best_bids
+    tick_df[data.TickDataColumns.ASK1P.value] = best_asks
+    # ------ trades at the bid or at the ask ------
+    has_trade_bool_arr = rng.random(num_ticks) < config.trade_probability
+    trade_prices = np.where(rng.random(num_ticks) < 0.5, best_bids, best_asks)
+    tick_df[data.TickDataColumns.LAST_PRICE.value] = np.where(has_trade_bool_arr, trade_prices, 0).astype(np.float32)
+    tick_df[data.TickDataColumns.LAST_QUANTITY.value] = np.where(has_trade_bool_arr, draw_quantities(rng, config, num_ticks), 0).astype(np.int32)
+    tick_info = data.TickInfo(symbol = "SYNTHETIC", date = data.Date(day = 7, month = 3, year = 2017), intra_day_period = data.IntraDayPeriod.WHOLE_DAY)
+    return data.TickDataFrame.wrap_without_copy(tick_df, tick_info)
+
+
+# ------ sampling benchmark ------
+""" Times every sampler on synthetic tick data of increasing size and appends the results to a csv file
+-> the time is the best of `repeats` runs, the peak memory is measured by tracemalloc in a separate run
+   (tracing slows down allocations, the timed runs are not traced)
+-> the peak memory is the memory allocated by the sampler on top of the tick data, numpy arrays are traced
+-> every run of the benchmark appends its rows with the same run label, runs can be compared in the results file """
+BENCHMARK_SIZES : List[int] = [10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+
+
+def make_default_samplers() -> List[Tuple[str, Callable[[data.TickDataFrame], data.BarDataFrame]]]:
+    return [
+        ("time_sampling_60", lambda tick_wrapper : sampling.time_sampling(tick_wrapper, sampling_seconds = 60)),
+        ("tick_sampling_200", lambda tick_wrapper : sampling.tick_sampling(tick_wrapper, sampling_ticks = 200)),
+        ("volume_sampling_100", lambda tick_wrapper : sampling.volume_sampling(tick_wrapper, sampling_volume = 100)),
+        ("dollar_sampling_2000000", lambda tick_wrapper : sampling.dollar_sampling(tick_wrapper, sampling_dollar = 2000000)),
+        ("tick_sampling_limit_book_200", lambda tick_wrapper : sampling.tick_sampling_limit_book(tick_wrapper, sampling_ticks = 200)),
+        ("volume_sampling_limit_book_100", lambda tick_wrapper : sampling.volume_sampling_limit_book(tick_wrapper, sampling_volume = 100)),
+    ]
+
+
+@dataclass
+class BenchmarkResult:
+    run_label : str
+    sampler_name : str
+    num_ticks : int
+    num_bars : int
+    seconds : float
+    ticks_per_second : float
+    peak_memory_mb : float
+
+
+def benchmark_sampler(run_label : str, sampler_name : str, sampler_func : Callable[[data.TickDataFrame], data.BarDataFrame],
+                      tick_wrapper : data.TickDataFrame, repeats : int = 3) -> BenchmarkResult:
+    """ :param repeats: number of timed runs, at least 1 """
+    if repeats < 1:
+        raise ValueError(f"The number of timed runs should be at least 1 : repeats : {repeats}")
+    best_seconds = float("inf")
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        sampler_func(tick_wrapper)
+        best_seconds = min(best_seconds, time.perf_counter() - start_time)
+    tracemalloc.start()
+    try:
+        num_bars = len(sampler_func(tick_wrapper))
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return BenchmarkResult(run_label = run_label, sampler_name = sampler_name, num_ticks = len(tick_wrapper), num_bars = num_bars,
+                           seconds = best_seconds, ticks_per_second = len(tick_wrapper) / max(best_seconds, 1e-9),
+                           peak_memory_mb = peak_bytes / 2 ** 20)
+
+
+def append_benchmark_results(results : List[BenchmarkResult], results_file_path : str) -> None:
+    """ appends the results to a csv file, the header is written when the file is created """
+    is_new_file = not os.path.exists(results_file_path)
+    with open(results_file_path, "a", newline = "") as results_file:
+        writer = csv.DictWriter(results_file, fieldnames = [field.name for field in fields(BenchmarkResult)])
+        if is_new_file:
+            writer.writeheader()
+        writer.writerows([asdict(result) for result in results])
+
+
+def run_sampling_benchmark(results_file_path : str, sizes : Optional[List[int]] = None, config : Optional[SyntheticTickConfig] = None,
+                           samplers : Optional[List[Tuple[str, Callable]]] = None, repeats : int = 3, run_label : Optional[str] = None,
+                           seed : int = 0) -> List[BenchmarkResult]:
+    """
+    :param results_file_path: csv file the results are appended to
+    :param sizes: numbers of ticks, None uses BENCHMARK_SIZES (10k to 10M ticks)
+    :param samplers: (name, function of a tick data frame) pairs, None uses make_default_samplers()
+    :param run_label: label of the rows of this run, None uses the current time
+    NOTE : the rows of each size are appended as soon as the size is done, a run that fails on a large size keeps the smaller sizes
+    NOTE : the sampling logs are silenced while the benchmark runs
+    """
+    sizes = BENCHMARK_SIZES if sizes is None else sizes
+    samplers = make_default_samplers() if samplers is None else samplers
+    run_label = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S") if run_label is None else run_label
+    previous_level = dp_logger.LOGGER.level
+    dp_logger.LOGGER.setLevel(logging.WARNING)
+    results = []
+    try:
+        for num_ticks in sizes:
+            tick_wrapper = make_synthetic_ticks(num_ticks, config = config, seed = seed)
+            size_results = [benchmark_sampler(run_label, sampler_name, sampler_func, tick_wrapper, repeats = repeats)
+                            for sampler_name, sampler_func in samplers]
+            del tick_wrapper
+            append_benchmark_results(size_results, results_file_path)
+            results.extend(size_results)
+    finally:
+        dp_logger.LOGGER.setLevel(previous_level)
+    return results
@@ -0,0 +1,108 @@
+import definitions
+import enum
+import hashlib
+import json
+import os
+import pickle
+import numpy as np
+from typing import Any, Callable
+import src.data_base_module.data_blocks as data
+import src.machine_learning_module.machine_learning_logger as ml_logger
+
+
+# ------ persistent cache for derived artifacts -------
+""" Features, labels and filters are stored on disk under a key made of
+-> a hash of the full configuration of the generator (class, parameters_dict, alias, barriers, thresholds ...)
+-> a fingerprint of the bar data frame the artifact was created from
+A change to either produces a new key, so stale artifacts are never returned
+NOTE : bump ARTIFACT_CACHE_VERSION whenever the way features, labels or filters are computed changes """
+
+ARTIFACT_CACHE_VERSION : int = 1
+FEATURE_ARTIFACT : str = "features"
+LABEL_ARTIFACT : str = "labels"
+FILTER_ARTIFACT : str = "filters"
+
+
+def describe_configuration(value : Any) -> Any:
+    """ converts a generator and everything it holds into a json serializable description """
+    if isinstance(value, enum.Enum):
+        return f"{type(value).__name__}.{value.name}"
+    if isinstance(value, (str, bool, int, float)) or value is None:
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(key) : describe_configuration(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [describe_configuration(val) for val in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((describe_configuration(val) for val in value), key = str)
+    if callable(value):
+        return f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', repr(value))}"
+    if hasattr(value, "__dict__"):
+        return {"class" : f"{type(value).__module__}.{type(value).__qualname__}",
+                "attributes" : describe_configuration(vars(value))}
+    return repr(value)
+
+
+def hash_generator_configuration(generator : Any) -> str:
+    description = {"version" : ARTIFACT_CACHE_VERSION, "generator" : describe_configuration(generator)}
+    return hashlib.sha256(json.dumps(description, sort_keys = True).encode()).hexdigest()
+
+
+def fingerprint_bar_data(bar_wrapper : data.BarDataFrame) -> str:
+    """ hash of the bar info and of the values, data types and column names of the bar data """
+    sha256 = hashlib.sha256(str(bar_wrapper.bar_info).encode())
+    for col_name in bar_wrapper.bar_data.columns:
+        column_array = np.ascontiguousarray(bar_wrapper.bar_data[col_name].to_numpy())
+        sha256.update(f"{col_name}:{column_array.dtype.str}:{len(column_array)}".encode())
+        sha256.update(memoryview(column_array).cast("B"))
+    return sha256.hexdigest()
+
+
+class ArtifactCache:
+    """
+    On disk cache of FeatureDataFrame, LabelDataFrame and FilterArray objects
+    Each artifact is a pickle file named by its key, under [cache folder]/[artifact kind]/
+    """
+    def __init__(self, cache_folder_path : str = os.path.join(definitions.DATA_FOLDER_PATH, "artifact_cache")):
+        self.cache_folder_path : str = cache_folder_path
+        self.hits : int = 0
+        self.misses : int = 0
+
+    def get_artifact_file_path(self, artifact_kind : str, generator : Any, bar_wrapper : data.BarDataFrame) -> str:
+        key = hashlib.sha256((hash_generator_configuration(generator) + fingerprint_bar_data(bar_wrapper)).encode()).hexdigest()
+        return os.path.join(self.cache_folder_path, artifact_kind, key + ".pkl")
+
+    def get_or_create(self, artifact_kind : str, generator : Any, bar_wrapper : data.BarDataFrame,
+                      create_func : Callable[[data.BarDataFrame], Any]) -> Any:
+        """
+        :param artifact_kind: FEATURE_ARTIFACT, LABEL_ARTIFACT or FILTER_ARTIFACT
+        :param generator: the generator whose configuration identifies the artifact
+        :param create_func: creates the artifact on a cache miss, e.g. generator.create_labels_for_data_bar
+        """
+        file_path = self.get_artifact_file_path(artifact_kind, generator, bar_wrapper)
+        if os.path.exists(file_path):
+            with open(file_path, "rb") as artifact_file:
+                artifact = pickle.load(artifact_file)
+            self.hits += 1
+            ml_logger.log_artifact_cache_hit(artifact_kind = artifact_kind, bar_wrapper = bar_wrapper)
+            return artifact
+        self.misses += 1
+        artifact = create_func(bar_wrapper)
+        # ------ write to a temporary file first so that an interrupted run does not leave a broken artifact ------
+        os.makedirs(os.path.dirname(file_path), exist_ok = True)
+        temp_file_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(temp_file_path, "wb") as artifact_file:
+            pickle.dump(artifact, artifact_file, protocol = pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file_path, file_path)
+        return artifact
+
+    def get_or_create_features(self, feature_generator, bar_wrapper : data.BarDataFrame):
+        return self.get_or_create(FEATURE_ARTIFACT, feature_generator, bar_wrapper, feature_generator.create_features_for_data_bar)
+
+    def get_or_create_labels(self, label_generator, bar_wrapper : data.BarDataFrame):
+        return self.get_or_create(LABEL_ARTIFACT, label_generator, bar_wrapper, label_generator.create_labels_for_data_bar)
+
+    def get_or_create_filter(self, filter_generator, bar_wrapper : data.BarDataFrame):
+        return self.get_or_create(FILTER_ARTIFACT, filter_generator, bar_wrapper, filter_generator.create_filter_for_data_bar)
@@ -60,6 +60,14 @@ def log_filter_feature_label(dataset_description : str):
 def log_cross_val_completion(number_completed : int):
     LOGGER.info(pipeline_submodule_str + f"complete cross validating train test set : {number_completed}")
 
+def log_artifact_cache_summary(hits : int, misses : int):
+    LOGGER.info(pipeline_submodule_str + f"artifact cache -- hits : {hits} -- misses : {misses}")
+
+# ----- artifact cache logger -----
+artifact_cache_submodule_str = "SubModule : artifact_cache --"
+def log_artifact_cache_hit(artifact_kind : str, bar_wrapper : data.BarDataFrame):
+    LOGGER.info(artifact_cache_submodule_str + f"loaded cached {artifact_kind} for : {bar_wrapper}")
+
 # ----- boot strap logger -----
 bootstrap_submodule_str = "SubModule : bootstraping"
 def log_boot_strap(boot_strap_gen_name : str, label_data_frame_description : str, filter_description : str):
@@ -8,13 +8,15 @@ import src.data_base_module.data_blocks as data
 import src.machine_learning_module.feature_generators as feature_gen_mod
 import src.machine_learning_module.label_generators as label_gen_mod
 import src.machine_learning_module.filter_generators as filter_gen_mod
+import src.machine_learning_module.artifact_cache as artifact_cache_mod
 import src.machine_learning_module.machine_learning_logger as ml_logger
 import src.machine_learning_module.performance_metrics as perf_mod
 
 
 # ------ set up data -----
 def apply_transforms_to_data(bar_wrapper_lst : List[data.BarDataFrame], feature_generator : feature_gen_mod.FeatureGenerator,
-                             label_generator : label_gen_mod.LabelGenerator, filter_generator : filter_gen_mod.FilterGenerator)\
+                             label_generator : label_gen_mod.LabelGenerator, filter_generator : filter_gen_mod.FilterGenerator,
+                             artifact_cache : artifact_cache_mod.ArtifactCache = None)\
                             ->(List[feature_gen_mod.FeatureDataFrame], List[label_gen_mod.LabelDataFrame], List[filter_gen_mod.FilterArray]):
     """
     Takes in a feature generator, label generator and filter generator and applies them to the list of data frames
@@ -22,15 +24,23 @@ def apply_transforms_to_data(bar_wrapper_lst : List[data.BarDataFrame], feature_
     :param feature_generator:
     :param label_generator:
     :param filter_generator:
+    :param artifact_cache: optional, features, labels and filters already computed with the same generator configuration
+    on the same bar data are loaded from the cache instead of being recomputed
     :return: List of feature data frames, List of label data frames, List of Filter arrays listed in the same order as the input
     bardata frames and produced from the corresponding bar data frame
     """
-    feature_df_lst: List[feature_gen_mod.FeatureDataFrame] = [
-        feature_generator.create_features_for_data_bar(bar_wrapper) for bar_wrapper in bar_wrapper_lst]
-    label_df_lst: List[label_gen_mod.LabelDataFrame] = [label_generator.create_labels_for_data_bar(bar_wrapper) for
-                                                        bar_wrapper in bar_wrapper_lst]
-    filter_array_lst: List[filter_gen_mod.FilterArray] = [filter_generator.create_filter_for_data_bar(bar_wrapper) for
-                                                          bar_wrapper in bar_wrapper_lst]
+    if artifact_cache is None:
+        feature_df_lst: List[feature_gen_mod.FeatureDataFrame] = [
+            feature_generator.create_features_for_data_bar(bar_wrapper) for bar_wrapper in bar_wrapper_lst]
+        label_df_lst: List[label_gen_mod.LabelDataFrame] = [label_generator.create_labels_for_data_bar(bar_wrapper) for
+                                                            bar_wrapper in bar_wrapper_lst]
+        filter_array_lst: List[filter_gen_mod.FilterArray] = [filter_generator.create_filter_for_data_bar(bar_wrapper) for
+                                                              bar_wrapper in bar_wrapper_lst]
+        return feature_df_lst, label_df_lst, filter_array_lst
+    feature_df_lst = [artifact_cache.get_or_create_features(feature_generator, bar_wrapper) for bar_wrapper in bar_wrapper_lst]
+    label_df_lst = [artifact_cache.get_or_create_labels(label_generator, bar_wrapper) for bar_wrapper in bar_wrapper_lst]
+    filter_array_lst = [artifact_cache.get_or_create_filter(filter_generator, bar_wrapper) for bar_wrapper in bar_wrapper_lst]
+    ml_logger.log_artifact_cache_summary(hits = artifact_cache.hits, misses = artifact_cache.misses)
     return feature_df_lst, label_df_lst, filter_array_lst
 
 def filter_features_and_labels(feature_wrapper : feature_gen_mod.FeatureDataFrame, label_wrapper : label_gen_mod.LabelDataFrame, filter_array : filter_gen_mod.FilterArray,
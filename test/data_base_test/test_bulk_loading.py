@@ -0,0 +1,52 @@
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+import src.data_base_module.data_blocks as dat
+import src.data_base_module.storage_backends as storage
+from src.data_base_module.data_retrival import DataBase, make_interleaved_bar_infos
+
+
+class BulkLoadingTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DataBase(storage_backend=storage.ParquetStorageBackend(), data_storage_folder_path=self.temp_dir.name)
+        self.symbol = "TEST"
+        self.dates = [dat.Date(day=day, month=3, year=2017) for day in range(1, 11)]
+        for date in self.dates:
+            for intra_day_period in [dat.IntraDayPeriod.MORNING, dat.IntraDayPeriod.AFTERNOON]:
+                bar_df = pd.DataFrame({col.value : np.full(4, date.day * 1.0) for col in dat.BarDataColumns})
+                bar_info = dat.BarInfo(symbol=self.symbol, date=date, intra_day_period=intra_day_period,
+                                       sampling_type=dat.Sampling.VOLUME, sampling_level=20)
+                self.db.insert_sampled_bar(dat.BarDataFrame(bar_data=bar_df, bar_info=bar_info))
+            tick_df = pd.DataFrame({col.value : np.full(6, date.day) for col in dat.TickDataColumns})
+            tick_info = dat.TickInfo(symbol=self.symbol, date=date, intra_day_period=dat.IntraDayPeriod.MORNING)
+            self.db.insert_clean_tick_data(dat.TickDataFrame(tick_df=tick_df, tick_info=tick_info))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_interleaved_order(self):
+        bar_infos = make_interleaved_bar_infos(symbol=self.symbol, dates=self.dates, sampling_type=dat.Sampling.VOLUME, sampling_level=20)
+        bar_wrappers = self.db.load_many(bar_infos, workers=4)
+        self.assertEqual(len(bar_wrappers), 20)
+        for bar_info, bar_wrapper in zip(bar_infos, bar_wrappers):
+            self.assertEqual(bar_wrapper.bar_info, bar_info)
+            self.assertEqual(bar_wrapper.get_column(dat.BarDataColumns.CLOSE).iloc[0], bar_info.date.day)
+        self.assertEqual(bar_wrappers[0].bar_info.intra_day_period, dat.IntraDayPeriod.MORNING)
+        self.assertEqual(bar_wrappers[1].bar_info.intra_day_period, dat.IntraDayPeriod.AFTERNOON)
+
+    def test_parallel_matches_serial(self):
+        requests = [dat.TickInfo(symbol=self.symbol, date=date, intra_day_period=dat.IntraDayPeriod.MORNING) for date in self.dates]
+        requests += make_interleaved_bar_infos(symbol=self.symbol, dates=self.dates[::-1], sampling_type=dat.Sampling.VOLUME, sampling_level=20)
+        serial_lst = self.db.load_many(requests, workers=1)
+        thread_lst = self.db.load_many(requests, workers=4)
+        process_lst = self.db.load_many(requests, workers=2, use_processes=True)
+        self.assertEqual(serial_lst, thread_lst)
+        self.assertEqual(serial_lst, process_lst)
+
+    def test_missing_file(self):
+        missing_info = dat.BarInfo(symbol=self.symbol, date=dat.Date(day=1, month=1, year=2000), intra_day_period=dat.IntraDayPeriod.MORNING,
+                                   sampling_type=dat.Sampling.VOLUME, sampling_level=20)
+        with self.assertRaises(FileNotFoundError):
+            self.db.load_many([missing_info] * 3, workers=3)
@@ -0,0 +1,78 @@
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+import src.data_base_module.data_blocks as dat
+import src.data_base_module.storage_backends as storage
+import src.data_base_module.data_cache as dat_cache
+from src.data_base_module.data_retrival import DataBase
+
+
+class RecordingStorageBackend(storage.ParquetStorageBackend):
+    """ records the columns of every read """
+    def __init__(self):
+        super().__init__()
+        self.read_columns = []
+
+    def read_frame(self, file_path : str, dtypes):
+        self.read_columns.append(list(dtypes.keys()))
+        return super().read_frame(file_path, dtypes)
+
+
+class ColumnProjectionTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.backend = RecordingStorageBackend()
+        self.db = DataBase(storage_backend=self.backend, data_storage_folder_path=self.temp_dir.name)
+        self.date = dat.Date(day=7, month=3, year=2017)
+        tick_df = pd.DataFrame({col.value : np.arange(20) + i for i, col in enumerate(dat.TickDataColumns)})
+        self.tick_wrapper = dat.TickDataFrame(tick_df=tick_df, tick_info=dat.TickInfo(symbol="TEST", date=self.date, intra_day_period=dat.IntraDayPeriod.MORNING))
+        self.db.insert_clean_tick_data(self.tick_wrapper)
+        bar_df = pd.DataFrame({col.value : np.arange(10) * 2.0 for col in dat.BarDataColumns})
+        self.bar_info = dat.BarInfo(symbol="TEST", date=self.date, intra_day_period=dat.IntraDayPeriod.MORNING, sampling_type=dat.Sampling.VOLUME, sampling_level=20)
+        self.db.insert_sampled_bar(dat.BarDataFrame(bar_data=bar_df, bar_info=self.bar_info))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def get_clean_ticks(self, columns):
+        return self.db.get_clean_tick_data(symbol="TEST", date=self.date, intra_day_period=dat.IntraDayPeriod.MORNING, columns=columns)
+
+    def test_projection_reads_requested_columns(self):
+        lazy_wrapper = self.get_clean_ticks(dat.TRADE_TICK_COLUMNS)
+        self.assertEqual(self.backend.read_columns, [[col.value for col in dat.TRADE_TICK_COLUMNS]])
+        self.assertEqual(len(lazy_wrapper), 20)
+        self.assertTrue(lazy_wrapper.is_loaded(dat.TickDataColumns.LAST_PRICE))
+        self.assertFalse(lazy_wrapper.is_loaded(dat.TickDataColumns.ASK1P))
+        trade_df = lazy_wrapper.get_columns([dat.TickDataColumns.LAST_QUANTITY, dat.TickDataColumns.TIMESTAMP_NANO])
+        self.assertEqual(list(trade_df.columns), [dat.TickDataColumns.LAST_QUANTITY.value, dat.TickDataColumns.TIMESTAMP_NANO.value])
+        self.assertEqual(len(self.backend.read_columns), 1)
+
+    def test_depth_columns_load_on_access(self):
+        lazy_wrapper = self.get_clean_ticks([])
+        self.assertEqual(self.backend.read_columns, [])
+        self.assertEqual(list(lazy_wrapper.get_column(dat.TickDataColumns.BID2P).iloc[:2]), [14.0, 15.0])
+        self.assertEqual(self.backend.read_columns, [[dat.TickDataColumns.BID2P.value]])
+        # ------ tick_data reads the remaining columns only ------
+        eager_wrapper = self.get_clean_ticks(None)
+        self.assertEqual(lazy_wrapper, eager_wrapper)
+        self.assertEqual(len(self.backend.read_columns[-1]), len(dat.TickDataColumns) - 1)
+
+    def test_lazy_bar(self):
+        lazy_bar = self.db.get_sampled_bar(symbol="TEST", date=self.date, intra_day_period=dat.IntraDayPeriod.MORNING, sampling_level=20,
+                                           sampling_type=dat.Sampling.VOLUME, columns=[dat.BarDataColumns.CLOSE])
+        self.assertEqual(lazy_bar.get_column(dat.BarDataColumns.CLOSE).iloc[-1], 18.0)
+        self.assertEqual(self.backend.read_columns, [[dat.BarDataColumns.CLOSE.value]])
+        self.assertEqual(len(lazy_bar.bar_data.columns), len(dat.BarDataColumns))
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            self.db.get_clean_tick_data(symbol="TEST", date=self.date, intra_day_period=dat.IntraDayPeriod.AFTERNOON, columns=[])
+
+    def test_insert_invalidates_projections(self):
+        self.db.cache = dat_cache.DataCache(max_bytes=10 ** 6)
+        self.get_clean_ticks(dat.TRADE_TICK_COLUMNS)
+        tick_df = self.tick_wrapper.tick_data.copy()
+        tick_df[dat.TickDataColumns.LAST_PRICE.value] = 5
+        self.db.insert_clean_tick_data(dat.TickDataFrame(tick_df=tick_df, tick_info=self.tick_wrapper.tick_info))
+        self.assertEqual(self.get_clean_ticks(dat.TRADE_TICK_COLUMNS).get_column(dat.TickDataColumns.LAST_PRICE).iloc[0], 5)
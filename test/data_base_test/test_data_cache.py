@@ -0,0 +1,72 @@
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+import src.data_base_module.data_blocks as dat
+import src.data_base_module.storage_backends as storage
+import src.data_base_module.data_cache as dat_cache
+from src.data_base_module.data_retrival import DataBase
+
+
+class DataCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DataBase(storage_backend=storage.CsvStorageBackend(), data_storage_folder_path=self.temp_dir.name,
+                           cache=dat_cache.DataCache(max_bytes=2 ** 30))
+        self.symbol = "TEST"
+        self.dates = [dat.Date(day=day, month=3, year=2017) for day in (1, 2, 3)]
+        for date in self.dates:
+            self.db.insert_sampled_bar(self.create_bar_wrapper(date, close_price=date.day))
+        # ------ the cache holds exactly two bar data frames, the size of a bar is measured by the cache itself ------
+        self.get_bar(self.dates[0])
+        bar_bytes = self.db.cache.get_statistics().current_bytes
+        self.cache = dat_cache.DataCache(max_bytes=bar_bytes * 2)
+        self.db.cache = self.cache
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def create_bar_wrapper(self, date : dat.Date, close_price : float) -> dat.BarDataFrame:
+        bar_df = pd.DataFrame({col.value : np.arange(10) * 1.0 for col in dat.BarDataColumns})
+        bar_df[dat.BarDataColumns.CLOSE.value] = close_price
+        bar_info = dat.BarInfo(symbol=self.symbol, date=date, intra_day_period=dat.IntraDayPeriod.MORNING,
+                               sampling_type=dat.Sampling.VOLUME, sampling_level=20)
+        return dat.BarDataFrame(bar_data=bar_df, bar_info=bar_info)
+
+    def get_bar(self, date : dat.Date) -> dat.BarDataFrame:
+        return self.db.get_sampled_bar(symbol=self.symbol, date=date, intra_day_period=dat.IntraDayPeriod.MORNING,
+                                       sampling_level=20, sampling_type=dat.Sampling.VOLUME)
+
+    def test_hits_and_misses(self):
+        first_wrapper = self.get_bar(self.dates[0])
+        second_wrapper = self.get_bar(self.dates[0])
+        statistics = self.cache.get_statistics()
+        self.assertEqual((statistics.hits, statistics.misses), (1, 1))
+        self.assertEqual(first_wrapper, second_wrapper)
+
+    def test_lru_eviction(self):
+        self.get_bar(self.dates[0])
+        self.get_bar(self.dates[1])
+        self.get_bar(self.dates[0])
+        self.get_bar(self.dates[2])
+        statistics = self.cache.get_statistics()
+        self.assertEqual(statistics.evictions, 1)
+        self.assertEqual(statistics.num_entries, 2)
+        self.assertLessEqual(statistics.current_bytes, statistics.max_bytes)
+        # ------ date 1 was the least recently used and has been evicted ------
+        self.get_bar(self.dates[0])
+        self.assertEqual(self.cache.get_statistics().hits, 2)
+        self.get_bar(self.dates[1])
+        self.assertEqual(self.cache.get_statistics().misses, 4)
+
+    def test_read_only(self):
+        bar_wrapper = self.get_bar(self.dates[0])
+        with self.assertRaises(ValueError):
+            bar_wrapper.bar_data.loc[0, dat.BarDataColumns.CLOSE.value] = 100
+        self.assertEqual(self.get_bar(self.dates[0]).get_column(dat.BarDataColumns.CLOSE).iloc[0], 1)
+
+    def test_insert_invalidates(self):
+        self.get_bar(self.dates[0])
+        self.db.insert_sampled_bar(self.create_bar_wrapper(self.dates[0], close_price=99))
+        self.assertEqual(self.get_bar(self.dates[0]).get_column(dat.BarDataColumns.CLOSE).iloc[0], 99)
+        self.assertEqual(self.cache.get_statistics().hits, 0)
@@ -0,0 +1,82 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import src.data_base_module.data_blocks as dat
+import src.data_base_module.storage_backends as storage
+from src.data_base_module.data_retrival import DataBase
+
+
+class DataCatalogTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DataBase(storage_backend=storage.CsvStorageBackend(), data_storage_folder_path=self.temp_dir.name)
+        self.symbol = "TEST"
+        self.dates = [dat.Date(day=day, month=2, year=2017) for day in (1, 2, 3, 6)]
+        # ------ insert afternoon before morning to check the ordering of the queries ------
+        for date in self.dates:
+            for intra_day_period in [dat.IntraDayPeriod.AFTERNOON, dat.IntraDayPeriod.MORNING]:
+                bar_df = pd.DataFrame({col.value : np.arange(5) * 1.0 for col in dat.BarDataColumns})
+                bar_df[dat.BarDataColumns.TIMESTAMP.value] = np.arange(5) * 10 + date.day * 1000
+                bar_info = dat.BarInfo(symbol=self.symbol, date=date, intra_day_period=intra_day_period,
+                                       sampling_type=dat.Sampling.VOLUME, sampling_level=20)
+                self.db.insert_sampled_bar(dat.BarDataFrame(bar_data=bar_df, bar_info=bar_info))
+        tick_df = pd.DataFrame({col.value : np.arange(7) for col in dat.TickDataColumns})
+        self.tick_info = dat.TickInfo(symbol=self.symbol, date=self.dates[0], intra_day_period=dat.IntraDayPeriod.WHOLE_DAY)
+        self.db.insert_clean_tick_data(dat.TickDataFrame(tick_df=tick_df, tick_info=self.tick_info))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_list_available_order(self):
+        bar_infos = self.db.list_available(symbol=self.symbol, sampling_type=dat.Sampling.VOLUME, sampling_level=20)
+        self.assertEqual(len(bar_infos), 8)
+        self.assertEqual([bar_info.date for bar_info in bar_infos[:2]], [self.dates[0], self.dates[0]])
+        self.assertEqual([bar_info.intra_day_period for bar_info in bar_infos[:2]],
+                         [dat.IntraDayPeriod.MORNING, dat.IntraDayPeriod.AFTERNOON])
+
+    def test_list_available_date_range(self):
+        bar_infos = self.db.list_available(symbol=self.symbol, sampling_type=dat.Sampling.VOLUME, sampling_level=20,
+                                           date_range=(self.dates[1], self.dates[2]),
+                                           intra_day_periods=[dat.IntraDayPeriod.MORNING])
+        self.assertEqual([bar_info.date for bar_info in bar_infos], [self.dates[1], self.dates[2]])
+        self.assertEqual(self.db.list_available(symbol=self.symbol, sampling_type=dat.Sampling.VOLUME, sampling_level=50), [])
+
+    def test_get_sampled_bars_range(self):
+        bar_wrappers = self.db.get_sampled_bars_range(symbol=self.symbol, sampling_type=dat.Sampling.VOLUME, sampling_level=20,
+                                                      date_range=(self.dates[2], self.dates[3]))
+        self.assertEqual(len(bar_wrappers), 4)
+        self.assertEqual(bar_wrappers[-1].bar_info.date, self.dates[3])
+        self.assertEqual(bar_wrappers[-1].bar_info.intra_day_period, dat.IntraDayPeriod.AFTERNOON)
+
+    def test_entry_statistics(self):
+        entries = self.db.catalog.query_bar_entries(symbol=self.symbol, sampling_type=dat.Sampling.VOLUME, sampling_level=20,
+                                                    date_range=(self.dates[0], self.dates[0]))
+        self.assertEqual(entries[0].row_count, 5)
+        self.assertEqual(entries[0].start_timestamp, 1000)
+        self.assertEqual(entries[0].end_timestamp, 1040)
+        self.assertEqual(len(entries[0].checksum), 64)
+
+    def test_rebuild_catalog_skips_stray_files(self):
+        # ------ a file with an unrecognised name in each data folder is not recorded ------
+        stray_file_paths = [os.path.join(self.db.tick_data_folder_path, self.symbol, "notes.csv"),
+                            os.path.join(self.db.tick_clean_data_folder, "notes.csv"),
+                            os.path.join(self.db.bar_data_folder_path, self.symbol, "volume", "notes.csv")]
+        for stray_file_path in stray_file_paths:
+            os.makedirs(os.path.dirname(stray_file_path), exist_ok=True)
+            with open(stray_file_path, "w") as stray_file:
+                stray_file.write("not data\n")
+        self.assertIsNone(self.db.parse_raw_tick_file_path(stray_file_paths[0]))
+        self.assertIsNone(self.db.parse_clean_tick_file_path(stray_file_paths[1]))
+        self.assertIsNone(self.db.parse_sampled_bar_file_path(stray_file_paths[2]))
+        self.assertEqual(self.db.rebuild_catalog(), 9)
+        self.assertEqual(self.db.list_available_clean_ticks(symbol=self.symbol), [self.tick_info])
+
+    def test_rebuild_catalog(self):
+        os.remove(self.db.catalog.catalog_file_path)
+        self.assertEqual(self.db.list_available_clean_ticks(symbol=self.symbol), [])
+        num_recorded = self.db.rebuild_catalog()
+        self.assertEqual(num_recorded, 9)
+        self.assertEqual(self.db.list_available_clean_ticks(symbol=self.symbol), [self.tick_info])
+        self.assertEqual(len(self.db.list_available(symbol=self.symbol, sampling_type=dat.Sampling.VOLUME, sampling_level=20)), 8)
@@ -0,0 +1,80 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import src.data_base_module.data_blocks as dat
+import src.data_base_module.storage_backends as storage
+from src.data_base_module.data_retrival import DataBase, migrate_data_base
+
+
+class DataSchemaTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.date = dat.Date(day=7, month=3, year=2017)
+        self.symbol = "TEST"
+        num_ticks = 100
+        tick_df = pd.DataFrame({col.value : np.arange(num_ticks) * 1.0 + 19000 for col in dat.TickDataColumns})
+        tick_df[dat.TickDataColumns.TIMESTAMP_NANO.value] = 1488844800000000000 + np.arange(num_ticks) * 1000
+        # ------ interpolated quantities are rounded when stored ------
+        tick_df[dat.TickDataColumns.ASK1Q.value] = np.arange(num_ticks) + 0.75
+        self.tick_info = dat.TickInfo(symbol=self.symbol, date=self.date, intra_day_period=dat.IntraDayPeriod.MORNING)
+        self.tick_wrapper = dat.TickDataFrame(tick_df=tick_df, tick_info=self.tick_info)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_compact_dtypes(self):
+        db = DataBase(storage_backend=storage.CsvStorageBackend(), data_storage_folder_path=self.temp_dir.name)
+        db.insert_clean_tick_data(self.tick_wrapper)
+        tick_df = db.get_clean_tick_data(symbol=self.symbol, date=self.date, intra_day_period=dat.IntraDayPeriod.MORNING).tick_data
+        self.assertEqual(tick_df[dat.TickDataColumns.TIMESTAMP_NANO.value].dtype, np.int64)
+        self.assertEqual(tick_df[dat.TickDataColumns.LAST_PRICE.value].dtype, np.float32)
+        self.assertEqual(tick_df[dat.TickDataColumns.BID3Q.value].dtype, np.int32)
+        self.assertEqual(list(tick_df[dat.TickDataColumns.ASK1Q.value].iloc[:3]), [1, 2, 3])
+        self.assertEqual(tick_df[dat.TickDataColumns.TIMESTAMP_NANO.value].iloc[-1], 1488844800000099000)
+        # ------ 8 bytes for the time stamp and 4 bytes for each of the other 22 columns instead of 8 ------
+        compact_bytes = tick_df.memory_usage(index=False).sum()
+        legacy_bytes = self.tick_wrapper.tick_data.astype(dat.LEGACY_TICK_DATA_DTYPES).memory_usage(index=False).sum()
+        self.assertEqual(compact_bytes * 184, legacy_bytes * 96)
+
+    def test_schema_version_stored(self):
+        for backend in [storage.CsvStorageBackend(), storage.ParquetStorageBackend(), storage.NumpyMemmapStorageBackend()]:
+            db = DataBase(storage_backend=backend, data_storage_folder_path=os.path.join(self.temp_dir.name, backend.name))
+            db.insert_clean_tick_data(self.tick_wrapper)
+            file_path = db.get_clean_tick_file_path(self.tick_info)
+            self.assertEqual(backend.read_schema_version(file_path), dat.SCHEMA_VERSION)
+
+    def test_legacy_file(self):
+        db = DataBase(storage_backend=storage.CsvStorageBackend(), data_storage_folder_path=self.temp_dir.name)
+        file_path = db.get_clean_tick_file_path(self.tick_info)
+        os.makedirs(os.path.dirname(file_path))
+        self.tick_wrapper.tick_data.to_csv(file_path, index=False)
+        self.assertEqual(db.storage_backend.read_schema_version(file_path), dat.LEGACY_SCHEMA_VERSION)
+        # ------ reading a legacy file is logged ------
+        with self.assertLogs("data_base_module", level="WARNING") as captured_logs:
+            tick_df = db.get_clean_tick_data(symbol=self.symbol, date=self.date, intra_day_period=dat.IntraDayPeriod.MORNING).tick_data
+        self.assertTrue(any("schema version " + str(dat.LEGACY_SCHEMA_VERSION) in message for message in captured_logs.output))
+        self.assertEqual(dict(tick_df.dtypes.astype(str)), dat.TICK_DATA_DTYPES)
+
+    def test_migration_skips_current_files(self):
+        csv_db = DataBase(storage_backend=storage.CsvStorageBackend(), data_storage_folder_path=os.path.join(self.temp_dir.name, "csv"))
+        parquet_db = DataBase(storage_backend=storage.ParquetStorageBackend(), data_storage_folder_path=os.path.join(self.temp_dir.name, "parquet"))
+        # ------ a legacy source file is written at the current schema version in the target ------
+        file_path = csv_db.get_clean_tick_file_path(self.tick_info)
+        os.makedirs(os.path.dirname(file_path))
+        self.tick_wrapper.tick_data.to_csv(file_path, index=False)
+        self.assertEqual(migrate_data_base(source=csv_db, target=parquet_db), 1)
+        target_file_path = parquet_db.get_clean_tick_file_path(self.tick_info)
+        self.assertEqual(parquet_db.storage_backend.read_schema_version(target_file_path), dat.SCHEMA_VERSION)
+        # ------ a rerun keeps the target files that are already at the current schema version ------
+        self.assertEqual(migrate_data_base(source=csv_db, target=parquet_db), 0)
+        self.assertEqual(parquet_db.list_available_clean_ticks(symbol=self.symbol), [self.tick_info])
+
+    def test_missing_quantity(self):
+        tick_df = self.tick_wrapper.tick_data.copy()
+        tick_df.loc[3, dat.TickDataColumns.BID1Q.value] = np.nan
+        raw_df = dat.apply_schema(tick_df, dat.RAW_TICK_DATA_DTYPES)
+        self.assertTrue(np.isnan(raw_df[dat.TickDataColumns.BID1Q.value].iloc[3]))
+        with self.assertRaises(dat.SchemaViolationException):
+            dat.apply_schema(tick_df, dat.TICK_DATA_DTYPES)
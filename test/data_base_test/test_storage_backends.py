@@ -0,0 +1,80 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import src.data_base_module.data_blocks as dat
+import src.data_base_module.storage_backends as storage
+from src.data_base_module.data_retrival import DataBase, migrate_data_base
+
+
+class StorageBackendTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.date = dat.Date(day=12, month=5, year=2019)
+        self.symbol = "TEST"
+        num_ticks = 50
+        tick_df = pd.DataFrame({col.value : np.arange(num_ticks) + i for i, col in enumerate(dat.TickDataColumns)})
+        tick_df[dat.TickDataColumns.TIMESTAMP_NANO.value] = 1488844800000000000 + np.arange(num_ticks) * 1000
+        tick_df["redundant_column"] = 1
+        self.tick_info = dat.TickInfo(symbol=self.symbol, date=self.date, intra_day_period=dat.IntraDayPeriod.MORNING)
+        self.tick_wrapper = dat.TickDataFrame(tick_df=tick_df, tick_info=self.tick_info)
+
+        bar_df = pd.DataFrame({col.value : np.arange(10) * 1.5 for col in dat.BarDataColumns})
+        bar_df[dat.BarDataColumns.TIMESTAMP.value] = 1488844800000000000 + np.arange(10) * 60
+        self.bar_info = dat.BarInfo(symbol=self.symbol, date=self.date, intra_day_period=dat.IntraDayPeriod.MORNING,
+                                    sampling_type=dat.Sampling.VOLUME, sampling_level=20)
+        self.bar_wrapper = dat.BarDataFrame(bar_data=bar_df, bar_info=self.bar_info)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def round_trip(self, backend : storage.StorageBackend):
+        db = DataBase(storage_backend=backend, data_storage_folder_path=self.temp_dir.name)
+        db.insert_clean_tick_data(self.tick_wrapper)
+        db.insert_sampled_bar(self.bar_wrapper)
+        tick_wrapper = db.get_clean_tick_data(symbol=self.symbol, date=self.date, intra_day_period=dat.IntraDayPeriod.MORNING)
+        bar_wrapper = db.get_sampled_bar(symbol=self.symbol, date=self.date, intra_day_period=dat.IntraDayPeriod.MORNING,
+                                         sampling_level=20, sampling_type=dat.Sampling.VOLUME)
+        expected_tick_df = self.tick_wrapper.tick_data.astype(dat.TICK_DATA_DTYPES)
+        expected_bar_df = self.bar_wrapper.bar_data.astype(dat.BAR_DATA_DTYPES)
+        pd.testing.assert_frame_equal(tick_wrapper.tick_data, expected_tick_df)
+        pd.testing.assert_frame_equal(bar_wrapper.bar_data, expected_bar_df)
+
+    def test_csv_round_trip(self):
+        self.round_trip(storage.CsvStorageBackend())
+
+    def test_parquet_round_trip(self):
+        self.round_trip(storage.ParquetStorageBackend())
+
+    def test_memmap_round_trip(self):
+        self.round_trip(storage.NumpyMemmapStorageBackend())
+
+    def test_memmap_read_is_zero_copy(self):
+        db = DataBase(storage_backend=storage.NumpyMemmapStorageBackend(mmap_mode="r"), data_storage_folder_path=self.temp_dir.name)
+        db.insert_clean_tick_data(self.tick_wrapper)
+        tick_wrapper = db.get_clean_tick_data(symbol=self.symbol, date=self.date, intra_day_period=dat.IntraDayPeriod.MORNING)
+        last_price_array = tick_wrapper.tick_data[dat.TickDataColumns.LAST_PRICE.value].values
+        self.assertIsInstance(last_price_array.base, np.memmap)
+        with self.assertRaises(ValueError):
+            tick_wrapper.tick_data.loc[0, dat.TickDataColumns.LAST_PRICE.value] = 0
+
+    def test_memmap_copy_on_write(self):
+        db = DataBase(storage_backend=storage.NumpyMemmapStorageBackend(mmap_mode="c"), data_storage_folder_path=self.temp_dir.name)
+        db.insert_clean_tick_data(self.tick_wrapper)
+        tick_wrapper = db.get_clean_tick_data(symbol=self.symbol, date=self.date, intra_day_period=dat.IntraDayPeriod.MORNING)
+        tick_wrapper.tick_data.loc[0, dat.TickDataColumns.LAST_PRICE.value] = -1
+        reloaded_wrapper = db.get_clean_tick_data(symbol=self.symbol, date=self.date, intra_day_period=dat.IntraDayPeriod.MORNING)
+        self.assertEqual(reloaded_wrapper.tick_data[dat.TickDataColumns.LAST_PRICE.value].iloc[0], 1)
+
+    def test_migration(self):
+        csv_db = DataBase(storage_backend=storage.CsvStorageBackend(), data_storage_folder_path=self.temp_dir.name)
+        parquet_db = DataBase(storage_backend=storage.ParquetStorageBackend(), data_storage_folder_path=self.temp_dir.name)
+        csv_db.insert_clean_tick_data(self.tick_wrapper)
+        csv_db.insert_sampled_bar(self.bar_wrapper)
+        num_migrated = migrate_data_base(source=csv_db, target=parquet_db, remove_source_files=True)
+        self.assertEqual(num_migrated, 2)
+        self.assertFalse(os.path.exists(csv_db.get_sampled_bar_file_path(self.bar_info)))
+        self.assertTrue(os.path.exists(parquet_db.get_sampled_bar_file_path(self.bar_info)))
+        tick_wrapper = parquet_db.get_clean_tick_data(symbol=self.symbol, date=self.date, intra_day_period=dat.IntraDayPeriod.MORNING)
+        pd.testing.assert_frame_equal(tick_wrapper.tick_data, self.tick_wrapper.tick_data.astype(dat.TICK_DATA_DTYPES))
@@ -0,0 +1,71 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import src.data_base_module.data_blocks as dat
+import src.data_base_module.storage_backends as storage
+import src.data_base_module.tick_archive as tick_archive
+from src.data_base_module.data_retrival import DataBase
+
+
+class TickArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DataBase(storage_backend=storage.CsvStorageBackend(), data_storage_folder_path=os.path.join(self.temp_dir.name, "data_storage"))
+        self.archive = tick_archive.TickArchive(archive_folder_path=os.path.join(self.temp_dir.name, "tick_archive"))
+        self.symbol = "TEST"
+        self.dates = [dat.Date(day=day, month=2, year=2017) for day in (1, 2, 3)]
+        # ------ day k has time stamps k * 1000 + [0, 10, ... 90] and last prices 100 * k + [0, 1, ... 9] ------
+        for day_number, date in enumerate(self.dates, start=1):
+            tick_df = pd.DataFrame({col.value : np.ones(10) for col in dat.TickDataColumns})
+            tick_df[dat.TickDataColumns.TIMESTAMP_NANO.value] = day_number * 1000 + np.arange(10) * 10
+            tick_df[dat.TickDataColumns.LAST_PRICE.value] = 100.0 * day_number + np.arange(10)
+            tick_df[dat.TickDataColumns.LAST_QUANTITY.value] = np.arange(10) % 2
+            tick_df[dat.TickDataColumns.BID1P.value] = [0, 0, 0] + [1] * 7
+            self.db.storage_backend.write_frame(tick_df, self.db.get_raw_tick_file_path(self.symbol, date), dtypes=dat.RAW_TICK_DATA_DTYPES)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_ingest_and_footers(self):
+        added_partitions = tick_archive.ingest_raw_tick_files(data_base=self.db, tick_archive=self.archive, symbol=self.symbol)
+        self.assertEqual([partition.date for partition in added_partitions], self.dates)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, "tick_archive", self.symbol, "2017", "02", "03", tick_archive.FOOTER_FILE_NAME)))
+        footer = self.archive.read_partition_statistics(self.symbol, self.dates[1])
+        self.assertEqual(footer.row_count, 10)
+        self.assertEqual((footer.min_timestamp, footer.max_timestamp), (2000, 2090))
+        self.assertEqual((footer.min_last_price, footer.max_last_price), (200.0, 209.0))
+        self.assertEqual(footer.num_trades, 5)
+        self.assertEqual(footer.zero_price_counts[dat.TickDataColumns.BID1P.value], 3)
+        self.assertEqual(footer.zero_price_counts[dat.TickDataColumns.ASK1P.value], 0)
+        # ------ second ingest adds nothing, appending an existing day raises ------
+        self.assertEqual(tick_archive.ingest_raw_tick_files(data_base=self.db, tick_archive=self.archive, symbol=self.symbol), [])
+        with self.assertRaises(tick_archive.PartitionExistsException):
+            self.archive.append_partition(self.archive.read_partition(self.symbol, self.dates[0]))
+
+    def test_partition_round_trip(self):
+        ingested_wrappers = []
+        tick_archive.ingest_raw_tick_files(data_base=self.db, tick_archive=self.archive, symbol=self.symbol, ingest_callback=ingested_wrappers.append)
+        self.assertEqual([tick_wrapper.tick_info.date for tick_wrapper in ingested_wrappers], self.dates)
+        self.assertEqual(self.archive.read_partition(self.symbol, self.dates[2]), self.db.get_raw_tick_data(self.symbol, self.dates[2]))
+
+    def test_partition_skipping(self):
+        tick_archive.ingest_raw_tick_files(data_base=self.db, tick_archive=self.archive, symbol=self.symbol)
+        time_partitions = self.archive.find_partitions(self.symbol, time_range=(2050, 3005))
+        self.assertEqual([partition.date for partition in time_partitions], self.dates[1:])
+        price_partitions = self.archive.find_partitions(self.symbol, price_range=(150, 250))
+        self.assertEqual([partition.date for partition in price_partitions], [self.dates[1]])
+        self.assertEqual(self.archive.find_partitions(self.symbol, date_range=(self.dates[0], self.dates[0]), price_range=(150, 250)), [])
+
+    def test_query_filters_rows(self):
+        tick_archive.ingest_raw_tick_files(data_base=self.db, tick_archive=self.archive, symbol=self.symbol)
+        tick_wrappers = self.archive.query(self.symbol, time_range=(2050, 3005))
+        self.assertEqual([len(tick_wrapper) for tick_wrapper in tick_wrappers], [5, 1])
+        tick_wrappers = self.archive.query(self.symbol, price_range=(203, 204.5))
+        self.assertEqual(list(tick_wrappers[0].get_tick_data()[dat.TickDataColumns.LAST_PRICE.value]), [203.0, 204.0])
+
+    def test_interrupted_partition_ignored(self):
+        partial_folder_path = self.archive.get_partition_folder_path(self.symbol, dat.Date(day=9, month=2, year=2017))
+        os.makedirs(partial_folder_path)
+        self.assertEqual(self.archive.list_partition_dates(self.symbol), [])
@@ -0,0 +1,92 @@
+import unittest
+import functools
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import src.data_base_module.data_blocks as dat
+import src.data_base_module.storage_backends as storage
+import src.data_processing_module.data_cleaning as data_cleaner
+from src.data_base_module.data_retrival import DataBase
+
+
+class TickChunksTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.symbol = "TEST"
+        self.date = dat.Date(day=7, month=3, year=2017)
+        num_ticks = 100
+        tick_df = pd.DataFrame({col.value : 19000.0 + np.arange(num_ticks) for col in dat.TickDataColumns})
+        # ------ 50 morning ticks one second apart, 50 afternoon ticks starting 2 hours later ------
+        timestamps = 1488844800000000000 + np.arange(num_ticks) * 10 ** 9
+        timestamps[50:] += 2 * 3600 * 10 ** 9
+        tick_df[dat.TickDataColumns.TIMESTAMP_NANO.value] = timestamps
+        for col in dat.TICK_QUANTITY_COLUMNS:
+            tick_df[col.value] = 10.0 + np.arange(num_ticks) % 7
+        # ------ zero runs and outliers away from the ends of chunks of 16 ticks ------
+        tick_df.loc[3:5, dat.TickDataColumns.ASK1P.value] = 0
+        tick_df.loc[20:21, dat.TickDataColumns.BID3Q.value] = 0
+        tick_df.loc[40, dat.TickDataColumns.BID1Q.value] = 5000
+        tick_df.loc[70, dat.TickDataColumns.LAST_PRICE.value] = 30000
+        self.tick_df = tick_df
+        self.cleaning_funcs = [data_cleaner.interpolate_zero_bid_ask_prices,
+                               data_cleaner.interpolate_zero_bid_ask_quantities,
+                               functools.partial(data_cleaner.interpolate_bid_ask_quantity_outliers, outlier_threshold=1000),
+                               functools.partial(data_cleaner.interpolate_trade_price_outliers, lower_threshold=18000, upper_threshold=20000)]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_data_base(self, backend : storage.StorageBackend) -> DataBase:
+        db = DataBase(storage_backend=backend, data_storage_folder_path=os.path.join(self.temp_dir.name, backend.name))
+        backend.write_frame(self.tick_df, db.get_raw_tick_file_path(self.symbol, self.date), dtypes=dat.RAW_TICK_DATA_DTYPES)
+        return db
+
+    def test_chunk_meta_data(self):
+        for backend in [storage.CsvStorageBackend(), storage.ParquetStorageBackend(), storage.NumpyMemmapStorageBackend()]:
+            db = self.make_data_base(backend)
+            tick_chunks = list(db.iter_raw_tick_data(self.symbol, self.date, chunk_size=30))
+            self.assertEqual([len(tick_chunk) for tick_chunk in tick_chunks], [30, 30, 30, 10])
+            self.assertEqual([tick_chunk.start_row for tick_chunk in tick_chunks], [0, 30, 60, 90])
+            self.assertEqual([tick_chunk.is_last_chunk for tick_chunk in tick_chunks], [False, False, False, True])
+            self.assertEqual(tick_chunks[1].first_timestamp, self.tick_df[dat.TickDataColumns.TIMESTAMP_NANO.value].iloc[30])
+            whole_df = pd.concat([tick_chunk.tick_wrapper.tick_data for tick_chunk in tick_chunks], ignore_index=True)
+            self.assertTrue(whole_df.equals(db.get_raw_tick_data(self.symbol, self.date).tick_data))
+
+    def test_unordered_chunks(self):
+        tick_df = self.tick_df.iloc[::-1].reset_index(drop=True)
+        tick_info = dat.TickInfo(symbol=self.symbol, date=self.date, intra_day_period=dat.IntraDayPeriod.WHOLE_DAY)
+        # ------ ticks within a chunk are sorted, ticks across chunks must be in order ------
+        tick_chunk, = dat.make_tick_chunks([dat.TickDataFrame(tick_df=tick_df, tick_info=tick_info)])
+        self.assertTrue(tick_chunk.tick_wrapper.tick_data.equals(self.tick_df))
+        with self.assertRaises(dat.UnorderedTickDataException):
+            list(dat.make_tick_chunks([dat.TickDataFrame(tick_df=tick_df.iloc[i:i + 50], tick_info=tick_info) for i in (0, 50)]))
+
+    def test_split_chunks(self):
+        db = self.make_data_base(storage.CsvStorageBackend())
+        morning_wrapper, afternoon_wrapper = data_cleaner.morning_after_noon_split(db.get_raw_tick_data(self.symbol, self.date), 1)
+        period_chunks = list(data_cleaner.morning_after_noon_split_chunks(db.iter_raw_tick_data(self.symbol, self.date, chunk_size=16), 1))
+        self.assertEqual([(len(tick_chunk), tick_chunk.chunk_index, tick_chunk.is_last_chunk) for tick_chunk in period_chunks],
+                         [(16, 0, False), (16, 1, False), (16, 2, False), (2, 3, True), (14, 0, False), (16, 1, False), (16, 2, False), (4, 3, True)])
+        for tick_wrapper, intra_day_period in [(morning_wrapper, dat.IntraDayPeriod.MORNING), (afternoon_wrapper, dat.IntraDayPeriod.AFTERNOON)]:
+            chunk_dfs = [tick_chunk.tick_wrapper.tick_data for tick_chunk in period_chunks if tick_chunk.tick_wrapper.tick_info.intra_day_period == intra_day_period]
+            self.assertTrue(pd.concat(chunk_dfs, ignore_index=True).equals(tick_wrapper.tick_data))
+
+    def test_chunked_cleaning_matches_whole_cleaning(self):
+        for backend in [storage.CsvStorageBackend(), storage.ParquetStorageBackend(), storage.NumpyMemmapStorageBackend()]:
+            db = self.make_data_base(backend)
+            for tick_wrapper in data_cleaner.morning_after_noon_split(db.get_raw_tick_data(self.symbol, self.date), 1):
+                tick_wrapper = dat.TickDataFrame(tick_df=tick_wrapper.tick_data.copy(), tick_info=tick_wrapper.tick_info)
+                for cleaning_func in self.cleaning_funcs:
+                    cleaning_func(tick_wrapper)
+                db.insert_clean_tick_data(tick_wrapper)
+            whole_wrappers = [db.get_clean_tick_data(self.symbol, self.date, period) for period in (dat.IntraDayPeriod.MORNING, dat.IntraDayPeriod.AFTERNOON)]
+            whole_dfs = [tick_wrapper.tick_data.copy() for tick_wrapper in whole_wrappers]
+            period_chunks = data_cleaner.morning_after_noon_split_chunks(db.iter_raw_tick_data(self.symbol, self.date, chunk_size=16), 1)
+            stored_tick_infos = db.insert_clean_tick_chunks(data_cleaner.clean_tick_chunks(period_chunks, self.cleaning_funcs))
+            self.assertEqual([tick_info.intra_day_period for tick_info in stored_tick_infos], [dat.IntraDayPeriod.MORNING, dat.IntraDayPeriod.AFTERNOON])
+            for tick_info, whole_df in zip(stored_tick_infos, whole_dfs):
+                chunked_df = db.get_clean_tick_data(self.symbol, self.date, tick_info.intra_day_period).tick_data
+                self.assertTrue(chunked_df.equals(whole_df))
+            self.assertEqual(whole_dfs[0][dat.TickDataColumns.ASK1P.value].iloc[4], 19004.0)
+            self.assertEqual(whole_dfs[1][dat.TickDataColumns.LAST_PRICE.value].iloc[20], 19070.0)
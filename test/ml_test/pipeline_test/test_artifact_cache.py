@@ -0,0 +1,54 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import src.data_base_module.data_blocks as dat
+import src.machine_learning_module.filter_generators as filter_gen_mod
+import src.machine_learning_module.artifact_cache as artifact_cache_mod
+
+
+class ArtifactCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.artifact_cache = artifact_cache_mod.ArtifactCache(cache_folder_path=self.temp_dir.name)
+        bar_df = pd.DataFrame({col.value : np.arange(20) * 1.0 for col in dat.BarDataColumns})
+        bar_df[dat.BarDataColumns.CLOSE.value] = np.sin(np.arange(20)) * 5
+        bar_info = dat.BarInfo(symbol="TEST", date=dat.Date(day=1, month=3, year=2017), intra_day_period=dat.IntraDayPeriod.MORNING,
+                               sampling_type=dat.Sampling.VOLUME, sampling_level=20)
+        self.bar_wrapper = dat.BarDataFrame(bar_data=bar_df, bar_info=bar_info)
+        self.filter_generator = filter_gen_mod.SymmetricAbsPriceCumSum(threshold=3, criteria=dat.BarDataColumns.CLOSE)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_hit_returns_same_artifact(self):
+        created_filter = self.artifact_cache.get_or_create_filter(self.filter_generator, self.bar_wrapper)
+        cached_filter = self.artifact_cache.get_or_create_filter(self.filter_generator, self.bar_wrapper)
+        self.assertEqual((self.artifact_cache.hits, self.artifact_cache.misses), (1, 1))
+        self.assertTrue(np.array_equal(created_filter.get_filter_array_ref(), cached_filter.get_filter_array_ref()))
+        self.assertEqual(created_filter.get_sampled_indices(), cached_filter.get_sampled_indices())
+
+    def test_persists_across_instances(self):
+        self.artifact_cache.get_or_create_filter(self.filter_generator, self.bar_wrapper)
+        other_cache = artifact_cache_mod.ArtifactCache(cache_folder_path=self.temp_dir.name)
+        other_cache.get_or_create_filter(self.filter_generator, self.bar_wrapper)
+        self.assertEqual((other_cache.hits, other_cache.misses), (1, 0))
+        self.assertEqual(len(os.listdir(os.path.join(self.temp_dir.name, artifact_cache_mod.FILTER_ARTIFACT))), 1)
+
+    def test_configuration_change_misses(self):
+        self.artifact_cache.get_or_create_filter(self.filter_generator, self.bar_wrapper)
+        other_threshold_generator = filter_gen_mod.SymmetricAbsPriceCumSum(threshold=4, criteria=dat.BarDataColumns.CLOSE)
+        other_criteria_generator = filter_gen_mod.SymmetricAbsPriceCumSum(threshold=3, criteria=dat.BarDataColumns.OPEN)
+        self.artifact_cache.get_or_create_filter(other_threshold_generator, self.bar_wrapper)
+        self.artifact_cache.get_or_create_filter(other_criteria_generator, self.bar_wrapper)
+        self.assertEqual((self.artifact_cache.hits, self.artifact_cache.misses), (0, 3))
+
+    def test_bar_data_change_misses(self):
+        self.artifact_cache.get_or_create_filter(self.filter_generator, self.bar_wrapper)
+        changed_bar_df = self.bar_wrapper.bar_data.copy()
+        changed_bar_df.loc[5, dat.BarDataColumns.CLOSE.value] = 100.0
+        changed_wrapper = dat.BarDataFrame(bar_data=changed_bar_df, bar_info=self.bar_wrapper.bar_info)
+        self.assertNotEqual(artifact_cache_mod.fingerprint_bar_data(self.bar_wrapper), artifact_cache_mod.fingerprint_bar_data(changed_wrapper))
+        self.artifact_cache.get_or_create_filter(self.filter_generator, changed_wrapper)
+        self.assertEqual(self.artifact_cache.misses, 2)
@@ -0,0 +1,83 @@
+import unittest
+import json
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import src.data_base_module.data_blocks as dat_blocks
+import src.data_base_module.storage_backends as storage
+import src.data_processing_module.data_cleaning as dat_clean
+import src.data_processing_module.batch_cleaning as batch_cleaning
+from src.data_base_module.data_retrival import DataBase
+
+
+def make_cleaning_pipeline(upper_threshold):
+    return dat_clean.TickCleaningPipeline([
+        dat_clean.ZeroInterpolationStep(dat_clean.BID_ASK_PRICE_COLUMNS),
+        dat_clean.ZeroInterpolationStep(dat_clean.BID_ASK_QUANTITY_COLUMNS),
+        dat_clean.OutlierInterpolationStep(dat_clean.BID_ASK_PRICE_COLUMNS, lower_threshold=100, upper_threshold=upper_threshold),
+        dat_clean.TradeOutlierInterpolationStep(dat_blocks.TickDataColumns.LAST_PRICE, lower_threshold=100, upper_threshold=upper_threshold)])
+
+
+class TestBatchCleaning(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DataBase(storage_backend=storage.CsvStorageBackend(), data_storage_folder_path=os.path.join(self.temp_dir.name, "data_storage"))
+        self.manifest_file_path = os.path.join(self.temp_dir.name, "manifest.json")
+        self.symbol = "TEST"
+        self.dates = [dat_blocks.Date(day=day, month=3, year=2017) for day in (6, 7, 8)]
+        # ------ 100 ticks over 10 hours a day, 70 before the split 7 hours after the first tick, with zeros and outliers ------
+        rng = np.random.default_rng(0)
+        for date in self.dates:
+            tick_df = pd.DataFrame({col.value : rng.integers(150, 190, 100).astype(np.float64) for col in dat_blocks.TickDataColumns})
+            tick_df[dat_blocks.TickDataColumns.TIMESTAMP_NANO.value] = 1488844800000000000 + np.arange(100) * 360 * 10 ** 9
+            for col in list(dat_blocks.TickDataColumns)[1:]:
+                tick_df.loc[rng.random(100) < 0.1, col.value] = 0
+                tick_df.loc[rng.random(100) < 0.05, col.value] = 5000
+            self.db.storage_backend.write_frame(tick_df, self.db.get_raw_tick_file_path(self.symbol, date), dtypes=dat_blocks.RAW_TICK_DATA_DTYPES)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_clean_days_in_parallel(self):
+        day_reports = batch_cleaning.run_batch_cleaning(self.db, self.symbol, make_cleaning_pipeline(200), self.manifest_file_path, workers=2)
+        self.assertEqual(sorted(day_report.date.get_str() for day_report in day_reports), [date.get_str() for date in self.dates])
+        for day_report in day_reports:
+            self.assertEqual((day_report.raw_row_count, day_report.morning_row_count, day_report.afternoon_row_count), (100, 70, 30))
+            self.assertGreater(day_report.total_seconds, 0)
+            # ------ same clean tick data as cleaning the day in this process ------
+            morning_wrapper, _ = dat_clean.morning_after_noon_split(self.db.get_raw_tick_data(self.symbol, day_report.date), 7)
+            make_cleaning_pipeline(200)(morning_wrapper)
+            stored_wrapper = self.db.get_clean_tick_data(self.symbol, day_report.date, dat_blocks.IntraDayPeriod.MORNING)
+            expected_df = dat_blocks.apply_schema(morning_wrapper.tick_data, dat_blocks.TICK_DATA_DTYPES).reset_index(drop=True)
+            self.assertTrue(stored_wrapper.tick_data.equals(expected_df))
+        with open(self.manifest_file_path) as manifest_file:
+            self.assertEqual(sorted(json.load(manifest_file)["days"]), ["20170306", "20170307", "20170308"])
+
+    def test_resume(self):
+        # ------ the run is interrupted by an unreadable file on the last day, the finished days are in the manifest ------
+        last_file_path = self.db.get_raw_tick_file_path(self.symbol, self.dates[2])
+        os.rename(last_file_path, last_file_path + ".bak")
+        with open(last_file_path, "w") as broken_file:
+            broken_file.write("not a tick file")
+        with self.assertRaises(Exception):
+            batch_cleaning.run_batch_cleaning(self.db, self.symbol, make_cleaning_pipeline(200), self.manifest_file_path)
+        manifest = batch_cleaning.CleaningManifest(self.manifest_file_path, self.symbol, 7, make_cleaning_pipeline(200))
+        self.assertEqual([manifest.is_done(date) for date in self.dates], [True, True, False])
+        self.assertEqual(manifest.day_reports["20170307"].morning_row_count, 70)
+        # ------ the next run only cleans the last day ------
+        os.replace(last_file_path + ".bak", last_file_path)
+        day_reports = batch_cleaning.run_batch_cleaning(self.db, self.symbol, make_cleaning_pipeline(200), self.manifest_file_path, workers=2)
+        self.assertEqual([day_report.date for day_report in day_reports], [self.dates[2]])
+        self.assertEqual(batch_cleaning.run_batch_cleaning(self.db, self.symbol, make_cleaning_pipeline(200), self.manifest_file_path), [])
+
+    def test_date_range_and_settings(self):
+        day_reports = batch_cleaning.run_batch_cleaning(self.db, self.symbol, make_cleaning_pipeline(200), self.manifest_file_path,
+                                                        date_range=(self.dates[1], self.dates[2]))
+        self.assertEqual([day_report.date for day_report in day_reports], self.dates[1:])
+        with self.assertRaises(batch_cleaning.CleaningManifestMismatchException):
+            batch_cleaning.run_batch_cleaning(self.db, self.symbol, make_cleaning_pipeline(300), self.manifest_file_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import functools
+import numpy as np
+import pandas as pd
+import src.data_processing_module.data_cleaning as dat_clean
+import src.data_base_module.data_blocks as dat_blocks
+
+TICK_INFO = dat_blocks.TickInfo(symbol="TEST", date=dat_blocks.Date(day=7, month=3, year=2017), intra_day_period=dat_blocks.IntraDayPeriod.MORNING)
+
+
+def make_cleaning_funcs(lower_threshold, upper_threshold, quantity_threshold, trade_quantity_threshold):
+    return [dat_clean.interpolate_zero_bid_ask_prices,
+            dat_clean.interpolate_zero_bid_ask_quantities,
+            functools.partial(dat_clean.interpolate_bid_ask_quantity_outliers, outlier_threshold=quantity_threshold),
+            functools.partial(dat_clean.interpolate_bid_ask_price_outliers, lower_threshold=lower_threshold, upper_threshold=upper_threshold),
+            functools.partial(dat_clean.interpolate_trade_price_outliers, lower_threshold=lower_threshold, upper_threshold=upper_threshold),
+            functools.partial(dat_clean.interpolate_trade_volume_outliers, outlier_threshold=trade_quantity_threshold)]
+
+
+def make_cleaning_pipeline(lower_threshold, upper_threshold, quantity_threshold, trade_quantity_threshold):
+    return dat_clean.TickCleaningPipeline([
+        dat_clean.ZeroInterpolationStep(dat_clean.BID_ASK_PRICE_COLUMNS),
+        dat_clean.ZeroInterpolationStep(dat_clean.BID_ASK_QUANTITY_COLUMNS),
+        dat_clean.OutlierInterpolationStep(dat_clean.BID_ASK_QUANTITY_COLUMNS, upper_threshold=quantity_threshold),
+        dat_clean.OutlierInterpolationStep(dat_clean.BID_ASK_PRICE_COLUMNS, lower_threshold=lower_threshold, upper_threshold=upper_threshold),
+        dat_clean.TradeOutlierInterpolationStep(dat_blocks.TickDataColumns.LAST_PRICE, lower_threshold=lower_threshold, upper_threshold=upper_threshold),
+        dat_clean.TradeOutlierInterpolationStep(dat_blocks.TickDataColumns.LAST_QUANTITY, upper_threshold=trade_quantity_threshold)])
+
+
+def make_dirty_tick_df(num_ticks, seed):
+    """ prices around 19000 and quantities below 50 with zero runs and outliers, some columns are entirely 0 """
+    rng = np.random.default_rng(seed)
+    tick_df = pd.DataFrame({col.value : np.zeros(num_ticks) for col in dat_blocks.TickDataColumns})
+    tick_df[dat_blocks.TickDataColumns.TIMESTAMP_NANO.value] = 1488844800000000000 + np.arange(num_ticks) * 10 ** 6
+    for col in list(dat_blocks.TickDataColumns)[1:]:
+        if col in dat_blocks.TICK_QUANTITY_COLUMNS:
+            values = rng.integers(1, 50, num_ticks).astype(np.float64)
+            values[rng.random(num_ticks) < 0.05] = 5000
+        else:
+            values = 19000 + rng.normal(0, 300, num_ticks).round(1)
+            values[rng.random(num_ticks) < 0.05] = rng.choice([100.0, 1e5])
+        values[rng.random(num_ticks) < 0.2] = 0
+        tick_df[col.value] = values
+    tick_df[dat_blocks.TickDataColumns.ASK5Q.value] = 0
+    return tick_df
+
+
+class TestTickCleaningPipeline(unittest.TestCase):
+    def assert_same_tick_df(self, expected_df, clean_df):
+        self.assertEqual(list(expected_df.dtypes), list(clean_df.dtypes))
+        for col_name in expected_df.columns:
+            self.assertTrue(np.array_equal(expected_df[col_name].to_numpy(), clean_df[col_name].to_numpy(), equal_nan=True), col_name)
+
+    def check_same_as_function_chain(self, tick_df, thresholds):
+        expected_wrapper = dat_blocks.TickDataFrame.wrap_without_copy(tick_df.copy(), TICK_INFO)
+        for cleaning_func in make_cleaning_funcs(*thresholds):
+            cleaning_func(expected_wrapper)
+        clean_wrapper = dat_blocks.TickDataFrame.wrap_without_copy(tick_df.copy(), TICK_INFO)
+        make_cleaning_pipeline(*thresholds)(clean_wrapper)
+        self.assert_same_tick_df(expected_wrapper.tick_data, clean_wrapper.tick_data)
+
+    def test_same_as_function_chain(self):
+        for seed in range(3):
+            tick_df = make_dirty_tick_df(300, seed)
+            for dtypes in [dat_blocks.RAW_TICK_DATA_DTYPES, dat_blocks.TICK_DATA_DTYPES, dat_blocks.LEGACY_TICK_DATA_DTYPES]:
+                for thresholds in [(18000, 20000, 1000, 200), (18000.5, 19999.9, 20, 10)]:
+                    self.check_same_as_function_chain(dat_blocks.apply_schema(tick_df, dtypes), thresholds)
+
+    def test_edge_cases(self):
+        tick_df = dat_blocks.apply_schema(make_dirty_tick_df(20, 7), dat_blocks.TICK_DATA_DTYPES)
+        # ------ zero and outlier runs at the start and at the end, no trade at all, a single tick, no ticks ------
+        tick_df.loc[:4, dat_blocks.TickDataColumns.ASK1P.value] = 0
+        tick_df.loc[15:, dat_blocks.TickDataColumns.BID1P.value] = 1e6
+        tick_df[dat_blocks.TickDataColumns.LAST_PRICE.value] = 0
+        for edge_df in [tick_df, tick_df.iloc[:1].reset_index(drop=True), tick_df.iloc[:0]]:
+            self.check_same_as_function_chain(edge_df, (18000, 20000, 1000, 200))
+
+    def test_interpolate_invalid_block(self):
+        # ------ one column per row of the block ------
+        values = np.array([[0.0, 2.0, 0.0, 8.0, 0.0], [1.0, 0.0, 0.0, 0.0, 3.0]])
+        dat_clean.interpolate_invalid_block(values, values == 0)
+        self.assertTrue(np.array_equal(values, np.array([[2.0, 2.0, 5.0, 8.0, 8.0], [1.0, 1.5, 2.0, 2.5, 3.0]])))
+        values = np.zeros((1, 3))
+        dat_clean.interpolate_invalid_block(values, values == 0)
+        self.assertTrue(np.isnan(values).all())
+
+    def test_clean_tick_chunks(self):
+        tick_df = dat_blocks.apply_schema(make_dirty_tick_df(200, 11), dat_blocks.RAW_TICK_DATA_DTYPES)
+        thresholds = (18000, 20000, 1000, 200)
+        tick_chunks = list(dat_blocks.make_tick_chunks(dat_blocks.TickDataFrame.wrap_without_copy(tick_df.iloc[start : start + 50], TICK_INFO)
+                                                       for start in range(0, 200, 50)))
+        expected_dfs = [chunk.tick_wrapper.tick_data for chunk in dat_clean.clean_tick_chunks(tick_chunks, make_cleaning_funcs(*thresholds))]
+        clean_dfs = [chunk.tick_wrapper.tick_data for chunk in dat_clean.clean_tick_chunks(tick_chunks, [make_cleaning_pipeline(*thresholds)])]
+        for expected_df, clean_df in zip(expected_dfs, clean_dfs):
+            self.assert_same_tick_df(expected_df, clean_df)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import src.data_processing_module.data_diagnostics as data_diagnostics
+from src.data_base_module.data_blocks import TickDataColumns, TickDataFrame, TickInfo, Date, IntraDayPeriod
+import pandas as pd
+import numpy as np
+import json
+import unittest
+
+
+class DiagnosticsReportTest(unittest.TestCase):
+    def setUp(self):
+        # -------- ascending asks and descending bids with a few zeros, missing values, swapped levels and duplicated time stamps --------
+        rng = np.random.default_rng(11)
+        num_ticks = 2000
+        tick_df = pd.DataFrame({col.value : np.zeros(num_ticks) for col in TickDataColumns})
+        tick_df[TickDataColumns.TIMESTAMP_NANO.value] = 1488844800000000000 + np.arange(num_ticks) * 10 ** 7
+        tick_df.loc[[10, 11, 500], TickDataColumns.TIMESTAMP_NANO.value] = tick_df.loc[[9, 9, 499], TickDataColumns.TIMESTAMP_NANO.value].values
+        mid_prices = 19000 + 5 * np.cumsum(rng.choice([-1, 0, 1], num_ticks))
+        for level in range(5):
+            tick_df[data_diagnostics.ASK_PRICE_COLUMNS[level].value] = mid_prices + 5 * (level + 1)
+            tick_df[data_diagnostics.BID_PRICE_COLUMNS[level].value] = mid_prices - 5 * (level + 1)
+        for col in data_diagnostics.data_cleaner.BID_ASK_QUANTITY_COLUMNS:
+            tick_df[col.value] = rng.integers(1, 50, num_ticks)
+        has_trade_bool_arr = rng.random(num_ticks) < 0.5
+        tick_df[TickDataColumns.LAST_PRICE.value] = np.where(has_trade_bool_arr, mid_prices, 0)
+        tick_df[TickDataColumns.LAST_QUANTITY.value] = np.where(has_trade_bool_arr, rng.integers(1, 300, num_ticks), 0)
+        tick_df.loc[rng.choice(num_ticks, 30), TickDataColumns.ASK3P.value] = 0
+        tick_df.loc[rng.choice(num_ticks, 20), TickDataColumns.BID2Q.value] = 0
+        tick_df.loc[rng.choice(num_ticks, 15), TickDataColumns.BID4P.value] = 50000
+        tick_df.loc[rng.choice(num_ticks, 5), TickDataColumns.LAST_QUANTITY.value] = 0
+        tick_df.loc[rng.choice(num_ticks, 7), TickDataColumns.ASK1Q.value] = np.nan
+        tick_info = TickInfo(symbol = "TEST", date = Date(day = 7, month = 3, year = 2017), intra_day_period = IntraDayPeriod.MORNING)
+        self.tick_wrapper = TickDataFrame(tick_df = tick_df, tick_info = tick_info)
+        self.tick_df = self.tick_wrapper.get_tick_data()
+
+    def test_counts_match_row_by_row_checks(self):
+        report = data_diagnostics.diagnose(self.tick_wrapper, price_thresholds = (18000, 20000), quantity_thresholds = (0, 40), trade_quantity_threshold = 200)
+        tick_df = self.tick_df
+        ask_rows = zip(*[tick_df[col.value] for col in data_diagnostics.ASK_PRICE_COLUMNS])
+        bid_rows = zip(*[tick_df[col.value] for col in data_diagnostics.BID_PRICE_COLUMNS])
+        self.assertEqual(report.ask_not_ascending_count, sum(not data_diagnostics.is_ascending(list(row)) for row in ask_rows))
+        self.assertEqual(report.bid_not_descending_count, sum(not data_diagnostics.is_descending(list(row)) for row in bid_rows))
+        self.assertGreater(report.book_order_violation_count, 0)
+        self.assertEqual(report.row_count, 2000)
+        self.assertEqual(report.duplicated_timestamp_count, int(tick_df[TickDataColumns.TIMESTAMP_NANO.value].duplicated().sum()))
+        self.assertEqual(report.duplicated_timestamp_count, 3)
+        self.assertEqual(report.missing_value_counts, {col_name : int(tick_df[col_name].isnull().sum()) for col_name in tick_df.columns})
+        self.assertEqual(report.zero_price_counts[TickDataColumns.ASK3P.value], int((tick_df[TickDataColumns.ASK3P.value] == 0).sum()))
+        self.assertEqual(report.zero_quantity_counts[TickDataColumns.BID2Q.value], int((tick_df[TickDataColumns.BID2Q.value] == 0).sum()))
+        self.assertEqual(report.price_quantity_mismatch_counts[TickDataColumns.ASK3P.value], report.zero_price_counts[TickDataColumns.ASK3P.value])
+        self.assertEqual(report.trade_price_quantity_mismatch_count,
+                         int(((tick_df[TickDataColumns.LAST_PRICE.value] == 0) ^ (tick_df[TickDataColumns.LAST_QUANTITY.value] == 0)).sum()))
+        bid4p_values = tick_df[TickDataColumns.BID4P.value]
+        self.assertEqual(report.price_outlier_counts[TickDataColumns.BID4P.value], int(((bid4p_values < 18000) | (bid4p_values > 20000)).sum()))
+        self.assertEqual(report.quantity_outlier_counts[TickDataColumns.BID1Q.value], int((tick_df[TickDataColumns.BID1Q.value] > 40).sum()))
+        self.assertEqual(report.trade_quantity_outlier_count, int((tick_df[TickDataColumns.LAST_QUANTITY.value] > 200).sum()))
+
+    def test_skipped_outlier_checks(self):
+        report = data_diagnostics.diagnose(self.tick_wrapper)
+        self.assertEqual(report.price_outlier_counts, {})
+        self.assertEqual(report.quantity_outlier_counts, {})
+        self.assertIsNone(report.trade_quantity_outlier_count)
+
+    def test_json_round_trip(self):
+        report = data_diagnostics.diagnose(self.tick_wrapper, price_thresholds = (18000, 20000))
+        report_dict = json.loads(json.dumps(report.to_dict()))
+        self.assertEqual(data_diagnostics.DiagnosticsReport.from_dict(report_dict), report)
+
+
+if __name__ == '__main__':
+    unittest.main()
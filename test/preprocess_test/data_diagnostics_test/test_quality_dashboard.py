@@ -0,0 +1,98 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import src.data_base_module.data_blocks as dat_blocks
+import src.data_base_module.storage_backends as storage
+import src.data_processing_module.data_diagnostics as data_diagnostics
+import src.data_processing_module.quality_dashboard as quality_dashboard
+from src.data_base_module.data_retrival import DataBase
+
+
+def make_tick_df(rng, num_ticks, num_zeros):
+    """ ascending asks and descending bids around a random walk, num_zeros zero entries in ask1p, one price spike in bid1p and crossed ask levels in one tick """
+    tick_df = pd.DataFrame({col.value : np.zeros(num_ticks) for col in dat_blocks.TickDataColumns})
+    tick_df[dat_blocks.TickDataColumns.TIMESTAMP_NANO.value] = 1488844800000000000 + np.arange(num_ticks) * 10 ** 8
+    mid_prices = 1000 + np.cumsum(rng.choice([-1, 0, 1], num_ticks))
+    for level in range(5):
+        tick_df[data_diagnostics.ASK_PRICE_COLUMNS[level].value] = mid_prices + level + 1
+        tick_df[data_diagnostics.BID_PRICE_COLUMNS[level].value] = mid_prices - level - 1
+    tick_df[dat_blocks.TickDataColumns.LAST_PRICE.value] = mid_prices
+    tick_df[dat_blocks.TickDataColumns.LAST_QUANTITY.value] = rng.integers(1, 10, num_ticks)
+    tick_df.loc[rng.choice(num_ticks, num_zeros, replace=False), dat_blocks.TickDataColumns.ASK1P.value] = 0
+    tick_df.loc[num_ticks // 2, dat_blocks.TickDataColumns.BID1P.value] = 9000
+    tick_df.loc[10, dat_blocks.TickDataColumns.ASK2P.value] = tick_df.loc[10, dat_blocks.TickDataColumns.ASK1P.value] - 1
+    return tick_df
+
+
+class TestQualityDashboard(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DataBase(storage_backend=storage.CsvStorageBackend(), data_storage_folder_path=os.path.join(self.temp_dir.name, "data_storage"))
+        self.output_folder_path = os.path.join(self.temp_dir.name, "dashboard")
+        self.dates = [dat_blocks.Date(day=day, month=3, year=2017) for day in (6, 7)]
+        rng = np.random.default_rng(0)
+        for symbol in ("AAA", "BBB"):
+            for date in self.dates:
+                self.db.storage_backend.write_frame(make_tick_df(rng, 300, 4), self.db.get_raw_tick_file_path(symbol, date),
+                                                    dtypes=dat_blocks.RAW_TICK_DATA_DTYPES)
+        tick_info = dat_blocks.TickInfo(symbol="AAA", date=self.dates[0], intra_day_period=dat_blocks.IntraDayPeriod.MORNING)
+        self.db.insert_clean_tick_data(dat_blocks.TickDataFrame(tick_df=make_tick_df(rng, 200, 0), tick_info=tick_info))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_quality_table(self):
+        quality_df = quality_dashboard.run_quality_dashboard(self.db, self.output_folder_path, workers=2)
+        self.assertEqual(len(quality_df), 5)
+        self.assertEqual(list(quality_df["tick_kind"]), ["clean", "raw", "raw", "raw", "raw"])
+        raw_df = quality_df[quality_df["tick_kind"] == "raw"]
+        self.assertEqual(list(raw_df["zero_price_count"]), [4, 4, 4, 4])
+        self.assertEqual(list(raw_df["book_order_violation_count"]), [1, 1, 1, 1])
+        self.assertTrue((quality_df["price_outlier_count"] >= 1).all())
+        report = data_diagnostics.diagnose(self.db.get_raw_tick_data("BBB", self.dates[1]))
+        last_row = quality_df.iloc[-1]
+        self.assertEqual((last_row["symbol"], last_row["date"]), ("BBB", "20170307"))
+        self.assertEqual(last_row["ask_not_ascending_count"], report.ask_not_ascending_count)
+        self.assertEqual(last_row["bid_not_descending_count"], report.bid_not_descending_count)
+        self.assertEqual(last_row["duplicated_timestamp_count"], 0)
+        stored_df = pd.read_parquet(os.path.join(self.output_folder_path, "quality.parquet"))
+        pd.testing.assert_frame_equal(stored_df, quality_df)
+        with open(os.path.join(self.output_folder_path, "quality.html")) as html_file:
+            page = html_file.read()
+        self.assertIn("Summary per symbol", page)
+        self.assertIn("BBB", page)
+
+    def test_rerun_only_rescans_changed_files(self):
+        first_df = quality_dashboard.run_quality_dashboard(self.db, self.output_folder_path)
+        pd.testing.assert_frame_equal(quality_dashboard.run_quality_dashboard(self.db, self.output_folder_path), first_df)
+        # ------ rewriting one day changes its checksum, only that day is diagnosed again ------
+        changed_tick_df = make_tick_df(np.random.default_rng(1), 300, 9)
+        self.db.storage_backend.write_frame(changed_tick_df, self.db.get_raw_tick_file_path("BBB", self.dates[0]), dtypes=dat_blocks.RAW_TICK_DATA_DTYPES)
+        second_df = quality_dashboard.run_quality_dashboard(self.db, self.output_folder_path)
+        is_changed_bool_arr = (second_df["symbol"] == "BBB") & (second_df["date"] == "20170306")
+        self.assertEqual(list(second_df.loc[is_changed_bool_arr, "zero_price_count"]), [9])
+        self.assertNotEqual(second_df.loc[is_changed_bool_arr, "checksum"].item(), first_df.loc[is_changed_bool_arr, "checksum"].item())
+        pd.testing.assert_frame_equal(second_df[~is_changed_bool_arr], first_df[~is_changed_bool_arr])
+        # ------ other outlier settings discard the cache ------
+        third_df = quality_dashboard.run_quality_dashboard(self.db, self.output_folder_path, outlier_window=51)
+        self.assertFalse((third_df["diagnose_seconds"] == second_df["diagnose_seconds"]).any())
+
+    def test_stray_files_are_ignored(self):
+        for folder_path in (os.path.join(self.db.tick_data_folder_path, "AAA"), self.db.tick_clean_data_folder):
+            with open(os.path.join(folder_path, "notes.csv"), "w") as stray_file:
+                stray_file.write("not tick data\n")
+        self.assertEqual(len(quality_dashboard.find_stored_tick_files(self.db)), 5)
+        self.assertEqual(len(quality_dashboard.run_quality_dashboard(self.db, self.output_folder_path)), 5)
+
+    def test_symbol_filter(self):
+        quality_df = quality_dashboard.run_quality_dashboard(self.db, self.output_folder_path, symbols=["BBB"])
+        self.assertEqual(list(quality_df["symbol"]), ["BBB", "BBB"])
+        summary_df = quality_dashboard.make_symbol_summary_table(quality_df)
+        self.assertEqual(summary_df.loc[0, "num_days"], 2)
+        self.assertEqual(summary_df.loc[0, "row_count"], 600)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import src.data_processing_module.data_cleaning as data_cleaner
+from src.data_base_module.data_blocks import TickDataColumns, TickDataFrame, TickInfo, Date, IntraDayPeriod
+import pandas as pd
+import numpy as np
+import unittest
+
+
+def reference_rolling_median_outliers(column_values, window, num_mads, min_relative_scale):
+    """ window by window Hampel filter, the windows at both ends are mirrored around the first / last entry """
+    half_window = window // 2
+
+    def rolling_median(values):
+        padded_values = np.concatenate([values[half_window : 0 : -1], values, values[-2 : -half_window - 2 : -1]])
+        return np.array([np.median(padded_values[row : row + window]) for row in range(len(values))])
+
+    medians = rolling_median(column_values)
+    abs_deviations = np.abs(column_values - medians)
+    scales = np.maximum(data_cleaner.MAD_NORMAL_SCALE * rolling_median(abs_deviations), min_relative_scale * np.abs(medians))
+    return abs_deviations > num_mads * scales
+
+
+class RollingOutlierTest(unittest.TestCase):
+    def setUp(self):
+        # -------- bid random walk with a level shift of 2000 in the middle of the session, spikes and zeros in the quotes and trades --------
+        rng = np.random.default_rng(5)
+        num_ticks = 4000
+        bids = 19000 + 5 * np.cumsum(rng.choice([-1, 0, 0, 1], num_ticks)) + np.where(np.arange(num_ticks) >= 2000, 2000, 0)
+        self.clean_bids = bids.astype(np.float32)
+        tick_df = pd.DataFrame({col.value : np.zeros(num_ticks, dtype = np.float32) for col in TickDataColumns})
+        tick_df[TickDataColumns.TIMESTAMP_NANO.value] = 1488844800000000000 + np.arange(num_ticks) * 10 ** 7
+        tick_df[TickDataColumns.BID1P.value] = self.clean_bids
+        tick_df[TickDataColumns.ASK1P.value] = self.clean_bids + 5
+        self.spike_rows = np.array([100, 1500, 2600, 3999])
+        tick_df.loc[self.spike_rows, TickDataColumns.BID1P.value] = [190000, 19, 0, 90000]
+        has_trade_bool_arr = rng.random(num_ticks) < 0.5
+        tick_df[TickDataColumns.LAST_PRICE.value] = np.where(has_trade_bool_arr, self.clean_bids, 0).astype(np.float32)
+        self.trade_spike_row = int(np.flatnonzero(has_trade_bool_arr)[500])
+        tick_df.loc[self.trade_spike_row, TickDataColumns.LAST_PRICE.value] = 1.5
+        self.has_trade_bool_arr = has_trade_bool_arr
+        tick_info = TickInfo(symbol = "TEST", date = Date(day = 7, month = 3, year = 2017), intra_day_period = IntraDayPeriod.MORNING)
+        self.tick_wrapper = TickDataFrame(tick_df = tick_df, tick_info = tick_info)
+
+    def test_matches_window_by_window_filter(self):
+        rng = np.random.default_rng(0)
+        values = np.stack([100 + np.cumsum(rng.normal(size = 300)), np.where(rng.random(300) < 0.05, 0, 50 + rng.normal(size = 300))])
+        outlier_bool_arr = data_cleaner.find_rolling_median_outliers(values, 21, 3.0, 0.0)
+        for col_index in range(2):
+            expected_bool_arr = reference_rolling_median_outliers(values[col_index], 21, 3.0, 0.0)
+            self.assertTrue(expected_bool_arr.any())
+            self.assertEqual(list(outlier_bool_arr[col_index]), list(expected_bool_arr))
+
+    def test_spikes_are_interpolated_and_level_shift_is_kept(self):
+        data_cleaner.interpolate_bid_ask_price_rolling_outliers(self.tick_wrapper, window = 101, num_mads = 5.0)
+        bids = self.tick_wrapper.tick_data[TickDataColumns.BID1P.value].values
+        is_spike_bool_arr = np.isin(np.arange(len(bids)), self.spike_rows)
+        self.assertTrue(np.array_equal(bids[~is_spike_bool_arr], self.clean_bids[~is_spike_bool_arr]))
+        for row in self.spike_rows:
+            self.assertLess(abs(bids[row] - self.clean_bids[row]), 20)
+        asks = self.tick_wrapper.tick_data[TickDataColumns.ASK1P.value].values
+        self.assertTrue(np.array_equal(asks, self.clean_bids + 5))
+
+    def test_trade_prices(self):
+        data_cleaner.interpolate_trade_price_rolling_outliers(self.tick_wrapper, window = 101, num_mads = 5.0)
+        last_prices = self.tick_wrapper.tick_data[TickDataColumns.LAST_PRICE.value].values
+        self.assertTrue((last_prices[~self.has_trade_bool_arr] == 0).all())
+        self.assertLess(abs(last_prices[self.trade_spike_row] - self.clean_bids[self.trade_spike_row]), 20)
+        other_trade_bool_arr = self.has_trade_bool_arr.copy()
+        other_trade_bool_arr[self.trade_spike_row] = False
+        self.assertTrue(np.array_equal(last_prices[other_trade_bool_arr], self.clean_bids[other_trade_bool_arr]))
+
+
+if __name__ == '__main__':
+    unittest.main()
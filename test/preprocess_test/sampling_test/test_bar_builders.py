@@ -0,0 +1,62 @@
+import src.data_processing_module.sampling as sampler
+import pandas as pd
+from src.data_base_module.data_blocks import TickDataColumns, TickDataFrame, TickInfo, Date, IntraDayPeriod, Sampling, TICK_DATA_DTYPES, apply_schema
+import numpy as np
+import unittest
+
+
+class BarBuilderTest(unittest.TestCase):
+    def setUp(self):
+        # -------- 400 random ticks, about a third of them without trades, large trades fill several dollar bars --------
+        rng = np.random.default_rng(5)
+        num_ticks = 400
+        tick_df = pd.DataFrame({col.value : np.zeros(num_ticks) for col in TickDataColumns})
+        tick_df[TickDataColumns.TIMESTAMP_NANO.value] = 1488844800000000000 + np.cumsum(rng.integers(0, 5 * 10 ** 9, num_ticks))
+        has_trade_bool_arr = rng.random(num_ticks) < 0.66
+        tick_df[TickDataColumns.LAST_PRICE.value] = np.where(has_trade_bool_arr, rng.choice([10, 15.5, 20, 35.25], num_ticks), 0)
+        tick_df[TickDataColumns.LAST_QUANTITY.value] = np.where(has_trade_bool_arr, rng.choice([1, 2, 5, 30, 120], num_ticks), 0)
+        self.tick_info = TickInfo(symbol="TEST", date=Date(day=7, month=3, year=2017), intra_day_period=IntraDayPeriod.MORNING)
+        self.tick_df = apply_schema(tick_df, TICK_DATA_DTYPES)
+
+    def check_builder(self, builder_class, sampling_func, sampling_level : int):
+        batch_df = sampling_func(TickDataFrame(tick_df=self.tick_df, tick_info=self.tick_info), sampling_level).bar_data
+        for chunk_size in [1, 7, 100, len(self.tick_df)]:
+            builder = builder_class(self.tick_info, sampling_level)
+            bar_wrappers = [builder.push(TickDataFrame(tick_df=self.tick_df.iloc[i:i + chunk_size], tick_info=self.tick_info))
+                            for i in range(0, len(self.tick_df), chunk_size)]
+            bar_wrappers.append(builder.flush())
+            self.assertEqual(bar_wrappers[0].bar_info.sampling_type, builder_class.sampling_type)
+            streamed_df = pd.concat([bar_wrapper.bar_data for bar_wrapper in bar_wrappers], ignore_index=True)
+            self.assertTrue(streamed_df.equals(batch_df))
+
+    def test_volume_bar_builder(self):
+        self.check_builder(sampler.VolumeBarBuilder, sampler.volume_sampling, 50)
+
+    def test_dollar_bar_builder(self):
+        self.check_builder(sampler.DollarBarBuilder, sampler.dollar_sampling, 700)
+
+    def test_tick_bar_builder(self):
+        self.check_builder(sampler.TickBarBuilder, sampler.tick_sampling, 15)
+
+    def test_time_bar_builder(self):
+        self.check_builder(sampler.TimeBarBuilder, sampler.time_sampling, 60)
+
+    def test_bars_completed_by_next_tick(self):
+        # ------ a volume bar is only formed once the tick after its last tick has arrived ------
+        builder = sampler.VolumeBarBuilder(self.tick_info, 5)
+        trade_df = self.tick_df[self.tick_df[TickDataColumns.LAST_PRICE.value] > 0]
+        trade_df = trade_df[trade_df[TickDataColumns.LAST_QUANTITY.value] == 5].iloc[:3]
+        self.assertEqual(len(builder.push(TickDataFrame(tick_df=trade_df.iloc[:1], tick_info=self.tick_info))), 0)
+        self.assertEqual(len(builder.push(TickDataFrame(tick_df=trade_df.iloc[1:], tick_info=self.tick_info))), 2)
+        self.assertEqual(len(builder.flush()), 0)
+        self.assertEqual(builder.flush().bar_info.sampling_type, Sampling.VOLUME)
+
+    def test_late_tick(self):
+        builder = sampler.TimeBarBuilder(self.tick_info, 1)
+        builder.push(TickDataFrame(tick_df=self.tick_df.iloc[10:20], tick_info=self.tick_info))
+        with self.assertRaises(sampler.LateTickException):
+            builder.push(TickDataFrame(tick_df=self.tick_df.iloc[:10], tick_info=self.tick_info))
+
+
+if __name__ == '__main__':
+    unittest.main()
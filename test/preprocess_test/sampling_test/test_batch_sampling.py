@@ -0,0 +1,79 @@
+import src.data_processing_module.batch_sampling as batch_sampling
+import src.data_processing_module.sampling as sampler
+import src.data_base_module.storage_backends as storage
+from src.data_base_module.data_retrival import DataBase
+import pandas as pd
+from src.data_base_module.data_blocks import TickDataColumns, TickDataFrame, TickInfo, Date, IntraDayPeriod, Sampling
+import numpy as np
+import tempfile
+import unittest
+
+
+class BatchSamplingTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DataBase(storage_backend=storage.CsvStorageBackend(), data_storage_folder_path=self.temp_dir.name)
+        # -------- 3 dates x 2 periods of clean ticks, integer prices and quantities keep the bars exact --------
+        rng = np.random.default_rng(5)
+        self.tick_wrappers = {}
+        for day in [6, 7, 8]:
+            for period in [IntraDayPeriod.MORNING, IntraDayPeriod.AFTERNOON]:
+                num_ticks = 500
+                tick_df = pd.DataFrame({col.value : np.zeros(num_ticks) for col in TickDataColumns})
+                tick_df[TickDataColumns.TIMESTAMP_NANO.value] = 1488844800000000000 + np.arange(num_ticks) * 10 ** 8
+                has_trade_bool_arr = rng.random(num_ticks) < 0.66
+                prices = 100 + np.cumsum(rng.choice([-1, 0, 1], num_ticks))
+                tick_df[TickDataColumns.LAST_PRICE.value] = np.where(has_trade_bool_arr, prices, 0)
+                tick_df[TickDataColumns.LAST_QUANTITY.value] = np.where(has_trade_bool_arr, rng.choice([1, 2, 5], num_ticks), 0)
+                tick_info = TickInfo(symbol="TEST", date=Date(day=day, month=3, year=2017), intra_day_period=period)
+                self.tick_wrappers[(day, period)] = TickDataFrame(tick_df=tick_df, tick_info=tick_info)
+                self.db.insert_clean_tick_data(self.tick_wrappers[(day, period)])
+        self.sampling_specs = [batch_sampling.SamplingSpec(Sampling.VOLUME, 20), batch_sampling.SamplingSpec(Sampling.VOLUME, 50),
+                               batch_sampling.SamplingSpec(Sampling.TICK, 30), batch_sampling.SamplingSpec(Sampling.TICK_RUN, 20)]
+        self.date_range = (Date(day=7, month=3, year=2017), Date(day=8, month=3, year=2017))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_bars_match_samplers(self):
+        reports = batch_sampling.run_batch_sampling(self.db, "TEST", self.sampling_specs, date_range=self.date_range, workers=2)
+        self.assertEqual([report.tick_info.date.day for report in reports], [7, 7, 8, 8])
+        for report in reports:
+            self.assertEqual(len(report.sampled_bar_infos), 4)
+            self.assertEqual(report.skipped_bar_infos, [])
+            self.assertEqual(report.num_ticks, 500)
+            self.assertGreaterEqual(report.total_seconds, 0.0)
+            tick_wrapper = self.tick_wrappers[(report.tick_info.date.day, report.tick_info.intra_day_period)]
+            tick_info = report.tick_info
+            expected_bars = {Sampling.VOLUME : sampler.volume_sampling(tick_wrapper, sampling_volume=50),
+                             Sampling.TICK : sampler.tick_sampling(tick_wrapper, sampling_ticks=30),
+                             Sampling.TICK_RUN : sampler.tick_run_sampling(tick_wrapper, expected_ticks=20)}
+            for sampling_type, expected_wrapper in expected_bars.items():
+                stored_wrapper = self.db.get_sampled_bar(symbol="TEST", date=tick_info.date, intra_day_period=tick_info.intra_day_period,
+                                                         sampling_level=expected_wrapper.bar_info.sampling_level, sampling_type=sampling_type)
+                self.assertTrue(np.allclose(stored_wrapper.bar_data.to_numpy(dtype=np.float64), expected_wrapper.bar_data.to_numpy(dtype=np.float64)))
+        # ------ the date out of the range is not sampled ------
+        self.assertEqual(len(self.db.list_available("TEST", Sampling.VOLUME, 20)), 4)
+
+    def test_existing_bars_are_skipped(self):
+        batch_sampling.run_batch_sampling(self.db, "TEST", self.sampling_specs[:2], date_range=self.date_range)
+        reports = batch_sampling.run_batch_sampling(self.db, "TEST", self.sampling_specs, date_range=self.date_range)
+        for report in reports:
+            self.assertEqual([bar_info.sampling_level for bar_info in report.skipped_bar_infos], [20, 50])
+            self.assertEqual([bar_info.sampling_type for bar_info in report.sampled_bar_infos], [Sampling.TICK, Sampling.TICK_RUN])
+        # ------ a unit with all bars stored does not read its ticks ------
+        reports = batch_sampling.run_batch_sampling(self.db, "TEST", self.sampling_specs, date_range=self.date_range, workers=2)
+        for report in reports:
+            self.assertEqual(report.sampled_bar_infos, [])
+            self.assertEqual(report.num_ticks, 0)
+            self.assertEqual(report.load_seconds, 0.0)
+
+    def test_overwrite(self):
+        batch_sampling.run_batch_sampling(self.db, "TEST", self.sampling_specs, intra_day_periods=[IntraDayPeriod.MORNING])
+        reports = batch_sampling.run_batch_sampling(self.db, "TEST", self.sampling_specs, intra_day_periods=[IntraDayPeriod.MORNING], skip_existing=False)
+        self.assertEqual(len(reports), 3)
+        self.assertTrue(all(len(report.sampled_bar_infos) == 4 for report in reports))
+
+
+if __name__ == '__main__':
+    unittest.main()
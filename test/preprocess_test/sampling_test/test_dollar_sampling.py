@@ -103,7 +103,8 @@ class DollarSamplingTest(unittest.TestCase):
         bar2 = {dat_blocks.BarDataColumns.TIMESTAMP.value: 700, dat_blocks.BarDataColumns.OPEN.value: 13, dat_blocks.BarDataColumns.CLOSE.value: 10,
                 dat_blocks.BarDataColumns.HIGH.value: 22, dat_blocks.BarDataColumns.LOW.value: 10, dat_blocks.BarDataColumns.VWAP.value: 100 / 6.6,
                 dat_blocks.BarDataColumns.VOLUME.value: 6.6}
-        bar3 = {dat_blocks.BarDataColumns.TIMESTAMP.value: 1010, dat_blocks.BarDataColumns.OPEN.value: 10, dat_blocks.BarDataColumns.CLOSE.value: 18,
+        # ------ a bar takes the time stamp of the first tick after the previous bar was formed, not the time stamp of the splitting tick ------
+        bar3 = {dat_blocks.BarDataColumns.TIMESTAMP.value: 1331, dat_blocks.BarDataColumns.OPEN.value: 10, dat_blocks.BarDataColumns.CLOSE.value: 18,
                 dat_blocks.BarDataColumns.HIGH.value: 29, dat_blocks.BarDataColumns.LOW.value: 10, dat_blocks.BarDataColumns.VWAP.value: 100 / 5.4,
                 dat_blocks.BarDataColumns.VOLUME.value: 5.4}
         bar4 = {dat_blocks.BarDataColumns.TIMESTAMP.value: 1545, dat_blocks.BarDataColumns.OPEN.value: 10, dat_blocks.BarDataColumns.CLOSE.value: 5,
@@ -118,4 +119,16 @@ class DollarSamplingTest(unittest.TestCase):
         expected_bar_wrapper = dat_blocks.BarDataFrame(bar_data = expected_bar_df, bar_info = expected_bar_info)
         result_bar_wrapper = sampler.dollar_sampling(self.tick_df_wrapper, sampling_dollar=sampling_level)
 
-        self.assertTrue(all(expected_bar_wrapper.bar_data == result_bar_wrapper.bar_data))
+        self.assertEqual(result_bar_wrapper.bar_info, expected_bar_info)
+        self.assertTrue(np.allclose(expected_bar_wrapper.bar_data.to_numpy(dtype=float), result_bar_wrapper.bar_data.to_numpy(dtype=float)))
+
+    def test_multi_bar_tick(self):
+        # ------ a tick of 220 dollars completes the first bar, fills the second and carries 70 dollars (3.5 shares) into the third ------
+        tick_df = self.raw_tick_df.iloc[:4].copy()
+        tick_df[dat_blocks.TickDataColumns.LAST_PRICE.value] = [10, 20, 10, 20]
+        tick_df[dat_blocks.TickDataColumns.LAST_QUANTITY.value] = [5, 11, 5, 1]
+        tick_wrapper = dat_blocks.TickDataFrame(tick_df=tick_df, tick_info=self.tick_info)
+        bar_df = sampler.dollar_sampling(tick_wrapper, sampling_dollar=100).bar_data
+        self.assertEqual(list(bar_df[dat_blocks.BarDataColumns.VOLUME.value]), [7.5, 5.0, 6.5])
+        self.assertEqual(list(bar_df[dat_blocks.BarDataColumns.OPEN.value]), [10.0, 20.0, 20.0])
+        self.assertEqual(list(bar_df[dat_blocks.BarDataColumns.TIMESTAMP.value]), [175, 175, 477])
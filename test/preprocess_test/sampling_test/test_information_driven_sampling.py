@@ -0,0 +1,101 @@
+import src.data_processing_module.sampling as sampler
+import src.data_base_module.storage_backends as storage
+from src.data_base_module.data_retrival import DataBase
+import pandas as pd
+from src.data_base_module.data_blocks import TickDataColumns, TickDataFrame, TickInfo, Date, IntraDayPeriod, Sampling, IMBALANCE_SAMPLINGS, RUN_SAMPLINGS
+import numpy as np
+import tempfile
+import unittest
+
+
+def reference_bars(signs, amounts, expected_ticks, ewma_span, is_run_bar):
+    """ tick by tick loop of the imbalance / run bar definitions """
+    alpha = 2 / (ewma_span + 1)
+    bound = sampler.EXPECTED_TICKS_BOUND_RATIO
+    warm_up_signs, warm_up_amounts = signs[:expected_ticks], amounts[:expected_ticks]
+    expected_num_ticks = float(expected_ticks)
+    expected_imbalance = np.mean(warm_up_signs * warm_up_amounts)
+    buy_probability = np.mean(warm_up_signs > 0)
+    expected_buy = np.mean(warm_up_amounts[warm_up_signs > 0]) if (warm_up_signs > 0).any() else 0.0
+    expected_sell = np.mean(warm_up_amounts[warm_up_signs < 0]) if (warm_up_signs < 0).any() else 0.0
+    bars, bar_start, imbalance, buys, sells, num_buys = [], 0, 0.0, 0.0, 0.0, 0
+    for tick in range(len(signs)):
+        imbalance += signs[tick] * amounts[tick]
+        buys += amounts[tick] if signs[tick] > 0 else 0.0
+        sells += amounts[tick] if signs[tick] < 0 else 0.0
+        num_buys += int(signs[tick] > 0)
+        if is_run_bar:
+            is_bar_end = max(buys, sells) >= expected_num_ticks * max(buy_probability * expected_buy, (1 - buy_probability) * expected_sell)
+        else:
+            is_bar_end = abs(imbalance) >= expected_num_ticks * abs(expected_imbalance)
+        if is_bar_end:
+            num_ticks = tick - bar_start + 1
+            bars.append((bar_start, tick))
+            expected_imbalance += alpha * (imbalance / num_ticks - expected_imbalance)
+            expected_buy += alpha * (buys / num_buys - expected_buy) if num_buys > 0 else 0.0
+            expected_sell += alpha * (sells / (num_ticks - num_buys) - expected_sell) if num_buys < num_ticks else 0.0
+            buy_probability += alpha * (num_buys / num_ticks - buy_probability)
+            expected_num_ticks = min(max(expected_num_ticks + alpha * (num_ticks - expected_num_ticks), expected_ticks / bound), expected_ticks * bound)
+            bar_start, imbalance, buys, sells, num_buys = tick + 1, 0.0, 0.0, 0.0, 0
+    return bars
+
+
+class InformationDrivenSamplingTest(unittest.TestCase):
+    def setUp(self):
+        # -------- trending random walk with trades on 2 out of 3 ticks, integer amounts keep the cumulative sums exact --------
+        rng = np.random.default_rng(3)
+        num_ticks = 3000
+        tick_df = pd.DataFrame({col.value : np.zeros(num_ticks) for col in TickDataColumns})
+        tick_df[TickDataColumns.TIMESTAMP_NANO.value] = 1488844800000000000 + np.arange(num_ticks) * 10 ** 8
+        has_trade_bool_arr = rng.random(num_ticks) < 0.66
+        prices = 100 + np.cumsum(rng.choice([-1, 0, 1, 1], num_ticks))
+        tick_df[TickDataColumns.LAST_PRICE.value] = np.where(has_trade_bool_arr, prices, 0)
+        tick_df[TickDataColumns.LAST_QUANTITY.value] = np.where(has_trade_bool_arr, rng.choice([1, 2, 5, 30], num_ticks), 0)
+        self.tick_info = TickInfo(symbol="TEST", date=Date(day=7, month=3, year=2017), intra_day_period=IntraDayPeriod.MORNING)
+        self.tick_wrapper = TickDataFrame(tick_df=tick_df, tick_info=self.tick_info)
+
+    def test_tick_rule_signs(self):
+        self.assertEqual(list(sampler.tick_rule_signs(np.array([10.0, 10, 11, 11, 10, 12]))), [1, 1, 1, 1, -1, 1])
+        self.assertEqual(list(sampler.tick_rule_signs(np.array([10.0, 10, 9]))), [-1, -1, -1])
+        self.assertEqual(list(sampler.tick_rule_signs(np.array([10.0, 10]))), [1, 1])
+
+    def test_bars_match_tick_loop(self):
+        timestamps, prices, quantities = sampler.find_trade_ticks(self.tick_wrapper.tick_data)
+        signs = sampler.tick_rule_signs(prices)
+        for sampling_type in IMBALANCE_SAMPLINGS + RUN_SAMPLINGS:
+            amounts = sampler.find_trade_amounts(sampling_type, prices, quantities)
+            if sampling_type in RUN_SAMPLINGS:
+                bar_starts, bar_ends = sampler.find_run_bars(signs, amounts, 50, 10)
+            else:
+                bar_starts, bar_ends = sampler.find_imbalance_bars(signs * amounts, 50, 10)
+            expected_bars = reference_bars(signs, amounts, 50, 10, sampling_type in RUN_SAMPLINGS)
+            self.assertGreater(len(expected_bars), 5)
+            self.assertEqual(list(zip(bar_starts, bar_ends)), expected_bars)
+
+    def test_bar_aggregation(self):
+        bar_wrapper = sampler.volume_run_sampling(self.tick_wrapper, expected_ticks=50)
+        self.assertEqual(bar_wrapper.bar_info.sampling_type, Sampling.VOLUME_RUN)
+        self.assertEqual(bar_wrapper.bar_info.sampling_level, 50)
+        timestamps, prices, quantities = sampler.find_trade_ticks(self.tick_wrapper.tick_data)
+        bar_starts, bar_ends = sampler.find_run_bars(sampler.tick_rule_signs(prices), quantities, 50, sampler.IMBALANCE_EWMA_SPAN)
+        bar_df = bar_wrapper.bar_data
+        self.assertEqual(list(bar_df["volume"]), [quantities[start : end + 1].sum() for start, end in zip(bar_starts, bar_ends)])
+        self.assertEqual(list(bar_df["open"]), list(prices[bar_starts]))
+        self.assertEqual(list(bar_df["timestamp"]), list(timestamps[bar_starts]))
+
+    def test_data_base_path(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db = DataBase(storage_backend=storage.CsvStorageBackend(), data_storage_folder_path=temp_dir)
+            for sampling_type in IMBALANCE_SAMPLINGS + RUN_SAMPLINGS:
+                bar_wrapper = sampler.information_driven_sampling(self.tick_wrapper, sampling_type, expected_ticks=50)
+                db.insert_sampled_bar(bar_wrapper)
+                file_path = db.get_sampled_bar_file_path(bar_wrapper.bar_info)
+                self.assertEqual(db.parse_sampled_bar_file_path(file_path), bar_wrapper.bar_info)
+            self.assertEqual(db.rebuild_catalog(), 6)
+            stored_wrapper = db.get_sampled_bar(symbol="TEST", date=self.tick_info.date, intra_day_period=IntraDayPeriod.MORNING,
+                                                sampling_level=50, sampling_type=Sampling.TICK_IMBALANCE)
+            self.assertEqual(len(stored_wrapper), len(sampler.tick_imbalance_sampling(self.tick_wrapper, expected_ticks=50)))
+
+
+if __name__ == '__main__':
+    unittest.main()
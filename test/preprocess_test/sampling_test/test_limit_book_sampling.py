@@ -0,0 +1,64 @@
+import src.data_processing_module.sampling as sampler
+import pandas as pd
+from src.data_base_module.data_blocks import TickDataColumns, TickDataFrame, TickInfo, Date, IntraDayPeriod, Sampling, LimitBookBarColumns, LimitBookBarDataFrame
+import numpy as np
+import unittest
+
+
+class LimitBookSamplingTest(unittest.TestCase):
+    def setUp(self):
+        # -------- 6 ticks, the third tick has no trade, volume bars of 5 : bar 1 = ticks 1, 2, bar 2 = ticks 2 (residue), 4, 5 --------
+        tick_df = pd.DataFrame({col.value : np.zeros(6) for col in TickDataColumns})
+        tick_df[TickDataColumns.TIMESTAMP_NANO.value] = [101, 256, 312, 498, 685, 795]
+        tick_df[TickDataColumns.LAST_PRICE.value] = [20, 30, 0, 25, 35, 40]
+        tick_df[TickDataColumns.LAST_QUANTITY.value] = [3, 4, 0, 2, 5, 1]
+        tick_df[TickDataColumns.ASK1P.value] = [11, 12, 20, 13, 14, 15]
+        tick_df[TickDataColumns.BID1P.value] = [9, 10, 10, 10, 11, 12]
+        self.tick_info = TickInfo(symbol="TEST", date=Date(day=17, month=7, year=2012), intra_day_period=IntraDayPeriod.MORNING)
+        self.tick_wrapper = TickDataFrame(tick_df=tick_df, tick_info=self.tick_info)
+
+    def test_volume_sampling_limit_book(self):
+        bar_wrapper = sampler.volume_sampling_limit_book(self.tick_wrapper, sampling_volume=5)
+        self.assertIsInstance(bar_wrapper, LimitBookBarDataFrame)
+        self.assertEqual(bar_wrapper.bar_info.sampling_type, Sampling.VOLUME)
+        self.assertTrue(bar_wrapper.get_trade_bar().bar_data.equals(sampler.volume_sampling(self.tick_wrapper, sampling_volume=5).bar_data))
+        expected_quotes = pd.DataFrame({
+            LimitBookBarColumns.OPEN_BID.value : [9.0, 10.0], LimitBookBarColumns.CLOSE_BID.value : [10.0, 11.0],
+            LimitBookBarColumns.HIGH_BID.value : [10.0, 11.0], LimitBookBarColumns.LOW_BID.value : [9.0, 10.0],
+            LimitBookBarColumns.AVERAGE_BID.value : [9.5, 31 / 3],
+            LimitBookBarColumns.OPEN_ASK.value : [11.0, 12.0], LimitBookBarColumns.CLOSE_ASK.value : [12.0, 14.0],
+            LimitBookBarColumns.HIGH_ASK.value : [12.0, 14.0], LimitBookBarColumns.LOW_ASK.value : [11.0, 12.0],
+            LimitBookBarColumns.AVERAGE_ASK.value : [11.5, 13.0],
+            LimitBookBarColumns.AVERAGE_BID_ASK_SPREAD.value : [2.0, 8 / 3], LimitBookBarColumns.STD_BID_ASK_SPREAD.value : [0.0, np.sqrt(2 / 9)]})
+        quote_df = bar_wrapper.bar_data.loc[:, [col.value for col in LimitBookBarColumns]]
+        self.assertTrue(np.allclose(quote_df.to_numpy(), expected_quotes.to_numpy()))
+
+    def test_tick_sampling_limit_book(self):
+        bar_wrapper = sampler.tick_sampling_limit_book(self.tick_wrapper, sampling_ticks=4)
+        self.assertEqual(bar_wrapper.bar_info.sampling_type, Sampling.TICK)
+        # ------ the trade bars are the tick bars of the trade ticks only ------
+        trade_tick_df = self.tick_wrapper.tick_data[self.tick_wrapper.tick_data[TickDataColumns.LAST_PRICE.value] > 0]
+        trade_tick_wrapper = TickDataFrame(tick_df=trade_tick_df, tick_info=self.tick_info)
+        self.assertTrue(bar_wrapper.get_trade_bar().bar_data.equals(sampler.tick_sampling(trade_tick_wrapper, sampling_ticks=4).bar_data))
+        # ------ the quotes of the tick without trade are not used, the left over trade ticks form the last bar ------
+        self.assertEqual(list(bar_wrapper.get_limit_book_column(LimitBookBarColumns.HIGH_ASK)), [14.0, 15.0])
+        self.assertEqual(list(bar_wrapper.get_limit_book_column(LimitBookBarColumns.AVERAGE_ASK)), [12.5, 15.0])
+        self.assertEqual(list(bar_wrapper.get_limit_book_column(LimitBookBarColumns.CLOSE_BID)), [11.0, 12.0])
+        self.assertEqual(list(bar_wrapper.get_limit_book_column(LimitBookBarColumns.STD_BID_ASK_SPREAD)), [np.std([2, 2, 3, 3]), 0.0])
+
+    def test_tick_sampling_limit_book_counts_trade_ticks(self):
+        # ------ bars of 3 trade ticks : ticks 1, 2, 4 then ticks 5, 6, the tick without trade does not move the bar boundaries ------
+        bar_df = sampler.tick_sampling_limit_book(self.tick_wrapper, sampling_ticks=3).bar_data
+        self.assertEqual(list(bar_df["timestamp"]), [101, 685])
+        self.assertEqual(list(bar_df["volume"]), [9.0, 6.0])
+        self.assertEqual(list(bar_df["open"]), [20.0, 35.0])
+        self.assertEqual(list(bar_df[LimitBookBarColumns.OPEN_ASK.value]), [11.0, 14.0])
+
+    def test_no_ticks(self):
+        tick_wrapper = TickDataFrame(tick_df=self.tick_wrapper.tick_data.iloc[:0], tick_info=self.tick_info)
+        self.assertEqual(len(sampler.volume_sampling_limit_book(tick_wrapper, sampling_volume=5)), 0)
+        self.assertEqual(len(sampler.tick_sampling_limit_book(tick_wrapper, sampling_ticks=4)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import src.data_processing_module.sampling as sampler
+import pandas as pd
+from src.data_base_module.data_blocks import TickDataColumns, TickDataFrame, TickInfo, Date, IntraDayPeriod, Sampling, TICK_DATA_DTYPES, apply_schema
+import numpy as np
+import unittest
+
+
+class MultiLevelSamplingTest(unittest.TestCase):
+    def setUp(self):
+        # -------- 2000 random ticks, about a third of them without trades --------
+        rng = np.random.default_rng(7)
+        num_ticks = 2000
+        tick_df = pd.DataFrame({col.value : np.zeros(num_ticks) for col in TickDataColumns})
+        tick_df[TickDataColumns.TIMESTAMP_NANO.value] = 1488844800000000000 + np.cumsum(rng.integers(0, 5 * 10 ** 9, num_ticks))
+        has_trade_bool_arr = rng.random(num_ticks) < 0.66
+        tick_df[TickDataColumns.LAST_PRICE.value] = np.where(has_trade_bool_arr, rng.choice([10, 15.5, 20, 35.25], num_ticks), 0)
+        tick_df[TickDataColumns.LAST_QUANTITY.value] = np.where(has_trade_bool_arr, rng.choice([1, 2, 5, 30, 120], num_ticks), 0)
+        self.tick_info = TickInfo(symbol="TEST", date=Date(day=7, month=3, year=2017), intra_day_period=IntraDayPeriod.MORNING)
+        self.tick_wrapper = TickDataFrame(tick_df=apply_schema(tick_df, TICK_DATA_DTYPES), tick_info=self.tick_info)
+
+    def check_multi_level(self, multi_sampling_func, sampling_func, sampling_type : Sampling, levels):
+        bar_wrappers = multi_sampling_func(self.tick_wrapper, levels=levels)
+        self.assertEqual(list(bar_wrappers.keys()), levels)
+        for level in levels:
+            single_wrapper = sampling_func(self.tick_wrapper, level)
+            self.assertEqual(bar_wrappers[level].bar_info, single_wrapper.bar_info)
+            self.assertEqual(bar_wrappers[level].bar_info.sampling_type, sampling_type)
+            self.assertTrue(bar_wrappers[level].bar_data.equals(single_wrapper.bar_data))
+
+    def test_volume_sampling_multi(self):
+        self.check_multi_level(sampler.volume_sampling_multi, sampler.volume_sampling, Sampling.VOLUME, [10, 20, 50, 100])
+
+    def test_dollar_sampling_multi(self):
+        self.check_multi_level(sampler.dollar_sampling_multi, sampler.dollar_sampling, Sampling.DOLLAR, [500, 1000, 5000])
+
+    def test_tick_sampling_multi(self):
+        self.check_multi_level(sampler.tick_sampling_multi, sampler.tick_sampling, Sampling.TICK, [7, 20, 200])
+
+    def test_time_sampling_multi(self):
+        self.check_multi_level(sampler.time_sampling_multi, sampler.time_sampling, Sampling.TIME, [1, 15, 60, 300])
+        # ------ out of order ticks are sorted into their bins separately for every level ------
+        self.tick_wrapper = TickDataFrame(tick_df=self.tick_wrapper.tick_data.iloc[::-1].reset_index(drop=True), tick_info=self.tick_info)
+        self.check_multi_level(sampler.time_sampling_multi, sampler.time_sampling, Sampling.TIME, [15, 60])
+
+    def test_no_ticks(self):
+        self.tick_wrapper = TickDataFrame(tick_df=self.tick_wrapper.tick_data.iloc[:0], tick_info=self.tick_info)
+        for multi_sampling_func in [sampler.volume_sampling_multi, sampler.dollar_sampling_multi, sampler.tick_sampling_multi, sampler.time_sampling_multi]:
+            self.assertEqual([len(bar_wrapper) for bar_wrapper in multi_sampling_func(self.tick_wrapper, levels=[10, 20]).values()], [0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
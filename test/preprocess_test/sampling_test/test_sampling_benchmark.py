@@ -0,0 +1,76 @@
+import src.data_processing_module.sampling_benchmark as benchmark
+import src.data_processing_module.sampling as sampler
+from src.data_base_module.data_blocks import TickDataColumns
+import pandas as pd
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+class SyntheticTicksTest(unittest.TestCase):
+    def test_synthetic_ticks(self):
+        config = benchmark.SyntheticTickConfig(trade_probability=0.3, block_trade_probability=0.01, block_trade_quantity_range=(1000, 2000))
+        tick_wrapper = benchmark.make_synthetic_ticks(20000, config=config, seed=1)
+        tick_df = tick_wrapper.tick_data
+        self.assertEqual(list(tick_df.columns), [col.value for col in TickDataColumns])
+        timestamps = tick_df[TickDataColumns.TIMESTAMP_NANO.value].to_numpy()
+        self.assertTrue((np.diff(timestamps) > 0).all())
+        has_trade_bool_arr = tick_df[TickDataColumns.LAST_PRICE.value].to_numpy() > 0
+        self.assertAlmostEqual(has_trade_bool_arr.mean(), 0.3, delta=0.02)
+        quantities = tick_df[TickDataColumns.LAST_QUANTITY.value].to_numpy()[has_trade_bool_arr]
+        self.assertTrue((quantities >= 1).all())
+        # ------ block trades span several volume bars of 100 ------
+        self.assertGreater((quantities >= 1000).sum(), 20)
+        bid_prices = tick_df[TickDataColumns.BID1P.value].to_numpy()
+        ask_prices = tick_df[TickDataColumns.ASK1P.value].to_numpy()
+        self.assertTrue((ask_prices > bid_prices).all())
+        trade_prices = tick_df[TickDataColumns.LAST_PRICE.value].to_numpy()[has_trade_bool_arr]
+        self.assertTrue(((trade_prices == bid_prices[has_trade_bool_arr]) | (trade_prices == ask_prices[has_trade_bool_arr])).all())
+        # ------ the same seed gives the same ticks ------
+        self.assertTrue(tick_df.equals(benchmark.make_synthetic_ticks(20000, config=config, seed=1).tick_data))
+
+    def test_quantity_distributions(self):
+        for quantity_distribution in benchmark.QuantityDistribution:
+            config = benchmark.SyntheticTickConfig(trade_probability=1.0, quantity_distribution=quantity_distribution, mean_quantity=4,
+                                                   block_trade_probability=0.0)
+            quantities = benchmark.make_synthetic_ticks(20000, config=config).tick_data[TickDataColumns.LAST_QUANTITY.value]
+            self.assertGreaterEqual(quantities.min(), 1)
+            self.assertAlmostEqual(quantities.mean(), 4, delta=0.3)
+
+
+class SamplingBenchmarkTest(unittest.TestCase):
+    def test_results_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            results_file_path = os.path.join(temp_dir, "results.csv")
+            results = benchmark.run_sampling_benchmark(results_file_path, sizes=[1000, 5000], repeats=1, run_label="first")
+            self.assertEqual(len(results), 2 * len(benchmark.make_default_samplers()))
+            tick_wrapper = benchmark.make_synthetic_ticks(5000)
+            volume_result = [result for result in results if result.sampler_name == "volume_sampling_100" and result.num_ticks == 5000][0]
+            self.assertEqual(volume_result.num_bars, len(sampler.volume_sampling(tick_wrapper, sampling_volume=100)))
+            self.assertTrue(all(result.seconds > 0 and result.peak_memory_mb > 0 for result in results))
+            # ------ a second run appends its rows under its own label ------
+            benchmark.run_sampling_benchmark(results_file_path, sizes=[1000], repeats=1, run_label="second")
+            results_df = pd.read_csv(results_file_path)
+            self.assertEqual(list(results_df["run_label"].value_counts().sort_index()), [12, 6])
+            self.assertEqual(list(results_df.columns), ["run_label", "sampler_name", "num_ticks", "num_bars", "seconds", "ticks_per_second", "peak_memory_mb"])
+
+    def test_finished_sizes_are_kept(self):
+        def failing_sampler(tick_wrapper):
+            if len(tick_wrapper) > 1000:
+                raise MemoryError()
+            return sampler.tick_sampling(tick_wrapper, sampling_ticks=200)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            results_file_path = os.path.join(temp_dir, "results.csv")
+            with self.assertRaises(MemoryError):
+                benchmark.run_sampling_benchmark(results_file_path, sizes=[1000, 5000], samplers=[("failing", failing_sampler)], repeats=1)
+            self.assertEqual(list(pd.read_csv(results_file_path)["num_ticks"]), [1000])
+
+    def test_repeats_validation(self):
+        tick_wrapper = benchmark.make_synthetic_ticks(1000)
+        with self.assertRaises(ValueError):
+            benchmark.benchmark_sampler("label", "tick", lambda tick_wrapper : sampler.tick_sampling(tick_wrapper), tick_wrapper, repeats=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import src.data_processing_module.sampling as sampler
 import pandas as pd
-from src.data_base_module.data_blocks import TickDataColumns, TickDataFrame, Date, IntraDayPeriod, TickBarDataFrame, BarDataColumns
+from src.data_base_module.data_blocks import TickDataColumns, TickDataFrame, TickInfo, Date, IntraDayPeriod, BarDataFrame, BarInfo, BarDataColumns, Sampling
 import numpy as np
 import unittest
 
@@ -78,8 +78,8 @@ class TickSamplingTest(unittest.TestCase):
         # ------ create gibberish column to test redundant column removal of TickDataFrame Wrapper class -----
         self.raw_tick_df["alalabaarababababa_bubrabubra"] = 0
         # ------ create tick data frame wrapper object -------
-        self.tick_df_wrapper = TickDataFrame(tick_df=self.raw_tick_df, date=self.test_date, intra_day_period=IntraDayPeriod.WHOLE_DAY,
-                                        symbol="TEST")
+        self.tick_info = TickInfo(symbol="TEST", date=self.test_date, intra_day_period=IntraDayPeriod.WHOLE_DAY)
+        self.tick_df_wrapper = TickDataFrame(tick_df=self.raw_tick_df, tick_info=self.tick_info)
 
     def test_case(self):
         # ------ expected answer ---------
@@ -98,9 +98,11 @@ class TickSamplingTest(unittest.TestCase):
         expected_bar_df = pd.DataFrame([bar1, bar2, bar3, bar4])
         # ------ create gibberish column to test redundant column removal of VolumeDataFrame Wrapper class ------
         expected_bar_df["hachoooo_hachoooo"] = 1
-        expected_bar_wrapper = TickBarDataFrame(bar_df = expected_bar_df, sampling_ticks=4, date=self.test_date,
-                                                 intra_day_period=IntraDayPeriod.WHOLE_DAY, symbol = "TEST", deep_copy = False)
+        expected_bar_info = BarInfo(symbol="TEST", date=self.test_date, intra_day_period=IntraDayPeriod.WHOLE_DAY,
+                                    sampling_type=Sampling.TICK, sampling_level=4)
+        expected_bar_wrapper = BarDataFrame(bar_data=expected_bar_df, bar_info=expected_bar_info)
         result_bar_wrapper = sampler.tick_sampling(self.tick_df_wrapper, sampling_ticks=4)
 
-        self.assertTrue(all(expected_bar_wrapper.get_bar_data_reference() == result_bar_wrapper.get_bar_data_reference()))
+        self.assertEqual(result_bar_wrapper.bar_info, expected_bar_info)
+        self.assertTrue((expected_bar_wrapper.bar_data == result_bar_wrapper.bar_data).all().all())
 
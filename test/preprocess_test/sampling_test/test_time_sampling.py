@@ -92,7 +92,7 @@ class TimeSamplingTest(unittest.TestCase):
     def test_case(self):
         # --------- expected answer --------
         bar1 = {BarDataColumns.TIMESTAMP.value: 0, BarDataColumns.OPEN.value: 10.0, BarDataColumns.CLOSE.value: 40.0,
-                BarDataColumns.HIGH.value: 40.0, BarDataColumns.LOW.value: 10.0, BarDataColumns.VWAP.value: 25.5,
+                BarDataColumns.HIGH.value: 40.0, BarDataColumns.LOW.value: 10.0, BarDataColumns.VWAP.value: 25.0,
                 BarDataColumns.VOLUME.value: 4}
         bar2 = {BarDataColumns.TIMESTAMP.value: 0, BarDataColumns.OPEN.value: 0.0, BarDataColumns.CLOSE.value: 0.0,
                 BarDataColumns.HIGH.value: 0.0, BarDataColumns.LOW.value: 0.0, BarDataColumns.VWAP.value: 0.0,
@@ -124,6 +124,9 @@ class TimeSamplingTest(unittest.TestCase):
         # ------ sampling -----
         result_bar_wrapper = sampler.time_sampling(tick_wrapper=self.tick_wrapper, sampling_seconds=15)
 
-        self.assertTrue(all(expected_bar_wrapper.bar_data == result_bar_wrapper.bar_data))
+        self.assertEqual(result_bar_wrapper.bar_info, expected_bar_info)
+        self.assertTrue((expected_bar_wrapper.bar_data == result_bar_wrapper.bar_data).all().all())
+        # ------ the input tick data frame keeps its range index ------
+        self.assertIsInstance(self.tick_wrapper.tick_data.index, pd.RangeIndex)
 
 
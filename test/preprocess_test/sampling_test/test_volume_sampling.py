@@ -1,6 +1,6 @@
 import src.data_processing_module.sampling as sampler
 import pandas as pd
-from src.data_base_module.data_blocks import TickDataColumns, TickDataFrame, Date, IntraDayPeriod, VolumeBarDataFrame, BarDataColumns
+from src.data_base_module.data_blocks import TickDataColumns, TickDataFrame, TickInfo, Date, IntraDayPeriod, BarDataFrame, BarInfo, BarDataColumns, Sampling
 import numpy as np
 import unittest
 
@@ -96,7 +96,8 @@ class VolumeSamplingTest(unittest.TestCase):
         self.raw_tick_df["alalabaarababababa_bubrabubra"] = 0
 
         # ------ create tick data frame wrapper object -------
-        self.tick_wrapper = TickDataFrame(tick_df=self.raw_tick_df, date=self.test_date, intra_day_period=IntraDayPeriod.WHOLE_DAY, symbol="TEST")
+        self.tick_info = TickInfo(symbol="TEST", date=self.test_date, intra_day_period=IntraDayPeriod.WHOLE_DAY)
+        self.tick_wrapper = TickDataFrame(tick_df=self.raw_tick_df, tick_info=self.tick_info)
 
     def test_case(self):
         bar1 = {BarDataColumns.TIMESTAMP.value : 101, BarDataColumns.OPEN.value : 20.0, BarDataColumns.CLOSE.value : 35.0,
@@ -122,11 +123,21 @@ class VolumeSamplingTest(unittest.TestCase):
         # ------ create gibberish column to test redundant column removal of VolumeDataFrame Wrapper class ------
         expected_bar_df["hachoooo_hachoooo"] = 1
         # ------ create answer bar df wrapper -------
-        expected_bar_wrapper = VolumeBarDataFrame(bar_df=expected_bar_df, sampling_volume=10, date=self.test_date,
-                                                   intra_day_period=IntraDayPeriod.WHOLE_DAY, symbol="TEST",
-                                                   deep_copy=False)
+        expected_bar_info = BarInfo(symbol="TEST", date=self.test_date, intra_day_period=IntraDayPeriod.WHOLE_DAY,
+                                    sampling_type=Sampling.VOLUME, sampling_level=10)
+        expected_bar_wrapper = BarDataFrame(bar_data=expected_bar_df, bar_info=expected_bar_info)
         # ------ sampling ------
         result_bar_wrapper = sampler.volume_sampling(self.tick_wrapper, sampling_volume = 10)
 
-        self.assertTrue(all(expected_bar_wrapper.get_bar_data_reference() == result_bar_wrapper.get_bar_data_reference()))
+        self.assertEqual(result_bar_wrapper.bar_info, expected_bar_info)
+        self.assertTrue((expected_bar_wrapper.bar_data == result_bar_wrapper.bar_data).all().all())
 
+
+    def test_no_complete_bar(self):
+        # ------ bars completed by the last tick are dropped, as are ticks without a trade price ------
+        tick_df = self.raw_tick_df.iloc[16:].copy()
+        tick_df.loc[18, TickDataColumns.LAST_QUANTITY.value] = 20
+        tick_df.loc[17, TickDataColumns.LAST_PRICE.value] = 0
+        result_bar_wrapper = sampler.volume_sampling(TickDataFrame(tick_df=tick_df, tick_info=self.tick_info), sampling_volume = 10)
+        self.assertEqual(len(result_bar_wrapper), 0)
+        self.assertEqual(list(result_bar_wrapper.bar_data.columns), [col.value for col in BarDataColumns])